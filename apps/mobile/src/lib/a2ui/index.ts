@@ -6,6 +6,7 @@ export type {
   A2UIUpdateDataModel,
   A2UIOperation,
   A2UIOperationZone,
+  A2UIPatchOperation,
   BackendResponse,
   InterpretResult,
   ChatEvent,
@@ -14,6 +15,6 @@ export type {
   WidgetState,
 } from './types';
 
-export { parseResponse, createUserMessage, resolvePointer } from './parser';
+export { parseResponse, createUserMessage, resolvePointer, applyDataModelPatch } from './parser';
 export { interpretResponse } from './interpreter';
 export { createWidgetEvent } from './event-emitter';
@@ -24,6 +24,7 @@ const nextId = () => `msg-${++_idCounter}-${Date.now()}`;
  */
 export function interpretResponse(response: BackendResponse): InterpretResult {
   const errors: string[] = [];
+  const staleSurfaceIds: string[] = [];
   let operationsProcessed = 0;
   let firstStreamSurfaceId: string | undefined;
 
@@ -51,8 +52,16 @@ export function interpretResponse(response: BackendResponse): InterpretResult {
         }
 
         if (op.updateDataModel) {
-          const { surfaceId, dataModel } = op.updateDataModel;
-          store.updateDataModel(surfaceId, dataModel);
+          const { surfaceId, dataModel, version } = op.updateDataModel;
+          store.updateDataModel(surfaceId, dataModel, version);
+          operationsProcessed++;
+        }
+
+        if (op.patchDataModel) {
+          const { surfaceId, patch, baseVersion, version } = op.patchDataModel;
+          if (!store.patchDataModel(surfaceId, patch, baseVersion, version)) {
+            staleSurfaceIds.push(surfaceId);
+          }
           operationsProcessed++;
         }
 
@@ -90,7 +99,7 @@ export function interpretResponse(response: BackendResponse): InterpretResult {
     timestamp: new Date().toISOString(),
   };
 
-  return { message, operationsProcessed, errors };
+  return { message, operationsProcessed, errors, staleSurfaceIds };
 }
 
 /**
@@ -4,7 +4,7 @@
  * Handles both legacy `payload` format and A2UI v0.10 `widgets` format.
  */
 
-import type { A2UIMessage, ChatMessage, ChatWidget } from './types';
+import type { A2UIMessage, A2UIPatchOperation, ChatMessage, ChatWidget } from './types';
 
 let _idCounter = 0;
 const nextId = () => `msg-${++_idCounter}-${Date.now()}`;
@@ -27,6 +27,39 @@ export function resolvePointer(
   return current;
 }
 
+/**
+ * Apply a patchDataModel patch (JSON Patch add/replace/remove) to a copy of a data model.
+ * e.g. applyDataModelPatch({ sets: [] }, [{ op: "add", path: "/sets/-", value: 1 }]) → { sets: [1] }
+ */
+export function applyDataModelPatch(
+  data: Record<string, unknown>,
+  patch: A2UIPatchOperation[]
+): Record<string, unknown> {
+  const result = JSON.parse(JSON.stringify(data)) as Record<string, unknown>;
+  for (const op of patch) {
+    const parts = op.path
+      .slice(1)
+      .split('/')
+      .map((part) => part.replace(/~1/g, '/').replace(/~0/g, '~'));
+    const last = parts.pop() as string;
+    let target: any = result;
+    for (const part of parts) {
+      target = target[part];
+    }
+    if (Array.isArray(target)) {
+      if (op.op === 'add' && last === '-') target.push(op.value);
+      else if (op.op === 'add') target.splice(Number(last), 0, op.value);
+      else if (op.op === 'replace') target[Number(last)] = op.value;
+      else target.splice(Number(last), 1);
+    } else if (op.op === 'remove') {
+      delete target[last];
+    } else {
+      target[last] = op.value;
+    }
+  }
+  return result;
+}
+
 /**
  * Parse A2UI v0.10 messages array into a ChatWidget.
  */
@@ -57,6 +57,12 @@ export interface ChatEvent {
 
 export type A2UIOperationZone = 'context' | 'stream' | 'overlay';
 
+export interface A2UIPatchOperation {
+  op: 'add' | 'replace' | 'remove';
+  path: string;
+  value?: unknown;
+}
+
 export interface A2UIOperation {
   createSurface?: {
     surfaceId: string;
@@ -70,6 +76,15 @@ export interface A2UIOperation {
   updateDataModel?: {
     surfaceId: string;
     dataModel: Record<string, unknown>;
+    // Version of the merged model (sent when the backend uses patchDataModel)
+    version?: string;
+  };
+  patchDataModel?: {
+    surfaceId: string;
+    // Only apply to a surface whose model is at baseVersion
+    baseVersion?: string;
+    version?: string;
+    patch: A2UIPatchOperation[];
   };
   deleteSurface?: {
     surfaceId: string;
@@ -83,10 +98,14 @@ export interface BackendResponse {
   // Legacy formats (still supported)
   payload?: { type: string; props: Record<string, unknown> } | null;
   widgets?: A2UIMessage[] | null;
+  // Coaching note still being written for a fast-path event (GET /api/chat/notes/{id})
+  pending_note?: string | null;
 }
 
 export interface InterpretResult {
   message: ChatMessage;
   operationsProcessed: number;
   errors: string[];
+  // Surfaces a patchDataModel could not be applied to (fetch their whole model)
+  staleSurfaceIds: string[];
 }
@@ -2,12 +2,40 @@ import { create } from 'zustand';
 import { persist, createJSONStorage } from 'zustand/middleware';
 import { mmkvStorage } from '../lib/mmkv';
 import { API_BASE } from '../services/config';
-import type { ChatEvent, ChatMessage } from '../lib/a2ui/types';
+import type { BackendResponse, ChatEvent, ChatMessage } from '../lib/a2ui/types';
 import { createUserMessage } from '../lib/a2ui/parser';
 import { interpretResponse } from '../lib/a2ui/interpreter';
 import { useSurfaceStore } from './surface-store';
 
 const MAX_PERSISTED_MESSAGES = 50;
+const NOTE_WAIT_SECONDS = 20;
+const NOTE_MAX_POLLS = 3;
+
+/** Fetch the coaching note the backend writes after answering an event. */
+async function fetchPendingNote(noteId: string): Promise<BackendResponse | null> {
+  for (let i = 0; i < NOTE_MAX_POLLS; i++) {
+    const res = await fetch(`${API_BASE}/api/chat/notes/${noteId}?wait=${NOTE_WAIT_SECONDS}`);
+    if (!res.ok) return null;
+    const note = await res.json();
+    if (note.status === 'ready') {
+      return note.text ? { text: note.text, operations: note.operations ?? undefined } : null;
+    }
+    if (note.status !== 'pending') return null;
+  }
+  return null;
+}
+
+/** Fetch the whole data model of surfaces a patchDataModel could not be applied to. */
+async function resyncSurfaces(surfaceIds: string[], sessionId: string): Promise<void> {
+  for (const surfaceId of surfaceIds) {
+    const res = await fetch(
+      `${API_BASE}/api/chat/surfaces/${surfaceId}?session_id=${encodeURIComponent(sessionId)}`,
+    );
+    if (!res.ok) continue; // Unknown to the backend: keep the model we have
+    const { dataModel, version } = await res.json();
+    useSurfaceStore.getState().replaceDataModel(surfaceId, dataModel, version);
+  }
+}
 
 interface ChatState {
   messages: ChatMessage[];
@@ -47,6 +75,9 @@ export const useChatStore = create<ChatState>()(
           if (!res.ok) throw new Error(`HTTP ${res.status}`);
           const data = await res.json();
           const result = interpretResponse(data);
+          resyncSurfaces(result.staleSurfaceIds, get().sessionId).catch((e) =>
+            console.warn('[chat-store] surface resync failed:', e),
+          );
 
           set((s) => ({ messages: [...s.messages, result.message] }));
 
@@ -92,12 +123,28 @@ export const useChatStore = create<ChatState>()(
           if (!res.ok) throw new Error(`HTTP ${res.status}`);
           const data = await res.json();
           const result = interpretResponse(data);
+          resyncSurfaces(result.staleSurfaceIds, get().sessionId).catch((e) =>
+            console.warn('[chat-store] surface resync failed:', e),
+          );
 
           set((s) => ({ messages: [...s.messages, result.message] }));
 
           if (result.errors.length > 0) {
             console.warn('[chat-store] interpreter errors:', result.errors);
           }
+
+          if (data.pending_note) {
+            fetchPendingNote(data.pending_note)
+              .then((note) => {
+                if (!note) return;
+                const noteResult = interpretResponse(note);
+                resyncSurfaces(noteResult.staleSurfaceIds, get().sessionId).catch((e) =>
+                  console.warn('[chat-store] surface resync failed:', e),
+                );
+                set((s) => ({ messages: [...s.messages, noteResult.message] }));
+              })
+              .catch((e) => console.warn('[chat-store] note fetch failed:', e));
+          }
         } catch (e) {
           console.error('[chat-store] sendEvent failed:', e);
         } finally {
@@ -1,6 +1,8 @@
 import { create } from 'zustand';
 import { persist, createJSONStorage } from 'zustand/middleware';
 import { mmkvStorage } from '../lib/mmkv';
+import { applyDataModelPatch } from '../lib/a2ui/parser';
+import type { A2UIPatchOperation } from '../lib/a2ui/types';
 
 export type SurfaceZone = 'context' | 'stream' | 'overlay';
 export type SurfaceState = 'active' | 'frozen' | 'dismissed';
@@ -10,6 +12,7 @@ export interface Surface {
   zone: SurfaceZone;
   widgetType: string;
   dataModel: Record<string, unknown>;
+  dataModelVersion?: string;
   state: SurfaceState;
   linkedMessageId?: string;
   createdAt: number;
@@ -28,7 +31,15 @@ interface SurfaceStoreState {
     linkedMessageId?: string,
   ) => void;
   updateComponents: (surfaceId: string, newWidgetType: string) => void;
-  updateDataModel: (surfaceId: string, dataModel: Record<string, unknown>) => void;
+  updateDataModel: (surfaceId: string, dataModel: Record<string, unknown>, version?: string) => void;
+  /** Returns false (and changes nothing) if the surface is missing, at another version, or the patch does not fit. */
+  patchDataModel: (
+    surfaceId: string,
+    patch: A2UIPatchOperation[],
+    baseVersion?: string,
+    version?: string,
+  ) => boolean;
+  replaceDataModel: (surfaceId: string, dataModel: Record<string, unknown>, version?: string) => void;
   deleteSurface: (surfaceId: string) => void;
 
   // Lifecycle
@@ -91,7 +102,7 @@ export const useSurfaceStore = create<SurfaceStoreState>()(
         });
       },
 
-      updateDataModel: (surfaceId, dataModel) => {
+      updateDataModel: (surfaceId, dataModel, version) => {
         set((state) => {
           const surface = state.surfaces[surfaceId];
           if (!surface) return state;
@@ -101,6 +112,51 @@ export const useSurfaceStore = create<SurfaceStoreState>()(
               [surfaceId]: {
                 ...surface,
                 dataModel: { ...surface.dataModel, ...dataModel },
+                dataModelVersion: version,
+                updatedAt: Date.now(),
+              },
+            },
+          };
+        });
+      },
+
+      patchDataModel: (surfaceId, patch, baseVersion, version) => {
+        const surface = get().surfaces[surfaceId];
+        // A patch is only valid for the model it was computed from
+        if (!surface || (baseVersion !== undefined && surface.dataModelVersion !== baseVersion)) {
+          return false;
+        }
+        let dataModel: Record<string, unknown>;
+        try {
+          dataModel = applyDataModelPatch(surface.dataModel, patch);
+        } catch {
+          return false;
+        }
+        set((state) => ({
+          surfaces: {
+            ...state.surfaces,
+            [surfaceId]: {
+              ...surface,
+              dataModel,
+              dataModelVersion: version,
+              updatedAt: Date.now(),
+            },
+          },
+        }));
+        return true;
+      },
+
+      replaceDataModel: (surfaceId, dataModel, version) => {
+        set((state) => {
+          const surface = state.surfaces[surfaceId];
+          if (!surface) return state;
+          return {
+            surfaces: {
+              ...state.surfaces,
+              [surfaceId]: {
+                ...surface,
+                dataModel,
+                dataModelVersion: version,
                 updatedAt: Date.now(),
               },
             },
@@ -0,0 +1,289 @@
+"""Gemini explicit context caching for the static GENESIS prefix.
+
+Every chat turn sends the ~22 KB unified instruction plus the tool
+declarations. With GENESIS_CONTEXT_CACHE enabled, that prefix is stored once
+as a Gemini CachedContent and requests reference it by name instead:
+
+- Create: the first request with a new prefix goes out uncached while the
+  cache is created in the background; later requests use it
+- Refresh: the TTL is extended in the background when it is close to expiry
+- Invalidate: a prefix change (instruction file reloaded, tools changed, other
+  model) replaces the cache; a model error on a cached request drops it
+- Fallback: if caching is unsupported or fails (e.g. prefix below the model's
+  minimum), requests are sent uncached and creation is retried later
+
+Shared by all sessions in the process, unlike ADK's per-session
+ContextCacheConfig.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable
+
+from google import genai
+from google.genai import types
+
+from settings import env_flag
+
+if TYPE_CHECKING:
+    from google.adk.agents.callback_context import CallbackContext
+    from google.adk.models import LlmRequest, LlmResponse
+
+logger = logging.getLogger(__name__)
+
+GENESIS_CONTEXT_CACHE = env_flag("GENESIS_CONTEXT_CACHE")
+GENESIS_CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("GENESIS_CONTEXT_CACHE_TTL_SECONDS", "3600"))
+# Extend the TTL once less than this remains
+GENESIS_CONTEXT_CACHE_REFRESH_SECONDS = int(os.getenv("GENESIS_CONTEXT_CACHE_REFRESH_SECONDS", "600"))
+# After a failed create, send uncached for this long before trying again
+GENESIS_CONTEXT_CACHE_RETRY_SECONDS = int(os.getenv("GENESIS_CONTEXT_CACHE_RETRY_SECONDS", "900"))
+
+# A cache this close to expiry is not used (the request could outlive it)
+EXPIRY_SAFETY_SECONDS = 60
+
+
+@dataclass
+class CachedPrefix:
+    """A created cache and the request prefix it holds."""
+
+    name: str
+    fingerprint: str
+    model: str
+    expire_at: float  # Unix time
+
+
+def prefix_fingerprint(llm_request: LlmRequest) -> str:
+    """Hash of everything the cache replaces: model, system instruction, tools, tool config."""
+    data = llm_request.config.model_dump(
+        mode="json",
+        include={"system_instruction", "tools", "tool_config"},
+        exclude_none=True,
+    )
+    data["model"] = llm_request.model
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+class InstructionCache:
+    """Process-wide explicit cache of the agent's static request prefix."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], Any] = genai.Client,
+        enabled: bool = GENESIS_CONTEXT_CACHE,
+        ttl_seconds: int = GENESIS_CONTEXT_CACHE_TTL_SECONDS,
+        refresh_seconds: int = GENESIS_CONTEXT_CACHE_REFRESH_SECONDS,
+        retry_seconds: int = GENESIS_CONTEXT_CACHE_RETRY_SECONDS,
+    ):
+        """
+        Args:
+            client_factory: Builds the google-genai client (stubbed in tests)
+            enabled: Use context caching at all
+            ttl_seconds: TTL given to the cache on create and refresh
+            refresh_seconds: Refresh once less than this remains
+            retry_seconds: Back-off after a failed create
+        """
+        self.client_factory = client_factory
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self.refresh_seconds = min(refresh_seconds, ttl_seconds // 2)
+        self.retry_seconds = retry_seconds
+
+        self._client = None
+        self.current: CachedPrefix | None = None
+        self._creating: str | None = None  # Fingerprint being created
+        self._retry_at: dict[str, float] = {}  # Fingerprint -> unix time
+        self._tasks: set[asyncio.Task] = set()
+        self._refreshing = False
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "created": 0,
+            "refreshed": 0,
+            "invalidated": 0,
+            "failures": 0,
+        }
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self.client_factory()
+        return self._client
+
+    # =========================================================================
+    # ADK callbacks
+    # =========================================================================
+
+    async def before_model(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> LlmResponse | None:
+        """before_model_callback: point the request at the cache when one is ready."""
+        if self.enabled:
+            try:
+                self.apply(llm_request)
+            except Exception as e:
+                logger.warning(f"Context cache skipped for this request: {e}")
+        return None
+
+    async def on_model_error(
+        self, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception
+    ) -> LlmResponse | None:
+        """on_model_error_callback: stop using a cache the model rejected."""
+        cached_content = llm_request.config.cached_content if llm_request.config else None
+        if self.current is not None and cached_content == self.current.name:
+            logger.warning(f"Model error on cached request, dropping cache {cached_content}: {error}")
+            self._invalidate(delete=False)
+        return None  # The error itself is still raised
+
+    # =========================================================================
+    # Cache use
+    # =========================================================================
+
+    def apply(self, llm_request: LlmRequest) -> bool:
+        """
+        Use the cache for a request if it matches, else arrange for one.
+
+        Args:
+            llm_request: Request about to be sent (modified in place on a hit)
+
+        Returns:
+            True if the request now references the cache
+        """
+        config = llm_request.config
+        if config is None or not config.system_instruction or config.cached_content or not llm_request.model:
+            return False
+
+        fingerprint = prefix_fingerprint(llm_request)
+        now = time.time()
+        current = self.current
+        if current is not None and current.fingerprint == fingerprint:
+            remaining = current.expire_at - now
+            if remaining > EXPIRY_SAFETY_SECONDS:
+                config.system_instruction = None
+                config.tools = None
+                config.tool_config = None
+                config.cached_content = current.name
+                self._stats["hits"] += 1
+                if remaining < self.refresh_seconds and not self._refreshing:
+                    self._spawn(self._refresh(current))
+                return True
+
+        self._stats["misses"] += 1
+        if current is not None and current.fingerprint != fingerprint:
+            self._invalidate(delete=True)  # Prefix changed (e.g. instruction reloaded)
+        elif current is not None:
+            self.current = None  # Expired
+
+        if self._creating != fingerprint and self._retry_at.get(fingerprint, 0) <= now:
+            self._creating = fingerprint
+            self._spawn(
+                self._create(
+                    fingerprint,
+                    llm_request.model,
+                    types.CreateCachedContentConfig(
+                        system_instruction=config.system_instruction,
+                        tools=config.tools,
+                        tool_config=config.tool_config,
+                        ttl=f"{self.ttl_seconds}s",
+                        display_name="genesis-instruction",
+                    ),
+                )
+            )
+        return False
+
+    async def close(self) -> None:
+        """Stop background work and delete the cache (shutdown)."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        if self.current is not None:
+            await self._delete(self.current.name)
+            self.current = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "cache": self.current.name if self.current else None,
+        }
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    async def _create(self, fingerprint: str, model: str, cache_config: types.CreateCachedContentConfig) -> None:
+        try:
+            cached = await self.client.aio.caches.create(model=model, config=cache_config)
+        except Exception as e:
+            self._stats["failures"] += 1
+            self._retry_at[fingerprint] = time.time() + self.retry_seconds
+            logger.warning(f"Context caching unavailable for {model}, sending the instruction uncached: {e}")
+            return
+        finally:
+            if self._creating == fingerprint:
+                self._creating = None
+
+        self._retry_at.pop(fingerprint, None)
+        self._stats["created"] += 1
+        replaced = self.current
+        self.current = CachedPrefix(
+            name=cached.name,
+            fingerprint=fingerprint,
+            model=model,
+            expire_at=self._expire_at(cached),
+        )
+        logger.info(f"Created context cache {cached.name} for {model}")
+        if replaced is not None:
+            await self._delete(replaced.name)
+
+    async def _refresh(self, cached_prefix: CachedPrefix) -> None:
+        self._refreshing = True
+        try:
+            updated = await self.client.aio.caches.update(
+                name=cached_prefix.name,
+                config=types.UpdateCachedContentConfig(ttl=f"{self.ttl_seconds}s"),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to refresh context cache {cached_prefix.name}: {e}")
+            if self.current is cached_prefix:
+                self._invalidate(delete=False)
+            return
+        finally:
+            self._refreshing = False
+        cached_prefix.expire_at = self._expire_at(updated)
+        self._stats["refreshed"] += 1
+
+    def _invalidate(self, delete: bool) -> None:
+        if self.current is None:
+            return
+        name = self.current.name
+        self.current = None
+        self._stats["invalidated"] += 1
+        if delete:
+            self._spawn(self._delete(name))
+
+    async def _delete(self, name: str) -> None:
+        try:
+            await self.client.aio.caches.delete(name=name)
+        except Exception as e:
+            logger.debug(f"Failed to delete context cache {name}: {e}")
+
+    def _expire_at(self, cached: Any) -> float:
+        expire_time = getattr(cached, "expire_time", None)
+        if isinstance(expire_time, datetime):
+            return expire_time.timestamp()
+        return time.time() + self.ttl_seconds
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
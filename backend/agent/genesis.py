@@ -15,7 +15,10 @@ defined in the unified instruction file.
 from pathlib import Path
 
 from google.adk.agents import Agent
+from google.adk.agents.readonly_context import ReadonlyContext
 
+from agent.context_cache import InstructionCache
+from prompts import InstructionFile
 from tools import generate_widget, get_user_context, update_user_context
 
 # Load instruction from unified file (V4)
@@ -41,10 +44,20 @@ FORMATO DE RESPUESTA:
 El campo "agent" SIEMPRE es "GENESIS". El campo "payload" es opcional.
 """
 
-try:
-    GENESIS_INSTRUCTION = INSTRUCTION_PATH.read_text(encoding="utf-8")
-except Exception:
-    GENESIS_INSTRUCTION = DEFAULT_GENESIS_INSTRUCTION
+# Read once; re-read when the file changes on disk (no restart needed)
+genesis_instruction = InstructionFile(INSTRUCTION_PATH, default=DEFAULT_GENESIS_INSTRUCTION)
+
+# Instruction as loaded at import
+GENESIS_INSTRUCTION = genesis_instruction.text
+
+
+def _current_instruction(context: ReadonlyContext) -> str:
+    """Instruction provider for ADK: the latest version of the unified file."""
+    return genesis_instruction.text
+
+
+# Optional Gemini context cache for the static prefix (GENESIS_CONTEXT_CACHE)
+instruction_cache = InstructionCache()
 
 genesis = Agent(
     name="genesis",
@@ -57,8 +70,10 @@ genesis = Agent(
         "y educacion (explicaciones, ciencia). "
         "Maneja todas las consultas directamente como una entidad unificada."
     ),
-    instruction=GENESIS_INSTRUCTION,
+    instruction=_current_instruction,
     tools=[generate_widget, get_user_context, update_user_context],
+    before_model_callback=instruction_cache.before_model,
+    on_model_error_callback=instruction_cache.on_model_error,
     # V4: No sub_agents - all handled internally by GENESIS
 )
 
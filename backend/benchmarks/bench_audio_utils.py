@@ -0,0 +1,102 @@
+"""
+Benchmark: numpy audio primitives vs the previous struct/per-sample versions.
+
+Reports the CPU cost of one 100 ms chunk for level calculation, 24k -> 16k
+resampling and mixing, at the 16 kHz client rate and the 24 kHz Gemini
+output rate.
+
+Usage (from backend/):
+    python -m benchmarks.bench_audio_utils [iterations]
+"""
+
+import random
+import struct
+import sys
+import timeit
+
+from voice.audio_utils import calculate_audio_level, mix_audio_chunks, resample_audio
+from voice.resampler import StreamingResampler
+
+
+# =============================================================================
+# Previous implementations (struct.unpack + Python loops)
+# =============================================================================
+
+def legacy_calculate_audio_level(audio_bytes: bytes) -> float:
+    num_samples = len(audio_bytes) // 2
+    samples = struct.unpack(f"<{num_samples}h", audio_bytes[: num_samples * 2])
+    rms = (sum(s * s for s in samples) / len(samples)) ** 0.5
+    return min(1.0, rms / 32767.0 * 1.5)
+
+
+def legacy_resample_audio(audio_bytes: bytes, from_rate: int, to_rate: int) -> bytes:
+    num_samples = len(audio_bytes) // 2
+    samples = list(struct.unpack(f"<{num_samples}h", audio_bytes[: num_samples * 2]))
+    ratio = to_rate / from_rate
+    resampled = []
+    for i in range(int(num_samples * ratio)):
+        src_idx = i / ratio
+        idx_low = int(src_idx)
+        idx_high = min(idx_low + 1, num_samples - 1)
+        frac = src_idx - idx_low
+        resampled.append(int(samples[idx_low] * (1 - frac) + samples[idx_high] * frac))
+    return struct.pack(f"<{len(resampled)}h", *resampled)
+
+
+def legacy_mix_audio_chunks(chunks: list[bytes]) -> bytes:
+    num_samples = min(len(c) for c in chunks) // 2
+    all_samples = [struct.unpack(f"<{num_samples}h", c[: num_samples * 2]) for c in chunks]
+    mixed = []
+    for i in range(num_samples):
+        avg = sum(samples[i] for samples in all_samples) // len(all_samples)
+        mixed.append(max(-32768, min(32767, avg)))
+    return struct.pack(f"<{len(mixed)}h", *mixed)
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+def chunk(sample_rate: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    num_samples = sample_rate // 10  # 100 ms
+    return struct.pack(f"<{num_samples}h", *(rng.randint(-20000, 20000) for _ in range(num_samples)))
+
+
+def report(label: str, legacy, current, iterations: int) -> None:
+    legacy_us = timeit.timeit(legacy, number=iterations) / iterations * 1e6
+    current_us = timeit.timeit(current, number=iterations) / iterations * 1e6
+    print(f"  {label:<28} {legacy_us:9.1f} us -> {current_us:7.1f} us  ({legacy_us / current_us:5.1f}x)")
+
+
+def main(iterations: int) -> None:
+    for rate in (16000, 24000):
+        a, b = chunk(rate, 1), chunk(rate, 2)
+        print(f"{rate // 1000} kHz, 100 ms chunk ({len(a)} bytes), per call:")
+        report("calculate_audio_level", lambda: legacy_calculate_audio_level(a), lambda: calculate_audio_level(a), iterations)
+        if rate == 24000:
+            resampler = StreamingResampler(24000, 16000)
+            report(
+                "StreamingResampler 24k -> 16k",
+                lambda: legacy_resample_audio(a, 24000, 16000),
+                lambda: resampler.process(a),
+                iterations,
+            )
+            report(
+                "resample_audio 24k -> 16k",
+                lambda: legacy_resample_audio(a, 24000, 16000),
+                lambda: resample_audio(a, 24000, 16000),
+                iterations,
+            )
+        else:
+            report(
+                "resample_audio 16k -> 24k",
+                lambda: legacy_resample_audio(a, 16000, 24000),
+                lambda: resample_audio(a, 16000, 24000),
+                iterations,
+            )
+        report("mix_audio_chunks (2)", lambda: legacy_mix_audio_chunks([a, b]), lambda: mix_audio_chunks([a, b]), iterations)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,150 @@
+"""
+Benchmark: per-event widget build cost, registry vs the previous if-chain.
+
+Builds the widgets for workout_started / workout_completed events with the
+old ``_build_event_widget`` if-chain (copied below) and with
+``event_registry.build`` (pydantic-validated payload + declarative
+templates), then again with many extra event types registered to show that
+dispatch cost does not grow with the number of handlers.
+
+Usage (from backend/):
+    python -m benchmarks.bench_event_widgets [iterations]
+"""
+
+import sys
+import time
+
+from schemas.request import ChatEvent
+from services.event_widgets import EventHandler, EventRegistry, WidgetTemplate, event_registry
+from tools.generate_widget import (
+    create_context_widget,
+    create_overlay_widget,
+    create_stream_widget,
+    format_as_a2ui,
+)
+
+EVENTS = {
+    "workout_started": ChatEvent(
+        type="workout_started",
+        payload={
+            "sessionId": "w-1",
+            "title": "Fuerza A",
+            "exercises": [
+                {"name": f"Ejercicio {i}", "sets": 4, "reps": "6-8", "rpe": 8} for i in range(8)
+            ],
+        },
+    ),
+    "workout_completed": ChatEvent(
+        type="workout_completed",
+        payload={
+            "sessionId": "w-1",
+            "title": "Fuerza A",
+            "totalVolume": 12500,
+            "totalSets": 24,
+            "totalReps": 180,
+            "durationMins": 62,
+            "prs": [{"exercise": "Sentadilla", "weight": 140}],
+        },
+    ),
+}
+
+
+def legacy_build_event_widget(event: ChatEvent, note: str = ""):
+    """The previous if-chain implementation from main.py."""
+    etype = event.type
+    p = event.payload
+
+    if etype == "workout_started":
+        exercises = p.get("exercises", [])
+        props = {
+            "workoutId": p.get("sessionId", ""),
+            "title": p.get("title", "Workout"),
+            "exercises": [
+                {
+                    "id": str(i),
+                    "name": ex.get("name", ex.get("exercise", "")),
+                    "target": {
+                        "sets": ex.get("sets", 3),
+                        "reps": ex.get("reps", "8-12"),
+                        "rpe": ex.get("rpe"),
+                    },
+                    "setsCompleted": [],
+                }
+                for i, ex in enumerate(exercises)
+            ],
+        }
+        payload = {"type": "live-session-tracker", "props": props}
+        widgets = format_as_a2ui("live-session-tracker", props)
+        ops = create_overlay_widget("live-session-tracker", props)
+        context_props = {
+            "exerciseName": exercises[0].get("name", "") if exercises else "",
+            "targetSets": exercises[0].get("sets", 3) if exercises else 3,
+            "targetReps": str(exercises[0].get("reps", "8-12")) if exercises else "8-12",
+            "elapsed": 0,
+            "totalSetsCompleted": 0,
+        }
+        ops.extend(create_context_widget("training-mode-bar", context_props))
+        return payload, widgets, ops
+
+    if etype == "workout_completed":
+        props = {
+            "sessionId": p.get("sessionId", ""),
+            "title": p.get("title", "Workout Complete"),
+            "totalVolume": p.get("totalVolume", 0),
+            "totalSets": p.get("totalSets", 0),
+            "totalReps": p.get("totalReps", 0),
+            "durationMins": p.get("durationMins", 0),
+            "prs": p.get("prs", []),
+            "genesisNote": note[:200] if note else "",
+        }
+        payload = {"type": "workout-complete", "props": props}
+        widgets = format_as_a2ui("workout-complete", props)
+        ops = create_stream_widget("workout-complete", props)
+        ops.append({"deleteSurface": {"surfaceId": "*overlay*"}})
+        return payload, widgets, ops
+
+    return None
+
+
+def crowded_registry(extra: int) -> EventRegistry:
+    """The real handlers plus ``extra`` dummy event types."""
+    registry = EventRegistry()
+    for event_type in EVENTS:
+        registry.register(event_registry.get(event_type))
+    dummy = event_registry.get("workout_completed")
+    for i in range(extra):
+        registry.register(EventHandler(
+            event_type=f"custom_event_{i}",
+            payload_model=dummy.payload_model,
+            widgets=(WidgetTemplate("workout-complete", "stream", dummy.widgets[0].props),),
+            ack_text="",
+        ))
+    return registry
+
+
+def measure(label: str, build, event: ChatEvent, iterations: int) -> None:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        build(event)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<40} {elapsed / iterations * 1e6:8.1f} us/event")
+
+
+def main(iterations: int) -> None:
+    print(f"iterations: {iterations:,}")
+    crowded = crowded_registry(200)
+    for event_type, event in EVENTS.items():
+        print(f"{event_type}:")
+        measure("legacy if-chain", legacy_build_event_widget, event, iterations)
+        measure("registry (validated)", event_registry.build, event, iterations)
+        measure("registry, 200 extra handlers", crowded.build, event, iterations)
+        measure(
+            "payload validation only",
+            lambda e: event_registry.get(e.type).payload_model.model_validate(e.payload),
+            event,
+            iterations,
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,128 @@
+"""
+Benchmark: payload size and cost of delta updates.
+
+Two flows, each as full ``updateDataModel`` operations and as
+``patchDataModel`` deltas from ``SurfaceModels.compact``, reporting bytes
+on the wire and server-side time per update:
+
+- workout-complete note: the fast path renders the workout-complete card,
+  then the coaching note fills in its ``genesisNote`` (the update the
+  backend sends today)
+- live-session-tracker (8 exercises x 4 sets) updated in place after every
+  logged set: what deltas would save if the tracker kept its surface
+  (``generate_operations`` currently creates a new surface per response)
+
+Usage (from backend/):
+    python -m benchmarks.bench_surface_deltas [sessions]
+"""
+
+import json
+import sys
+import time
+
+from services.event_widgets import event_registry
+from schemas.request import ChatEvent
+from services.surface_deltas import SurfaceModels
+from tools.generate_widget import generate_operations
+
+EXERCISES = 8
+SETS = 4
+
+
+def _tracker(logged: int) -> dict:
+    return {
+        "workoutId": "w-1",
+        "title": "Fuerza A",
+        "exercises": [
+            {
+                "id": str(i),
+                "name": f"Ejercicio {i}",
+                "target": {"sets": SETS, "reps": "6-8", "rpe": 8},
+                "setsCompleted": [
+                    {"weight": 60 + 2.5 * s, "reps": 8, "rpe": 8}
+                    for s in range(max(0, min(SETS, logged - i * SETS)))
+                ],
+            }
+            for i in range(EXERCISES)
+        ],
+    }
+
+
+def _size(operations: list[dict]) -> int:
+    return len(json.dumps(operations, ensure_ascii=False))
+
+
+WORKOUT_COMPLETED = ChatEvent(
+    type="workout_completed",
+    payload={
+        "sessionId": "w-1",
+        "title": "Fuerza A",
+        "duration": 3600,
+        "totalSets": EXERCISES * SETS,
+        "totalVolume": 12400,
+        "prs": ["Sentadilla 100 kg", "Press banca 80 kg"],
+    },
+)
+NOTE = "Gran sesión: subiste el volumen un 10% y mantuviste el RPE bajo control. Mañana, movilidad."
+
+
+def run_note(models: SurfaceModels, session_id: str) -> tuple[int, float]:
+    """Render the workout-complete card, then send its note; return (bytes of the update, seconds)."""
+    payload, _, operations = event_registry.build(WORKOUT_COMPLETED)
+    surface_id = operations[0]["createSurface"]["surfaceId"]
+    models.compact(session_id, operations)
+
+    # What _generate_event_note sends once the note is written
+    props = {**payload["props"], "genesisNote": NOTE}
+    update = [{"updateDataModel": {"surfaceId": surface_id, "dataModel": props}}]
+    start = time.perf_counter()
+    sent = models.compact(session_id, update)
+    return _size(sent), time.perf_counter() - start
+
+
+def run_tracker(models: SurfaceModels, session_id: str) -> tuple[int, float]:
+    """Send one workout's updates; return (bytes of updates, seconds spent compacting)."""
+    operations = generate_operations("live-session-tracker", _tracker(0), zone="overlay")
+    surface_id = operations[0]["createSurface"]["surfaceId"]
+    models.compact(session_id, operations)
+
+    total_bytes = 0
+    elapsed = 0.0
+    for logged in range(1, EXERCISES * SETS + 1):
+        update = [{"updateDataModel": {"surfaceId": surface_id, "dataModel": _tracker(logged)}}]
+        start = time.perf_counter()
+        sent = models.compact(session_id, update)
+        elapsed += time.perf_counter() - start
+        total_bytes += _size(sent)
+    return total_bytes, elapsed
+
+
+def main(sessions: int = 200) -> None:
+    flows = (
+        (f"workout-complete note, {sessions} sessions ({sessions} updates)", run_note, 1),
+        (
+            f"live-session-tracker in place, {EXERCISES}x{SETS} sets, {sessions} sessions "
+            f"({sessions * EXERCISES * SETS} updates)",
+            run_tracker,
+            EXERCISES * SETS,
+        ),
+    )
+    for title, run, updates_per_session in flows:
+        updates = sessions * updates_per_session
+        print(title)
+        for label, enabled in (("full updateDataModel", False), ("patchDataModel deltas", True)):
+            models = SurfaceModels(enabled=enabled, max_sessions=sessions)
+            total_bytes = 0
+            elapsed = 0.0
+            for i in range(sessions):
+                session_bytes, session_elapsed = run(models, f"s{i}")
+                total_bytes += session_bytes
+                elapsed += session_elapsed
+            print(
+                f"  {label:24s} {total_bytes / updates:8.0f} B/update  "
+                f"{elapsed / updates * 1e6:7.1f} us/update"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,111 @@
+"""
+Benchmark: slotted WearableMetrics vs the previous plain dataclass.
+
+Measures retained memory for a backfill-sized batch and the throughput of
+per-row ``to_record`` against the batch ``to_records`` / ``to_columns``
+exports.
+
+Usage (from backend/):
+    python -m benchmarks.bench_wearable_metrics [rows]
+"""
+
+import sys
+import time
+import tracemalloc
+from dataclasses import field, fields, make_dataclass
+from datetime import date, datetime, timedelta, timezone
+
+from wearables.models import WearableMetrics, to_columns, to_records
+
+# The pre-slots model: same fields, regular __dict__-backed instances
+LegacyWearableMetrics = make_dataclass(
+    "LegacyWearableMetrics",
+    [(f.name, f.type, field(default=f.default)) for f in fields(WearableMetrics)],
+)
+
+
+def legacy_to_record(m) -> dict:
+    """The previous per-row implementation of ``to_record``."""
+    return {
+        "user_id": m.user_id,
+        "provider": m.provider,
+        "data_date": m.data_date.isoformat(),
+        "hrv_rmssd": m.hrv_rmssd,
+        "hrv_sdnn": m.hrv_sdnn,
+        "resting_hr": m.resting_hr,
+        "sleep_score": m.sleep_score,
+        "sleep_hours": m.sleep_hours,
+        "deep_sleep_minutes": m.deep_sleep_minutes,
+        "rem_sleep_minutes": m.rem_sleep_minutes,
+        "light_sleep_minutes": m.light_sleep_minutes,
+        "awake_minutes": m.awake_minutes,
+        "recovery_score": m.recovery_score,
+        "readiness_score": m.readiness_score,
+        "stress_level": m.stress_level,
+        "body_battery": m.body_battery,
+        "strain": m.strain,
+        "steps": m.steps,
+        "active_calories": m.active_calories,
+        "total_calories": m.total_calories,
+        "active_minutes": m.active_minutes,
+        "raw_data_id": m.raw_data_id,
+        "synced_at": m.synced_at.isoformat() if m.synced_at else None,
+    }
+
+
+def build(cls, rows: int) -> list:
+    start = date(2023, 1, 1)
+    synced_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        cls(
+            user_id=f"user-{i % 500}",
+            provider="garmin",
+            data_date=start + timedelta(days=i % 365),
+            hrv_rmssd=40.0 + i % 30,
+            resting_hr=50 + i % 20,
+            sleep_hours=7.5,
+            steps=8000 + i % 4000,
+            active_calories=500,
+            total_calories=2400,
+            synced_at=synced_at,
+        )
+        for i in range(rows)
+    ]
+
+
+def measure_memory(cls, rows: int) -> float:
+    tracemalloc.start()
+    batch = build(cls, rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del batch
+    return current / 1024 / 1024
+
+
+def measure_time(label: str, func, batch) -> None:
+    started = time.perf_counter()
+    func(batch)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<34} {elapsed * 1000:8.1f} ms  ({len(batch) / elapsed:,.0f} rows/s)")
+
+
+def main(rows: int) -> None:
+    print(f"rows: {rows:,}")
+
+    print("memory (retained after build):")
+    legacy_mb = measure_memory(LegacyWearableMetrics, rows)
+    slotted_mb = measure_memory(WearableMetrics, rows)
+    print(f"  legacy dataclass                   {legacy_mb:8.1f} MB")
+    print(f"  slotted dataclass                  {slotted_mb:8.1f} MB  ({slotted_mb / legacy_mb:.0%})")
+
+    print("export:")
+    legacy = build(LegacyWearableMetrics, rows)
+    slotted = build(WearableMetrics, rows)
+    measure_time("legacy to_record per row", lambda batch: [legacy_to_record(m) for m in batch], legacy)
+    measure_time("slotted to_record per row", lambda batch: [m.to_record() for m in batch], slotted)
+    measure_time("slotted to_records (batch)", to_records, slotted)
+    measure_time("slotted to_columns (columnar)", to_columns, slotted)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
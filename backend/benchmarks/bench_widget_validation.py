@@ -0,0 +1,70 @@
+"""
+Benchmark: widget props validation cost per response.
+
+Validates representative widget payloads with ``widget_catalog.validate``:
+valid props of a small, a medium and a large widget, props caught by the
+fast-reject check, and props rejected by full validation. For comparison,
+the same valid payloads are validated after recompiling the model's schema
+(``model_rebuild(force=True)``), the cost the catalog avoids by compiling
+once at import.
+
+Usage (from backend/):
+    python -m benchmarks.bench_widget_validation [iterations]
+"""
+
+import sys
+import time
+
+from schemas.widgets import WIDGET_PROPS, WidgetCatalog
+
+VALID = {
+    "quote-card": {"quote": "No tienes que ser perfecto para ser consistente.", "author": "GENESIS"},
+    "workout-card": {
+        "title": "Upper Body A - Push",
+        "category": "Hipertrofia",
+        "duration": "55 min",
+        "workoutId": "ub-a-001",
+        "exercises": [
+            {"name": f"Ejercicio {i}", "sets": 4, "reps": "8-10", "load": "75% 1RM"} for i in range(6)
+        ],
+        "coachNote": "Enfocate en la conexion mente-musculo.",
+    },
+    "weekly-review-dashboard": {
+        "weekRange": "8-14 ene",
+        "highlights": [{"title": f"Métrica {i}", "value": i * 10, "trend": "up"} for i in range(6)],
+        "insights": [{"type": kind, "text": "Dormiste mejor los días de entreno"} for kind in ("win", "risk", "tip")],
+        "nextMove": {"question": "¿Subimos volumen?", "options": ["Sí", "No"], "recommendation": "Sí"},
+        "wearableData": {"avgHrv": 48, "avgSleep": 7.2, "trainingLoad": 640, "trend": "up"},
+    },
+}
+FAST_REJECT = ("meal-plan", {"title": "Plan"})
+DEEP_REJECT = ("workout-card", {"title": "Push", "exercises": [{"name": "Press"}, {"sets": 4}]})
+
+
+def measure(validate, widget_type: str, props: dict, iterations: int) -> float:
+    """Microseconds per validate() call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        validate(widget_type, props)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(iterations: int = 20_000) -> None:
+    catalog = WidgetCatalog(enabled=True)
+
+    def compile_per_call(widget_type: str, props: dict) -> None:
+        model = WIDGET_PROPS[widget_type]
+        model.model_rebuild(force=True)
+        model.model_validate(props)
+
+    print(f"{'payload':32s} {'catalog':>10s} {'recompiled':>10s}")
+    for widget_type, props in VALID.items():
+        compiled = measure(catalog.validate, widget_type, props, iterations)
+        rebuilt = measure(compile_per_call, widget_type, props, max(1, iterations // 100))
+        print(f"{widget_type:32s} {compiled:8.1f}us {rebuilt:8.1f}us")
+    for label, (widget_type, props) in (("fast reject (missing prop)", FAST_REJECT), ("full reject (nested)", DEEP_REJECT)):
+        print(f"{label:32s} {measure(catalog.validate, widget_type, props, iterations):8.1f}us")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -11,35 +11,46 @@ import base64
 import json
 import logging
 import os
+import uuid
 from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Any
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from google.adk.events import Event
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
 
 from agent import root_agent
+from agent.genesis import instruction_cache
 from schemas.clipboard import MessageRole
-from schemas.request import ChatEvent, ChatRequest, EventsRequest
-from schemas.response import AgentResponse
-from tools.generate_widget import (
-    format_as_a2ui,
-    generate_operations,
-    create_stream_widget,
-    create_context_widget,
-    create_overlay_widget,
-)
+from schemas.request import ChatRequest, EventsRequest
+from schemas.response import AgentResponse, WidgetPayload
+from schemas.widgets import widget_catalog
+from tools.generate_widget import generate_operations
 from services.auth import resolve_user_id_from_request
+from services.coaching_notes import coaching_notes
+from services.event_widgets import EventWidgets, event_registry
+from services.response_cache import response_cache
 from services.session_store import get_or_create_session, set_session, session_store
-from wearables import wearables_router
+from services.surface_deltas import surface_models
+from settings import env_flag
+from wearables import process_webhook_job, wearables_router, webhook_queue
 from voice import voice_router
+from voice.elevenlabs_client import tts_pool
+from voice.live_sessions import live_sessions
 from routers.v1 import v1_router
 
 MAX_ATTACHMENTS = 4
 
+# Known events answered with deterministic widgets before the agent runs
+CHAT_EVENT_FAST_PATH = env_flag("CHAT_EVENT_FAST_PATH")
+# Longest a GET /api/chat/notes/{id} may wait for the note
+NOTE_MAX_WAIT_SECONDS = 25
+
 
 def _decode_base64(data: str) -> bytes:
     if not data:
@@ -113,6 +124,10 @@ async def lifespan(app: FastAPI):
     logger.info("Connecting to SessionStore...")
     await session_store.connect()
 
+    # Start wearable webhook workers (drain the on-disk spool)
+    logger.info("Starting wearable webhook queue workers...")
+    await webhook_queue.start(process_webhook_job)
+
     # Initialize ADK Runner
     logger.info("Initializing ADK Runner with GENESIS agent (V4)...")
     runner = Runner(
@@ -127,6 +142,11 @@ async def lifespan(app: FastAPI):
     yield
 
     # Cleanup
+    await webhook_queue.stop()
+    await tts_pool.close()
+    await live_sessions.close()
+    await instruction_cache.close()
+    await coaching_notes.close()
     logger.info("Disconnecting from SessionStore...")
     await session_store.disconnect()
     logger.info("Shutdown complete")
@@ -167,6 +187,11 @@ async def health_check():
         "model": "gemini-2.5-flash",
         "version": "0.2.0",  # V4 architecture
         "architecture": "V4-unified",
+        "context_cache": instruction_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "coaching_notes": coaching_notes.stats(),
+        "surface_deltas": surface_models.stats(),
+        "widget_validation": widget_catalog.stats(),
     }
 
 
@@ -204,8 +229,31 @@ async def chat(request: ChatRequest, raw_request: Request):
             message_text = f"[EVENT:{request.event.type}] {event_json}\n{message_text}"
             logger.info(f"Event attached: {request.event.type}")
 
+        # A coaching note still being written for this session appends to the
+        # clipboard and the ADK session: let it finish first
+        if not await coaching_notes.wait_for_session(request.session_id, NOTE_MAX_WAIT_SECONDS):
+            logger.warning(f"Coaching note for session {request.session_id} still pending, continuing")
+
         # Persist clipboard state (independent of ADK session)
         clipboard = await get_or_create_session(request.session_id, user_id)
+
+        # Repeated self-contained questions are answered from the response cache
+        cache_lookup = response_cache.lookup(request, clipboard.user_profile)
+        if cache_lookup.response is not None:
+            response = cache_lookup.response
+            logger.info(f"Response cache hit ({cache_lookup.tier}, {cache_lookup.intent})")
+            clipboard.add_message(MessageRole.USER, request.message, agent="GENESIS")
+            clipboard.add_message(
+                MessageRole.ASSISTANT,
+                response.text,
+                agent=response.agent,
+                widget_type=response.payload.type if response.payload else None,
+            )
+            await set_session(clipboard)
+            await _append_cached_turn(session, message_text, response)
+            response.operations = surface_models.compact(request.session_id, response.operations)
+            return response
+
         clipboard.add_message(
             MessageRole.USER,
             request.message,
@@ -229,6 +277,12 @@ async def chat(request: ChatRequest, raw_request: Request):
             parts=parts,
         )
 
+        # Known events: widgets now, coaching note from the agent later
+        if request.event and CHAT_EVENT_FAST_PATH:
+            event_widgets = event_registry.build(request.event)
+            if event_widgets is not None:
+                return await _event_fast_path(request, user_id, user_content, clipboard, event_widgets)
+
         final_result = None
         all_events = []
         async for event in runner.run_async(
@@ -249,13 +303,17 @@ async def chat(request: ChatRequest, raw_request: Request):
 
         # Deterministic widget construction for known events
         if request.event:
-            event_widget = _build_event_widget(request.event, response)
+            event_widget = event_registry.build(request.event, note=response.text)
             if event_widget:
                 payload, widgets, operations = event_widget
-                response.payload = payload
+                response.payload = WidgetPayload.model_validate(payload)
                 response.widgets = widgets
                 response.operations = operations
 
+        response_cache.store(cache_lookup, response, all_events, clipboard.user_profile)
+        # After caching: the cached copy keeps the full data models
+        response.operations = surface_models.compact(request.session_id, response.operations)
+
         widget_type = response.payload.type if response.payload else None
         clipboard.add_message(
             MessageRole.ASSISTANT,
@@ -353,69 +411,132 @@ async def receive_events(request: EventsRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def _build_event_widget(
-    event: ChatEvent, response: AgentResponse
-) -> tuple[dict, list[dict], list[dict]] | None:
-    """Deterministically construct the correct widget for a known event type.
+async def _append_cached_turn(session, message_text: str, response: AgentResponse) -> None:
+    """Add a response-cache hit to the ADK session, so follow-up questions have the context."""
+    invocation_id = f"cache-{uuid.uuid4().hex}"
+    for author, role, text in (("user", "user", message_text), (root_agent.name, "model", response.text)):
+        await session_service.append_event(
+            session,
+            Event(
+                invocation_id=invocation_id,
+                author=author,
+                content=types.Content(role=role, parts=[types.Part(text=text)]),
+            ),
+        )
+
 
-    Returns (payload_dict, a2ui_widgets, operations) or None if the event type
-    is unknown.
+async def _event_fast_path(
+    request: ChatRequest,
+    user_id: str,
+    user_content: types.Content,
+    clipboard,
+    event_widgets: EventWidgets,
+) -> AgentResponse:
+    """Answer a known event with its widgets immediately.
+
+    The agent still runs, in the background, to write the coaching note; the
+    response's ``pending_note`` is the ID to fetch it from /api/chat/notes.
     """
-    etype = event.type
-    p = event.payload
-
-    if etype == "workout_started":
-        exercises = p.get("exercises", [])
-        props = {
-            "workoutId": p.get("sessionId", ""),
-            "title": p.get("title", "Workout"),
-            "exercises": [
-                {
-                    "id": str(i),
-                    "name": ex.get("name", ex.get("exercise", "")),
-                    "target": {
-                        "sets": ex.get("sets", 3),
-                        "reps": ex.get("reps", "8-12"),
-                        "rpe": ex.get("rpe"),
-                    },
-                    "setsCompleted": [],
-                }
-                for i, ex in enumerate(exercises)
-            ],
-        }
-        payload = {"type": "live-session-tracker", "props": props}
-        widgets = format_as_a2ui("live-session-tracker", props)
-        # Operations: overlay zone for live-session-tracker + context zone for training-mode-bar
-        ops = create_overlay_widget("live-session-tracker", props)
-        context_props = {
-            "exerciseName": exercises[0].get("name", "") if exercises else "",
-            "targetSets": exercises[0].get("sets", 3) if exercises else 3,
-            "targetReps": str(exercises[0].get("reps", "8-12")) if exercises else "8-12",
-            "elapsed": 0,
-            "totalSetsCompleted": 0,
-        }
-        ops.extend(create_context_widget("training-mode-bar", context_props))
-        return payload, widgets, ops
-
-    if etype == "workout_completed":
-        props = {
-            "sessionId": p.get("sessionId", ""),
-            "title": p.get("title", "Workout Complete"),
-            "totalVolume": p.get("totalVolume", 0),
-            "totalSets": p.get("totalSets", 0),
-            "totalReps": p.get("totalReps", 0),
-            "durationMins": p.get("durationMins", 0),
-            "prs": p.get("prs", []),
-            "genesisNote": response.text[:200] if response.text else "",
-        }
-        payload = {"type": "workout-complete", "props": props}
-        widgets = format_as_a2ui("workout-complete", props)
-        # Operations: stream zone for workout-complete + delete overlay
-        ops = create_stream_widget("workout-complete", props)
-        ops.append({"deleteSurface": {"surfaceId": "*overlay*"}})
-        return payload, widgets, ops
+    payload, widgets, operations = event_widgets
+    response = AgentResponse(
+        text=event_registry.get(request.event.type).ack_text,
+        payload=payload,
+        widgets=widgets,
+        operations=surface_models.compact(request.session_id, operations),
+    )
+    response.pending_note = coaching_notes.start(
+        _generate_event_note(request, user_id, user_content, payload, operations),
+        session_id=request.session_id,
+    )
+    logger.info(f"Event fast path: {request.event.type} (note {response.pending_note})")
 
-    return None
+    clipboard.add_message(
+        MessageRole.ASSISTANT,
+        response.text,
+        agent=response.agent,
+        widget_type=payload["type"],
+    )
+    await set_session(clipboard)
+    return response
+
+
+async def _generate_event_note(
+    request: ChatRequest,
+    user_id: str,
+    user_content: types.Content,
+    payload: dict,
+    operations: list[dict],
+) -> dict:
+    """Run the agent for an event answered by the fast path and return its note."""
+    all_events = [
+        event
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=request.session_id,
+            new_message=user_content,
+        )
+    ]
+    note = parse_agent_response(all_events).text
+
+    clipboard = await get_or_create_session(request.session_id, user_id)
+    clipboard.add_message(MessageRole.ASSISTANT, note, agent="GENESIS")
+    await set_session(clipboard)
+
+    result = {"text": note, "operations": None}
+    if request.event.type == "workout_completed":
+        # Fill in the note the workout-complete widget was rendered without
+        surface_id = operations[0]["createSurface"]["surfaceId"]
+        props = {**payload["props"], "genesisNote": note[:200]}
+        result["operations"] = surface_models.compact(
+            request.session_id,
+            [{"updateDataModel": {"surfaceId": surface_id, "dataModel": props}}],
+        )
+    return result
+
+
+@app.get("/api/chat/notes/{note_id}")
+async def get_chat_note(note_id: str, wait: float = 0):
+    """
+    Fetch a coaching note started by the event fast path.
+
+    Args:
+        note_id: ``pending_note`` from the chat response
+        wait: Seconds to wait for the note if it is still being written (max 25)
+
+    Returns:
+        {"id", "status": "pending" | "ready" | "failed", "text", "operations"}
+    """
+    note = await coaching_notes.get(note_id, wait_seconds=min(max(wait, 0), NOTE_MAX_WAIT_SECONDS))
+    if note is None:
+        raise HTTPException(status_code=404, detail="Note not found or expired")
+    return note
+
+
+@app.get("/api/chat/surfaces/{surface_id}")
+async def get_surface_model(surface_id: str, session_id: str):
+    """
+    Fetch a surface's whole data model, for a client that could not apply a
+    ``patchDataModel`` (its surface is missing or at another version).
+
+    Returns:
+        {"surfaceId", "dataModel", "version"}
+    """
+    model = surface_models.get(session_id, surface_id)
+    if model is None:
+        raise HTTPException(status_code=404, detail="Surface not known for this session")
+    return model
+
+
+def _valid_widget(payload: Any) -> dict | None:
+    """The agent's widget payload, or None if its props fail the widget catalog."""
+    if not isinstance(payload, dict):
+        logger.warning(f"Dropping malformed widget payload: {type(payload).__name__}")
+        return None
+    errors = widget_catalog.validate(payload.get("type"), payload.get("props", {}))
+    if errors:
+        logger.warning(f"Dropping invalid {payload.get('type')} widget: {'; '.join(errors)}")
+        return None
+    return payload
 
 
 def parse_agent_response(events: list) -> AgentResponse:
@@ -565,6 +686,9 @@ def parse_agent_response(events: list) -> AgentResponse:
                     except json.JSONDecodeError:
                         pass
 
+    # Widgets the client could not render are dropped; the text is still sent
+    payload = _valid_widget(payload) if payload else None
+
     # Generate operations from payload if present
     operations = None
     if payload:
@@ -0,0 +1,5 @@
+"""Prompt assembly: hot-reloadable instruction files."""
+
+from prompts.assembly import InstructionFile
+
+__all__ = ["InstructionFile"]
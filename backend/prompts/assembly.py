@@ -0,0 +1,80 @@
+"""Prompt Assembly.
+
+System prompts are mostly static text, so none of it should be rebuilt or
+re-read per request:
+
+- InstructionFile: an instruction file read once and re-read only when its
+  mtime changes (checked at most every PROMPT_RELOAD_CHECK_SECONDS), so an
+  edited instruction goes live without restarting the process
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Seconds between mtime checks of an instruction file (negative disables reload)
+PROMPT_RELOAD_CHECK_SECONDS = float(os.getenv("PROMPT_RELOAD_CHECK_SECONDS", "5"))
+
+
+class InstructionFile:
+    """An instruction file, reloaded when it changes on disk."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        default: str = "",
+        check_interval: float = PROMPT_RELOAD_CHECK_SECONDS,
+    ):
+        """
+        Args:
+            path: Instruction file
+            default: Text used while the file cannot be read
+            check_interval: Seconds between mtime checks (negative disables reload)
+        """
+        self.path = Path(path)
+        self.default = default
+        self.check_interval = check_interval
+        self.version = 0  # Bumped whenever the text changes
+        self._text = default
+        self._mtime_ns: int | None = None
+        self._checked_at = time.monotonic()
+        self._load()
+
+    @property
+    def text(self) -> str:
+        """Current instruction text."""
+        if self.check_interval >= 0:
+            now = time.monotonic()
+            if now - self._checked_at >= self.check_interval:
+                self._checked_at = now
+                self._reload_if_changed()
+        return self._text
+
+    def _reload_if_changed(self) -> None:
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns != self._mtime_ns:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+            text = self.path.read_text(encoding="utf-8")
+        except OSError as e:
+            if self._mtime_ns is not None:
+                # Keep the last good text rather than falling back mid-flight
+                logger.warning(f"Could not reload {self.path.name}, keeping loaded version: {e}")
+            self._mtime_ns = None
+            return
+
+        self._mtime_ns = mtime_ns
+        if text != self._text:
+            if self.version:
+                logger.info(f"Reloaded instruction file {self.path.name}")
+            self._text = text
+            self.version += 1
@@ -54,3 +54,8 @@ class AgentResponse(BaseModel):
         default=None,
         description="A2UI zone operations for mobile client",
     )
+
+    pending_note: Optional[str] = Field(
+        default=None,
+        description="ID of a coaching note still being written; fetch it from /api/chat/notes/{id}",
+    )
@@ -0,0 +1,633 @@
+"""Widget props catalog.
+
+One pydantic model per widget type documented to the agent (the
+``generate_widget`` docstring and instructions/genesis_unified.txt). Models
+are lenient: extra props are allowed, display values may be numbers or
+strings, and where the two documents describe a widget differently both
+shapes are accepted (``ONE_OF``). Only props a widget cannot be rendered
+from are rejected.
+
+``widget_catalog.validate`` checks a payload in two steps:
+
+- Fast reject: props that are not an object, that miss a required top-level
+  prop or that have none of the model's ``ONE_OF`` props are rejected with set
+  operations before pydantic runs
+- Full validation with the model's validator, compiled once when this module
+  is imported
+
+Widget types not in the catalog are let through (the client shows its
+fallback widget). WIDGET_PROPS_VALIDATION=false turns validation off.
+"""
+
+import logging
+from typing import Any, ClassVar, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+from settings import env_flag
+
+logger = logging.getLogger(__name__)
+
+WIDGET_PROPS_VALIDATION = env_flag("WIDGET_PROPS_VALIDATION", default=True)
+
+# Errors reported per rejected payload
+MAX_REPORTED_ERRORS = 5
+
+Number = int | float
+# Shown as text by the client; the model sometimes emits numbers
+Text = str | int | float
+
+
+class _Props(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+    # Widgets documented in more than one shape: at least one of these
+    # top-level props must be present (checked by WidgetCatalog)
+    ONE_OF: ClassVar[frozenset[str]] = frozenset()
+
+
+# =============================================================================
+# BLAZE (strength)
+# =============================================================================
+
+class WorkoutExercise(_Props):
+    name: str
+    sets: Optional[Text] = None
+    reps: Optional[Text] = None
+    load: Optional[Text] = None
+
+
+class WorkoutCardProps(_Props):
+    title: Text
+    exercises: list[WorkoutExercise]
+    category: Optional[str] = None
+    duration: Optional[Text] = None
+    workoutId: Optional[str] = None
+    warmup: Optional[list[Text]] = None
+    cooldown: Optional[list[Text]] = None
+    coachNote: Optional[str] = None
+
+
+class TimerWidgetProps(_Props):
+    ONE_OF = frozenset({"seconds", "duration"})
+
+    seconds: Optional[Number] = None
+    duration: Optional[Number] = None
+    label: Optional[Text] = None
+    autoStart: Optional[bool] = None
+
+
+class TargetSet(_Props):
+    sets: Text
+    reps: Text
+    rpe: Optional[Text] = None  # "7-8", "RPE 8"
+
+
+class CompletedSet(_Props):
+    weight: Number
+    reps: Number
+
+
+class TrackerExercise(_Props):
+    id: Optional[Text] = None
+    name: Optional[str] = None
+    target: TargetSet
+    setsCompleted: list[CompletedSet] = Field(default_factory=list)
+
+
+class LiveSessionTrackerProps(_Props):
+    title: Optional[Text] = None
+    workoutId: Optional[str] = None
+    exercises: list[TrackerExercise]
+
+
+class PlateCalculatorProps(_Props):
+    targetWeight: Number
+    barWeight: Optional[Number] = None
+
+
+class WorkoutCompleteProps(_Props):
+    title: Text
+    totalVolume: Number
+    totalSets: Number
+    durationMins: Number
+    totalReps: Optional[Number] = None
+    prs: list[Any] = Field(default_factory=list)
+    genesisNote: Optional[str] = None
+
+
+class CardioSessionTrackerProps(_Props):
+    targetDuration: Number
+    title: Optional[Text] = None
+    modality: Optional[str] = None
+    targetZone: Optional[Number] = None
+
+
+class HiitIntervalTrackerProps(_Props):
+    totalRounds: Number
+    workSeconds: Number
+    restSeconds: Number
+    title: Optional[Text] = None
+    exercises: Optional[list[dict[str, Any]]] = None
+
+
+class HeartRateZoneProps(_Props):
+    currentHR: Number
+    zone: Number
+    maxHR: Optional[Number] = None
+    targetZone: Optional[Number] = None
+
+
+class TrainingModeBarProps(_Props):
+    exerciseName: Optional[str] = None
+    targetSets: Optional[Text] = None
+    targetReps: Optional[Text] = None
+    elapsed: Optional[Number] = None
+    totalSetsCompleted: Optional[Number] = None
+
+
+# =============================================================================
+# SAGE (nutrition)
+# =============================================================================
+
+class Meal(_Props):
+    name: str
+    time: Optional[Text] = None
+    kcal: Optional[Number] = None
+    calories: Optional[Number] = None
+    highlight: Optional[bool] = None
+
+
+class MealPlanProps(_Props):
+    meals: list[Meal]
+    title: Optional[Text] = None
+    totalKcal: Optional[Number] = None
+    totalCalories: Optional[Number] = None
+
+
+class HydrationTrackerProps(_Props):
+    ONE_OF = frozenset({"goal", "goal_ml"})
+
+    current: Optional[Number] = None
+    goal: Optional[Number] = None
+    consumed_ml: Optional[Number] = None
+    goal_ml: Optional[Number] = None
+    entries: Optional[list[dict[str, Any]]] = None
+
+
+class RecipeCardProps(_Props):
+    title: Text
+    ingredients: list[Text]
+    instructions: list[Text]
+    kcal: Optional[Number] = None
+    time: Optional[Text] = None
+    tags: Optional[list[Text]] = None
+
+
+class MacroValue(_Props):
+    current: Number
+    target: Number
+
+
+class MacroTrackerProps(_Props):
+    ONE_OF = frozenset({"calories", "goals"})
+
+    # Per macro {current, target} ...
+    calories: Optional[MacroValue] = None
+    protein: Optional[MacroValue] = None
+    carbs: Optional[MacroValue] = None
+    fat: Optional[MacroValue] = None
+    # ... or macro -> amount tables
+    goals: Optional[dict[str, Number]] = None
+    consumed: Optional[dict[str, Number]] = None
+    remaining: Optional[dict[str, Number]] = None
+    meals: Optional[list[Meal]] = None
+
+
+class GroceryItem(_Props):
+    name: Text
+    quantity: Optional[Text] = None
+
+
+class GroceryCategory(_Props):
+    name: Text
+    items: list[GroceryItem]
+
+
+class SmartGroceryListProps(_Props):
+    categories: list[GroceryCategory]
+    title: Optional[Text] = None
+
+
+class Supplement(_Props):
+    name: Text
+    dose: Optional[Text] = None
+    timing: Optional[Text] = None
+    priority: Optional[Number] = None
+
+
+class SupplementStackProps(_Props):
+    supplements: list[Supplement]
+    goal: Optional[Text] = None
+
+
+# =============================================================================
+# SPARK (habits)
+# =============================================================================
+
+class CheckinQuestion(_Props):
+    label: Text
+    type: str  # slider, select, number, text, scale, body_map...
+    id: Optional[Text] = None
+    min: Optional[Number] = None
+    max: Optional[Number] = None
+    options: Optional[list[Text]] = None
+
+
+class DailyCheckinProps(_Props):
+    ONE_OF = frozenset({"questions", "fields"})
+
+    date: Optional[Text] = None
+    questions: Optional[list[CheckinQuestion]] = None
+    fields: Optional[list[CheckinQuestion]] = None
+
+
+class ChecklistItem(_Props):
+    id: Text
+    text: Optional[Text] = None
+    label: Optional[Text] = None
+    checked: Optional[bool] = None
+    completed: Optional[bool] = None
+
+
+class ChecklistProps(_Props):
+    title: Text
+    items: list[ChecklistItem]
+
+
+class QuickAction(_Props):
+    id: Text
+    label: Text
+    icon: Optional[str] = None
+    highlight: Optional[bool] = None
+
+
+class ActionRecommendation(_Props):
+    actionId: Text
+    reason: Text
+
+
+class QuickActionsProps(_Props):
+    actions: list[QuickAction]
+    title: Optional[Text] = None
+    recommendation: Optional[ActionRecommendation] = None
+
+
+class QuoteCardProps(_Props):
+    quote: Text
+    author: Optional[Text] = None
+
+
+class HabitStreakProps(_Props):
+    ONE_OF = frozenset({"streakDays", "currentStreak"})
+
+    streakDays: Optional[Number] = None
+    currentStreak: Optional[Number] = None
+    longestStreak: Optional[Number] = None
+    habitName: Optional[Text] = None
+    weekView: Optional[list[dict[str, Any]]] = None
+    message: Optional[Text] = None
+
+
+# =============================================================================
+# STELLA (mindset, analytics)
+# =============================================================================
+
+class Metric(_Props):
+    label: Text
+    value: Text
+
+
+class ProgressDashboardProps(_Props):
+    ONE_OF = frozenset({"metrics", "summary", "highlights", "goals"})
+
+    title: Optional[Text] = None
+    metrics: Optional[list[Metric]] = None
+    subtitle: Optional[Text] = None
+    progress: Optional[Number] = None
+    summary: Optional[dict[str, Any] | Text] = None
+    highlights: Optional[list[dict[str, Any]]] = None
+    goals: Optional[list[dict[str, Any]]] = None
+
+
+class InsightCardProps(_Props):
+    title: Text
+    insight: Text
+    trend: Optional[str] = None
+    recommendation: Optional[Text] = None
+
+
+class SleepAnalysisProps(_Props):
+    ONE_OF = frozenset({"duration", "totalSleep", "score", "sleepScore"})
+
+    duration: Optional[Text] = None
+    totalSleep: Optional[Number] = None
+    quality: Optional[Text] = None
+    score: Optional[Number] = None
+    sleepScore: Optional[Number] = None
+    stages: Optional[dict[str, Text]] = None
+    insights: Optional[list[Text]] = None
+
+
+class BodyCompVisualizerProps(_Props):
+    ONE_OF = frozenset({"dataPoints", "currentWeight", "measurements"})
+
+    title: Optional[Text] = None
+    metrics: Optional[list[Text]] = None
+    dataPoints: Optional[list[dict[str, Any]]] = None
+    currentWeight: Optional[Number] = None
+    targetWeight: Optional[Number] = None
+    measurements: Optional[dict[str, Any]] = None
+
+
+class BreathPattern(_Props):
+    inhale: Number
+    exhale: Number
+    hold: Optional[Number] = None
+
+
+class BreathworkGuideProps(_Props):
+    ONE_OF = frozenset({"technique", "pattern"})
+
+    technique: Optional[Literal["box", "4-7-8"]] = None
+    pattern: Optional[BreathPattern] = None
+    durationSeconds: Optional[Number] = None
+    rounds: Optional[Number] = None
+    instructions: Optional[list[Text]] = None
+
+
+class RecoveryDashboardProps(_Props):
+    readinessScore: Number
+    components: Optional[dict[str, Any]] = None
+    recommendation: Optional[Text] = None
+
+
+class HrvInsightProps(_Props):
+    currentHRV: Number
+    baseline: Optional[Number] = None
+    recommendations: Optional[list[Text]] = None
+
+
+class MobilityExercise(_Props):
+    name: Text
+    duration: Optional[Text] = None
+    reps: Optional[Text] = None
+    instructions: Optional[Text] = None
+
+
+class MobilityRoutineProps(_Props):
+    exercises: list[MobilityExercise]
+    title: Optional[Text] = None
+    targetAreas: Optional[list[Text]] = None
+
+
+class PainReportProps(_Props):
+    zone: Text
+    intensity: Number
+    recommendations: Optional[list[Text]] = None
+    shouldSeeProfessional: Optional[bool] = None
+    modifiedExercises: Optional[list[dict[str, Any]]] = None
+
+
+class CycleTrackerProps(_Props):
+    phase: str
+    currentDay: Optional[Number] = None
+    cycleLength: Optional[Number] = None
+    nutritionTips: Optional[list[Text]] = None
+
+
+class TrendChartProps(_Props):
+    data: list[dict[str, Any]]
+    metric: Optional[Text] = None
+    unit: Optional[str] = None
+
+
+class ComparisonCardProps(_Props):
+    myth: dict[str, Any]
+    reality: dict[str, Any]
+    title: Optional[Text] = None
+    takeaway: Optional[Text] = None
+
+
+class RecoveryFactor(_Props):
+    name: Text
+    value: Number
+    status: str
+    unit: Optional[str] = None
+
+
+class RecoveryScoreProps(_Props):
+    score: Number
+    status: str
+    factors: list[RecoveryFactor] = Field(default_factory=list)
+    recommendation: Optional[Text] = None
+
+
+# =============================================================================
+# V3 core widgets
+# =============================================================================
+
+class CallToAction(_Props):
+    id: Text
+    label: Text
+
+
+class ReadinessField(_Props):
+    id: Text
+    type: Literal["slider", "select"]
+    label: Text
+    options: Optional[list[Any]] = None
+    min: Optional[Number] = None
+    max: Optional[Number] = None
+
+
+class ReadinessCheckinProps(_Props):
+    fields: list[ReadinessField]
+    cta: CallToAction
+    prefilledData: Optional[dict[str, Any]] = None
+
+
+class PlanTab(_Props):
+    id: Text
+    label: Text
+    content: Any = None
+
+
+class PlanCardProps(_Props):
+    mode: Literal["workout", "nutrition", "habits"]
+    title: Text
+    summary: Text
+    primaryCta: CallToAction
+    secondaryCta: Optional[CallToAction] = None
+    tabs: Optional[list[PlanTab]] = None
+    duration: Optional[Text] = None
+    intensity: Optional[Text] = None
+
+
+class TrackerProgress(_Props):
+    current: Number
+    total: Number
+
+
+class LiveTrackerProps(_Props):
+    type: Literal["workout", "habits", "nutrition"]
+    sessionId: Optional[Text] = None
+    progress: TrackerProgress
+    cta: Any
+    currentExercise: Optional[dict[str, Any]] = None
+    items: Optional[list[dict[str, Any]]] = None
+
+
+class ReviewHighlight(_Props):
+    title: Text
+    value: Text
+    trend: Optional[Text] = None
+
+
+class ReviewInsight(_Props):
+    type: Literal["win", "risk", "tip"]
+    text: Text
+    icon: Optional[str] = None
+
+
+class NextMove(_Props):
+    question: Text
+    options: list[Any]
+    recommendation: Optional[Any] = None
+
+
+class WeeklyReviewDashboardProps(_Props):
+    ONE_OF = frozenset({"weekRange", "weekOf"})
+
+    weekRange: Optional[Text] = None
+    highlights: Optional[list[ReviewHighlight]] = None
+    insights: Optional[list[ReviewInsight]] = None
+    nextMove: Optional[NextMove] = None
+    wearableData: Optional[dict[str, Any]] = None
+    weekOf: Optional[Text] = None
+    training: Optional[dict[str, Any]] = None
+    nutrition: Optional[dict[str, Any]] = None
+    recovery: Optional[dict[str, Any]] = None
+    wins: Optional[list[Text]] = None
+
+
+class AlertBannerProps(_Props):
+    type: Literal["warning", "error", "success"]
+    message: Text
+
+
+WIDGET_PROPS: dict[str, type[BaseModel]] = {
+    "workout-card": WorkoutCardProps,
+    "timer-widget": TimerWidgetProps,
+    "live-session-tracker": LiveSessionTrackerProps,
+    "plate-calculator": PlateCalculatorProps,
+    "cardio-session-tracker": CardioSessionTrackerProps,
+    "hiit-interval-tracker": HiitIntervalTrackerProps,
+    "heart-rate-zone": HeartRateZoneProps,
+    "workout-complete": WorkoutCompleteProps,
+    "training-mode-bar": TrainingModeBarProps,
+    "meal-plan": MealPlanProps,
+    "hydration-tracker": HydrationTrackerProps,
+    "recipe-card": RecipeCardProps,
+    "macro-tracker": MacroTrackerProps,
+    "smart-grocery-list": SmartGroceryListProps,
+    "supplement-stack": SupplementStackProps,
+    "daily-checkin": DailyCheckinProps,
+    "checklist": ChecklistProps,
+    "quick-actions": QuickActionsProps,
+    "genesis-quick-actions": QuickActionsProps,
+    "quote-card": QuoteCardProps,
+    "habit-streak": HabitStreakProps,
+    "progress-dashboard": ProgressDashboardProps,
+    "insight-card": InsightCardProps,
+    "sleep-analysis": SleepAnalysisProps,
+    "body-comp-visualizer": BodyCompVisualizerProps,
+    "breathwork-guide": BreathworkGuideProps,
+    "recovery-score": RecoveryScoreProps,
+    "recovery-dashboard": RecoveryDashboardProps,
+    "hrv-insight": HrvInsightProps,
+    "mobility-routine": MobilityRoutineProps,
+    "pain-report": PainReportProps,
+    "cycle-tracker": CycleTrackerProps,
+    "trend-chart": TrendChartProps,
+    "comparison-card": ComparisonCardProps,
+    "readiness-checkin": ReadinessCheckinProps,
+    "plan-card": PlanCardProps,
+    "live-tracker": LiveTrackerProps,
+    "weekly-review-dashboard": WeeklyReviewDashboardProps,
+    "alert-banner": AlertBannerProps,
+}
+
+
+class WidgetCatalog:
+    """Validates widget props against the catalog models."""
+
+    def __init__(self, models: dict[str, type[BaseModel]] = WIDGET_PROPS, enabled: bool = WIDGET_PROPS_VALIDATION):
+        self.enabled = enabled
+        self._models = dict(models)
+        # Top-level props without a default, for the fast-reject check
+        self._required = {
+            widget_type: frozenset(name for name, info in model.model_fields.items() if info.is_required())
+            for widget_type, model in self._models.items()
+        }
+        self._one_of = {widget_type: model.ONE_OF for widget_type, model in self._models.items()}
+        self._stats = {"validated": 0, "rejected": 0, "fast_rejected": 0, "unknown_type": 0}
+
+    def __contains__(self, widget_type: str) -> bool:
+        return widget_type in self._models
+
+    def validate(self, widget_type: Any, props: Any) -> list[str]:
+        """
+        Check a widget's props.
+
+        Args:
+            widget_type: The widget type
+            props: The widget props
+
+        Returns:
+            Error messages; empty if the widget can be sent
+        """
+        if not self.enabled:
+            return []
+        if not isinstance(widget_type, str) or not isinstance(props, dict):
+            self._stats["fast_rejected"] += 1
+            return ["widget needs a string type and an object of props"]
+        model = self._models.get(widget_type)
+        if model is None:
+            self._stats["unknown_type"] += 1
+            return []
+
+        missing = self._required[widget_type] - props.keys()
+        if missing:
+            self._stats["fast_rejected"] += 1
+            return [f"missing required props: {', '.join(sorted(missing))}"]
+        one_of = self._one_of[widget_type]
+        if one_of and props.keys().isdisjoint(one_of):
+            self._stats["fast_rejected"] += 1
+            return [f"needs one of the props: {', '.join(sorted(one_of))}"]
+        try:
+            model.model_validate(props)
+        except ValidationError as e:
+            self._stats["rejected"] += 1
+            return [
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in e.errors(include_url=False)[:MAX_REPORTED_ERRORS]
+            ]
+        self._stats["validated"] += 1
+        return []
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._stats, "enabled": self.enabled, "types": len(self._models)}
+
+
+widget_catalog = WidgetCatalog()
@@ -0,0 +1,219 @@
+"""Deferred coaching notes for fast-path chat events.
+
+Known chat events (workout_started, workout_completed) are answered
+immediately with deterministic widgets; the agent's coaching note for the
+event is generated in the background. The response carries the note's ID and
+the client fetches it with GET /api/chat/notes/{id} (long-poll via ``wait``).
+
+A note's generation writes to the session (clipboard and ADK history), so
+the next chat request on that session waits for it (``wait_for_session``)
+instead of racing it.
+
+Notes are kept for CHAT_NOTE_TTL_SECONDS and bounded by CHAT_NOTE_MAX_NOTES
+(oldest dropped first); unfinished notes that are dropped are cancelled.
+
+The note is generated on the instance that answered the event, but the GET
+may land on another one, so each note's status and result are also written
+to Redis (when connected) and read from there for IDs not known locally.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Coroutine
+
+from services.session_store import session_store
+
+logger = logging.getLogger(__name__)
+
+CHAT_NOTE_TTL_SECONDS = float(os.getenv("CHAT_NOTE_TTL_SECONDS", "600"))
+CHAT_NOTE_MAX_NOTES = int(os.getenv("CHAT_NOTE_MAX_NOTES", "1000"))
+
+CHAT_NOTE_PREFIX = "ngx:chat-note:"
+# How often a long-poll for a note generated on another instance re-reads Redis
+CHAT_NOTE_POLL_SECONDS = 0.25
+
+
+@dataclass
+class _Note:
+    task: asyncio.Task
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class NoteStore:
+    """Background note generation, fetched later by ID."""
+
+    def __init__(self, ttl_seconds: float = CHAT_NOTE_TTL_SECONDS, max_notes: int = CHAT_NOTE_MAX_NOTES):
+        self.ttl_seconds = ttl_seconds
+        self.max_notes = max(1, max_notes)
+        self._notes: OrderedDict[str, _Note] = OrderedDict()
+        self._by_session: dict[str, asyncio.Task] = {}
+        self._stats = {
+            "started": 0, "ready": 0, "failed": 0, "dropped": 0, "shared_reads": 0, "session_waits": 0,
+        }
+
+    def start(self, generate: Coroutine[Any, Any, dict[str, Any]], session_id: str | None = None) -> str:
+        """
+        Start generating a note in the background.
+
+        Args:
+            generate: Coroutine returning the note ({"text": ..., optional "operations": [...]})
+            session_id: Chat session the generation writes to (see ``wait_for_session``)
+
+        Returns:
+            The note ID
+        """
+        self._prune()
+        note_id = uuid.uuid4().hex
+        task = asyncio.create_task(self._run(note_id, generate))
+        task.add_done_callback(self._count)
+        # A task cancelled before it ran never awaited ``generate``
+        task.add_done_callback(lambda _: generate.close())
+        self._notes[note_id] = _Note(task=task)
+        if session_id is not None:
+            self._by_session[session_id] = task
+            task.add_done_callback(lambda done: self._release_session(session_id, done))
+        self._stats["started"] += 1
+        return note_id
+
+    async def wait_for_session(self, session_id: str, timeout: float) -> bool:
+        """
+        Wait for the note still being generated for a session, if any.
+
+        Args:
+            session_id: The chat session
+            timeout: Longest to wait, in seconds
+
+        Returns:
+            False if the note was still pending after ``timeout``
+        """
+        task = self._by_session.get(session_id)
+        if task is None or task.done():
+            return True
+        self._stats["session_waits"] += 1
+        done, _ = await asyncio.wait({task}, timeout=timeout)
+        return bool(done)
+
+    async def get(self, note_id: str, wait_seconds: float = 0) -> dict[str, Any] | None:
+        """
+        Get a note, waiting up to ``wait_seconds`` for it to finish.
+
+        Returns:
+            {"id", "status": "pending" | "ready" | "failed", "text", "operations"},
+            or None if the ID is unknown or expired
+        """
+        note = self._notes.get(note_id)
+        if note is None:
+            return await self._get_shared(note_id, wait_seconds)
+        if wait_seconds > 0 and not note.task.done():
+            await asyncio.wait({note.task}, timeout=wait_seconds)
+
+        result: dict[str, Any] = {"id": note_id, "status": "pending", "text": None, "operations": None}
+        if not note.task.done():
+            return result
+        if note.task.cancelled() or note.task.exception() is not None:
+            result["status"] = "failed"
+            return result
+        result.update(status="ready", **note.task.result())
+        return result
+
+    async def close(self) -> None:
+        """Cancel notes still being generated (shutdown)."""
+        tasks = [note.task for note in self._notes.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._notes.clear()
+        self._by_session.clear()
+
+    def stats(self) -> dict[str, Any]:
+        pending = sum(1 for note in self._notes.values() if not note.task.done())
+        return {**self._stats, "pending": pending, "stored": len(self._notes)}
+
+    # =========================================================================
+    # Shared (Redis) copy
+    # =========================================================================
+
+    async def _run(self, note_id: str, generate: Coroutine[Any, Any, dict[str, Any]]) -> dict[str, Any]:
+        await self._publish(note_id, {"status": "pending"})
+        try:
+            result = await generate
+        except (Exception, asyncio.CancelledError):
+            await self._publish(note_id, {"status": "failed"})
+            raise
+        await self._publish(note_id, {"status": "ready", **result})
+        return result
+
+    async def _publish(self, note_id: str, note: dict[str, Any]) -> None:
+        client = session_store.redis
+        if client is None:
+            return
+        try:
+            await client.setex(
+                f"{CHAT_NOTE_PREFIX}{note_id}",
+                max(1, int(self.ttl_seconds)),
+                json.dumps(note, ensure_ascii=False, default=str),
+            )
+        except Exception as e:
+            logger.warning(f"Redis coaching note set failed: {e}")
+
+    async def _get_shared(self, note_id: str, wait_seconds: float) -> dict[str, Any] | None:
+        """A note started on another instance, polling Redis while it is pending."""
+        client = session_store.redis
+        if client is None:
+            return None
+        deadline = time.monotonic() + wait_seconds
+        while True:
+            try:
+                data = await client.get(f"{CHAT_NOTE_PREFIX}{note_id}")
+            except Exception as e:
+                logger.warning(f"Redis coaching note get failed: {e}")
+                return None
+            if data is None:
+                return None
+            shared = json.loads(data)
+            remaining = deadline - time.monotonic()
+            if shared["status"] != "pending" or remaining <= 0:
+                break
+            await asyncio.sleep(min(CHAT_NOTE_POLL_SECONDS, remaining))
+
+        self._stats["shared_reads"] += 1
+        return {
+            "id": note_id,
+            "status": shared["status"],
+            "text": shared.get("text"),
+            "operations": shared.get("operations"),
+        }
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.ttl_seconds
+        while self._notes:
+            note_id, note = next(iter(self._notes.items()))
+            if note.created_at > cutoff and len(self._notes) < self.max_notes:
+                break
+            del self._notes[note_id]
+            if not note.task.done():
+                note.task.cancel()
+                self._stats["dropped"] += 1
+
+    def _release_session(self, session_id: str, task: asyncio.Task) -> None:
+        if self._by_session.get(session_id) is task:
+            del self._by_session[session_id]
+
+    def _count(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            self._stats["failed"] += 1
+            logger.warning(f"Coaching note generation failed: {error}")
+        else:
+            self._stats["ready"] += 1
+
+
+coaching_notes = NoteStore()
@@ -0,0 +1,226 @@
+"""Deterministic widgets for known chat events.
+
+Each known event type is an ``EventHandler`` in ``event_registry``:
+
+- ``payload_model``: pydantic model the event payload is validated against
+  (schema compiled once, when the model class is defined)
+- ``widgets``: declarative templates, one per widget to show: widget type,
+  zone and a function from the validated payload to the widget props. The
+  first template is the primary widget (``payload`` / legacy ``widgets``)
+- ``operations``: static operations appended after the widgets (e.g. closing
+  the overlay)
+- ``ack_text``: text sent with the widgets when the agent's reply is not
+  waited for (event fast path)
+
+Adding an event type is one ``event_registry.register(EventHandler(...))``.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, NamedTuple
+
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, ValidationError, ValidationInfo, field_validator
+
+from schemas.request import ChatEvent
+from tools.generate_widget import format_as_a2ui, generate_operations
+
+logger = logging.getLogger(__name__)
+
+
+class EventWidgets(NamedTuple):
+    """Widgets built for an event."""
+
+    payload: dict[str, Any]  # Primary widget {"type", "props"}
+    widgets: list[dict]  # A2UI v0.10 messages for the primary widget
+    operations: list[dict]  # Zone operations for all widgets
+
+
+@dataclass(frozen=True)
+class WidgetTemplate:
+    """One widget rendered for an event."""
+
+    widget_type: str
+    zone: str  # "stream", "context" or "overlay"
+    # (validated payload, agent note) -> widget props
+    props: Callable[[Any, str], dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class EventHandler:
+    """How a known event type is rendered."""
+
+    event_type: str
+    payload_model: type[BaseModel]
+    widgets: tuple[WidgetTemplate, ...]
+    ack_text: str
+    operations: tuple[dict[str, dict[str, Any]], ...] = ()
+
+
+class EventRegistry:
+    """Event type -> handler."""
+
+    def __init__(self):
+        self._handlers: dict[str, EventHandler] = {}
+
+    def register(self, handler: EventHandler) -> EventHandler:
+        if handler.event_type in self._handlers:
+            raise ValueError(f"Event handler already registered: {handler.event_type}")
+        if not handler.widgets:
+            raise ValueError(f"Event handler without widgets: {handler.event_type}")
+        self._handlers[handler.event_type] = handler
+        return handler
+
+    def get(self, event_type: str) -> EventHandler | None:
+        return self._handlers.get(event_type)
+
+    def __contains__(self, event_type: str) -> bool:
+        return event_type in self._handlers
+
+    def build(self, event: ChatEvent, note: str = "") -> EventWidgets | None:
+        """
+        Build the widgets for an event.
+
+        Args:
+            event: The chat event
+            note: Agent text for widgets that show a note, when already known
+
+        Returns:
+            The widgets, or None if the event type is unknown or its payload
+            is invalid (the agent handles it instead)
+        """
+        handler = self._handlers.get(event.type)
+        if handler is None:
+            return None
+        try:
+            payload = handler.payload_model.model_validate(event.payload)
+        except ValidationError as e:
+            logger.warning(f"Invalid {event.type} payload, not rendering widgets: {e.error_count()} error(s)")
+            return None
+
+        operations: list[dict] = []
+        primary: dict[str, Any] | None = None
+        for template in handler.widgets:
+            props = template.props(payload, note)
+            if primary is None:
+                primary = {"type": template.widget_type, "props": props}
+            operations.extend(generate_operations(template.widget_type, props, zone=template.zone))
+        # Fresh dicts per response: callers may mutate what they are given
+        operations.extend({key: dict(value) for key, value in op.items()} for op in handler.operations)
+        return EventWidgets(
+            payload=primary,
+            widgets=format_as_a2ui(primary["type"], primary["props"]),
+            operations=operations,
+        )
+
+
+event_registry = EventRegistry()
+
+
+# =============================================================================
+# Payload models
+# =============================================================================
+
+class _EventPayload(BaseModel):
+    # Clients send extra fields; they are ignored, not rejected
+    model_config = ConfigDict(extra="ignore", populate_by_name=True)
+
+    @classmethod
+    def _null_as_default(cls, value: Any, info: ValidationInfo) -> Any:
+        # Clients send null for "not set": render the default, as before the registry
+        return cls.model_fields[info.field_name].default if value is None else value
+
+
+class PlannedExercise(_EventPayload):
+    name: str | None = Field(default="", validation_alias=AliasChoices("name", "exercise"))
+    sets: int = 3
+    reps: int | str = "8-12"
+    rpe: str | int | float | None = None  # "7-8" and "RPE 8" are common
+
+    @field_validator("sets", "reps", mode="before")
+    @classmethod
+    def _target_defaults(cls, value: Any, info: ValidationInfo) -> Any:
+        return cls._null_as_default(value, info)
+
+
+class WorkoutStartedPayload(_EventPayload):
+    session_id: str | None = Field(default="", alias="sessionId")
+    title: str | None = "Workout"
+    exercises: list[PlannedExercise] = Field(default_factory=list)
+
+
+class WorkoutCompletedPayload(_EventPayload):
+    session_id: str | None = Field(default="", alias="sessionId")
+    title: str | None = "Workout Complete"
+    total_volume: int | float = Field(default=0, alias="totalVolume")
+    total_sets: int = Field(default=0, alias="totalSets")
+    total_reps: int = Field(default=0, alias="totalReps")
+    duration_mins: int | float = Field(default=0, alias="durationMins")
+    prs: list[Any] = Field(default_factory=list)
+
+    @field_validator("total_volume", "total_sets", "total_reps", "duration_mins", mode="before")
+    @classmethod
+    def _total_defaults(cls, value: Any, info: ValidationInfo) -> Any:
+        return cls._null_as_default(value, info)
+
+
+# =============================================================================
+# Handlers
+# =============================================================================
+
+def _live_session_tracker(payload: WorkoutStartedPayload, note: str) -> dict[str, Any]:
+    return {
+        "workoutId": payload.session_id,
+        "title": payload.title,
+        "exercises": [
+            {
+                "id": str(i),
+                "name": exercise.name,
+                "target": {"sets": exercise.sets, "reps": exercise.reps, "rpe": exercise.rpe},
+                "setsCompleted": [],
+            }
+            for i, exercise in enumerate(payload.exercises)
+        ],
+    }
+
+
+def _training_mode_bar(payload: WorkoutStartedPayload, note: str) -> dict[str, Any]:
+    first = payload.exercises[0] if payload.exercises else None
+    return {
+        "exerciseName": first.name if first else "",
+        "targetSets": first.sets if first else 3,
+        "targetReps": str(first.reps) if first else "8-12",
+        "elapsed": 0,
+        "totalSetsCompleted": 0,
+    }
+
+
+def _workout_complete(payload: WorkoutCompletedPayload, note: str) -> dict[str, Any]:
+    return {
+        "sessionId": payload.session_id,
+        "title": payload.title,
+        "totalVolume": payload.total_volume,
+        "totalSets": payload.total_sets,
+        "totalReps": payload.total_reps,
+        "durationMins": payload.duration_mins,
+        "prs": payload.prs,
+        "genesisNote": note[:200] if note else "",
+    }
+
+
+event_registry.register(EventHandler(
+    event_type="workout_started",
+    payload_model=WorkoutStartedPayload,
+    widgets=(
+        WidgetTemplate("live-session-tracker", "overlay", _live_session_tracker),
+        WidgetTemplate("training-mode-bar", "context", _training_mode_bar),
+    ),
+    ack_text="¡Vamos! Tu sesión está en marcha.",
+))
+
+event_registry.register(EventHandler(
+    event_type="workout_completed",
+    payload_model=WorkoutCompletedPayload,
+    widgets=(WidgetTemplate("workout-complete", "stream", _workout_complete),),
+    operations=({"deleteSurface": {"surfaceId": "*overlay*"}},),
+    ack_text="¡Entrenamiento completado! Buen trabajo.",
+))
@@ -0,0 +1,399 @@
+"""Response cache for repeated /api/chat questions.
+
+Many chat messages are near-identical ("¿Qué entreno hoy?", "Hola", "¿Por qué
+debo hacer deload?"). With CHAT_RESPONSE_CACHE enabled, the answers to a few
+self-contained intents are cached and served without running the agent:
+
+- Tier 1: hash of (intent, normalized message, relevant profile fields)
+- Tier 2 (CHAT_RESPONSE_CACHE_VECTOR): local vector index of hashed character
+  trigrams, searched only among entries with the same intent and profile
+  fields, for rephrasings of a cached question
+
+Eligibility is decided per intent and is conservative:
+- Requests with an event or attachments are never cached
+- Only greeting, education and daily training questions are cached; education
+  questions that mention the user's own data, refer back to the conversation
+  ("¿Por qué?", "Explain that") or name no topic are not
+- A response is not stored if the agent read or wrote the user's context, if
+  it contains a widget the intent does not allow, or if it names the user
+
+A hit is served with new surface IDs in its operations, so two users (or
+two answers in one chat) never share a surface.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import time
+import unicodedata
+import uuid
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Iterable
+
+import numpy as np
+
+from schemas.clipboard import UserProfile
+from schemas.request import ChatRequest
+from schemas.response import AgentResponse
+from settings import env_flag
+
+logger = logging.getLogger(__name__)
+
+CHAT_RESPONSE_CACHE = env_flag("CHAT_RESPONSE_CACHE")
+CHAT_RESPONSE_CACHE_VECTOR = env_flag("CHAT_RESPONSE_CACHE_VECTOR")
+CHAT_RESPONSE_CACHE_SIMILARITY = float(os.getenv("CHAT_RESPONSE_CACHE_SIMILARITY", "0.9"))
+CHAT_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+
+
+@dataclass(frozen=True)
+class IntentRule:
+    """Caching rule for one intent."""
+
+    ttl_seconds: int
+    # Profile fields the answer may depend on (part of the key)
+    profile_fields: tuple[str, ...] = ("preferred_language",)
+    # Widget types a cacheable response may carry (empty = text only)
+    widget_types: frozenset[str] = frozenset()
+    # Answers change every day (the date is part of the key)
+    daily: bool = False
+    # Users whose answers would draw on personal health data are not cached
+    skip_personal_health: bool = False
+
+
+INTENT_RULES: dict[str, IntentRule] = {
+    "greeting": IntentRule(ttl_seconds=24 * 3600),
+    "education": IntentRule(ttl_seconds=7 * 24 * 3600),
+    "training_today": IntentRule(
+        ttl_seconds=6 * 3600,
+        profile_fields=(
+            "preferred_language",
+            "fitness_level",
+            "primary_goal",
+            "available_equipment",
+            "injuries",
+            "training_days_per_week",
+        ),
+        widget_types=frozenset({"workout-card"}),
+        daily=True,
+        skip_personal_health=True,
+    ),
+}
+
+GREETING_RE = re.compile(
+    r"^(hola|hi|hello|hey|buenas|buenos dias|buenas tardes|buenas noches|good morning|"
+    r"good afternoon|good evening|que tal|como estas|how are you)( genesis)?$"
+)
+TRAINING_TODAY_RE = re.compile(
+    r"^(que (entreno|entrenar|entrenamos|hago|deberia entrenar) hoy|rutina (de|para) hoy|"
+    r"what (should i|do i|to) train today|workout for today|today s workout)$"
+)
+EDUCATION_RE = re.compile(
+    r"^(por que|que es|que son|que significa|como funciona|cual es la diferencia|explica|explicame|"
+    r"why|what is|what are|what does|how does|explain)\b"
+)
+# References to earlier turns: the answer depends on the conversation
+CONTEXTUAL_RE = re.compile(
+    r"\b(eso|esto|esa|ese|esas|esos|esta|este|estas|estos|aquello|ello|anterior|previo|mismo|"
+    r"that|this|these|those|it|its|they|them|above|previous|same)\b"
+)
+# Words that name no topic: a question made only of these is a follow-up
+FILLER_WORDS = frozenset(
+    "el la lo los las un una unos unas de del al y o en a entre con para por es son "
+    "diferencia significa funciona the an of and or in on to for between is are do does mean difference "
+    "work works".split()
+)
+# First-person references: the answer would be about the user, not the topic
+PERSONAL_RE = re.compile(
+    r"\b(mi|mis|me|yo|conmigo|hice|comi|dormi|pese|my|i|im|ive|mine|myself)\b|\d+\s*(kg|lb|kcal|cal)\b"
+)
+
+# Tools whose use means the answer was built from the user's own data
+PERSONAL_TOOLS = frozenset({"get_user_context", "update_user_context"})
+
+VECTOR_DIM = 1024
+
+
+def normalize_message(text: str) -> str:
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(re.sub(r"[^\w\s]", " ", stripped).split())
+
+
+def classify_intent(normalized: str) -> str | None:
+    """Cacheable intent of a normalized message, or None."""
+    if GREETING_RE.match(normalized):
+        return "greeting"
+    if TRAINING_TODAY_RE.match(normalized):
+        return "training_today"
+    opener = EDUCATION_RE.match(normalized)
+    if (
+        opener
+        and not PERSONAL_RE.search(normalized)
+        and not CONTEXTUAL_RE.search(normalized)
+        and any(word not in FILLER_WORDS for word in normalized[opener.end():].split())
+    ):
+        return "education"
+    return None
+
+
+def trigram_vector(normalized: str) -> np.ndarray:
+    """Unit-length hashed character-trigram vector (a local, model-free embedding)."""
+    vector = np.zeros(VECTOR_DIM, dtype=np.float32)
+    padded = f"  {normalized} "
+    for i in range(len(padded) - 2):
+        vector[zlib.crc32(padded[i:i + 3].encode("utf-8")) % VECTOR_DIM] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def fresh_surface_ids(operations: list[dict] | None) -> list[dict] | None:
+    """
+    Copy of cached zone operations with a new ID for every surface they create.
+
+    Surface IDs that the operations do not create (e.g. the ``*overlay*``
+    wildcard of deleteSurface) are kept.
+    """
+    if not operations:
+        return operations
+    renamed = {
+        op["createSurface"]["surfaceId"]: f"surface-{uuid.uuid4().hex[:8]}"
+        for op in operations
+        if "createSurface" in op
+    }
+    fresh = []
+    for op in operations:
+        copy = {}
+        for name, body in op.items():
+            if isinstance(body, dict) and body.get("surfaceId") in renamed:
+                body = {**body, "surfaceId": renamed[body["surfaceId"]]}
+            copy[name] = body
+        fresh.append(copy)
+    return fresh
+
+
+@dataclass
+class CacheLookup:
+    """Result of a cache lookup; pass it to ``store`` after a miss."""
+
+    intent: str | None = None
+    key: str | None = None
+    partition: str | None = None
+    normalized: str = ""
+    reason: str | None = None  # Why the request is not cacheable
+    response: AgentResponse | None = None
+    tier: str | None = None  # "exact" or "vector" on a hit
+
+
+@dataclass
+class _Entry:
+    response: dict[str, Any]
+    expires_at: float
+    partition: str
+    vector: np.ndarray | None = None
+
+
+class ResponseCache:
+    """Process-wide LRU of cacheable chat responses."""
+
+    def __init__(
+        self,
+        enabled: bool = CHAT_RESPONSE_CACHE,
+        vector_tier: bool = CHAT_RESPONSE_CACHE_VECTOR,
+        similarity: float = CHAT_RESPONSE_CACHE_SIMILARITY,
+        max_entries: int = CHAT_RESPONSE_CACHE_MAX_ENTRIES,
+    ):
+        self.enabled = enabled
+        self.vector_tier = vector_tier
+        self.similarity = similarity
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # Partition -> keys of its entries, for the vector tier
+        self._partitions: dict[str, set[str]] = {}
+        self._stats = {"exact_hits": 0, "vector_hits": 0, "misses": 0, "stores": 0, "expired": 0}
+        self._skipped: dict[str, int] = {}
+
+    def lookup(self, request: ChatRequest, profile: UserProfile | None) -> CacheLookup:
+        """
+        Find a cached response for a chat request.
+
+        Args:
+            request: The chat request
+            profile: The user's profile from the clipboard, if any
+
+        Returns:
+            The lookup; ``response`` is set on a hit, ``reason`` when the
+            request is not cacheable
+        """
+        if not self.enabled:
+            return CacheLookup(reason="disabled")
+        lookup = self._key(request, profile)
+        if lookup.key is None:
+            self._skip(lookup.reason)
+            return lookup
+
+        now = time.time()
+        entry = self._get(lookup.key, now)
+        if entry is not None:
+            lookup.tier = "exact"
+        elif self.vector_tier:
+            entry = self._nearest(lookup, now)
+            if entry is not None:
+                lookup.tier = "vector"
+
+        if entry is None:
+            self._stats["misses"] += 1
+            return lookup
+        self._stats[f"{lookup.tier}_hits"] += 1
+        lookup.response = AgentResponse.model_validate(entry.response)
+        lookup.response.operations = fresh_surface_ids(lookup.response.operations)
+        return lookup
+
+    def store(
+        self,
+        lookup: CacheLookup,
+        response: AgentResponse,
+        events: Iterable[Any] = (),
+        profile: UserProfile | None = None,
+    ) -> bool:
+        """
+        Cache the agent's response to a request that missed.
+
+        Args:
+            lookup: The miss returned by ``lookup``
+            response: The response sent to the user
+            events: ADK events of the run (checked for personal-data tools)
+            profile: The user's profile (responses naming the user are not cached)
+
+        Returns:
+            True if the response was cached
+        """
+        if not self.enabled or lookup.key is None or lookup.response is not None:
+            return False
+        reason = self._response_ineligible(lookup.intent, response, events, profile)
+        if reason:
+            self._skip(reason)
+            return False
+
+        rule = INTENT_RULES[lookup.intent]
+        self._drop(lookup.key)
+        self._entries[lookup.key] = _Entry(
+            response=response.model_dump(mode="json"),
+            expires_at=time.time() + rule.ttl_seconds,
+            partition=lookup.partition,
+            vector=trigram_vector(lookup.normalized) if self.vector_tier else None,
+        )
+        self._partitions.setdefault(lookup.partition, set()).add(lookup.key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+        self._stats["stores"] += 1
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._partitions.clear()
+
+    def stats(self) -> dict[str, Any]:
+        hits = self._stats["exact_hits"] + self._stats["vector_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "skipped": dict(self._skipped),
+        }
+
+    # =========================================================================
+    # Eligibility
+    # =========================================================================
+
+    def _key(self, request: ChatRequest, profile: UserProfile | None) -> CacheLookup:
+        if request.event is not None:
+            return CacheLookup(reason="event")
+        if request.attachments:
+            return CacheLookup(reason="attachments")
+
+        normalized = normalize_message(request.message)
+        intent = classify_intent(normalized)
+        if intent is None:
+            return CacheLookup(normalized=normalized, reason="intent")
+        rule = INTENT_RULES[intent]
+        if rule.skip_personal_health and profile is not None and (
+            profile.tracks_cycle or profile.connected_wearables
+        ):
+            return CacheLookup(intent=intent, normalized=normalized, reason="personal_health")
+
+        fields = {name: getattr(profile, name, None) for name in rule.profile_fields}
+        if fields.get("preferred_language") is None:
+            fields["preferred_language"] = "es"
+        if rule.daily:
+            fields["date"] = date.today().isoformat()
+        partition = f"{intent}|{sorted(fields.items())}"
+        key = hashlib.sha256(f"{partition}|{normalized}".encode("utf-8")).hexdigest()
+        return CacheLookup(intent=intent, key=key, partition=partition, normalized=normalized)
+
+    def _response_ineligible(
+        self,
+        intent: str,
+        response: AgentResponse,
+        events: Iterable[Any],
+        profile: UserProfile | None,
+    ) -> str | None:
+        for event in events:
+            get_calls = getattr(event, "get_function_calls", None)
+            if get_calls and any(call.name in PERSONAL_TOOLS for call in get_calls()):
+                return "personal_data"
+        widget_type = response.payload.type if response.payload else None
+        if widget_type is not None and widget_type not in INTENT_RULES[intent].widget_types:
+            return "widget"
+        if profile is not None and profile.name and profile.name.lower() in response.text.lower():
+            return "personal_data"
+        return None
+
+    # =========================================================================
+    # Storage
+    # =========================================================================
+
+    def _get(self, key: str, now: float) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._drop(key)
+            self._stats["expired"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _nearest(self, lookup: CacheLookup, now: float) -> _Entry | None:
+        keys = [key for key in self._partitions.get(lookup.partition, ()) if self._entries[key].vector is not None]
+        if not keys:
+            return None
+        matrix = np.stack([self._entries[key].vector for key in keys])
+        scores = matrix @ trigram_vector(lookup.normalized)
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity:
+            return None
+        return self._get(keys[best], now)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._partitions.get(entry.partition)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._partitions[entry.partition]
+
+    def _skip(self, reason: str | None) -> None:
+        if reason:
+            self._skipped[reason] = self._skipped.get(reason, 0) + 1
+
+
+response_cache = ResponseCache()
@@ -76,6 +76,11 @@ class SessionStore:
         except ImportError:
             print("Supabase client not available")
 
+    @property
+    def redis(self) -> redis.Redis | None:
+        """Shared Redis client, or None when Redis is unavailable."""
+        return self._redis
+
     async def disconnect(self) -> None:
         """Close Redis connection."""
         if self._redis:
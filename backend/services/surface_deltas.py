@@ -0,0 +1,304 @@
+"""Delta updates for A2UI surface data models.
+
+``generate_operations`` sends a widget's whole props dict in every
+``updateDataModel``, even when one field changed (a live tracker after one
+logged set, a note filled into a rendered card). With A2UI_DATA_MODEL_DELTAS
+enabled, the data model last sent for each surface is remembered per session
+and updates to a known surface are sent as JSON-Patch-style operations:
+
+    {"patchDataModel": {"surfaceId": "...", "baseVersion": "...", "version": "...", "patch": [
+        {"op": "add", "path": "/exercises/0/setsCompleted/-", "value": {...}}
+    ]}}
+
+- Patch ops are RFC 6902 ``add`` / ``replace`` / ``remove`` with JSON Pointer
+  paths; ``add`` to ``/list/-`` appends
+- The client merges a full ``updateDataModel`` into the existing model
+  (shallow), so the patch describes the same merge: top-level keys missing
+  from the update are kept
+- An update that changes nothing is dropped; a patch that would not be
+  smaller than the full data model is not used
+- Surfaces created in the same batch, or not known for the session (e.g.
+  another worker served them), always get the full data model
+- Every data model sent carries a ``version`` (hash of the model as this
+  server recorded it) and a patch names the ``baseVersion`` it applies to.
+  A client whose surface is missing or has another version (it dropped the
+  surface, or another instance updated it) must not apply the patch and
+  fetches the whole model instead (GET /api/chat/surfaces/{surface_id})
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from settings import env_flag
+
+logger = logging.getLogger(__name__)
+
+A2UI_DATA_MODEL_DELTAS = env_flag("A2UI_DATA_MODEL_DELTAS")
+A2UI_DELTA_MAX_SESSIONS = int(os.getenv("A2UI_DELTA_MAX_SESSIONS", "1000"))
+A2UI_DELTA_MAX_SURFACES = int(os.getenv("A2UI_DELTA_MAX_SURFACES", "32"))
+A2UI_DELTA_TTL_SECONDS = float(os.getenv("A2UI_DELTA_TTL_SECONDS", "7200"))
+
+# deleteSurface IDs that clear a whole zone on the client
+ZONE_WILDCARDS = {"*overlay*": "overlay", "*context*": "context"}
+
+
+def _pointer(path: str, key: Any) -> str:
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def diff_data_model(old: Any, new: Any, path: str = "") -> list[dict[str, Any]]:
+    """
+    JSON-Patch operations turning ``old`` into ``new``.
+
+    Dicts are diffed key by key and lists index by index; a list that only
+    grew gets ``add .../-`` appends. Anything else that differs is replaced.
+    Equal subtrees are skipped with one ``==`` (so a True/1 swap nested in
+    an otherwise equal subtree is not detected).
+
+    Args:
+        old: Previous JSON value
+        new: New JSON value
+        path: JSON Pointer of the values (root: "")
+
+    Returns:
+        The operations (empty if the values are equal)
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        if old == new:
+            return []
+        ops = [{"op": "remove", "path": _pointer(path, key)} for key in old if key not in new]
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            elif old[key] is not value:
+                ops.extend(diff_data_model(old[key], value, _pointer(path, key)))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(new) >= len(old):
+        if old == new:
+            return []
+        ops = []
+        for i, value in enumerate(old):
+            if value != new[i] or type(value) is not type(new[i]):
+                ops.extend(diff_data_model(value, new[i], _pointer(path, i)))
+        ops.extend({"op": "add", "path": f"{path}/-", "value": value} for value in new[len(old):])
+        return ops
+    # type() check: True == 1 but they serialize differently
+    if type(old) is type(new) and old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(model: dict[str, Any], patch: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Apply ``patchDataModel`` operations to a copy of a data model (what the
+    client does).
+
+    Raises:
+        KeyError, IndexError, ValueError: If an operation does not fit the model
+    """
+    result = json.loads(json.dumps(model))
+    for op in patch:
+        *parents, last = [
+            part.replace("~1", "/").replace("~0", "~") for part in op["path"].split("/")[1:]
+        ]
+        target = result
+        for part in parents:
+            target = target[int(part)] if isinstance(target, list) else target[part]
+        if isinstance(target, list):
+            if op["op"] == "add" and last == "-":
+                target.append(op["value"])
+            elif op["op"] == "add":
+                target.insert(int(last), op["value"])
+            elif op["op"] == "replace":
+                target[int(last)] = op["value"]
+            else:
+                del target[int(last)]
+        elif op["op"] in ("add", "replace"):
+            target[last] = op["value"]
+        elif op["op"] == "remove":
+            del target[last]
+        else:
+            raise ValueError(f"Unsupported patch op: {op['op']}")
+    return result
+
+
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _digest(canonical: str) -> str:
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def model_version(data_model: dict[str, Any]) -> str:
+    """Short content hash of a data model (same model, same version on every instance)."""
+    return _digest(_canonical(data_model))
+
+
+@dataclass
+class _Surface:
+    zone: str | None
+    data_model: dict[str, Any] = field(default_factory=dict)
+    version: str = ""
+
+
+@dataclass
+class _Session:
+    surfaces: OrderedDict[str, _Surface] = field(default_factory=OrderedDict)
+    touched_at: float = field(default_factory=time.monotonic)
+
+
+class SurfaceModels:
+    """Per-session record of the data model sent for each surface."""
+
+    def __init__(
+        self,
+        enabled: bool = A2UI_DATA_MODEL_DELTAS,
+        max_sessions: int = A2UI_DELTA_MAX_SESSIONS,
+        max_surfaces: int = A2UI_DELTA_MAX_SURFACES,
+        ttl_seconds: float = A2UI_DELTA_TTL_SECONDS,
+    ):
+        self.enabled = enabled
+        self.max_sessions = max(1, max_sessions)
+        self.max_surfaces = max(1, max_surfaces)
+        self.ttl_seconds = ttl_seconds
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+        self._stats = {"full_updates": 0, "patches": 0, "unchanged": 0, "bytes_saved": 0, "resyncs": 0}
+
+    def compact(self, session_id: str, operations: list[dict] | None) -> list[dict] | None:
+        """
+        Record the operations sent to a session and shrink its data model updates.
+
+        Args:
+            session_id: The chat session
+            operations: Zone operations about to be sent (not modified)
+
+        Returns:
+            The operations to send: ``updateDataModel`` for known surfaces
+            replaced by ``patchDataModel`` (or dropped when nothing changed)
+        """
+        if not self.enabled or not operations:
+            return operations
+        session = self._session(session_id)
+        created: set[str] = set()
+        result: list[dict] = []
+        for op in operations:
+            if "createSurface" in op:
+                surface_id = op["createSurface"]["surfaceId"]
+                self._remember(session, surface_id, _Surface(zone=op["createSurface"].get("zone")))
+                created.add(surface_id)
+            elif "deleteSurface" in op:
+                self._forget(session, op["deleteSurface"]["surfaceId"])
+            elif "updateDataModel" in op:
+                update = op["updateDataModel"]
+                op = self._update(session, update, full=update["surfaceId"] in created)
+                if op is None:
+                    continue
+            result.append(op)
+        return result
+
+    def get(self, session_id: str, surface_id: str) -> dict[str, Any] | None:
+        """
+        The data model last sent for a surface, for a client that could not apply a patch.
+
+        Returns:
+            {"surfaceId", "dataModel", "version"}, or None if the surface is
+            not known for the session on this instance
+        """
+        session = self._sessions.get(session_id)
+        surface = session.surfaces.get(surface_id) if session is not None else None
+        if surface is None:
+            return None
+        self._stats["resyncs"] += 1
+        return {
+            "surfaceId": surface_id,
+            "dataModel": copy.deepcopy(surface.data_model),
+            "version": surface.version,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._stats, "enabled": self.enabled, "sessions": len(self._sessions)}
+
+    # =========================================================================
+    # Surfaces
+    # =========================================================================
+
+    def _update(self, session: _Session, update: dict[str, Any], full: bool) -> dict | None:
+        surface_id = update["surfaceId"]
+        data_model = update.get("dataModel") or {}
+        surface = session.surfaces.get(surface_id)
+        if surface is None:
+            # Not created here: send it whole, diff later updates against it
+            surface = _Surface(zone=None)
+            full = True
+        # Serialized once: own copy (the caller's dicts may change after
+        # sending), update size and, usually, the new version
+        encoded = _canonical(data_model)
+        merged = {**surface.data_model, **json.loads(encoded)}
+        previous, base_version = surface.data_model, surface.version
+        surface.data_model = merged
+        self._remember(session, surface_id, surface)
+        version = _digest(encoded) if merged.keys() == data_model.keys() else model_version(merged)
+
+        if not full:
+            patch = diff_data_model(previous, merged)
+            if not patch:
+                self._stats["unchanged"] += 1
+                return None
+            surface.version = version
+            full_size = len(encoded)
+            patch_size = len(_canonical(patch))
+            if patch_size < full_size:
+                self._stats["patches"] += 1
+                self._stats["bytes_saved"] += full_size - patch_size
+                return {
+                    "patchDataModel": {
+                        "surfaceId": surface_id,
+                        "baseVersion": base_version,
+                        "version": surface.version,
+                        "patch": patch,
+                    }
+                }
+        else:
+            surface.version = version
+        self._stats["full_updates"] += 1
+        return {"updateDataModel": {**update, "version": surface.version}}
+
+    def _remember(self, session: _Session, surface_id: str, surface: _Surface) -> None:
+        session.surfaces[surface_id] = surface
+        session.surfaces.move_to_end(surface_id)
+        while len(session.surfaces) > self.max_surfaces:
+            session.surfaces.popitem(last=False)
+
+    def _forget(self, session: _Session, surface_id: str) -> None:
+        zone = ZONE_WILDCARDS.get(surface_id)
+        if zone is None:
+            session.surfaces.pop(surface_id, None)
+            return
+        for key in [key for key, surface in session.surfaces.items() if surface.zone == zone]:
+            del session.surfaces[key]
+
+    def _session(self, session_id: str) -> _Session:
+        now = time.monotonic()
+        while self._sessions:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if oldest.touched_at > now - self.ttl_seconds and len(self._sessions) < self.max_sessions:
+                break
+            del self._sessions[oldest_id]
+
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session()
+        session.touched_at = now
+        self._sessions.move_to_end(session_id)
+        return session
+
+
+surface_models = SurfaceModels()
@@ -0,0 +1,13 @@
+"""Environment settings helpers shared by the feature flags."""
+
+import os
+
+TRUE_VALUES = ("1", "true", "yes")
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Boolean environment variable: "1", "true" or "yes" (any case) is on."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in TRUE_VALUES
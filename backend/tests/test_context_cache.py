@@ -0,0 +1,182 @@
+"""Tests for Gemini context caching of the static GENESIS prefix.
+
+Tests cover:
+- create in the background, then use the cache on later requests
+- TTL refresh near expiry
+- invalidation on prefix change and on model errors
+- uncached fallback and retry back-off when caching fails
+All against a stubbed google-genai client.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models import LlmRequest
+from google.genai import types
+
+from agent.context_cache import InstructionCache
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class FakeCaches:
+    """Stub of ``client.aio.caches``."""
+
+    def __init__(self, fail_create: Exception | None = None):
+        self.fail_create = fail_create
+        self.created: list[types.CreateCachedContentConfig] = []
+        self.updated: list[str] = []
+        self.deleted: list[str] = []
+
+    async def create(self, model, config):
+        if self.fail_create:
+            raise self.fail_create
+        self.created.append(config)
+        return SimpleNamespace(
+            name=f"cachedContents/{len(self.created)}",
+            expire_time=datetime.now(timezone.utc) + timedelta(seconds=int(config.ttl[:-1])),
+        )
+
+    async def update(self, name, config):
+        self.updated.append(name)
+        return SimpleNamespace(name=name, expire_time=datetime.now(timezone.utc) + timedelta(hours=1))
+
+    async def delete(self, name):
+        self.deleted.append(name)
+
+
+def _cache(caches: FakeCaches, **kwargs) -> InstructionCache:
+    client = SimpleNamespace(aio=SimpleNamespace(caches=caches))
+    return InstructionCache(client_factory=lambda: client, enabled=True, **kwargs)
+
+
+def _request(instruction: str = "Eres GENESIS.") -> LlmRequest:
+    return LlmRequest(
+        model="gemini-2.5-flash",
+        contents=[types.Content(role="user", parts=[types.Part(text="hola")])],
+        config=types.GenerateContentConfig(
+            system_instruction=instruction,
+            tools=[types.Tool(function_declarations=[types.FunctionDeclaration(name="generate_widget")])],
+        ),
+    )
+
+
+async def _settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestInstructionCache:
+    """Tests for the process-wide instruction cache."""
+
+    @pytest.mark.anyio
+    async def test_first_request_uncached_then_cached(self):
+        """Test that the cache is created in the background and used by the next request."""
+        caches = FakeCaches()
+        cache = _cache(caches)
+
+        first = _request()
+        assert cache.apply(first) is False
+        assert first.config.system_instruction == "Eres GENESIS."
+        await _settle()
+        assert len(caches.created) == 1
+        assert caches.created[0].system_instruction == "Eres GENESIS."
+        assert caches.created[0].tools[0].function_declarations[0].name == "generate_widget"
+
+        second = _request()
+        assert cache.apply(second) is True
+        assert second.config.cached_content == "cachedContents/1"
+        assert second.config.system_instruction is None
+        assert second.config.tools is None
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.anyio
+    async def test_concurrent_misses_create_once(self):
+        """Test that requests arriving while the cache is created do not create it again."""
+        caches = FakeCaches()
+        cache = _cache(caches)
+
+        for _ in range(5):
+            cache.apply(_request())
+        await _settle()
+        assert len(caches.created) == 1
+
+    @pytest.mark.anyio
+    async def test_instruction_change_replaces_cache(self):
+        """Test that a reloaded instruction invalidates and deletes the old cache."""
+        caches = FakeCaches()
+        cache = _cache(caches)
+        cache.apply(_request("v1"))
+        await _settle()
+
+        changed = _request("v2")
+        assert cache.apply(changed) is False
+        assert changed.config.system_instruction == "v2"
+        await _settle()
+        assert caches.deleted == ["cachedContents/1"]
+        assert caches.created[-1].system_instruction == "v2"
+        assert cache.apply(_request("v2")) is True
+
+    @pytest.mark.anyio
+    async def test_refreshes_ttl_near_expiry(self):
+        """Test that a cache close to expiry has its TTL extended."""
+        caches = FakeCaches()
+        cache = _cache(caches, ttl_seconds=3600, refresh_seconds=600)
+        cache.apply(_request())
+        await _settle()
+
+        cache.current.expire_at -= 3300  # 5 minutes left
+        assert cache.apply(_request()) is True
+        await _settle()
+        assert caches.updated == ["cachedContents/1"]
+        assert cache.stats()["refreshed"] == 1
+
+    @pytest.mark.anyio
+    async def test_unsupported_falls_back_and_backs_off(self):
+        """Test that a failed create leaves requests uncached and is not retried immediately."""
+        caches = FakeCaches(fail_create=RuntimeError("400 Cached content is too small"))
+        cache = _cache(caches, retry_seconds=900)
+
+        cache.apply(_request())
+        await _settle()
+        caches.fail_create = None
+        request = _request()
+        assert cache.apply(request) is False
+        assert request.config.system_instruction == "Eres GENESIS."
+        await _settle()
+        assert caches.created == []
+        assert cache.stats()["failures"] == 1
+
+    @pytest.mark.anyio
+    async def test_model_error_drops_cache(self):
+        """Test that a model error on a cached request stops the cache being used."""
+        caches = FakeCaches()
+        cache = _cache(caches)
+        cache.apply(_request())
+        await _settle()
+
+        request = _request()
+        cache.apply(request)
+        result = await cache.on_model_error(
+            callback_context=None, llm_request=request, error=RuntimeError("404 cache not found")
+        )
+        assert result is None
+        assert cache.current is None
+
+    @pytest.mark.anyio
+    async def test_disabled_leaves_requests_alone(self):
+        """Test that the callback does nothing when caching is disabled."""
+        caches = FakeCaches()
+        cache = _cache(caches)
+        cache.enabled = False
+
+        request = _request()
+        assert await cache.before_model(callback_context=None, llm_request=request) is None
+        await _settle()
+        assert request.config.cached_content is None
+        assert caches.created == []
@@ -0,0 +1,310 @@
+"""Tests for the chat event fast path.
+
+Tests cover:
+- EventRegistry: validated payloads, declarative widget templates
+- NoteStore: background notes, long-poll, failures, expiry
+- /api/chat: known events answered with widgets before the agent finishes,
+  coaching note fetched later from /api/chat/notes/{id}
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import main
+from pydantic import BaseModel
+
+from schemas.clipboard import SessionClipboard
+from schemas.request import ChatEvent
+from services.coaching_notes import NoteStore
+from services.event_widgets import EventHandler, EventRegistry, WidgetTemplate, event_registry
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class TestEventRegistry:
+    """Tests for the event handler registry."""
+
+    def test_workout_started_widgets(self):
+        """Test that workout_started renders the overlay tracker and the context bar."""
+        event = ChatEvent(
+            type="workout_started",
+            payload={"sessionId": "w1", "exercises": [{"exercise": "Sentadilla", "sets": "4", "reps": 6}]},
+        )
+        payload, widgets, operations = event_registry.build(event)
+
+        assert payload["type"] == "live-session-tracker"
+        assert payload["props"]["title"] == "Workout"
+        assert payload["props"]["exercises"][0] == {
+            "id": "0",
+            "name": "Sentadilla",
+            "target": {"sets": 4, "reps": 6, "rpe": None},
+            "setsCompleted": [],
+        }
+        assert widgets[0]["version"] == "v0.10"
+        zones = [op["createSurface"]["zone"] for op in operations if "createSurface" in op]
+        assert zones == ["overlay", "context"]
+        assert operations[-1]["updateDataModel"]["dataModel"]["targetReps"] == "6"
+
+    def test_workout_completed_note_and_static_operations(self):
+        """Test that the note fills genesisNote and static operations are appended as fresh copies."""
+        event = ChatEvent(type="workout_completed", payload={"totalSets": 12})
+        first = event_registry.build(event, note="Gran trabajo")
+        second = event_registry.build(event)
+
+        assert first.payload["props"]["genesisNote"] == "Gran trabajo"
+        assert second.payload["props"]["genesisNote"] == ""
+        assert first.operations[-1] == {"deleteSurface": {"surfaceId": "*overlay*"}}
+        first.operations[-1]["deleteSurface"]["surfaceId"] = "changed"
+        assert event_registry.build(event).operations[-1]["deleteSurface"]["surfaceId"] == "*overlay*"
+
+    def test_baseline_payload_shapes(self):
+        """Test that payloads the inline handlers rendered (text RPE, null targets and totals) still render."""
+        started = ChatEvent(
+            type="workout_started",
+            payload={"exercises": [{"name": "Sentadilla", "sets": None, "reps": None, "rpe": "7-8"}]},
+        )
+        exercise = event_registry.build(started).payload["props"]["exercises"][0]
+        assert exercise["target"] == {"sets": 3, "reps": "8-12", "rpe": "7-8"}
+
+        completed = ChatEvent(type="workout_completed", payload={"totalSets": None, "durationMins": None})
+        props = event_registry.build(completed).payload["props"]
+        assert props["totalSets"] == 0
+        assert props["durationMins"] == 0
+
+    def test_invalid_or_unknown_events(self):
+        """Test that unknown types and invalid payloads are left to the agent."""
+        assert event_registry.build(ChatEvent(type="unknown_event")) is None
+        invalid = ChatEvent(type="workout_started", payload={"exercises": "sentadilla"})
+        assert event_registry.build(invalid) is None
+
+    def test_register_new_event_type(self):
+        """Test that a new event type is one registration, and types are unique."""
+
+        class RestStarted(BaseModel):
+            seconds: int
+
+        registry = EventRegistry()
+        registry.register(EventHandler(
+            event_type="rest_started",
+            payload_model=RestStarted,
+            widgets=(WidgetTemplate("rest-timer", "overlay", lambda p, note: {"seconds": p.seconds}),),
+            ack_text="Descansa.",
+        ))
+
+        built = registry.build(ChatEvent(type="rest_started", payload={"seconds": "90"}))
+        assert built.payload == {"type": "rest-timer", "props": {"seconds": 90}}
+        with pytest.raises(ValueError):
+            registry.register(registry.get("rest_started"))
+
+
+class TestNoteStore:
+    """Tests for deferred coaching notes."""
+
+    @pytest.mark.anyio
+    async def test_pending_then_ready(self):
+        """Test that a note is pending until generated and can be long-polled."""
+        store = NoteStore()
+        release = asyncio.Event()
+
+        async def generate():
+            await release.wait()
+            return {"text": "Gran sesión.", "operations": None}
+
+        note_id = store.start(generate())
+        assert (await store.get(note_id))["status"] == "pending"
+
+        asyncio.get_running_loop().call_later(0.02, release.set)
+        note = await store.get(note_id, wait_seconds=1)
+        assert note["status"] == "ready"
+        assert note["text"] == "Gran sesión."
+
+    @pytest.mark.anyio
+    async def test_failed_note(self):
+        """Test that a failing generation is reported as failed."""
+        store = NoteStore()
+
+        async def generate():
+            raise RuntimeError("model error")
+
+        note_id = store.start(generate())
+        note = await store.get(note_id, wait_seconds=1)
+        assert note["status"] == "failed"
+        assert store.stats()["failed"] == 1
+
+    @pytest.mark.anyio
+    async def test_old_notes_are_dropped(self):
+        """Test that notes past max_notes are dropped, cancelling unfinished ones."""
+        store = NoteStore(max_notes=1)
+        first = store.start(asyncio.sleep(10, result={"text": "a"}))
+        second = store.start(asyncio.sleep(0, result={"text": "b"}))
+
+        assert await store.get(first) is None
+        assert (await store.get(second, wait_seconds=1))["text"] == "b"
+        assert store.stats()["dropped"] == 1
+        await store.close()
+
+    @pytest.mark.anyio
+    async def test_note_from_another_instance(self):
+        """Test that a note generated on one instance is fetched on another through Redis."""
+        redis = FakeRedis()
+        origin, other = NoteStore(), NoteStore()
+        release = asyncio.Event()
+
+        async def generate():
+            await release.wait()
+            return {"text": "Gran sesión.", "operations": [{"updateDataModel": {"surfaceId": "s"}}]}
+
+        with patch("services.coaching_notes.session_store", SimpleNamespace(redis=redis)), \
+                patch("services.coaching_notes.CHAT_NOTE_POLL_SECONDS", 0.01):
+            note_id = origin.start(generate())
+            await asyncio.sleep(0)
+            assert (await other.get(note_id))["status"] == "pending"
+
+            asyncio.get_running_loop().call_later(0.02, release.set)
+            note = await other.get(note_id, wait_seconds=1)
+            assert note["status"] == "ready"
+            assert note["text"] == "Gran sesión."
+            assert note["operations"][0]["updateDataModel"]["surfaceId"] == "s"
+            assert await other.get("unknown") is None
+            assert redis.ttls[f"ngx:chat-note:{note_id}"] == 600
+        assert other.stats()["shared_reads"] == 2
+
+
+class FakeRedis:
+    """The get/setex subset of redis.asyncio.Redis used by NoteStore."""
+
+    def __init__(self):
+        self.values: dict[str, str] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.values[key] = value
+        self.ttls[key] = ttl
+
+
+class FakeRunner:
+    """Stands in for the ADK runner; the agent answers once ``release`` is set."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.release = asyncio.Event()
+        self.calls = 0
+
+    async def run_async(self, user_id, session_id, new_message):
+        self.calls += 1
+        await self.release.wait()
+        part = SimpleNamespace(text=self.text, function_response=None)
+        yield SimpleNamespace(content=SimpleNamespace(parts=[part]))
+
+
+class TestEventFastPath:
+    """Tests for /api/chat with known events."""
+
+    @pytest.fixture
+    def backend(self):
+        clipboard = SessionClipboard(session_id="s1", user_id="default-user")
+        runner = FakeRunner("¡Brutal! Subiste el volumen un 10%.")
+        with patch.object(main, "runner", runner), \
+                patch.object(main, "CHAT_EVENT_FAST_PATH", True), \
+                patch.object(main, "get_or_create_session", AsyncMock(return_value=clipboard)), \
+                patch.object(main, "set_session", AsyncMock()):
+            yield runner, clipboard
+
+    @pytest.mark.anyio
+    async def test_widgets_returned_before_agent(self, backend):
+        """Test that workout_completed renders immediately and the note arrives later."""
+        runner, clipboard = backend
+        transport = ASGITransport(app=main.app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/chat",
+                json={
+                    "message": "[event:workout_completed]",
+                    "session_id": "s1",
+                    "event": {"type": "workout_completed", "payload": {"sessionId": "w1", "totalSets": 12}},
+                },
+            )
+            data = response.json()
+            assert response.status_code == 200
+            assert not runner.release.is_set()  # Answered without waiting for the agent
+            assert data["payload"]["type"] == "workout-complete"
+            assert data["payload"]["props"]["totalSets"] == 12
+            assert data["operations"][0]["createSurface"]["zone"] == "stream"
+            assert data["pending_note"]
+
+            pending = await client.get(f"/api/chat/notes/{data['pending_note']}")
+            assert pending.json()["status"] == "pending"
+
+            runner.release.set()
+            note = (await client.get(f"/api/chat/notes/{data['pending_note']}?wait=2")).json()
+            assert note["status"] == "ready"
+            assert note["text"] == "¡Brutal! Subiste el volumen un 10%."
+            update = note["operations"][0]["updateDataModel"]
+            assert update["surfaceId"] == data["operations"][0]["createSurface"]["surfaceId"]
+            assert update["dataModel"]["genesisNote"] == note["text"]
+            assert update["dataModel"]["totalSets"] == 12
+
+            assert (await client.get("/api/chat/notes/unknown")).status_code == 404
+
+        assert runner.calls == 1
+        assert [m.content for m in clipboard.session_context][-1] == note["text"]
+
+    @pytest.mark.anyio
+    async def test_next_chat_waits_for_pending_note(self, backend):
+        """Test that the next message on the session runs after the note, not alongside it."""
+        runner, clipboard = backend
+        transport = ASGITransport(app=main.app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            data = (await client.post(
+                "/api/chat",
+                json={
+                    "message": "[event:workout_completed]",
+                    "session_id": "s1",
+                    "event": {"type": "workout_completed", "payload": {"totalSets": 12}},
+                },
+            )).json()
+            follow_up = asyncio.create_task(
+                client.post("/api/chat", json={"message": "¿Y mañana?", "session_id": "s1"})
+            )
+            await asyncio.sleep(0.05)
+            assert runner.calls == 1  # Still waiting for the note
+            assert not follow_up.done()
+
+            runner.release.set()
+            assert (await follow_up).status_code == 200
+            assert (await client.get(f"/api/chat/notes/{data['pending_note']}")).json()["status"] == "ready"
+
+        assert runner.calls == 2
+        contents = [m.content for m in clipboard.session_context]
+        assert contents.index("¡Brutal! Subiste el volumen un 10%.") < contents.index("¿Y mañana?")
+
+    @pytest.mark.anyio
+    async def test_fast_path_disabled_waits_for_agent(self, backend):
+        """Test that with the fast path off the agent's text is used inline."""
+        runner, _ = backend
+        runner.release.set()
+        transport = ASGITransport(app=main.app)
+        with patch.object(main, "CHAT_EVENT_FAST_PATH", False):
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                data = (await client.post(
+                    "/api/chat",
+                    json={
+                        "message": "[event:workout_started]",
+                        "session_id": "s2",
+                        "event": {"type": "workout_started", "payload": {"exercises": [{"name": "Sentadilla"}]}},
+                    },
+                )).json()
+
+        assert data["text"] == "¡Brutal! Subiste el volumen un 10%."
+        assert data["payload"]["type"] == "live-session-tracker"
+        assert data["pending_note"] is None
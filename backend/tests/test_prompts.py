@@ -0,0 +1,77 @@
+"""Tests for prompt assembly.
+
+Tests cover:
+- InstructionFile: load, default fallback, hot reload by mtime
+- GENESIS agent instruction provider
+"""
+
+import os
+
+from prompts import InstructionFile
+
+
+def _touch(path, text, bump_ns):
+    """Write a file and move its mtime forward so the change is always visible."""
+    path.write_text(text, encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump_ns))
+
+
+class TestInstructionFile:
+    """Tests for hot-reloadable instruction files."""
+
+    def test_loads_file(self, tmp_path):
+        """Test that the file text is loaded at construction."""
+        path = tmp_path / "genesis.txt"
+        path.write_text("Eres GENESIS.", encoding="utf-8")
+        instruction = InstructionFile(path, default="default")
+        assert instruction.text == "Eres GENESIS."
+        assert instruction.version == 1
+
+    def test_missing_file_uses_default(self, tmp_path):
+        """Test that a missing file falls back to the default text."""
+        instruction = InstructionFile(tmp_path / "missing.txt", default="default")
+        assert instruction.text == "default"
+        assert instruction.version == 0
+
+    def test_reloads_when_mtime_changes(self, tmp_path):
+        """Test that an edited file is picked up without recreating the object."""
+        path = tmp_path / "genesis.txt"
+        path.write_text("v1", encoding="utf-8")
+        instruction = InstructionFile(path, check_interval=0)
+
+        _touch(path, "v2", bump_ns=1_000_000_000)
+        assert instruction.text == "v2"
+        assert instruction.version == 2
+        assert instruction.text == "v2"  # Unchanged file is not re-read
+        assert instruction.version == 2
+
+    def test_check_interval_throttles_reload(self, tmp_path):
+        """Test that the file is not checked again within check_interval."""
+        path = tmp_path / "genesis.txt"
+        path.write_text("v1", encoding="utf-8")
+        instruction = InstructionFile(path, check_interval=3600)
+
+        _touch(path, "v2", bump_ns=1_000_000_000)
+        assert instruction.text == "v1"
+
+    def test_deleted_file_keeps_last_text(self, tmp_path):
+        """Test that the loaded text survives the file disappearing."""
+        path = tmp_path / "genesis.txt"
+        path.write_text("v1", encoding="utf-8")
+        instruction = InstructionFile(path, default="default", check_interval=0)
+
+        path.unlink()
+        assert instruction.text == "v1"
+
+
+class TestGenesisInstruction:
+    """Tests for the GENESIS agent's instruction provider."""
+
+    def test_agent_reads_current_instruction(self):
+        """Test that the agent's instruction tracks the unified instruction file."""
+        from agent.genesis import GENESIS_INSTRUCTION, genesis, genesis_instruction
+
+        assert callable(genesis.instruction)
+        assert genesis.instruction(None) == genesis_instruction.text == GENESIS_INSTRUCTION
+        assert "GENESIS" in GENESIS_INSTRUCTION
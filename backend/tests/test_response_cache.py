@@ -0,0 +1,216 @@
+"""Tests for the /api/chat response cache.
+
+Tests cover:
+- normalization and intent classification
+- exact-tier hits keyed by relevant profile fields, TTL expiry, LRU bound
+- eligibility: events, personal questions, personal-data tools, widgets
+- optional vector tier for rephrasings
+- hit-rate metrics
+- hits served with fresh surface IDs and recorded in the ADK session
+"""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import main
+from schemas.clipboard import SessionClipboard, UserProfile
+from schemas.request import ChatEvent, ChatRequest
+from schemas.response import AgentResponse, WidgetPayload
+from services.response_cache import ResponseCache, classify_intent, normalize_message
+from tools.generate_widget import generate_operations
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _ask(cache: ResponseCache, message: str, profile: UserProfile | None = None, **kwargs):
+    return cache.lookup(ChatRequest(message=message, **kwargs), profile)
+
+
+def _tool_event(name: str):
+    return SimpleNamespace(get_function_calls=lambda: [SimpleNamespace(name=name)])
+
+
+class TestIntentRules:
+    """Tests for normalization and intent classification."""
+
+    def test_normalize_message(self):
+        """Test that accents, case and punctuation do not change the key."""
+        assert normalize_message("¿Qué entreno HOY?") == normalize_message("que entreno hoy") == "que entreno hoy"
+
+    def test_classify_intent(self):
+        """Test that only self-contained questions get a cacheable intent."""
+        assert classify_intent(normalize_message("¡Hola GENESIS!")) == "greeting"
+        assert classify_intent(normalize_message("¿Qué entreno hoy?")) == "training_today"
+        assert classify_intent(normalize_message("¿Por qué debo hacer deload?")) == "education"
+        assert classify_intent(normalize_message("¿Por qué me duele la rodilla?")) is None
+        assert classify_intent(normalize_message("Hice 100 kg en sentadilla")) is None
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "¿Por qué?",
+            "Why?",
+            "¿Qué es eso?",
+            "Explain that",
+            "What does it mean?",
+            "Explícame lo anterior",
+            "What is the difference between these two?",
+            "¿Cuál es la diferencia?",
+        ],
+    )
+    def test_follow_ups_not_cached(self, message):
+        """Test that questions about earlier turns, or with no topic, get no intent."""
+        assert classify_intent(normalize_message(message)) is None
+
+    def test_topic_questions_cached(self):
+        """Test that questions naming their topic are still education."""
+        for message in (
+            "What is RPE?",
+            "¿Qué es el RPE?",
+            "Explain progressive overload",
+            "¿Cuál es la diferencia entre RIR y RPE?",
+        ):
+            assert classify_intent(normalize_message(message)) == "education"
+
+
+class TestResponseCache:
+    """Tests for the response cache."""
+
+    def test_disabled_by_default(self):
+        """Test that a disabled cache never hits or stores."""
+        cache = ResponseCache(enabled=False)
+        lookup = _ask(cache, "Hola")
+        assert lookup.reason == "disabled"
+        assert cache.store(lookup, AgentResponse(text="¡Hola!")) is False
+
+    def test_exact_hit_after_store(self):
+        """Test that the same question, phrased with different punctuation, hits."""
+        cache = ResponseCache(enabled=True)
+        miss = _ask(cache, "¿Qué es el deload?")
+        assert miss.response is None
+        assert cache.store(miss, AgentResponse(text="Una semana de descarga."))
+
+        hit = _ask(cache, "que es el DELOAD")
+        assert hit.tier == "exact"
+        assert hit.response.text == "Una semana de descarga."
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_profile_fields_are_part_of_key(self):
+        """Test that training answers are not shared across different profiles or days."""
+        cache = ResponseCache(enabled=True)
+        beginner = UserProfile(user_id="u1", fitness_level="beginner")
+        advanced = UserProfile(user_id="u2", fitness_level="advanced")
+        workout = AgentResponse(text="Hoy toca pierna.", payload=WidgetPayload(type="workout-card", props={}))
+
+        cache.store(_ask(cache, "¿Qué entreno hoy?", beginner), workout)
+        assert _ask(cache, "¿Qué entreno hoy?", UserProfile(user_id="u3", fitness_level="beginner")).response
+        assert _ask(cache, "¿Qué entreno hoy?", advanced).response is None
+
+    def test_expired_entry_misses(self):
+        """Test that an entry past its TTL is not served."""
+        cache = ResponseCache(enabled=True)
+        cache.store(_ask(cache, "Hola"), AgentResponse(text="¡Hola!"))
+        next(iter(cache._entries.values())).expires_at = 0
+
+        assert _ask(cache, "Hola").response is None
+        assert cache.stats()["expired"] == 1
+
+    def test_lru_bound(self):
+        """Test that the oldest entry is evicted past max_entries."""
+        cache = ResponseCache(enabled=True, max_entries=2)
+        for question in ("¿Qué es el RPE?", "¿Qué es el deload?", "¿Qué es la hipertrofia?"):
+            cache.store(_ask(cache, question), AgentResponse(text=question))
+
+        assert cache.stats()["entries"] == 2
+        assert _ask(cache, "¿Qué es el RPE?").response is None
+
+    def test_events_are_never_cached(self):
+        """Test that event-driven requests are not cacheable."""
+        cache = ResponseCache(enabled=True)
+        lookup = _ask(cache, "Hola", event=ChatEvent(type="workout_started"))
+        assert lookup.reason == "event"
+        assert cache.store(lookup, AgentResponse(text="¡Vamos!")) is False
+
+    def test_personal_data_responses_are_not_stored(self):
+        """Test that responses built from the user's data or naming the user are not stored."""
+        cache = ResponseCache(enabled=True)
+        profile = UserProfile(user_id="u1", name="Lucía")
+
+        lookup = _ask(cache, "¿Qué entreno hoy?", profile)
+        assert cache.store(lookup, AgentResponse(text="Pierna."), [_tool_event("get_user_context")]) is False
+        assert cache.store(lookup, AgentResponse(text="¡Lucía, hoy pierna!"), profile=profile) is False
+        assert cache.store(
+            _ask(cache, "Hola", profile),
+            AgentResponse(text="¡Hola!", payload=WidgetPayload(type="daily-checkin", props={})),
+        ) is False
+        assert cache.stats()["skipped"] == {"personal_data": 2, "widget": 1}
+
+    def test_tracked_health_data_skips_training(self):
+        """Test that training questions from users with wearables or cycle tracking are not cached."""
+        cache = ResponseCache(enabled=True)
+        profile = UserProfile(user_id="u1", connected_wearables=["oura"])
+        assert _ask(cache, "¿Qué entreno hoy?", profile).reason == "personal_health"
+
+    def test_vector_tier_matches_rephrasing(self):
+        """Test that the vector tier serves a close rephrasing within the same intent only."""
+        cache = ResponseCache(enabled=True, vector_tier=True, similarity=0.75)
+        cache.store(_ask(cache, "¿Qué es el deload?"), AgentResponse(text="Descarga."))
+
+        hit = _ask(cache, "¿Qué es un deload?")
+        assert hit.tier == "vector"
+        assert hit.response.text == "Descarga."
+        assert _ask(cache, "¿Qué es el RPE?").response is None
+        assert cache.stats()["vector_hits"] == 1
+
+    def test_hit_gets_fresh_surface_ids(self):
+        """Test that each hit creates new surfaces and leaves the cached copy untouched."""
+        cache = ResponseCache(enabled=True)
+        operations = [{"deleteSurface": {"surfaceId": "*overlay*"}}] + generate_operations(
+            "workout-card", {"title": "Push", "exercises": []}
+        )
+        cache.store(
+            _ask(cache, "¿Qué entreno hoy?"),
+            AgentResponse(text="Push.", payload=WidgetPayload(type="workout-card", props={}), operations=operations),
+        )
+
+        first = _ask(cache, "¿Qué entreno hoy?").response.operations
+        second = _ask(cache, "¿Qué entreno hoy?").response.operations
+        ids = [{body["surfaceId"] for op in ops for body in op.values()} for ops in (operations, first, second)]
+        assert len(ids[0]) == len(ids[1]) == len(ids[2]) == 2
+        assert ids[0] & ids[1] == ids[1] & ids[2] == {"*overlay*"}
+        assert first[1:] != operations[1:]
+        assert first[-1]["updateDataModel"]["dataModel"] == {"title": "Push", "exercises": []}
+
+
+class TestCacheHitEndpoint:
+    """Tests for /api/chat when the response cache hits."""
+
+    @pytest.mark.anyio
+    async def test_hit_is_recorded_in_adk_session(self):
+        """Test that a cached answer is appended to the ADK session like an agent turn."""
+        cache = ResponseCache(enabled=True)
+        cache.store(_ask(cache, "¿Qué es el deload?"), AgentResponse(text="Una semana de descarga."))
+        clipboard = SessionClipboard(session_id="cache-s1", user_id="default-user")
+        runner = SimpleNamespace(run_async=AsyncMock(side_effect=AssertionError("agent should not run")))
+
+        with patch.object(main, "response_cache", cache), patch.object(main, "runner", runner), \
+                patch.object(main, "get_or_create_session", AsyncMock(return_value=clipboard)), \
+                patch.object(main, "set_session", AsyncMock()):
+            transport = ASGITransport(app=main.app)
+            async with AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post(
+                    "/api/chat", json={"message": "que es el deload", "session_id": "cache-s1"}
+                )
+
+        assert response.json()["text"] == "Una semana de descarga."
+        session = await main.session_service.get_session(
+            app_name="ngx-a2ui", user_id="default-user", session_id="cache-s1"
+        )
+        turns = [(event.author, event.content.parts[0].text) for event in session.events]
+        assert turns == [("user", "que es el deload"), (main.root_agent.name, "Una semana de descarga.")]
@@ -0,0 +1,27 @@
+"""Tests for environment settings helpers."""
+
+import pytest
+
+from settings import env_flag
+
+
+class TestEnvFlag:
+    """Tests for env_flag."""
+
+    @pytest.mark.parametrize("value", ["1", "true", "TRUE", "yes", " Yes "])
+    def test_on_values(self, monkeypatch, value):
+        """Test that 1, true and yes turn a flag on, in any case."""
+        monkeypatch.setenv("TEST_FLAG", value)
+        assert env_flag("TEST_FLAG") is True
+
+    @pytest.mark.parametrize("value", ["0", "false", "no", ""])
+    def test_off_values(self, monkeypatch, value):
+        """Test that anything else turns a flag off, even when it defaults to on."""
+        monkeypatch.setenv("TEST_FLAG", value)
+        assert env_flag("TEST_FLAG", default=True) is False
+
+    def test_unset_uses_default(self, monkeypatch):
+        """Test that an unset flag takes its default."""
+        monkeypatch.delenv("TEST_FLAG", raising=False)
+        assert env_flag("TEST_FLAG") is False
+        assert env_flag("TEST_FLAG", default=True) is True
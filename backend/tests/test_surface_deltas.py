@@ -0,0 +1,214 @@
+"""Tests for A2UI data model delta updates.
+
+Tests cover:
+- JSON-Patch diffing of data models and applying the patches
+- per-session surface tracking: new surfaces, patches, unchanged updates
+- shallow-merge semantics of updateDataModel, zone wildcards, bounds
+- model versions, stored copies and fetching the whole model on a mismatch
+"""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+import main
+from services.surface_deltas import SurfaceModels, apply_patch, diff_data_model, model_version
+from tools.generate_widget import generate_operations
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _tracker(sets_completed: list[dict]) -> dict:
+    return {
+        "workoutId": "w1",
+        "title": "Fuerza A",
+        "exercises": [
+            {
+                "id": str(i),
+                "name": f"Ejercicio {i}",
+                "target": {"sets": 4, "reps": "6-8", "rpe": 8},
+                "setsCompleted": sets_completed if i == 0 else [],
+            }
+            for i in range(6)
+        ],
+    }
+
+
+def _update(surface_id: str, data_model: dict) -> dict:
+    return {"updateDataModel": {"surfaceId": surface_id, "dataModel": data_model}}
+
+
+class TestDiffDataModel:
+    """Tests for diff_data_model and apply_patch."""
+
+    def test_equal_models(self):
+        """Test that equal models produce no operations."""
+        assert diff_data_model(_tracker([]), _tracker([])) == []
+
+    def test_appended_set(self):
+        """Test that a logged set is one append to its list."""
+        patch = diff_data_model(_tracker([]), _tracker([{"weight": 100, "reps": 6}]))
+        assert patch == [
+            {"op": "add", "path": "/exercises/0/setsCompleted/-", "value": {"weight": 100, "reps": 6}}
+        ]
+
+    def test_add_replace_remove(self):
+        """Test that added, changed and removed keys become add, replace and remove."""
+        patch = diff_data_model({"a": 1, "b": True, "c": [1, 2]}, {"a": 2, "b": 1, "d/e": "x"})
+        assert {"op": "replace", "path": "/a", "value": 2} in patch
+        assert {"op": "replace", "path": "/b", "value": 1} in patch
+        assert {"op": "remove", "path": "/c"} in patch
+        assert {"op": "add", "path": "/d~1e", "value": "x"} in patch
+
+    def test_shrunk_list_is_replaced(self):
+        """Test that a list that lost items is replaced whole."""
+        assert diff_data_model({"items": [1, 2, 3]}, {"items": [1]}) == [
+            {"op": "replace", "path": "/items", "value": [1]}
+        ]
+
+    def test_patch_round_trip(self):
+        """Test that applying the patch reproduces the new model."""
+        old = {"title": "A", "items": [{"id": 1, "done": False}], "gone": 1}
+        new = {"title": "B", "items": [{"id": 1, "done": True}, {"id": 2, "done": False}], "new": {"x": 1}}
+        assert apply_patch(old, diff_data_model(old, new)) == new
+        assert old["title"] == "A"  # Not modified in place
+
+
+class TestSurfaceModels:
+    """Tests for per-session compaction of zone operations."""
+
+    def test_disabled_passes_through(self):
+        """Test that operations are untouched when deltas are disabled."""
+        operations = generate_operations("live-session-tracker", _tracker([]), zone="overlay")
+        assert SurfaceModels(enabled=False).compact("s1", operations) is operations
+
+    def test_new_surface_sent_whole(self):
+        """Test that a surface created in the same batch gets its full data model and its version."""
+        operations = generate_operations("live-session-tracker", _tracker([]), zone="overlay")
+        sent = SurfaceModels(enabled=True).compact("s1", operations)
+        assert sent[:2] == operations[:2]
+        assert sent[2]["updateDataModel"] == {**operations[2]["updateDataModel"], "version": model_version(_tracker([]))}
+
+    def test_update_becomes_patch(self):
+        """Test that updating a known surface sends only what changed."""
+        models = SurfaceModels(enabled=True)
+        operations = generate_operations("live-session-tracker", _tracker([]), zone="overlay")
+        surface_id = operations[0]["createSurface"]["surfaceId"]
+        models.compact("s1", operations)
+
+        [op] = models.compact("s1", [_update(surface_id, _tracker([{"weight": 100, "reps": 6}]))])
+        assert op == {
+            "patchDataModel": {
+                "surfaceId": surface_id,
+                "baseVersion": model_version(_tracker([])),
+                "version": model_version(_tracker([{"weight": 100, "reps": 6}])),
+                "patch": [
+                    {"op": "add", "path": "/exercises/0/setsCompleted/-", "value": {"weight": 100, "reps": 6}}
+                ],
+            }
+        }
+        assert models.stats()["patches"] == 1
+        assert models.stats()["bytes_saved"] > 0
+
+    def test_unchanged_update_dropped(self):
+        """Test that an update that changes nothing is not sent."""
+        models = SurfaceModels(enabled=True)
+        operations = generate_operations("workout-complete", {"title": "Done", "genesisNote": ""})
+        surface_id = operations[0]["createSurface"]["surfaceId"]
+        models.compact("s1", operations)
+
+        assert models.compact("s1", [_update(surface_id, {"title": "Done"})]) == []
+        assert models.stats()["unchanged"] == 1
+
+    def test_partial_update_keeps_other_keys(self):
+        """Test that keys missing from an update are kept, as the client's merge does."""
+        models = SurfaceModels(enabled=True)
+        props = {"title": "Entrenamiento completado", "totalSets": 12, "prs": ["Sentadilla 100 kg"], "genesisNote": ""}
+        operations = generate_operations("workout-complete", props)
+        surface_id = operations[0]["createSurface"]["surfaceId"]
+        models.compact("s1", operations)
+
+        update = {"title": props["title"], "prs": props["prs"], "genesisNote": "Gran trabajo"}
+        [op] = models.compact("s1", [_update(surface_id, update)])
+        assert op["patchDataModel"]["patch"] == [{"op": "replace", "path": "/genesisNote", "value": "Gran trabajo"}]
+
+    def test_patch_not_larger_than_update(self):
+        """Test that a small partial update is sent as is when its patch would be larger."""
+        models = SurfaceModels(enabled=True)
+        operations = generate_operations("workout-complete", {"title": "Done", "genesisNote": ""})
+        surface_id = operations[0]["createSurface"]["surfaceId"]
+        models.compact("s1", operations)
+
+        update = _update(surface_id, {"genesisNote": "Gran trabajo"})
+        [op] = models.compact("s1", [update])
+        assert op["updateDataModel"]["dataModel"] == {"genesisNote": "Gran trabajo"}
+        assert op["updateDataModel"]["version"] == model_version({"title": "Done", "genesisNote": "Gran trabajo"})
+
+    def test_unknown_surface_and_other_session(self):
+        """Test that surfaces are tracked per session and unknown ones get full updates."""
+        models = SurfaceModels(enabled=True)
+        operations = generate_operations("workout-complete", {"title": "Done", "genesisNote": ""})
+        surface_id = operations[0]["createSurface"]["surfaceId"]
+        models.compact("s1", operations)
+
+        update = _update(surface_id, {"title": "Done", "genesisNote": "x"})
+        assert "updateDataModel" in models.compact("s2", [update])[0]
+
+    def test_zone_wildcard_forgets_surfaces(self):
+        """Test that deleting a zone forgets its surfaces."""
+        models = SurfaceModels(enabled=True)
+        overlay = generate_operations("live-session-tracker", _tracker([]), zone="overlay")
+        surface_id = overlay[0]["createSurface"]["surfaceId"]
+        models.compact("s1", overlay)
+        models.compact("s1", [{"deleteSurface": {"surfaceId": "*overlay*"}}])
+
+        update = _update(surface_id, _tracker([{"weight": 100, "reps": 6}]))
+        assert "updateDataModel" in models.compact("s1", [update])[0]
+
+    def test_bounded_sessions(self):
+        """Test that the oldest session is dropped past max_sessions."""
+        models = SurfaceModels(enabled=True, max_sessions=2)
+        for session_id in ("s1", "s2", "s3"):
+            models.compact(session_id, generate_operations("quote-card", {"quote": "q"}))
+        assert models.stats()["sessions"] == 2
+
+    def test_stored_model_is_a_copy(self):
+        """Test that changing the sent dicts afterwards does not change the recorded model."""
+        models = SurfaceModels(enabled=True)
+        tracker = _tracker([])
+        operations = generate_operations("live-session-tracker", tracker, zone="overlay")
+        surface_id = operations[0]["createSurface"]["surfaceId"]
+        models.compact("s1", operations)
+
+        tracker["exercises"][0]["setsCompleted"].append({"weight": 100, "reps": 6})
+        [op] = models.compact("s1", [_update(surface_id, tracker)])
+        assert op["patchDataModel"]["patch"] == [
+            {"op": "add", "path": "/exercises/0/setsCompleted/-", "value": {"weight": 100, "reps": 6}}
+        ]
+        assert models.get("s1", surface_id)["dataModel"] == tracker
+
+
+class TestSurfaceResync:
+    """Tests for fetching a surface's whole data model."""
+
+    @pytest.mark.anyio
+    async def test_get_surface_model(self, monkeypatch):
+        """Test that the last recorded model and version are served, and unknown surfaces 404."""
+        models = SurfaceModels(enabled=True)
+        operations = generate_operations("workout-complete", {"title": "Done", "genesisNote": ""})
+        surface_id = operations[0]["createSurface"]["surfaceId"]
+        models.compact("s1", operations)
+        models.compact("s1", [_update(surface_id, {"title": "Done", "genesisNote": "Gran trabajo, " * 5})])
+        monkeypatch.setattr(main, "surface_models", models)
+
+        transport = ASGITransport(app=main.app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            found = await client.get(f"/api/chat/surfaces/{surface_id}", params={"session_id": "s1"})
+            other_session = await client.get(f"/api/chat/surfaces/{surface_id}", params={"session_id": "s2"})
+
+        model = {"title": "Done", "genesisNote": "Gran trabajo, " * 5}
+        assert found.json() == {"surfaceId": surface_id, "dataModel": model, "version": model_version(model)}
+        assert other_session.status_code == 404
+        assert models.stats()["resyncs"] == 1
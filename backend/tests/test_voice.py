@@ -2,21 +2,46 @@
 Tests for Voice Engine Module
 
 Tests cover:
-- audio_utils: PCM encoding/decoding, level calculation
+- audio_utils: PCM encoding/decoding, level calculation, resampling, mixing
+- resampler: streaming polyphase resampling
+- vad: server-side end-of-speech detection
+- protocol: binary audio frames and negotiation
+- levels: throttled audio level publishing
+- playout: paced, bounded outbound audio buffer
+- latency: per-turn traces and histograms
+- tts_pool: pre-warmed ElevenLabs sockets against a local fake TTS server
+- chunker: sentence-aware TTS text chunking and its latency timer
 - gemini_live: Client initialization, event types
+- live_sessions: Live pre-connect and resume against a fake Live server
 - session: State management, config
-- router: WebSocket endpoint, health check
+- capacity: session admission control
+- persistence: batched, debounced clipboard writes
+- router: WebSocket endpoint, health check, admission rejection
 """
 
+import asyncio
 import base64
+import json
+import random
+import time
 import struct
+import numpy as np
 import pytest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import websockets
+from fastapi import WebSocketDisconnect
+
 from voice.audio_utils import (
     encode_audio_base64,
     decode_audio_base64,
     calculate_audio_level,
+    resample_audio,
+    mix_audio_chunks,
+    pcm_to_samples,
     chunk_audio,
     validate_audio_format,
     create_silence,
@@ -24,10 +49,30 @@ from voice.audio_utils import (
     BYTES_PER_CHUNK,
     BYTES_PER_SAMPLE,
 )
+from voice.resampler import StreamingResampler
+from voice.vad import VadEvent, VoiceActivityDetector
+from voice.capacity import CapacityError, SessionRegistry
+from voice.chunker import TextChunker, chunk_text_stream
+from voice.elevenlabs_client import ElevenLabsClient, open_stream_input, send_keepalive
+from voice.levels import AudioLevelPublisher
+from voice.playout import AudioPlayout, PlayoutMetrics
+from voice.latency import LatencyHistogram, LatencyMetrics, TurnTrace
+from voice.live_sessions import LiveSessionManager
+from voice.persistence import ClipboardWriter
+from voice.tts_pool import TTSConnectionPool
+from voice.protocol import (
+    BINARY_SUBPROTOCOL,
+    FRAME_AUDIO,
+    FrameError,
+    decode_frame,
+    encode_frame,
+    negotiate_binary,
+)
 from voice.gemini_live import (
     GeminiLiveClient,
     GeminiEvent,
     GeminiEventType,
+    VOICE_BASE_PROMPT,
     VOICE_WIDGET_TOOL,
     build_voice_system_prompt,
 )
@@ -39,6 +84,11 @@ from voice.session import (
 )
 
 
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
 # =============================================================================
 # Audio Utils Tests
 # =============================================================================
@@ -110,6 +160,228 @@ class TestAudioLevel:
             assert 0.0 <= level <= 1.0
 
 
+def _random_pcm(num_samples: int, seed: int = 7) -> bytes:
+    rng = random.Random(seed)
+    return struct.pack(f"<{num_samples}h", *(rng.randint(-32768, 32767) for _ in range(num_samples)))
+
+
+class TestAudioProcessing:
+    """Tests for the vectorized resampling/mixing primitives."""
+
+    def test_level_matches_reference_rms(self):
+        """Test that the level equals the per-sample RMS formula."""
+        audio = _random_pcm(1600)
+        samples = struct.unpack("<1600h", audio)
+        rms = (sum(s * s for s in samples) / len(samples)) ** 0.5
+        assert calculate_audio_level(audio) == pytest.approx(min(1.0, rms / 32767.0 * 1.5))
+
+    def test_level_ignores_trailing_odd_byte(self):
+        """Test that an odd trailing byte does not change the level."""
+        audio = _random_pcm(100)
+        assert calculate_audio_level(audio + b"\x7f") == calculate_audio_level(audio)
+
+    def test_pcm_to_samples_is_zero_copy(self):
+        """Test that samples are a view over the original buffer."""
+        audio = bytearray(_random_pcm(10))
+        samples = pcm_to_samples(audio)
+        audio[0:2] = struct.pack("<h", 1234)
+        assert samples[0] == 1234
+
+    def test_resample_matches_linear_interpolation(self):
+        """Test resampling against the per-sample linear interpolation."""
+        audio = _random_pcm(2400)
+        samples = struct.unpack("<2400h", audio)
+        for from_rate, to_rate in ((24000, 16000), (16000, 24000), (16000, 8000)):
+            ratio = to_rate / from_rate
+            expected = []
+            for i in range(int(len(samples) * ratio)):
+                src_idx = i / ratio
+                low = int(src_idx)
+                high = min(low + 1, len(samples) - 1)
+                frac = src_idx - low
+                expected.append(int(samples[low] * (1 - frac) + samples[high] * frac))
+            result = struct.unpack(f"<{len(expected)}h", resample_audio(audio, from_rate, to_rate))
+            assert all(abs(a - b) <= 1 for a, b in zip(result, expected))
+
+    def test_resample_same_rate_and_empty(self):
+        """Test passthrough and empty input."""
+        audio = _random_pcm(10)
+        assert resample_audio(audio, 16000, 16000) is audio
+        assert resample_audio(b"", 24000, 16000) == b""
+
+    def test_mix_averages_with_floor_division(self):
+        """Test that mixing averages samples like integer floor division."""
+        a = struct.pack("<3h", 32767, -32768, -3)
+        b = struct.pack("<4h", 32767, -32768, 0, 99)
+        mixed = struct.unpack("<3h", mix_audio_chunks([a, b]))
+        assert mixed == (32767, -32768, -2)
+        assert mix_audio_chunks([a]) is a
+        assert mix_audio_chunks([]) == b""
+
+
+def _tone(frequency: float, sample_rate: int, seconds: float = 1.0, amplitude: int = 16000) -> bytes:
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype("<i2").tobytes()
+
+
+def _rms(audio: bytes) -> float:
+    samples = np.frombuffer(audio, dtype="<i2").astype(np.float64)
+    return float(np.sqrt(np.mean(samples ** 2)))
+
+
+class TestStreamingResampler:
+    """Tests for the streaming polyphase resampler."""
+
+    def test_chunked_output_matches_single_pass(self):
+        """Test that arbitrary chunk boundaries (even mid-sample) change nothing."""
+        audio = _tone(440, 24000)
+        whole = StreamingResampler(24000, 16000)
+        expected = whole.process(audio) + whole.flush()
+
+        streamed = StreamingResampler(24000, 16000)
+        rng = random.Random(3)
+        output, index = b"", 0
+        while index < len(audio):
+            size = rng.randint(1, 3000)
+            output += streamed.process(audio[index:index + size])
+            index += size
+        output += streamed.flush()
+        assert output == expected
+
+    def test_output_length_follows_ratio(self):
+        """Test that a full stream yields to_rate/from_rate samples (plus tail)."""
+        resampler = StreamingResampler(24000, 16000)
+        body = resampler.process(_tone(440, 24000))
+        assert abs(len(body) // 2 - 16000) <= resampler.taps_per_phase
+        assert len(body + resampler.flush()) // 2 == pytest.approx(16000, abs=2)
+
+    def test_passband_tone_preserved_and_aligned(self):
+        """Test that an in-band tone keeps its level and phase (delay compensated)."""
+        resampler = StreamingResampler(24000, 16000)
+        output = np.frombuffer(resampler.process(_tone(440, 24000)) + resampler.flush(), dtype="<i2")
+        ideal = 16000 * np.sin(2 * np.pi * 440 * np.arange(len(output)) / 16000)
+        assert np.abs(output - ideal)[100:-100].max() < 8
+
+    def test_out_of_band_tone_rejected(self):
+        """Test that content above the 8kHz output Nyquist does not alias."""
+        resampler = StreamingResampler(24000, 16000)
+        output = resampler.process(_tone(10000, 24000))
+        assert _rms(output[200:]) < 16000 * 0.001
+
+    def test_upsampling(self):
+        """Test 16kHz -> 24kHz keeps the tone level."""
+        resampler = StreamingResampler(16000, 24000)
+        output = resampler.process(_tone(1000, 16000))
+        assert len(output) // 2 == pytest.approx(24000, abs=resampler.taps_per_phase)
+        assert _rms(output[1000:-1000]) == pytest.approx(16000 / 2 ** 0.5, rel=0.02)
+
+    def test_reset_and_passthrough(self):
+        """Test reset clears state, flush is empty without input, same rate is passthrough."""
+        resampler = StreamingResampler(24000, 16000)
+        assert resampler.flush() == b""
+        first = resampler.process(_tone(440, 24000, seconds=0.1))
+        resampler.reset()
+        assert resampler.process(_tone(440, 24000, seconds=0.1)) == first
+
+        same = StreamingResampler(16000, 16000)
+        assert same.process(b"\x01\x02\x03") == b"\x01\x02"
+        assert same.process(b"\x04") == b"\x03\x04"
+
+
+def _voiced(seconds: float) -> bytes:
+    """Harmonic signal in the speech band (200 Hz fundamental)."""
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    wave = sum(np.sin(2 * np.pi * 200 * k * t) / k for k in range(2, 6))
+    return (4000 * wave).astype("<i2").tobytes()
+
+
+def _feed(vad: VoiceActivityDetector, audio: bytes, chunk_ms: int = 100) -> list[tuple[int, VadEvent]]:
+    """Feed audio in client-sized chunks, returning (chunk_index, event) pairs."""
+    size = SAMPLE_RATE * chunk_ms // 1000 * BYTES_PER_SAMPLE
+    events = []
+    for index, offset in enumerate(range(0, len(audio), size)):
+        event = vad.process(audio[offset:offset + size])
+        if event is not None:
+            events.append((index, event))
+    return events
+
+
+class TestVoiceActivityDetector:
+    """Tests for the server-side VAD."""
+
+    def test_speech_then_silence(self):
+        """Test start after speech and end after the hangover."""
+        vad = VoiceActivityDetector(hangover_ms=500)
+        audio = create_silence(300) + _voiced(1.0) + create_silence(1000)
+        events = _feed(vad, audio)
+        assert [event for _, event in events] == [VadEvent.SPEECH_START, VadEvent.SPEECH_END]
+        # Speech ends at chunk 13; the 500ms hangover closes it 5 chunks later
+        assert events[1][0] == 13 + 5 - 1
+
+    def test_hangover_bridges_short_pauses(self):
+        """Test that pauses shorter than the hangover do not end the turn."""
+        vad = VoiceActivityDetector(hangover_ms=500)
+        audio = _voiced(0.5) + create_silence(300) + _voiced(0.5)
+        assert [event for _, event in _feed(vad, audio)] == [VadEvent.SPEECH_START]
+        assert vad.in_speech
+
+    def test_low_frequency_noise_is_not_speech(self):
+        """Test that loud rumble outside the speech band is rejected."""
+        vad = VoiceActivityDetector()
+        t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+        rumble = (12000 * np.sin(2 * np.pi * 50 * t)).astype("<i2").tobytes()
+        assert _feed(vad, rumble) == []
+
+    def test_odd_chunk_sizes(self):
+        """Test that frames spanning chunk boundaries are handled."""
+        vad = VoiceActivityDetector(hangover_ms=300)
+        audio = _voiced(0.6) + create_silence(600)
+        events = [vad.process(audio[i:i + 1234]) for i in range(0, len(audio), 1234)]
+        assert [event for event in events if event] == [VadEvent.SPEECH_START, VadEvent.SPEECH_END]
+
+
+class TestAudioLevelPublisher:
+    """Tests for smoothed, rate-limited audio level publishing."""
+
+    def test_rate_limited(self):
+        """Test that at most max_hz levels are published per second."""
+        publisher = AudioLevelPublisher(max_hz=5, min_delta=0.0)
+        published = [
+            publisher.update(0.8 if i % 2 else 0.2, now=i * 0.02)
+            for i in range(50)  # 1 second of 20ms chunks
+        ]
+        assert 1 <= sum(level is not None for level in published) <= 5
+
+    def test_small_changes_skipped(self):
+        """Test that a steady level is published once."""
+        publisher = AudioLevelPublisher(max_hz=100, min_delta=0.05)
+        published = [publisher.update(0.5, now=i) for i in range(20)]
+        assert sum(level is not None for level in published) <= 3
+
+    def test_envelope_smoothing(self):
+        """Test fast attack and slower release."""
+        publisher = AudioLevelPublisher()
+        publisher.update(1.0, now=0.0)
+        after_attack = publisher.level
+        publisher.update(0.0, now=0.1)
+        assert after_attack >= 0.5
+        assert 0.0 < publisher.level < after_attack
+
+    def test_silence_settles_to_zero(self):
+        """Test that the envelope reaches and publishes zero after speech."""
+        publisher = AudioLevelPublisher(max_hz=10, min_delta=0.03)
+        publisher.update(0.9, now=0.0)
+        published = [publisher.update(0.0, now=0.1 * i) for i in range(1, 40)]
+        assert publisher.level == 0.0
+        assert [level for level in published if level is not None][-1] == 0.0
+
+    def test_disabled(self):
+        """Test max_hz=0 keeps the envelope but never publishes."""
+        publisher = AudioLevelPublisher(max_hz=0)
+        assert publisher.update(0.9, now=0.0) is None
+        assert publisher.level > 0.0
+
+
 class TestAudioChunking:
     """Tests for audio chunking functions."""
 
@@ -172,6 +444,41 @@ class TestSilenceGeneration:
         assert all(b == 0 for b in silence)
 
 
+class TestBinaryProtocol:
+    """Tests for binary audio frames and protocol negotiation."""
+
+    def test_frame_roundtrip(self):
+        """Test that header fields and payload survive encode/decode."""
+        pcm = _random_pcm(1600)
+        kind, sequence, payload = decode_frame(encode_frame(pcm, 70000))
+        assert kind == FRAME_AUDIO
+        assert sequence == 70000 & 0xFFFF
+        assert payload == pcm
+
+    def test_frame_overhead(self):
+        """Test that a frame is 4 bytes larger than the PCM (vs +33% base64)."""
+        pcm = _random_pcm(1600)
+        assert len(encode_frame(pcm, 0)) == len(pcm) + 4
+        assert len(encode_audio_base64(pcm)) > len(pcm) * 4 // 3
+
+    def test_short_frame_rejected(self):
+        """Test that frames shorter than the header raise FrameError."""
+        with pytest.raises(FrameError):
+            decode_frame(b"\x01\x00")
+
+    def test_negotiation(self):
+        """Test subprotocol and query parameter negotiation."""
+        def ws(subprotocols):
+            websocket = MagicMock()
+            websocket.scope = {"subprotocols": subprotocols}
+            return websocket
+
+        assert negotiate_binary(ws([BINARY_SUBPROTOCOL]), None) == (True, BINARY_SUBPROTOCOL)
+        assert negotiate_binary(ws([]), "binary") == (True, None)
+        assert negotiate_binary(ws([]), "json") == (False, None)
+        assert negotiate_binary(ws(["other"]), None) == (False, None)
+
+
 # =============================================================================
 # Gemini Live Client Tests
 # =============================================================================
@@ -269,6 +576,11 @@ class TestSystemPromptBuilder:
         # Should contain Spanish keywords
         assert "responde" in prompt.lower() or "usuario" in prompt.lower()
 
+    def test_base_prompt_lines_not_indented(self):
+        """Test that the static prompt carries no source indentation."""
+        assert build_voice_system_prompt() == VOICE_BASE_PROMPT
+        assert not any(line.startswith(" ") for line in VOICE_BASE_PROMPT.splitlines())
+
 
 class TestGeminiLiveClient:
     """Tests for GeminiLiveClient."""
@@ -288,6 +600,700 @@ class TestGeminiLiveClient:
         assert GeminiLiveClient.DEFAULT_VOICE == "Puck"
 
 
+# =============================================================================
+# Playout Tests
+# =============================================================================
+
+def _playout(**options) -> tuple[AudioPlayout, list[tuple[float, bytes]]]:
+    sent: list[tuple[float, bytes]] = []
+
+    async def send(frame: bytes) -> None:
+        sent.append((time.monotonic(), frame))
+
+    return AudioPlayout(send, metrics=PlayoutMetrics(), **options), sent
+
+
+class TestAudioPlayout:
+    """Tests for the paced outbound audio buffer."""
+
+    @pytest.mark.anyio
+    async def test_paced_at_real_time(self):
+        """Test that a burst is split into frames and sent no faster than real time plus lead."""
+        playout, sent = _playout(frame_ms=20, lead_ms=50)
+        start = time.monotonic()
+        await playout.put(b"\x01\x00" * 4800)  # 300 ms, arrives at once
+        await playout.drain()
+        elapsed = time.monotonic() - start
+
+        assert len(sent) == 15
+        assert all(len(frame) == 640 for _, frame in sent)
+        assert 0.2 <= elapsed < 0.35  # 300 ms of audio minus the 50 ms lead
+        await playout.close()
+
+    @pytest.mark.anyio
+    async def test_queue_is_bounded(self):
+        """Test that producers wait instead of growing the queue past max_buffer_ms."""
+        playout, _ = _playout(frame_ms=20, lead_ms=0, max_buffer_ms=100)
+        producer = asyncio.create_task(playout.put(b"\x01\x00" * 8000))  # 500 ms
+        await asyncio.sleep(0.05)
+
+        assert not producer.done()
+        assert playout.depth_ms <= 100
+        producer.cancel()
+        await playout.close()
+        assert playout.max_depth_ms <= 100
+
+    @pytest.mark.anyio
+    async def test_clear_drops_queued_audio(self):
+        """Test that clear() drops queued frames and nothing is sent afterwards."""
+        playout, sent = _playout(frame_ms=20, lead_ms=20)
+        await playout.put(b"\x01\x00" * 16000)  # 1 s
+        await asyncio.sleep(0.05)
+
+        await playout.clear()
+        sent_at_clear = len(sent)
+        await asyncio.sleep(0.05)
+
+        assert len(sent) == sent_at_clear
+        assert playout.depth_ms == 0
+        assert playout.dropped_ms > 800
+        assert playout.metrics.dropped_ms == playout.dropped_ms
+        await playout.close()
+
+    @pytest.mark.anyio
+    async def test_underruns(self):
+        """Test that a gap inside a response is an underrun and one between responses is not."""
+        playout, _ = _playout(frame_ms=20, lead_ms=0)
+        await playout.put(b"\x01\x00" * 320)  # 20 ms
+        await asyncio.sleep(0.05)  # TTS stalls mid-response
+        await playout.put(b"\x01\x00" * 320)
+        await playout.finish()
+        await playout.drain()
+        assert playout.underruns == 1
+
+        await asyncio.sleep(0.05)  # Silence between responses
+        await playout.put(b"\x01\x00" * 320)
+        await playout.drain()
+        assert playout.underruns == 1
+        await playout.close()
+
+
+# =============================================================================
+# Latency Tests
+# =============================================================================
+
+class TestTurnLatency:
+    """Tests for per-turn latency traces and histograms."""
+
+    def test_trace_durations(self):
+        """Test that stage durations come from the recorded milestones."""
+        trace = TurnTrace()
+        for milestone, at in [
+            ("first_user_audio", 10.0),
+            ("user_turn_end", 12.0),
+            ("first_text", 12.4),
+            ("first_tts_audio", 12.6),
+            ("first_audio_sent", 12.65),
+            ("last_audio_sent", 15.0),
+        ]:
+            trace.mark(milestone, now=at)
+        trace.mark("user_turn_end", now=13.0)  # First mark wins
+
+        durations = trace.durations()
+        assert durations["user_speech"] == pytest.approx(2000)
+        assert durations["llm_first_text"] == pytest.approx(400)
+        assert durations["tts_first_audio"] == pytest.approx(200)
+        assert durations["response"] == pytest.approx(650)
+        assert durations["total"] == pytest.approx(3000)
+        assert "widget" not in durations
+
+    def test_histogram_snapshot(self):
+        """Test bucket counts and percentiles."""
+        histogram = LatencyHistogram()
+        for value in (40, 150, 160, 900, 20000):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 5
+        assert snapshot["buckets"]["le_50"] == 1
+        assert snapshot["buckets"]["le_200"] == 2
+        assert snapshot["buckets"]["le_1000"] == 1
+        assert snapshot["buckets"]["inf"] == 1
+        assert snapshot["p50_ms"] == 160
+
+    def test_interrupted_and_empty_turns(self):
+        """Test that interrupted turns are counted but not timed, and empty traces ignored."""
+        metrics = LatencyMetrics()
+        trace = TurnTrace(user_turn_end=1.0, first_audio_sent=1.5, end_source="vad")
+
+        metrics.record(TurnTrace(), interrupted=True)
+        metrics.record(trace, interrupted=True)
+        metrics.record(trace)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["interrupted_turns"] == 1
+        assert snapshot["turns"] == 1
+        assert snapshot["end_sources"] == {"vad": 1}
+        assert snapshot["stages"]["response"]["count"] == 1
+
+
+# =============================================================================
+# Live Session Manager Tests
+# =============================================================================
+
+class FakeLiveSession:
+    """Server side of one fake Live session, as seen through the SDK session API."""
+
+    def __init__(self):
+        self.client_content: list[tuple[Any, bool]] = []
+        self.realtime: list[dict] = []
+        self.closed = False
+        self._outbox: asyncio.Queue = asyncio.Queue()
+
+    async def send_client_content(self, turns=None, turn_complete=True):
+        self.client_content.append((turns, turn_complete))
+
+    async def send_realtime_input(self, **kwargs):
+        self.realtime.append(kwargs)
+
+    def reply(self, text: str) -> None:
+        content = SimpleNamespace(interrupted=False, turn_complete=False)
+        self._outbox.put_nowait(SimpleNamespace(data=None, text=text, tool_call=None, server_content=content))
+        done = SimpleNamespace(interrupted=False, turn_complete=True)
+        self._outbox.put_nowait(SimpleNamespace(data=None, text=None, tool_call=None, server_content=done))
+
+    async def receive(self):
+        while True:
+            yield await self._outbox.get()
+
+
+class FakeLiveServer:
+    """Local stand-in for the Gemini Live service behind the SDK's connect()."""
+
+    def __init__(self, setup_delay: float = 0.0):
+        self.setup_delay = setup_delay
+        self.setups: list[dict] = []
+        self.sessions: list[FakeLiveSession] = []
+
+    def connect(self, model, config):
+        @asynccontextmanager
+        async def live_session():
+            await asyncio.sleep(self.setup_delay)  # WebSocket + setup handshake
+            session = FakeLiveSession()
+            self.setups.append({"model": model, **config})
+            self.sessions.append(session)
+            try:
+                yield session
+            finally:
+                session.closed = True
+
+        return live_session()
+
+    def client(self) -> GeminiLiveClient:
+        client = GeminiLiveClient(api_key="test-key")
+        client.client.aio.live.connect = self.connect
+        return client
+
+
+class TestLiveSessionManager:
+    """Tests for Gemini Live pre-connect and resume against a fake Live server."""
+
+    @pytest.fixture
+    def mock_websocket(self):
+        ws = AsyncMock()
+        ws.send_json = AsyncMock()
+        return ws
+
+    @pytest.mark.anyio
+    async def test_connect_overlaps_clipboard_load(self):
+        """Test that Live setup runs while the clipboard loads, with the base prompt."""
+        server = FakeLiveServer(setup_delay=0.2)
+        manager = LiveSessionManager(client_factory=server.client)
+
+        start = time.monotonic()
+        lease = manager.acquire("s1", "u1", "es")
+        await asyncio.sleep(0.2)  # Clipboard load
+        await lease.ready()
+
+        assert time.monotonic() - start < 0.35  # Not 0.4: the two overlap
+        assert lease.client.is_connected and not lease.resumed
+        assert server.setups[0]["response_modalities"] == ["TEXT"]
+        assert "CONTEXTO DEL USUARIO" not in server.setups[0]["system_instruction"]
+        await manager.close()
+        await lease.release()
+
+    @pytest.mark.anyio
+    async def test_user_context_sent_after_connect(self, mock_websocket):
+        """Test that the loaded user profile is sent as a context turn."""
+        server = FakeLiveServer()
+        manager = LiveSessionManager(client_factory=server.client)
+        lease = manager.acquire("s1", "u1")
+        session = VoiceSession(
+            websocket=mock_websocket,
+            config=VoiceSessionConfig(session_id="s1", user_id="u1"),
+            user_context={"name": "Ana"},
+            live=lease,
+        )
+
+        await session._connect_gemini()
+
+        [(turns, turn_complete)] = server.sessions[0].client_content
+        assert turn_complete is False
+        assert "- Nombre: Ana" in turns["parts"][0]["text"]
+        await session.cleanup()
+        assert server.sessions[0].closed
+
+    @pytest.mark.anyio
+    async def test_dropped_client_resumes_same_live_session(self, mock_websocket):
+        """Test that an abnormal drop parks the connection and a reconnect resumes it."""
+        server = FakeLiveServer()
+        manager = LiveSessionManager(client_factory=server.client, grace_seconds=5)
+        config = VoiceSessionConfig(session_id="s1", user_id="u1")
+
+        first = VoiceSession(websocket=mock_websocket, config=config, live=manager.acquire("s1", "u1"))
+        await first._connect_gemini()
+        first._client_close_code = 1006
+        first._gemini_turn_active = True  # Dropped mid-response
+        await first.cleanup()
+        assert not server.sessions[0].closed
+        assert manager.stats()["parked_now"] == 1
+
+        # Another user cannot pick it up
+        other = manager.acquire("s1", "intruder")
+        assert not other.resumed
+        await other.release()
+
+        lease = manager.acquire("s1", "u1")
+        assert lease.resumed
+        second = VoiceSession(websocket=mock_websocket, config=config, user_context={"name": "Ana"}, live=lease)
+        await second._connect_gemini()
+
+        assert second.gemini_client is first.gemini_client
+        assert second._discard_gemini_turn  # Tail of the cut-off response is dropped
+        assert server.sessions[0].client_content == []  # Context not sent twice
+        assert manager.stats()["resumed"] == 1
+
+        # The resumed session still talks to the same Live session
+        server.sessions[0].reply("Sigo aquí.")
+        events = second.gemini_client.receive()
+        assert (await events.__anext__()).type == GeminiEventType.TRANSCRIPT
+        await events.aclose()
+        await manager.close()
+        await lease.release()
+
+    @pytest.mark.anyio
+    async def test_normal_close_and_grace_expiry(self, mock_websocket):
+        """Test that a normal close disconnects and parked connections expire."""
+        server = FakeLiveServer()
+        manager = LiveSessionManager(client_factory=server.client, grace_seconds=0.02)
+        config = VoiceSessionConfig(session_id="s1", user_id="u1")
+
+        session = VoiceSession(websocket=mock_websocket, config=config, live=manager.acquire("s1", "u1"))
+        await session._connect_gemini()
+        session._client_close_code = 1000
+        await session.cleanup()
+        assert server.sessions[0].closed
+
+        lease = manager.acquire("s1", "u1")
+        await lease.ready()
+        lease.park()
+        await asyncio.sleep(0.05)
+        assert server.sessions[1].closed
+        assert manager.stats()["expired"] == 1
+
+        fresh = manager.acquire("s1", "u1")
+        await fresh.ready()
+        assert not fresh.resumed
+        assert len(server.sessions) == 3
+        await fresh.release()
+
+
+# =============================================================================
+# TTS Pool Tests
+# =============================================================================
+
+class FakeTTSServer:
+    """Local stand-in for the ElevenLabs stream-input websocket."""
+
+    def __init__(self):
+        self.connections = 0
+        self.bos: list[dict] = []
+        self.keepalives = 0
+        self.open_sockets: list = []
+        self.port = 0
+
+    async def handler(self, ws):
+        self.connections += 1
+        self.open_sockets.append(ws)
+        self.bos.append(json.loads(await ws.recv()))
+        async for raw in ws:
+            text = json.loads(raw).get("text")
+            if text == " ":
+                self.keepalives += 1
+            elif text == "":
+                await ws.send(json.dumps({"isFinal": True}))
+                return
+            else:
+                pcm = b"\x01\x00" * len(text)
+                await ws.send(json.dumps({"audio": base64.b64encode(pcm).decode()}))
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self.port}/v1/text-to-speech/{{voice_id}}/stream-input?model_id={{model_id}}"
+
+
+@asynccontextmanager
+async def fake_tts(**pool_options):
+    server = FakeTTSServer()
+    async with websockets.serve(server.handler, "127.0.0.1", 0) as ws_server:
+        server.port = ws_server.sockets[0].getsockname()[1]
+        pool = TTSConnectionPool(open_stream_input, send_keepalive, **pool_options)
+        client = ElevenLabsClient(api_key="test-key", pool=pool)
+        client.WS_URL = server.url
+        try:
+            yield server, pool, client
+        finally:
+            await pool.close()
+
+
+async def _text(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _until(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+class TestTTSConnectionPool:
+    """Tests for the pre-warmed ElevenLabs connection pool."""
+
+    @pytest.mark.anyio
+    async def test_prewarmed_socket_is_used(self):
+        """Test that a turn uses a socket opened and authenticated beforehand."""
+        async with fake_tts(size=1) as (server, pool, client):
+            client.prewarm()
+            await _until(lambda: pool.stats()["idle"] == 1)
+            assert server.bos[0]["xi_api_key"] == "test-key"
+
+            audio = [chunk async for chunk in client.stream_audio(_text("Hola", " mundo"))]
+
+            assert b"".join(audio) == b"\x01\x00" * len("Hola mundo")
+            assert pool.stats()["hits"] == 1
+            assert pool.stats()["misses"] == 0
+            # The used socket is replaced in the background
+            await _until(lambda: pool.stats()["idle"] == 1)
+            assert server.connections == 2
+
+    @pytest.mark.anyio
+    async def test_cold_pool_opens_directly(self):
+        """Test that a miss still streams on a freshly opened socket."""
+        async with fake_tts(size=0) as (server, pool, client):
+            audio = [chunk async for chunk in client.stream_audio(_text("Hola"))]
+            assert len(b"".join(audio)) == 8
+            assert pool.stats()["misses"] == 1
+            assert pool.stats()["idle"] == 0
+
+    @pytest.mark.anyio
+    async def test_dead_socket_replaced(self):
+        """Test that an idle socket closed by the server is not handed out."""
+        async with fake_tts(size=1) as (server, pool, client):
+            client.prewarm()
+            await _until(lambda: pool.stats()["idle"] == 1)
+            await server.open_sockets[0].close()
+            await asyncio.sleep(0.05)
+
+            audio = [chunk async for chunk in client.stream_audio(_text("Hola"))]
+            assert len(b"".join(audio)) == 8
+            assert pool.stats()["replaced"] == 1
+
+    @pytest.mark.anyio
+    async def test_keepalive(self):
+        """Test that idle sockets receive keep-alive messages."""
+        async with fake_tts(size=1, keepalive_seconds=0.02) as (server, pool, client):
+            client.prewarm()
+            await _until(lambda: server.keepalives >= 2)
+            assert pool.stats()["idle"] == 1
+
+
+# =============================================================================
+# TTS Chunker Tests
+# =============================================================================
+
+class TestTextChunker:
+    """Tests for sentence-aware TTS text chunking."""
+
+    def test_sentence_boundaries(self):
+        """Test that sentences are cut once the next fragment confirms the end."""
+        chunker = TextChunker.for_language("es")
+        assert chunker.push("Hola", now=0.0) == []
+        assert chunker.push("! ¿Cómo", now=0.0) == ["Hola! "]
+        assert chunker.push(" estás? Bien", now=0.0) == ["¿Cómo estás? "]
+        assert chunker.flush() == "Bien "
+
+    def test_abbreviations_and_numbers_do_not_cut(self):
+        """Test that 'Sr.' and decimals are not sentence ends."""
+        chunker = TextChunker.for_language("es")
+        assert chunker.push("El Sr. Pérez mide 1.75 metros. Y", now=0.0) == [
+            "El Sr. Pérez mide 1.75 metros. "
+        ]
+
+        english = TextChunker.for_language("en-US")
+        assert english.push("Dr. Smith said hi. Then", now=0.0) == ["Dr. Smith said hi. "]
+
+    def test_first_phrase_cuts_earlier(self):
+        """Test that the first clause of a turn is released at a lower threshold."""
+        chunker = TextChunker.for_language("es")
+        text = "Vamos a entrenar piernas, con foco en fuerza, y terminamos con movilidad"
+        first = chunker.push(text, now=0.0)
+        assert first == ["Vamos a entrenar piernas, "]
+        # Later clauses need min_chars before a cut
+        assert chunker.push(", y estiramientos", now=0.0) == []
+
+    def test_long_run_is_cut_at_a_space(self):
+        """Test that text without boundaries is cut at a word before max_chars."""
+        chunker = TextChunker.for_language("en")
+        chunks = chunker.push("word " * 60, now=0.0)
+        assert chunks
+        assert all(len(chunk) <= chunker.profile.max_chars + 1 for chunk in chunks)
+        assert all(chunk.endswith("word ") for chunk in chunks)
+
+    def test_expire_releases_complete_words(self):
+        """Test the max-latency timer releases text up to the last complete word."""
+        chunker = TextChunker.for_language("es", max_latency_ms=300)
+        chunker.push("Tu plan de hoy incluye sen", now=10.0)
+        assert chunker.time_until_deadline(now=10.1) == pytest.approx(0.2)
+
+        assert chunker.expire(now=10.3) == "Tu plan de hoy incluye "
+        assert chunker.push("tadillas.", now=10.35) == []
+        assert chunker.flush() == "sentadillas. "
+        assert chunker.time_until_deadline() is None
+
+    @pytest.mark.anyio
+    async def test_stream_honours_max_latency(self):
+        """Test that a pause in the text stream releases buffered words."""
+        queue: asyncio.Queue[str | None] = asyncio.Queue()
+        chunker = TextChunker.for_language("es", max_latency_ms=30)
+        received: list[tuple[str, float]] = []
+
+        async def consume():
+            async for chunk in chunk_text_stream(queue.get, chunker):
+                received.append((chunk, time.monotonic()))
+
+        consumer = asyncio.create_task(consume())
+        start = time.monotonic()
+        await queue.put("Empezamos con una serie ")
+        await asyncio.sleep(0.1)
+        await queue.put("corta. Luego")
+        await queue.put(None)
+        await consumer
+
+        assert [chunk for chunk, _ in received] == ["Empezamos con una serie ", "corta. ", "Luego "]
+        assert received[0][1] - start < 0.09
+
+
+# =============================================================================
+# Capacity Tests
+# =============================================================================
+
+class TestSessionRegistry:
+    """Tests for voice session admission control."""
+
+    @pytest.mark.anyio
+    async def test_admits_up_to_capacity(self):
+        """Test that sessions are admitted until max_sessions and counted."""
+        registry = SessionRegistry(max_sessions=2, max_per_user=5, wait_seconds=0)
+        first = await registry.admit("s1", "u1")
+        await registry.admit("s2", "u2")
+
+        with pytest.raises(CapacityError) as error:
+            await registry.admit("s3", "u3")
+        assert error.value.reason == "queue_full"
+        assert error.value.retry_after > 0
+
+        registry.release(first)
+        registry.release(first)  # Idempotent
+        await registry.admit("s3", "u3")
+        stats = registry.stats()
+        assert stats["active"] == 2
+        assert stats["users"] == 2
+        assert stats["rejected_capacity"] == 1
+
+    @pytest.mark.anyio
+    async def test_per_user_limit(self):
+        """Test that one user cannot hold more than max_per_user sessions."""
+        registry = SessionRegistry(max_sessions=10, max_per_user=1)
+        slot = await registry.admit("s1", "u1")
+
+        with pytest.raises(CapacityError) as error:
+            await registry.admit("s2", "u1")
+        assert error.value.reason == "user_limit"
+
+        await registry.admit("s3", "u2")  # Other users are unaffected
+        registry.release(slot)
+        await registry.admit("s2", "u1")
+
+    @pytest.mark.anyio
+    async def test_unauthenticated_sessions_skip_user_limit(self):
+        """Test that sessions without an authenticated user are only bound by the process limit."""
+        registry = SessionRegistry(max_sessions=3, max_per_user=1, wait_seconds=0)
+        slots = [await registry.admit(f"s{i}", None) for i in range(3)]
+
+        with pytest.raises(CapacityError) as error:
+            await registry.admit("s4", None)
+        assert error.value.reason == "queue_full"
+        assert registry.stats()["users"] == 0
+        for slot in slots:
+            registry.release(slot)
+        assert registry.stats()["active"] == 0
+
+    @pytest.mark.anyio
+    async def test_waiters_get_freed_slots_in_order(self):
+        """Test that queued sessions are admitted as slots free up, in FIFO order."""
+        registry = SessionRegistry(max_sessions=1, max_per_user=5, wait_seconds=1)
+        slot = await registry.admit("s1", "u1")
+        positions: list[int] = []
+
+        async def on_wait(position):
+            positions.append(position)
+
+        first = asyncio.create_task(registry.admit("s2", "u2", on_wait=on_wait))
+        second = asyncio.create_task(registry.admit("s3", "u3", on_wait=on_wait))
+        await asyncio.sleep(0.01)
+        assert positions == [1, 2]
+        assert registry.stats()["waiting"] == 2
+
+        registry.release(slot)
+        assert (await first).session_id == "s2"
+        assert not second.done()
+
+        registry.release(await first)
+        assert (await second).session_id == "s3"
+        assert registry.stats()["active"] == 1
+
+    @pytest.mark.anyio
+    async def test_handed_off_slot_cannot_be_taken(self):
+        """Test that a newcomer does not take a slot already handed to a waiter."""
+        registry = SessionRegistry(max_sessions=1, max_per_user=5, wait_seconds=0.05)
+        slot = await registry.admit("s1", "u1")
+        waiter = asyncio.create_task(registry.admit("s2", "u2"))
+        await asyncio.sleep(0.01)
+
+        registry.release(slot)  # Handed to the waiter, which has not run yet
+        newcomer = asyncio.create_task(registry.admit("s3", "u3"))
+        assert (await waiter).session_id == "s2"
+        with pytest.raises(CapacityError):
+            await newcomer
+        assert registry.stats()["active"] == 1
+
+    @pytest.mark.anyio
+    async def test_wait_times_out(self):
+        """Test that a queued session is rejected with a retry hint after wait_seconds."""
+        registry = SessionRegistry(max_sessions=1, wait_seconds=0.02, retry_after_seconds=7)
+        await registry.admit("s1", "u1")
+
+        with pytest.raises(CapacityError) as error:
+            await registry.admit("s2", "u2")
+        assert error.value.reason == "capacity"
+        assert error.value.retry_after == 7
+        assert registry.stats()["waiting"] == 0
+
+
+# =============================================================================
+# Persistence Tests
+# =============================================================================
+
+def _clipboard():
+    from schemas.clipboard import SessionClipboard
+
+    return SessionClipboard(session_id="test-session", user_id="test-user")
+
+
+class TestClipboardWriter:
+    """Tests for batched clipboard persistence."""
+
+    @pytest.mark.anyio
+    async def test_quick_turns_are_written_once(self):
+        """Test that turns in quick succession are written in one batch after the debounce."""
+        save = AsyncMock()
+        writer = ClipboardWriter(_clipboard(), save=save, debounce_seconds=0.05)
+
+        for i in range(3):
+            writer.record_turn(f"pregunta {i}", f"respuesta {i}")
+            await asyncio.sleep(0.01)
+        assert len(writer.clipboard.session_context) == 6
+        save.assert_not_awaited()
+
+        await asyncio.sleep(0.1)
+        save.assert_awaited_once_with(writer.clipboard)
+        assert writer.pending_turns == 0
+
+    @pytest.mark.anyio
+    async def test_max_pending_turns_forces_write(self):
+        """Test that reaching max_pending_turns writes without waiting for the debounce."""
+        save = AsyncMock()
+        writer = ClipboardWriter(_clipboard(), save=save, debounce_seconds=10, max_pending_turns=2)
+
+        writer.record_turn("uno", "one")
+        writer.record_turn("dos", "two")
+        await asyncio.sleep(0.01)
+        save.assert_awaited_once()
+
+    @pytest.mark.anyio
+    async def test_max_delay_caps_continuous_conversation(self):
+        """Test that a conversation that never pauses is still written after max_delay_seconds."""
+        save = AsyncMock()
+        writer = ClipboardWriter(
+            _clipboard(), save=save, debounce_seconds=0.05, max_delay_seconds=0.1, max_pending_turns=100
+        )
+
+        for _ in range(8):
+            writer.record_turn("hola", "hola")
+            await asyncio.sleep(0.03)  # Always inside the debounce window
+        assert save.await_count >= 1
+
+    @pytest.mark.anyio
+    async def test_close_flushes_pending_turns(self):
+        """Test that close() writes unsaved turns immediately."""
+        save = AsyncMock()
+        writer = ClipboardWriter(_clipboard(), save=save, debounce_seconds=10)
+
+        writer.record_turn("adiós", "")
+        await writer.close()
+        save.assert_awaited_once()
+        await writer.close()  # Nothing left to write
+        save.assert_awaited_once()
+
+    @pytest.mark.anyio
+    async def test_failed_write_is_retried(self):
+        """Test that turns stay pending after a failed write and go out with the next one."""
+        save = AsyncMock(side_effect=[ConnectionError("redis down"), None])
+        writer = ClipboardWriter(_clipboard(), save=save, debounce_seconds=10)
+
+        writer.record_turn("uno", "one")
+        await writer.flush()
+        assert writer.pending_turns == 1
+
+        writer.record_turn("dos", "two")
+        await writer.flush()
+        assert save.await_count == 2
+        assert writer.pending_turns == 0
+
+    @pytest.mark.anyio
+    async def test_empty_turn_is_ignored(self):
+        """Test that a turn with no text schedules nothing."""
+        save = AsyncMock()
+        writer = ClipboardWriter(_clipboard(), save=save, debounce_seconds=0)
+
+        writer.record_turn("", "")
+        await asyncio.sleep(0.01)
+        assert writer.pending_turns == 0
+        save.assert_not_awaited()
+
+
 # =============================================================================
 # Voice Session Tests
 # =============================================================================
@@ -384,6 +1390,370 @@ class TestVoiceSession:
         )
         assert session.user_context == context
 
+    def test_vad_off_by_default(self, mock_websocket, session_config):
+        """Test that server VAD only runs when enabled."""
+        assert VoiceSession(websocket=mock_websocket, config=session_config).vad is None
+
+    @pytest.mark.anyio
+    async def test_vad_ends_turn_before_client(self, mock_websocket, session_config):
+        """Test that server VAD closes the turn once and the late client end_turn is ignored."""
+        session_config.vad_enabled = True
+        session = VoiceSession(websocket=mock_websocket, config=session_config)
+        session._running = True
+        session.gemini_client = MagicMock()
+        session.gemini_client.send_audio = AsyncMock()
+        session.gemini_client.end_audio_stream = AsyncMock()
+
+        audio = _voiced(0.5) + create_silence(1500)
+        messages = [
+            {"type": "audio_chunk", "data": encode_audio_base64(chunk)}
+            for chunk in chunk_audio(audio)
+        ]
+        messages.append({"type": "end_turn"})
+
+        async def receive_json():
+            if messages:
+                return messages.pop(0)
+            session._running = False
+            return {"type": "noop"}
+
+        mock_websocket.receive_json = receive_json
+        await session._receive_from_client()
+
+        session.gemini_client.end_audio_stream.assert_awaited_once()
+        states = [
+            call.args[0]["value"]
+            for call in mock_websocket.send_json.call_args_list
+            if call.args[0]["type"] == "state"
+        ]
+        assert states.count("processing") == 1
+
+    @pytest.mark.anyio
+    async def test_client_ends_quiet_turn_after_vad_turn(self, mock_websocket, session_config):
+        """Test that after a VAD-ended turn, end_turn still closes a next turn too quiet for VAD."""
+        session_config.vad_enabled = True
+        session = VoiceSession(websocket=mock_websocket, config=session_config)
+        session._running = True
+        session.gemini_client = MagicMock()
+        session.gemini_client.send_audio = AsyncMock()
+        session.gemini_client.end_audio_stream = AsyncMock()
+
+        for chunk in chunk_audio(_voiced(0.5) + create_silence(1500)):
+            await session._handle_client_message({"type": "audio_chunk", "data": encode_audio_base64(chunk)})
+        assert session.gemini_client.end_audio_stream.await_count == 1
+        await session._send_state(VoiceState.IDLE)  # Reply spoken
+
+        for chunk in chunk_audio(create_silence(500)):
+            await session._handle_client_message({"type": "audio_chunk", "data": encode_audio_base64(chunk)})
+        await session._handle_client_message({"type": "end_turn"})
+        assert session.gemini_client.end_audio_stream.await_count == 2
+
+    @pytest.mark.anyio
+    async def test_binary_protocol_session(self, mock_websocket):
+        """Test binary audio in both directions with JSON control messages."""
+        config = VoiceSessionConfig(session_id="test-session", binary_audio=True, vad_enabled=False)
+        session = VoiceSession(websocket=mock_websocket, config=config)
+        session._running = True
+        session.gemini_client = MagicMock()
+        session.gemini_client.send_audio = AsyncMock()
+        session.gemini_client.end_audio_stream = AsyncMock()
+
+        pcm = _random_pcm(1600)
+        frames = [
+            {"type": "websocket.receive", "bytes": encode_frame(pcm, 0)},
+            {"type": "websocket.receive", "bytes": b"\x01"},  # invalid, dropped
+            {"type": "websocket.receive", "text": '{"type": "end_turn"}'},
+            {"type": "websocket.disconnect", "code": 1000},
+        ]
+        mock_websocket.receive = AsyncMock(side_effect=frames)
+        await session._receive_from_client()  # Normal close ends the loop quietly
+
+        session.gemini_client.send_audio.assert_awaited_once_with(pcm)
+        session.gemini_client.end_audio_stream.assert_awaited_once()
+
+        session._ws_open = True
+        await session._send_audio(pcm)
+        await session._send_audio(pcm)
+        await session.playout.drain()
+        sent = [call.args[0] for call in mock_websocket.send_bytes.call_args_list]
+        assert [decode_frame(frame)[1] for frame in sent] == list(range(len(sent)))
+        assert b"".join(decode_frame(frame)[2] for frame in sent) == pcm + pcm
+        assert all(call.args[0]["type"] != "audio_chunk" for call in mock_websocket.send_json.call_args_list)
+
+
+    @pytest.mark.anyio
+    async def test_audio_levels_throttled_and_on_state(self, mock_websocket):
+        """Test that chunks do not each produce a level message and state carries the level."""
+        config = VoiceSessionConfig(session_id="test-session", vad_enabled=False, level_max_hz=5)
+        session = VoiceSession(websocket=mock_websocket, config=config)
+        session.gemini_client = MagicMock()
+        session.gemini_client.send_audio = AsyncMock()
+
+        chunks = chunk_audio(_voiced(1.0), chunk_size=BYTES_PER_CHUNK // 5)  # 20ms chunks
+        for chunk in chunks:
+            await session._handle_client_audio(chunk)
+
+        messages = [call.args[0] for call in mock_websocket.send_json.call_args_list]
+        levels = [m for m in messages if m["type"] == "audio_level"]
+        assert len(chunks) == 50
+        assert 1 <= len(levels) <= 6
+        listening = next(m for m in messages if m["type"] == "state")
+        assert listening["value"] == "listening"
+        assert "level" in listening
+
+
+    @pytest.mark.anyio
+    async def test_barge_in_stops_audio_and_closes_tts(self, mock_websocket, session_config):
+        """Test time from cancel to last audio byte and that the TTS stream is closed."""
+        session = VoiceSession(websocket=mock_websocket, config=session_config)
+        session._running = True
+        session._persist_voice_conversation = AsyncMock()
+
+        audio_sent_at: list[float] = []
+        tts_closed = asyncio.Event()
+
+        async def send_json(data):
+            if data["type"] == "audio_chunk":
+                audio_sent_at.append(time.monotonic())
+
+        async def endless_tts(text_iterator, voice_id=None):
+            try:
+                while True:
+                    await asyncio.sleep(0.005)
+                    yield b"\x01\x00" * 160
+            finally:
+                tts_closed.set()  # Where the ElevenLabs websocket is closed
+
+        mock_websocket.send_json = send_json
+        session.elevenlabs_client.stream_audio = endless_tts
+
+        pipeline = asyncio.create_task(session._process_tts_pipeline())
+        await session.tts_text_queue.put("Hola, este es un mensaje largo.")
+        while len(audio_sent_at) < 5:
+            await asyncio.sleep(0.005)
+
+        cancel_at = time.monotonic()
+        await session._handle_client_message({"type": "cancel"})
+        cancel_done_at = time.monotonic()
+        sent_before = len(audio_sent_at)
+        await asyncio.sleep(0.1)
+
+        assert tts_closed.is_set()
+        assert len(audio_sent_at) == sent_before  # Nothing after the cancel returned
+        assert audio_sent_at[-1] - cancel_at < 0.05
+        assert cancel_done_at - cancel_at < 0.05
+        assert session.current_state == VoiceState.IDLE
+
+        session._running = False
+        pipeline.cancel()
+        await asyncio.gather(pipeline, return_exceptions=True)
+
+    @pytest.mark.anyio
+    async def test_tts_receives_phrase_chunks(self, mock_websocket, session_config):
+        """Test that Gemini fragments reach TTS as phrases and TTFA is recorded."""
+        session = VoiceSession(websocket=mock_websocket, config=session_config)
+        session._running = True
+        session._persist_voice_conversation = AsyncMock()
+        sent_text: list[str] = []
+
+        async def fake_tts(text_iterator, voice_id=None):
+            async for text in text_iterator:
+                sent_text.append(text)
+                yield b"\x01\x00" * 160
+
+        session.elevenlabs_client.stream_audio = fake_tts
+        for fragment in ("Ho", "la. Hoy ", "toca ", "pierna.", None):
+            await session.tts_text_queue.put(fragment)
+
+        pipeline = asyncio.create_task(session._process_tts_pipeline())
+        while session.last_time_to_first_audio_ms is None or session.state.is_speaking:
+            await asyncio.sleep(0.005)
+        session._running = False
+        pipeline.cancel()
+        await asyncio.gather(pipeline, return_exceptions=True)
+
+        assert sent_text == ["Hola. ", "Hoy toca pierna. "]
+        assert session.last_time_to_first_audio_ms >= 0
+
+    @pytest.mark.anyio
+    async def test_turn_latency_is_recorded(self, mock_websocket, session_config):
+        """Test that a full turn lands in the latency histograms."""
+        session = VoiceSession(websocket=mock_websocket, config=session_config)
+        session._running = True
+        session._persist_voice_conversation = AsyncMock()
+        session.gemini_client._connected = True
+        session.gemini_client.session = MagicMock()
+        session.gemini_client.send_audio = AsyncMock()
+        session.gemini_client.end_audio_stream = AsyncMock()
+
+        async def events():
+            yield GeminiEvent(type=GeminiEventType.TRANSCRIPT, text="Listo. ")
+            yield GeminiEvent(type=GeminiEventType.TURN_COMPLETE)
+
+        async def fake_tts(text_iterator, voice_id=None):
+            async for _ in text_iterator:
+                yield b"\x01\x00" * 160
+
+        session.gemini_client.receive = events
+        session.elevenlabs_client.stream_audio = fake_tts
+        metrics = LatencyMetrics()
+
+        with patch("voice.session.latency_metrics", metrics):
+            await session._handle_client_message(
+                {"type": "audio_chunk", "data": encode_audio_base64(_random_pcm(320))}
+            )
+            await session._handle_client_message({"type": "end_turn"})
+            pipeline = asyncio.create_task(session._process_tts_pipeline())
+            await session._receive_from_gemini()
+            while metrics.turns == 0:
+                await asyncio.sleep(0.005)
+            session._running = False
+            pipeline.cancel()
+            await asyncio.gather(pipeline, return_exceptions=True)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["end_sources"] == {"client": 1}
+        for stage in ("user_speech", "llm_first_text", "tts_first_audio", "response", "playback", "total"):
+            assert snapshot["stages"][stage]["count"] == 1
+        assert session.trace == TurnTrace()
+
+    @pytest.mark.anyio
+    async def test_unfinished_turn_trace_not_carried_over(self, mock_websocket, session_config):
+        """Test that an unanswered turn, or late text of a cancelled one, does not leak into the next trace."""
+        session = VoiceSession(websocket=mock_websocket, config=session_config)
+        session._running = True
+        session.gemini_client = MagicMock()
+        session.gemini_client.send_audio = AsyncMock()
+        session.gemini_client.end_audio_stream = AsyncMock()
+        audio = {"type": "audio_chunk", "data": encode_audio_base64(_random_pcm(320))}
+        metrics = LatencyMetrics()
+
+        with patch("voice.session.latency_metrics", metrics):
+            # Turn ended, but Gemini was interrupted before replying
+            await session._handle_client_message(audio)
+            await session._handle_client_message({"type": "end_turn"})
+            await session._send_state(VoiceState.IDLE)
+            await session._handle_client_message(audio)
+            assert metrics.interrupted_turns == 1
+            assert session.trace.user_turn_end is None
+
+            # Cancelled while waiting; the reply's text arrives after the cancel
+            await session._handle_client_message({"type": "end_turn"})
+            await session._handle_client_message({"type": "cancel"})
+            session.trace.mark("first_text")
+            await session._handle_client_message(audio)
+            assert session.trace.first_text is None
+            assert session.trace.first_user_audio is not None
+
+    @pytest.mark.anyio
+    async def test_turn_without_text_is_recorded(self, mock_websocket, session_config):
+        """Test that a turn Gemini ends without text still closes its trace."""
+        session = VoiceSession(websocket=mock_websocket, config=session_config)
+        session._running = True
+        session.trace.mark("first_user_audio")
+        session.trace.mark("user_turn_end")
+        metrics = LatencyMetrics()
+
+        with patch("voice.session.latency_metrics", metrics):
+            pipeline = asyncio.create_task(session._process_tts_pipeline())
+            await session.tts_text_queue.put(None)
+            while metrics.turns == 0:
+                await asyncio.sleep(0.005)
+            session._running = False
+            pipeline.cancel()
+            await asyncio.gather(pipeline, return_exceptions=True)
+
+        assert session.trace == TurnTrace()
+
+    @pytest.mark.anyio
+    async def test_interrupted_gemini_response_is_discarded(self, mock_websocket, session_config):
+        """Test that text Gemini still sends for an interrupted turn is not spoken."""
+        session = VoiceSession(websocket=mock_websocket, config=session_config)
+        session._running = True
+        session.gemini_client._connected = True
+        session.gemini_client.session = MagicMock()
+        interrupted = asyncio.Event()
+
+        async def events():
+            yield GeminiEvent(type=GeminiEventType.TRANSCRIPT, text="Primera parte. ")
+            await interrupted.wait()
+            yield GeminiEvent(type=GeminiEventType.TRANSCRIPT, text="Resto descartado.")
+            yield GeminiEvent(type=GeminiEventType.TURN_COMPLETE)
+            yield GeminiEvent(type=GeminiEventType.TRANSCRIPT, text="Nueva respuesta.")
+
+        session.gemini_client.receive = events
+        receiver = asyncio.create_task(session._receive_from_gemini())
+        while session.tts_text_queue.empty():
+            await asyncio.sleep(0.001)
+        await session._handle_interruption()
+        interrupted.set()
+        await receiver
+
+        queued = []
+        while not session.tts_text_queue.empty():
+            queued.append(session.tts_text_queue.get_nowait())
+        assert queued == ["Nueva respuesta."]
+
+    @pytest.mark.anyio
+    async def test_text_during_slow_tts_close_is_discarded(self, mock_websocket, session_config):
+        """Test that Gemini text arriving while the interrupted TTS stream closes is not spoken."""
+        session = VoiceSession(websocket=mock_websocket, config=session_config)
+        session._running = True
+        session._persist_voice_conversation = AsyncMock()
+        session.gemini_client._connected = True
+        session.gemini_client.session = MagicMock()
+        spoken: list[str] = []
+        closing = asyncio.Event()
+
+        async def slow_close_tts(text_iterator, voice_id=None):
+            try:
+                async for text in text_iterator:
+                    spoken.append(text)
+                    yield b"\x01\x00" * 160
+            finally:
+                closing.set()
+                await asyncio.sleep(0.05)  # ElevenLabs socket taking its time to close
+
+        async def events():
+            yield GeminiEvent(type=GeminiEventType.TRANSCRIPT, text="Primera parte. ")
+            await closing.wait()
+            yield GeminiEvent(type=GeminiEventType.TRANSCRIPT, text="Resto descartado. ")
+            yield GeminiEvent(type=GeminiEventType.TURN_COMPLETE)
+            yield GeminiEvent(type=GeminiEventType.TRANSCRIPT, text="Nueva respuesta. ")
+            yield GeminiEvent(type=GeminiEventType.TURN_COMPLETE)
+
+        session.elevenlabs_client.stream_audio = slow_close_tts
+        session.gemini_client.receive = events
+        pipeline = asyncio.create_task(session._process_tts_pipeline())
+        receiver = asyncio.create_task(session._receive_from_gemini())
+        while not spoken:
+            await asyncio.sleep(0.001)
+        await session._handle_interruption()
+        await receiver
+        while "Nueva respuesta. " not in spoken:
+            await asyncio.sleep(0.005)
+        session._running = False
+        pipeline.cancel()
+        await asyncio.gather(pipeline, return_exceptions=True)
+
+        assert spoken == ["Primera parte. ", "Nueva respuesta. "]
+
+    @pytest.mark.anyio
+    async def test_turns_are_persisted_in_batches(self, mock_websocket, session_config):
+        """Test that finished turns are not written one by one and are flushed on cleanup."""
+        session = VoiceSession(websocket=mock_websocket, config=session_config, clipboard=_clipboard())
+        session.persistence.save = AsyncMock()
+
+        for text in ("uno", "dos"):
+            session._current_turn_user_text = text
+            session._current_turn_assistant_text = f"respuesta {text}"
+            await session._persist_voice_conversation()
+        assert len(session.clipboard.session_context) == 4
+        session.persistence.save.assert_not_awaited()
+
+        await session.cleanup()
+        session.persistence.save.assert_awaited_once_with(session.clipboard)
+
 
 # =============================================================================
 # Router Tests (Integration)
@@ -408,6 +1778,37 @@ class TestVoiceRouter:
         assert data["service"] == "voice"
         assert "features" in data
 
+    def test_health_reports_metrics(self, test_client):
+        """Test that health exposes session counts and voice metrics."""
+        data = test_client.get("/voice/health").json()
+        assert data["sessions"]["active"] == 0
+        for section in ("tts_pool", "playout", "latency", "live_sessions"):
+            assert section in data
+
+    def test_rejects_over_capacity(self, test_client):
+        """Test that a connection over capacity gets a retry hint and a 1013 close."""
+        registry = SessionRegistry(max_sessions=0, wait_seconds=0, retry_after_seconds=3)
+        with patch("voice.router.voice_sessions", registry):
+            with test_client.websocket_connect("/ws/voice?user_id=u1") as ws:
+                message = ws.receive_json()
+                with pytest.raises(WebSocketDisconnect) as closed:
+                    ws.receive_json()
+
+        assert message["type"] == "error"
+        assert message["code"] == "queue_full"
+        assert message["retry_after"] == 3
+        assert closed.value.code == 1013
+
+    def test_query_user_id_is_not_limited_per_user(self, test_client):
+        """Test that only a user ID from a verified token is used for the per-user limit."""
+        registry = SessionRegistry()
+        registry.admit = AsyncMock(side_effect=CapacityError("capacity", "full", 1))
+        with patch("voice.router.voice_sessions", registry):
+            with test_client.websocket_connect("/ws/voice?user_id=default") as ws:
+                ws.receive_json()
+
+        assert registry.admit.call_args.args[1] is None
+
     def test_health_features(self, test_client):
         """Test voice health features info."""
         response = test_client.get("/voice/health")
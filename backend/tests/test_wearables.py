@@ -0,0 +1,695 @@
+"""
+Tests for Wearables Module
+
+Tests cover:
+- queue: webhook spool, idempotency, retries and recovery
+- models: slotted metrics and batch/columnar export
+- cache/store: provider user id resolution caching
+- archive: compressed content-addressed raw payload segments
+- streaming: incremental JSON/NDJSON ingest with bounded memory
+- router: webhook fast-ack
+"""
+
+import asyncio
+import json
+import tracemalloc
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from wearables import store
+from wearables.archive import BlobStore, LocalBlobStore, RawArchive, decode_segment, encode_segment
+from wearables.cache import provider_user_cache
+from wearables.garmin import normalize_garmin_daily
+from wearables.models import RECORD_FIELDS, WearableMetrics, WearableTokens, to_columns, to_records
+from wearables.queue import PermanentJobError, WebhookQueue, payload_hash
+from wearables.streaming import StreamingParseError, iter_json_records, iter_ndjson
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+GARMIN_PAYLOAD = {
+    "userId": "garmin-user-1",
+    "dailies": [
+        {"startTimeInSeconds": 1767225600, "steps": 9000, "restingHeartRateInBeatsPerMinute": 52},
+    ],
+}
+
+
+# =============================================================================
+# Webhook Queue Tests
+# =============================================================================
+
+class TestWebhookQueue:
+    """Tests for the on-disk webhook spool."""
+
+    def test_payload_hash_is_order_independent(self):
+        """Test that key order does not change the job id."""
+        a = payload_hash("garmin", {"a": 1, "b": [1, 2]})
+        b = payload_hash("garmin", {"b": [1, 2], "a": 1})
+        assert a == b
+        assert a != payload_hash("oura", {"a": 1, "b": [1, 2]})
+
+    @pytest.mark.anyio
+    async def test_duplicate_payload_processed_once(self, tmp_path):
+        """Test that retried deliveries are accepted but handled once."""
+        queue = WebhookQueue(spool_dir=tmp_path)
+        handled = []
+
+        async def handler(job):
+            handled.append(job.job_id)
+
+        job_id, accepted = await queue.enqueue("garmin", GARMIN_PAYLOAD)
+        assert accepted is True
+        _, accepted_again = await queue.enqueue("garmin", GARMIN_PAYLOAD)
+        assert accepted_again is False
+
+        assert await queue.drain(handler) == 1
+        assert handled == [job_id]
+
+        # Still a duplicate after processing (done marker)
+        _, accepted_after = await queue.enqueue("garmin", GARMIN_PAYLOAD)
+        assert accepted_after is False
+        assert queue.stats()["pending"] == 0
+
+    @pytest.mark.anyio
+    async def test_failed_job_is_retried_then_parked(self, tmp_path):
+        """Test that failing jobs back off and end up in failed/."""
+        queue = WebhookQueue(spool_dir=tmp_path, max_attempts=2)
+
+        async def handler(job):
+            raise RuntimeError("boom")
+
+        await queue.enqueue("oura", {"data": []}, user_id="u1")
+        assert await queue.drain(handler) == 1
+        # First failure is delayed by backoff, so nothing is claimable yet
+        assert queue.stats()["pending"] == 1
+        assert await queue.drain(handler) == 0
+
+        # Expire the backoff and fail again -> parked
+        for path in queue.pending_dir.glob("*.json"):
+            path.touch()
+        assert await queue.drain(handler) == 1
+        assert queue.stats()["failed"] == 1
+        assert queue.stats()["pending"] == 0
+
+    @pytest.mark.anyio
+    async def test_permanent_failure_is_parked_immediately(self, tmp_path):
+        """Test that jobs retrying cannot fix go to failed/ without retries and are counted."""
+        queue = WebhookQueue(spool_dir=tmp_path, max_attempts=5)
+
+        async def handler(job):
+            raise PermanentJobError("unknown garmin provider user x")
+
+        await queue.enqueue("garmin", GARMIN_PAYLOAD)
+        assert await queue.drain(handler) == 1
+        assert queue.stats()["failed"] == 1
+        assert queue.stats()["pending"] == 0
+        assert queue.stats()["rejected"] == 1
+
+    @pytest.mark.anyio
+    async def test_workers_drain_and_recover(self, tmp_path):
+        """Test that interrupted jobs are recovered and drained by workers."""
+        queue = WebhookQueue(spool_dir=tmp_path, workers=2, poll_interval=0.05)
+        await queue.enqueue("whoop", {"records": [], "user_id": "w1"})
+        # Simulate a crash mid-processing
+        claimed = queue._claim_next()
+        assert claimed is not None and claimed.parent == queue.processing_dir
+
+        done = asyncio.Event()
+
+        async def handler(job):
+            done.set()
+
+        await queue.start(handler)
+        try:
+            await asyncio.wait_for(done.wait(), timeout=2)
+        finally:
+            await queue.stop()
+        assert queue.stats()["processing"] == 0
+
+
+# =============================================================================
+# Provider User Cache Tests
+# =============================================================================
+
+class TestWearableMetricsExport:
+    """Tests for the slotted metrics model and its batch exports."""
+
+    def _metrics(self, day: int) -> WearableMetrics:
+        return WearableMetrics(
+            user_id="u1",
+            provider="garmin",
+            data_date=date(2024, 1, 1 + day % 28),
+            hrv_rmssd=50.0 + day,
+            steps=1000 * day,
+            synced_at=datetime(2024, 2, 1, tzinfo=timezone.utc) if day % 2 else None,
+        )
+
+    def test_metrics_are_slotted(self):
+        """Test that instances carry no per-instance __dict__."""
+        metrics = self._metrics(1)
+        assert not hasattr(metrics, "__dict__")
+        metrics.readiness_score = 80.0
+        assert metrics.to_record()["readiness_score"] == 80.0
+
+    def test_to_records_matches_to_record(self):
+        """Test that the batch export is identical to per-row to_record."""
+        batch = [self._metrics(i) for i in range(40)]
+        records = to_records(batch)
+        assert records == [metrics.to_record() for metrics in batch]
+        assert list(records[0]) == list(RECORD_FIELDS)
+        assert records[1]["data_date"] == "2024-01-02"
+        assert records[1]["synced_at"] == "2024-02-01T00:00:00+00:00"
+        assert records[0]["synced_at"] is None
+
+    def test_to_columns(self):
+        """Test columnar export against the row export."""
+        batch = [self._metrics(i) for i in range(10)]
+        columns = to_columns(batch)
+        assert list(columns) == list(RECORD_FIELDS)
+        records = to_records(batch)
+        for name, values in columns.items():
+            assert values == [record[name] for record in records]
+        assert to_columns([]) == {name: [] for name in RECORD_FIELDS}
+
+
+class TestProviderUserCache:
+    """Tests for cached provider user id resolution."""
+
+    @pytest.fixture
+    def fake_supabase(self, monkeypatch):
+        """Patch the store with a counting Supabase mock."""
+        mock = MagicMock()
+        query = mock.table.return_value.select.return_value.eq.return_value.eq.return_value
+        query.maybe_single.return_value.execute.return_value = MagicMock(data={"user_id": "ngx-1"})
+        mock.table.return_value.upsert.return_value.execute.return_value = MagicMock(data=[{"id": "c1"}])
+        monkeypatch.setattr(store, "SUPABASE_ENABLED", True)
+        monkeypatch.setattr(store, "SUPABASE", mock)
+        provider_user_cache.clear()
+        yield mock
+        provider_user_cache.clear()
+
+    @pytest.mark.anyio
+    async def test_burst_issues_single_query(self, fake_supabase):
+        """Test that repeated lookups hit the database once."""
+        for _ in range(20):
+            assert await store.resolve_user_id("garmin", "g-1") == "ngx-1"
+        selects = fake_supabase.table.return_value.select.call_count
+        assert selects == 1
+        assert provider_user_cache.stats()["hits"] == 19
+
+    @pytest.mark.anyio
+    async def test_negative_result_cached_and_invalidated(self, fake_supabase):
+        """Test that unknown users are cached until the connection is created."""
+        query = fake_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value
+        query.maybe_single.return_value.execute.return_value = MagicMock(data=None)
+
+        assert await store.resolve_user_id("oura", "o-1") is None
+        assert await store.resolve_user_id("oura", "o-1") is None
+        assert fake_supabase.table.return_value.select.call_count == 1
+
+        query.maybe_single.return_value.execute.return_value = MagicMock(data={"user_id": "ngx-2"})
+        await store.upsert_connection("ngx-2", "oura", WearableTokens(access_token="t", provider_user_id="o-1"))
+
+        assert await store.resolve_user_id("oura", "o-1") == "ngx-2"
+        # Lookup, previous connection read, lookup after invalidation
+        assert fake_supabase.table.return_value.select.call_count == 3
+
+    @pytest.mark.anyio
+    async def test_previous_provider_user_invalidated(self, fake_supabase):
+        """Test that reconnecting with another provider account drops the old id from the cache."""
+        query = fake_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value
+        assert await store.resolve_user_id("garmin", "g-1") == "ngx-1"
+
+        query.maybe_single.return_value.execute.return_value = MagicMock(data={"provider_user_id": "g-1"})
+        await store.upsert_connection("ngx-1", "garmin", WearableTokens(access_token="t", provider_user_id="g-2"))
+
+        query.maybe_single.return_value.execute.return_value = MagicMock(data=None)
+        assert await store.resolve_user_id("garmin", "g-1") is None
+
+    @pytest.mark.anyio
+    async def test_lookup_errors_not_cached(self, fake_supabase):
+        """Test that transient database errors are not cached."""
+        query = fake_supabase.table.return_value.select.return_value.eq.return_value.eq.return_value
+        query.maybe_single.return_value.execute.side_effect = RuntimeError("db down")
+
+        assert await store.resolve_user_id("whoop", "w-1") is None
+        assert provider_user_cache.stats()["entries"] == 0
+
+
+# =============================================================================
+# Raw Archive Tests
+# =============================================================================
+
+class TestRawArchive:
+    """Tests for the raw payload archive."""
+
+    def test_segment_roundtrip_collection(self):
+        """Test that collection payloads become one line per record."""
+        payload = {"userId": "g-1", "dailies": [{"steps": i} for i in range(5)]}
+        data, records = encode_segment(payload)
+        assert records == 5
+        assert decode_segment(data) == payload
+
+    def test_segment_roundtrip_plain(self):
+        """Test that non-collection payloads are stored as a single line."""
+        payload = {"HKQuantityTypeIdentifierStepCount": 1200, "date": "2026-01-01"}
+        data, records = encode_segment(payload)
+        assert records == 1
+        assert decode_segment(data) == payload
+
+    def test_archive_deduplicates_by_content(self, tmp_path):
+        """Test that identical payloads are written once and compressed."""
+        archive = RawArchive(LocalBlobStore(tmp_path))
+        payload = {"dailies": [{"steps": 9000, "calendarDate": "2026-01-01"}] * 200}
+
+        first = archive.put("garmin", payload)
+        second = archive.put("garmin", dict(reversed(list(payload.items()))))
+
+        assert first.created is True
+        assert second.created is False
+        assert first.key == second.key
+        assert first.size_bytes < len(str(payload))
+        assert archive.get(first.key) == payload
+        assert len(list(tmp_path.rglob("*.ndjson.gz"))) == 1
+
+    def test_concurrent_puts_of_one_key(self, tmp_path):
+        """Test that concurrent writers of the same blob all succeed and leave no temp files."""
+        from concurrent.futures import ThreadPoolExecutor
+        from threading import Barrier
+
+        blobs = LocalBlobStore(tmp_path)
+        writers = 16
+        barrier = Barrier(writers)
+
+        def put(i):
+            barrier.wait()
+            blobs.put("garmin/ab/abc.ndjson.gz", b"x" * 100_000)
+
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            list(pool.map(put, range(writers)))
+
+        assert blobs.get("garmin/ab/abc.ndjson.gz") == b"x" * 100_000
+        assert [path.name for path in tmp_path.rglob("*") if path.is_file()] == ["abc.ndjson.gz"]
+
+    @pytest.mark.anyio
+    async def test_save_raw_payload_stores_pointer(self, tmp_path, monkeypatch):
+        """Test that the DB row holds a pointer instead of the payload and is deduplicated per user."""
+        mock = MagicMock()
+        upsert = mock.table.return_value.upsert
+        upsert.return_value.execute.return_value = MagicMock(data=[{"id": "r1"}])
+        monkeypatch.setattr(store, "SUPABASE_ENABLED", True)
+        monkeypatch.setattr(store, "SUPABASE", mock)
+        monkeypatch.setattr(store, "raw_archive", RawArchive(LocalBlobStore(tmp_path)))
+
+        await store.save_raw_payload("u1", "garmin", "webhook", GARMIN_PAYLOAD)
+
+        row = upsert.call_args.args[0]
+        assert upsert.call_args.kwargs == {"on_conflict": "user_id,content_hash", "ignore_duplicates": True}
+        assert row["payload"] is None
+        assert row["archive_uri"].startswith("file://")
+        assert len(row["content_hash"]) == 64
+        assert row["record_count"] == 1
+
+    @pytest.mark.anyio
+    async def test_save_raw_payload_retries_after_failed_insert(self, tmp_path, monkeypatch):
+        """Test that an already archived payload still gets its row when the first insert failed."""
+        mock = MagicMock()
+        upsert = mock.table.return_value.upsert
+        upsert.return_value.execute.side_effect = [RuntimeError("db down"), MagicMock(data=[{"id": "r1"}])]
+        monkeypatch.setattr(store, "SUPABASE_ENABLED", True)
+        monkeypatch.setattr(store, "SUPABASE", mock)
+        monkeypatch.setattr(store, "raw_archive", RawArchive(LocalBlobStore(tmp_path)))
+
+        assert await store.save_raw_payload("u1", "garmin", "webhook", GARMIN_PAYLOAD) is None
+        assert await store.save_raw_payload("u1", "garmin", "webhook", GARMIN_PAYLOAD) == {"id": "r1"}
+        assert upsert.call_args_list[0].args[0]["archive_uri"] == upsert.call_args_list[1].args[0]["archive_uri"]
+        assert len(list(tmp_path.rglob("*.ndjson.gz"))) == 1
+
+    @pytest.mark.anyio
+    async def test_save_raw_payload_inline_without_archive(self, monkeypatch):
+        """Test that the payload stays inline (with its hash) when no archive is configured."""
+        mock = MagicMock()
+        monkeypatch.setattr(store, "SUPABASE_ENABLED", True)
+        monkeypatch.setattr(store, "SUPABASE", mock)
+        monkeypatch.setattr(store, "raw_archive", None)
+
+        await store.save_raw_payload("u1", "garmin", "webhook", GARMIN_PAYLOAD)
+
+        row = mock.table.return_value.upsert.call_args.args[0]
+        assert row["payload"] == GARMIN_PAYLOAD
+        assert "archive_uri" not in row
+        assert len(row["content_hash"]) == 64
+
+    def test_blob_store_is_abstract(self):
+        """Test that a blob store must implement the whole interface."""
+        class PartialStore(BlobStore):
+            def exists(self, key):
+                return False
+
+        with pytest.raises(TypeError):
+            PartialStore()
+
+
+# =============================================================================
+# Streaming Ingest Tests
+# =============================================================================
+
+async def _chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+def _garmin_day(i: int) -> dict:
+    return {
+        "summaryId": f"x{i}",
+        "startTimeInSeconds": 1700000000 + i * 86400,
+        "steps": 5000 + i,
+        "restingHeartRateInBeatsPerMinute": 55,
+        "averageStressLevel": 30,
+        "bodyBatteryMostRecentValue": 70,
+        "sleepingSeconds": 27000,
+        "activeKilocalories": 450,
+        "totalKilocalories": 2400,
+        "note": "ñ" * 200,
+    }
+
+
+class TestStreamingParsers:
+    """Tests for incremental JSON/NDJSON readers."""
+
+    @pytest.mark.anyio
+    async def test_ndjson_across_chunk_boundaries(self):
+        """Test NDJSON parsing with tiny chunks and multibyte characters."""
+        days = [_garmin_day(i) for i in range(5)]
+        body = "\n".join(json.dumps(d, ensure_ascii=False) for d in days).encode("utf-8")
+        assert await _collect(iter_ndjson(_chunked(body, 7))) == days
+
+    @pytest.mark.anyio
+    async def test_json_envelope_across_chunk_boundaries(self):
+        """Test enveloped JSON parsing with tiny chunks."""
+        days = [_garmin_day(i) for i in range(5)]
+        body = json.dumps({"userId": 12345, "dailies": days, "count": 5}).encode("utf-8")
+        envelope: dict = {}
+        records = await _collect(iter_json_records(_chunked(body, 5), envelope=envelope))
+        assert records == days
+        assert envelope == {"userId": 12345, "count": 5}
+
+    @pytest.mark.anyio
+    async def test_json_array_body(self):
+        """Test top-level JSON array bodies."""
+        body = json.dumps([{"a": 1}, {"a": 2}]).encode()
+        assert await _collect(iter_json_records(_chunked(body, 3))) == [{"a": 1}, {"a": 2}]
+
+    @pytest.mark.anyio
+    async def test_truncated_body_raises(self):
+        """Test that truncated bodies raise a parse error."""
+        body = b'{"dailies": [{"steps": 1}, {"steps"'
+        with pytest.raises(StreamingParseError):
+            await _collect(iter_json_records(_chunked(body, 4)))
+
+    @pytest.mark.anyio
+    async def test_oversized_record_rejected(self):
+        """Test that a single record above the limit is rejected."""
+        body = json.dumps([{"blob": "x" * 5000}]).encode()
+        with pytest.raises(StreamingParseError):
+            await _collect(iter_json_records(_chunked(body, 512), max_record_bytes=1024))
+
+
+class TestStreamingIngest:
+    """Tests for batched streaming ingest."""
+
+    @pytest.fixture
+    def stored(self, monkeypatch):
+        """Stub persistence and record batch sizes."""
+        from wearables import router
+
+        batches = {"raw": 0, "metrics": []}
+
+        async def fake_save_raw(user_id, provider, endpoint, payload, data_date=None):
+            batches["raw"] += 1
+
+        async def fake_save_batch(metrics_list):
+            batches["metrics"].append(len(metrics_list))
+            return len(metrics_list)
+
+        monkeypatch.setattr(router, "save_raw_payload", fake_save_raw)
+        monkeypatch.setattr(router, "save_wearable_data_batch", fake_save_batch)
+        return batches
+
+    @pytest.mark.anyio
+    async def test_large_export_bounded_memory(self, stored):
+        """Test that a multi-MB export is ingested with a small memory peak."""
+        from wearables.router import ingest_records
+
+        total_days = 20000
+        body_size = 0
+
+        async def synthetic_export():
+            # Generated lazily so the body never exists in memory at once
+            nonlocal body_size
+            yield b'{"userId": "g-1", "dailies": ['
+            for i in range(total_days):
+                piece = (("," if i else "") + json.dumps(_garmin_day(i), ensure_ascii=False)).encode("utf-8")
+                body_size += len(piece)
+                yield piece
+            yield b"]}"
+
+        tracemalloc.start()
+        try:
+            result = await ingest_records(
+                "garmin", "u1", iter_json_records(synthetic_export()), normalize_garmin_daily, batch_size=200
+            )
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert result == {"records": total_days, "rejected": 0, "errors": []}
+        assert body_size > 8 * 1024 * 1024
+        assert peak < 4 * 1024 * 1024
+        assert stored["metrics"] == [200] * (total_days // 200)
+        assert stored["raw"] == total_days // 200
+
+    @pytest.mark.anyio
+    async def test_stream_endpoint_ndjson(self, stored):
+        """Test the streaming endpoint with an NDJSON Apple export."""
+        from main import app
+
+        days = [
+            {"date": f"2026-01-{d:02d}", "HKQuantityTypeIdentifierStepCount": 1000 * d}
+            for d in range(1, 11)
+        ]
+        body = "\n".join(json.dumps(d) for d in days)
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/wearables/apple/ingest/stream?user_id=u1",
+                content=body,
+                headers={"content-type": "application/x-ndjson"},
+            )
+
+        assert response.status_code == 200
+        assert response.json()["records"] == 10
+        assert stored["metrics"] == [10]
+
+    @pytest.mark.anyio
+    async def test_stream_endpoint_reports_bad_records(self, stored):
+        """Test that records failing normalization are reported and the rest are stored."""
+        from main import app
+
+        days = [_garmin_day(0), {"startTimeInSeconds": "yesterday"}, _garmin_day(1), {"sleepingSeconds": "8h"}]
+        body = "\n".join(json.dumps(d) for d in days)
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/wearables/garmin/ingest/stream?user_id=u1",
+                content=body,
+                headers={"content-type": "application/x-ndjson"},
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["records"] == 2
+        assert data["rejected"] == 2
+        assert [error["record"] for error in data["errors"]] == [2, 4]
+        assert stored["metrics"] == [2]
+
+    @pytest.mark.anyio
+    async def test_failed_batch_not_counted(self, monkeypatch):
+        """Test that records are counted from what the store saved."""
+        from wearables import router
+
+        async def fake_save_raw(user_id, provider, endpoint, payload, data_date=None):
+            return None
+
+        async def failing_save_batch(metrics_list):
+            return 0
+
+        monkeypatch.setattr(router, "save_raw_payload", fake_save_raw)
+        monkeypatch.setattr(router, "save_wearable_data_batch", failing_save_batch)
+
+        async def days():
+            for i in range(3):
+                yield _garmin_day(i)
+
+        result = await router.ingest_records("garmin", "u1", days(), normalize_garmin_daily)
+        assert result["records"] == 0
+
+    @pytest.mark.anyio
+    async def test_stream_endpoint_rejects_malformed(self, stored):
+        """Test that malformed bodies return 400."""
+        from main import app
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post(
+                "/api/wearables/garmin/ingest/stream?user_id=u1",
+                content=b'{"dailies": [{"steps": 1},',
+                headers={"content-type": "application/json"},
+            )
+
+        assert response.status_code == 400
+
+
+# =============================================================================
+# Router Tests
+# =============================================================================
+
+class TestWebhookEndpoint:
+    """Tests for the fast-ack webhook endpoint."""
+
+    @pytest.mark.anyio
+    async def test_webhook_returns_immediately(self, tmp_path, monkeypatch):
+        """Test that webhook spools the payload and acknowledges."""
+        from main import app
+        from wearables import router
+
+        queue = WebhookQueue(spool_dir=tmp_path)
+        monkeypatch.setattr(router, "webhook_queue", queue)
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/wearables/garmin/webhook", json=GARMIN_PAYLOAD)
+            duplicate = await client.post("/api/wearables/garmin/webhook", json=GARMIN_PAYLOAD)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "accepted"
+        assert data["duplicate"] is False
+        assert duplicate.json()["duplicate"] is True
+        assert queue.stats()["pending"] == 1
+
+    @pytest.mark.anyio
+    async def test_webhook_uses_cloud_tasks_when_configured(self, tmp_path, monkeypatch):
+        """Test that webhooks become named Cloud Tasks, falling back to the spool on errors."""
+        from main import app
+        from wearables import router
+
+        queue = WebhookQueue(spool_dir=tmp_path)
+        tasks = []
+
+        def fake_enqueue(url, payload=None, task_id=None):
+            if task_id in {task[2] for task in tasks}:
+                return None
+            tasks.append((url, payload, task_id))
+            return {"name": task_id}
+
+        monkeypatch.setattr(router, "webhook_queue", queue)
+        monkeypatch.setattr(router, "is_tasks_configured", lambda: True)
+        monkeypatch.setattr(router, "enqueue_http_task", fake_enqueue)
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            first = (await client.post("/api/wearables/garmin/webhook", json=GARMIN_PAYLOAD)).json()
+            duplicate = (await client.post("/api/wearables/garmin/webhook", json=GARMIN_PAYLOAD)).json()
+
+            monkeypatch.setattr(router, "enqueue_http_task", MagicMock(side_effect=RuntimeError("quota")))
+            spooled = (await client.post("/api/wearables/oura/webhook?user_id=u1", json={"data": []})).json()
+
+        assert first["duplicate"] is False
+        assert duplicate["duplicate"] is True
+        url, body, task_id = tasks[0]
+        assert url == "http://test/api/wearables/garmin/webhook/process"
+        assert body == {"job_id": first["job_id"], "payload": GARMIN_PAYLOAD, "user_id": None}
+        assert task_id == first["job_id"]
+        assert spooled["duplicate"] is False
+        assert queue.stats()["pending"] == 1
+
+    def test_enqueue_http_task_request(self, monkeypatch):
+        """Test the Cloud Tasks request: JSON-serializable, base64 body, 409 as duplicate."""
+        import base64
+
+        from wearables import tasks
+
+        monkeypatch.setattr(tasks, "CLOUD_TASKS_PROJECT", "p")
+        monkeypatch.setattr(tasks, "CLOUD_TASKS_LOCATION", "l")
+        monkeypatch.setattr(tasks, "CLOUD_TASKS_QUEUE", "q")
+        monkeypatch.setattr(tasks.google.auth, "default", MagicMock(return_value=(MagicMock(), "p")))
+        session = MagicMock()
+        session.post.return_value = MagicMock(status_code=200, json=MagicMock(return_value={"name": "t"}))
+        monkeypatch.setattr(tasks, "AuthorizedSession", MagicMock(return_value=session))
+
+        payload = {"job_id": "j1", "payload": GARMIN_PAYLOAD, "user_id": None}
+        assert tasks.enqueue_http_task("https://api/process", payload, "j1") == {"name": "t"}
+
+        request = session.post.call_args.kwargs["json"]
+        task = json.loads(json.dumps(request))["task"]
+        assert task["name"] == "projects/p/locations/l/queues/q/tasks/j1"
+        assert json.loads(base64.b64decode(task["httpRequest"]["body"])) == payload
+
+        session.post.return_value = MagicMock(status_code=409)
+        assert tasks.enqueue_http_task("https://api/process", payload, "j1") is None
+
+    @pytest.mark.anyio
+    async def test_webhook_task_processing(self, tmp_path, monkeypatch):
+        """Test that the Cloud Tasks handler processes the job and rejects unknown users without a retry."""
+        from main import app
+        from wearables import router
+
+        monkeypatch.setattr(router, "webhook_queue", WebhookQueue(spool_dir=tmp_path))
+        monkeypatch.setattr(router, "resolve_user_id", AsyncMock(return_value=None))
+        monkeypatch.setattr(router, "save_raw_payload", AsyncMock())
+        monkeypatch.setattr(router, "save_wearable_data", AsyncMock())
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            known = await client.post(
+                "/api/wearables/garmin/webhook/process",
+                json={"job_id": "j1", "payload": GARMIN_PAYLOAD, "user_id": "u1"},
+            )
+            unknown = await client.post(
+                "/api/wearables/garmin/webhook/process",
+                json={"job_id": "j2", "payload": GARMIN_PAYLOAD},
+            )
+
+        assert known.status_code == 200
+        assert known.json()["status"] == "ok"
+        assert unknown.status_code == 200
+        assert unknown.json()["status"] == "rejected"
+        assert router.webhook_queue.stats()["rejected"] == 1
+
+    @pytest.mark.anyio
+    async def test_webhook_requires_user(self, tmp_path, monkeypatch):
+        """Test that webhooks without any user identifier are rejected."""
+        from main import app
+        from wearables import router
+
+        monkeypatch.setattr(router, "webhook_queue", WebhookQueue(spool_dir=tmp_path))
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/wearables/oura/webhook", json={"data": []})
+
+        assert response.status_code == 400
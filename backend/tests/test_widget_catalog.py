@@ -0,0 +1,128 @@
+"""Tests for the widget props catalog.
+
+Tests cover:
+- every widget example in the agent instructions passes the catalog
+- fast rejects (missing props, ONE_OF, non-object props) and full validation errors
+- generate_widget and parse_agent_response with invalid props
+"""
+
+import json
+import re
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import main
+from schemas.request import ChatEvent
+from schemas.widgets import WidgetCatalog, widget_catalog
+from services.event_widgets import event_registry
+from tools.generate_widget import generate_widget
+
+INSTRUCTIONS = Path(__file__).parent.parent / "instructions" / "genesis_unified.txt"
+EXAMPLE_RE = re.compile(r'\(\s*\n\s*"type"\s*:\s*"([a-z-]+)"\s*,\s*\n\s*"props"\s*:')
+
+
+def _instruction_examples() -> list[dict]:
+    """Widget examples from the instructions (written with ( ) instead of { })."""
+    text = INSTRUCTIONS.read_text(encoding="utf-8")
+    examples = []
+    for match in EXAMPLE_RE.finditer(text):
+        if match.group(1) == "widget-type":
+            continue  # Placeholder in the response format template
+        depth = 0
+        for end, char in enumerate(text[match.start():], start=match.start()):
+            depth += {"(": 1, ")": -1}.get(char, 0)
+            if depth == 0:
+                break
+        example = text[match.start():end + 1].replace("(", "{").replace(")", "}")
+        examples.append(json.loads(example))
+    return examples
+
+
+def _agent_events(text: str) -> list:
+    part = SimpleNamespace(text=text, function_response=None)
+    return [SimpleNamespace(content=SimpleNamespace(parts=[part]))]
+
+
+class TestCatalog:
+    """Tests for WidgetCatalog.validate."""
+
+    @pytest.mark.parametrize("example", _instruction_examples(), ids=lambda example: example["type"])
+    def test_instruction_examples_are_valid(self, example):
+        """Test that the widgets the agent is told to produce are in the catalog and pass it."""
+        assert example["type"] in widget_catalog
+        assert widget_catalog.validate(example["type"], example["props"]) == []
+
+    def test_event_widgets_are_valid(self):
+        """Test that the deterministic event widgets pass the catalog."""
+        for event in (
+            ChatEvent(type="workout_started", payload={"exercises": [{"name": "Sentadilla"}]}),
+            ChatEvent(type="workout_completed", payload={"totalSets": 12}),
+        ):
+            payload = event_registry.build(event).payload
+            assert widget_catalog.validate(payload["type"], payload["props"]) == []
+
+    def test_fast_reject(self):
+        """Test that missing props and non-object props are rejected before pydantic runs."""
+        catalog = WidgetCatalog()
+        assert catalog.validate("workout-card", {"title": "Push"}) == ["missing required props: exercises"]
+        assert catalog.validate("timer-widget", {"label": "Descanso"}) == [
+            "needs one of the props: duration, seconds"
+        ]
+        assert catalog.validate("workout-card", ["not", "an", "object"])
+        assert catalog.stats()["fast_rejected"] == 3
+
+    def test_nested_errors(self):
+        """Test that invalid nested props are reported with their location."""
+        catalog = WidgetCatalog()
+        errors = catalog.validate("workout-card", {"title": "Push", "exercises": [{"sets": 4}]})
+        assert errors == ["exercises.0.name: Field required"]
+        assert catalog.stats()["rejected"] == 1
+
+    def test_lenient_props(self):
+        """Test that extra props and numbers shown as text are accepted."""
+        props = {"title": 5, "exercises": [{"name": "Press", "sets": "4", "reps": 10, "tempo": "3-1-1"}], "x": 1}
+        assert widget_catalog.validate("workout-card", props) == []
+
+    def test_text_rpe(self):
+        """Test that RPE targets written as text are accepted."""
+        def tracker(rpe):
+            return {"exercises": [{"name": "Press", "target": {"sets": 4, "reps": "6-8", "rpe": rpe}}]}
+
+        for rpe in ("7-8", "RPE 8", 8, None):
+            assert widget_catalog.validate("live-session-tracker", tracker(rpe)) == []
+        assert generate_widget("live-session-tracker", tracker("7-8"))["type"] == "live-session-tracker"
+
+    def test_unknown_type_and_disabled(self):
+        """Test that unknown widget types pass and a disabled catalog accepts anything."""
+        catalog = WidgetCatalog()
+        assert catalog.validate("new-widget", {"anything": True}) == []
+        assert catalog.stats()["unknown_type"] == 1
+        assert WidgetCatalog(enabled=False).validate("workout-card", {}) == []
+
+
+class TestInvalidWidgets:
+    """Tests for how invalid widgets are handled."""
+
+    def test_generate_widget_returns_errors(self):
+        """Test that the tool reports invalid props back to the agent instead of a payload."""
+        result = generate_widget("meal-plan", {"meals": [{"kcal": 500}]})
+        assert "type" not in result
+        assert result["details"] == ["meals.0.name: Field required"]
+        assert generate_widget("quote-card", {"quote": "Hola"}) == {"type": "quote-card", "props": {"quote": "Hola"}}
+
+    def test_invalid_payload_dropped_text_kept(self):
+        """Test that an invalid widget in the agent's JSON is dropped and its text still sent."""
+        reply = json.dumps({"text": "Tu plan", "payload": {"type": "meal-plan", "props": {"meals": "pollo"}}})
+        response = main.parse_agent_response(_agent_events(reply))
+        assert response.text == "Tu plan"
+        assert response.payload is None
+        assert response.operations is None
+
+    def test_valid_payload_kept(self):
+        """Test that a valid widget gets its operations."""
+        reply = json.dumps({"text": "Cita", "payload": {"type": "quote-card", "props": {"quote": "Hola"}}})
+        response = main.parse_agent_response(_agent_events(reply))
+        assert response.payload.type == "quote-card"
+        assert response.operations[0]["createSurface"]["zone"] == "stream"
@@ -3,6 +3,8 @@
 import uuid
 from typing import Any
 
+from schemas.widgets import widget_catalog
+
 
 def format_as_a2ui(
     widget_type: str,
@@ -200,8 +202,13 @@ def generate_widget(widget_type: str, props: dict[str, Any]) -> dict:
     - Cuando la respuesta es puramente explicativa
     
     Returns:
-        Dict con type y props listo para A2UIMediator en frontend
+        Dict con type y props listo para A2UIMediator en frontend, o
+        { error, details } si los props no cumplen el catálogo (corrígelos y
+        vuelve a llamar)
     """
+    errors = widget_catalog.validate(widget_type, props)
+    if errors:
+        return {"error": f"Invalid props for {widget_type}", "details": errors}
     return {
         "type": widget_type,
         "props": props
@@ -5,8 +5,20 @@ Provides real-time voice interaction with GENESIS via Gemini Live API.
 
 Module Structure:
 - audio_utils.py: Audio encoding/decoding utilities
+- resampler.py: Streaming polyphase resampler (e.g. native-audio Gemini 24kHz -> 16kHz)
+- vad.py: Server-side voice activity detection (end of speech)
+- protocol.py: Binary WebSocket frame format and negotiation
+- levels.py: Smoothed, rate-limited audio level publisher
+- chunker.py: Sentence-aware text chunking for the TTS handoff
+- elevenlabs_client.py: ElevenLabs streaming TTS client
+- tts_pool.py: Pre-warmed TTS WebSocket pool
+- playout.py: Paced, bounded outbound audio buffer (jitter buffer)
+- latency.py: Per-turn latency traces and histograms
 - gemini_live.py: Gemini Live API client with bidirectional streaming
+- live_sessions.py: Gemini Live pre-connect and resume after client drops
+- persistence.py: Batched, debounced clipboard writes for voice turns
 - session.py: Voice session manager (WebSocket <-> Gemini bridge)
+- capacity.py: Session registry and admission control
 - router.py: FastAPI WebSocket router (/ws/voice)
 
 Usage:
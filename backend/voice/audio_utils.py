@@ -11,12 +11,16 @@ Audio Format Specifications:
 
 Transport:
 - Audio is base64-encoded for JSON WebSocket messages
+
+Sample processing uses numpy views over the PCM buffers (``np.frombuffer``)
+so per-chunk work stays vectorized and copy-free.
 """
 
 import base64
-import struct
 from dataclasses import dataclass
 
+import numpy as np
+
 
 # Audio configuration constants
 SAMPLE_RATE = 16000  # 16kHz
@@ -27,6 +31,9 @@ BYTES_PER_SAMPLE = SAMPLE_WIDTH * CHANNELS
 SAMPLES_PER_CHUNK = int(SAMPLE_RATE * CHUNK_DURATION_MS / 1000)
 BYTES_PER_CHUNK = SAMPLES_PER_CHUNK * BYTES_PER_SAMPLE
 
+# 16-bit signed little-endian, independent of host byte order
+PCM_DTYPE = np.dtype("<i2")
+
 
 @dataclass
 class AudioChunk:
@@ -74,6 +81,39 @@ def decode_audio_base64(encoded: str) -> bytes:
     return base64.b64decode(encoded)
 
 
+def pcm_to_samples(audio_bytes: bytes) -> np.ndarray:
+    """
+    View PCM bytes as an int16 sample array without copying.
+
+    A trailing odd byte is ignored. The returned array is read-only when
+    backed by ``bytes``.
+
+    Args:
+        audio_bytes: Raw PCM audio data (16-bit signed, little-endian)
+
+    Returns:
+        1-D int16 array of samples
+    """
+    return np.frombuffer(audio_bytes, dtype=PCM_DTYPE, count=len(audio_bytes) // SAMPLE_WIDTH)
+
+
+def samples_to_pcm(samples: np.ndarray) -> bytes:
+    """
+    Convert a sample array back to PCM bytes, clipping to the 16-bit range.
+
+    Float input is truncated toward zero.
+
+    Args:
+        samples: Array of samples (any numeric dtype)
+
+    Returns:
+        Raw PCM audio bytes (16-bit signed, little-endian)
+    """
+    if samples.dtype != PCM_DTYPE:
+        samples = np.clip(samples, -32768, 32767).astype(PCM_DTYPE)
+    return samples.tobytes()
+
+
 def chunk_audio(audio_bytes: bytes, chunk_size: int = BYTES_PER_CHUNK) -> list[bytes]:
     """
     Split audio data into chunks of specified size.
@@ -104,22 +144,14 @@ def calculate_audio_level(audio_bytes: bytes) -> float:
     Returns:
         Normalized audio level between 0.0 and 1.0
     """
-    if not audio_bytes or len(audio_bytes) < 2:
-        return 0.0
-
-    # Unpack 16-bit signed samples
-    num_samples = len(audio_bytes) // 2
-    try:
-        samples = struct.unpack(f"<{num_samples}h", audio_bytes[: num_samples * 2])
-    except struct.error:
+    samples = pcm_to_samples(audio_bytes)
+    if not samples.size:
         return 0.0
 
-    if not samples:
-        return 0.0
-
-    # Calculate RMS (Root Mean Square) for better volume representation
-    sum_squares = sum(s * s for s in samples)
-    rms = (sum_squares / len(samples)) ** 0.5
+    # Calculate RMS (Root Mean Square) for better volume representation.
+    # Accumulate in float64: squared int16 samples overflow int16/int32 sums.
+    as_float = samples.astype(np.float64)
+    rms = (float(np.dot(as_float, as_float)) / samples.size) ** 0.5
 
     # Normalize to 0-1 range (max 16-bit value is 32767)
     normalized = rms / 32767.0
@@ -152,7 +184,8 @@ def validate_audio_format(audio_bytes: bytes) -> bool:
 def resample_audio(audio_bytes: bytes, from_rate: int, to_rate: int) -> bytes:
     """
     Simple linear resampling of audio data.
-    Note: For production, consider using a proper resampling library.
+    Note: interpolating without a low-pass filter aliases when downsampling;
+    use resampler.StreamingResampler for streamed audio.
 
     Args:
         audio_bytes: Raw PCM audio data
@@ -165,31 +198,24 @@ def resample_audio(audio_bytes: bytes, from_rate: int, to_rate: int) -> bytes:
     if from_rate == to_rate:
         return audio_bytes
 
-    # Unpack samples
-    num_samples = len(audio_bytes) // 2
-    try:
-        samples = list(struct.unpack(f"<{num_samples}h", audio_bytes[: num_samples * 2]))
-    except struct.error:
-        return audio_bytes
+    samples = pcm_to_samples(audio_bytes)
+    num_samples = samples.size
+    if not num_samples:
+        return b""
 
     # Calculate new sample count
     ratio = to_rate / from_rate
     new_num_samples = int(num_samples * ratio)
 
-    # Linear interpolation resampling
-    resampled = []
-    for i in range(new_num_samples):
-        src_idx = i / ratio
-        idx_low = int(src_idx)
-        idx_high = min(idx_low + 1, num_samples - 1)
-        frac = src_idx - idx_low
+    # Linear interpolation between adjacent samples
+    src_idx = np.arange(new_num_samples) / ratio
+    idx_low = src_idx.astype(np.int64)
+    idx_high = np.minimum(idx_low + 1, num_samples - 1)
+    frac = src_idx - idx_low
+    resampled = samples[idx_low] * (1 - frac) + samples[idx_high] * frac
 
-        # Linear interpolation between adjacent samples
-        value = int(samples[idx_low] * (1 - frac) + samples[idx_high] * frac)
-        resampled.append(value)
-
-    # Pack back to bytes
-    return struct.pack(f"<{len(resampled)}h", *resampled)
+    # astype truncates toward zero, like int()
+    return resampled.astype(PCM_DTYPE).tobytes()
 
 
 def mix_audio_chunks(chunks: list[bytes]) -> bytes:
@@ -212,27 +238,12 @@ def mix_audio_chunks(chunks: list[bytes]) -> bytes:
     min_len = min(len(c) for c in chunks)
     num_samples = min_len // 2
 
-    # Unpack all chunks
-    all_samples = []
-    for chunk in chunks:
-        try:
-            samples = struct.unpack(f"<{num_samples}h", chunk[:num_samples * 2])
-            all_samples.append(samples)
-        except struct.error:
-            continue
-
-    if not all_samples:
-        return b""
-
-    # Mix by averaging
-    mixed = []
-    for i in range(num_samples):
-        total = sum(samples[i] for samples in all_samples)
-        avg = total // len(all_samples)
-        # Clamp to 16-bit range
-        mixed.append(max(-32768, min(32767, avg)))
+    # Stack as int32 so the sum cannot overflow
+    stacked = np.stack([pcm_to_samples(chunk)[:num_samples] for chunk in chunks]).astype(np.int32)
 
-    return struct.pack(f"<{len(mixed)}h", *mixed)
+    # Mix by averaging (floor division), clamped to 16-bit range
+    mixed = np.floor_divide(stacked.sum(axis=0), len(chunks))
+    return samples_to_pcm(mixed)
 
 
 def create_silence(duration_ms: int) -> bytes:
@@ -0,0 +1,206 @@
+"""
+Voice Session Capacity and Admission Control
+
+Every voice session holds three tasks plus a Gemini Live and an ElevenLabs
+connection, so the process admits only a bounded number at a time:
+
+- At most ``max_sessions`` concurrent sessions per process
+- At most ``max_per_user`` concurrent sessions per authenticated user
+  (checked first, never queued: it is almost always a client reconnect
+  loop). Unauthenticated sessions share no user ID, so they are only bound
+  by the process limit
+- When full, up to ``max_waiting`` connections wait in FIFO order for up to
+  ``wait_seconds``; a freed slot is handed straight to the oldest waiter
+- Rejections carry a reason and a ``retry_after`` hint (seconds)
+
+Live counts are reported by ``stats()`` on /voice/health.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+VOICE_MAX_SESSIONS = int(os.getenv("VOICE_MAX_SESSIONS", "100"))
+VOICE_MAX_SESSIONS_PER_USER = int(os.getenv("VOICE_MAX_SESSIONS_PER_USER", "2"))
+VOICE_ADMISSION_WAIT_SECONDS = float(os.getenv("VOICE_ADMISSION_WAIT_SECONDS", "5"))
+VOICE_ADMISSION_MAX_WAITING = int(os.getenv("VOICE_ADMISSION_MAX_WAITING", "20"))
+VOICE_ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("VOICE_ADMISSION_RETRY_AFTER_SECONDS", "10"))
+
+
+class CapacityError(Exception):
+    """Raised when a voice session cannot be admitted."""
+
+    def __init__(self, reason: str, message: str, retry_after: int):
+        super().__init__(message)
+        self.reason = reason  # "user_limit", "queue_full" or "capacity"
+        self.retry_after = retry_after
+
+
+@dataclass(eq=False)
+class SessionSlot:
+    """An admitted voice session."""
+
+    session_id: str
+    user_id: str | None
+    admitted_at: float = field(default_factory=time.monotonic)
+
+
+class SessionRegistry:
+    """Per-process registry of admitted voice sessions."""
+
+    def __init__(
+        self,
+        max_sessions: int = VOICE_MAX_SESSIONS,
+        max_per_user: int = VOICE_MAX_SESSIONS_PER_USER,
+        wait_seconds: float = VOICE_ADMISSION_WAIT_SECONDS,
+        max_waiting: int = VOICE_ADMISSION_MAX_WAITING,
+        retry_after_seconds: int = VOICE_ADMISSION_RETRY_AFTER_SECONDS,
+    ):
+        self.max_sessions = max_sessions
+        self.max_per_user = max_per_user
+        self.wait_seconds = wait_seconds
+        self.max_waiting = max_waiting
+        self.retry_after_seconds = retry_after_seconds
+
+        self._active: set[SessionSlot] = set()
+        # Sessions per user, admitted or waiting
+        self._per_user: dict[str, int] = {}
+        self._waiters: deque[asyncio.Future] = deque()
+        # Slots handed to a waiter that has not woken up yet
+        self._reserved = 0
+        self._stats = {"admitted": 0, "queued": 0, "rejected_user_limit": 0, "rejected_capacity": 0}
+
+    async def admit(
+        self,
+        session_id: str,
+        user_id: str | None,
+        on_wait: Callable[[int], Awaitable[Any]] | None = None,
+    ) -> SessionSlot:
+        """
+        Admit a voice session, waiting for a slot if the process is full.
+
+        Args:
+            session_id: Voice session ID
+            user_id: Authenticated user ID, or None (no per-user limit)
+            on_wait: Called with the queue position when the session has to wait
+
+        Returns:
+            The session's slot; pass it to ``release`` when the session ends
+
+        Raises:
+            CapacityError: Per-user limit reached, queue full, or no slot freed in time
+        """
+        if user_id is not None and self._per_user.get(user_id, 0) >= self.max_per_user:
+            self._stats["rejected_user_limit"] += 1
+            raise CapacityError(
+                "user_limit",
+                f"Too many voice sessions for this user (max {self.max_per_user})",
+                self.retry_after_seconds,
+            )
+
+        if len(self._active) + self._reserved < self.max_sessions and not self._waiters:
+            return self._take(session_id, user_id)
+
+        if self.wait_seconds <= 0 or len(self._waiters) >= self.max_waiting:
+            self._reject_capacity("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._increment_user(user_id)
+        self._stats["queued"] += 1
+        handed_off = False
+        try:
+            if on_wait is not None:
+                await on_wait(len(self._waiters))
+            await asyncio.wait_for(asyncio.shield(waiter), self.wait_seconds)
+            handed_off = True
+        except asyncio.TimeoutError:
+            self._reject_capacity("capacity")
+        finally:
+            self._decrement_user(user_id)
+            if not handed_off:
+                self._abandon(waiter)
+        self._reserved -= 1
+        return self._take(session_id, user_id)
+
+    def release(self, slot: SessionSlot) -> None:
+        """Free a session's slot (idempotent)."""
+        if slot not in self._active:
+            return
+        self._active.discard(slot)
+        self._decrement_user(slot.user_id)
+        self._hand_off()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "active": len(self._active),
+            "waiting": len(self._waiters),
+            "users": len({slot.user_id for slot in self._active if slot.user_id is not None}),
+            "max_sessions": self.max_sessions,
+            "max_per_user": self.max_per_user,
+        }
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _take(self, session_id: str, user_id: str | None) -> SessionSlot:
+        slot = SessionSlot(session_id=session_id, user_id=user_id)
+        self._active.add(slot)
+        self._increment_user(user_id)
+        self._stats["admitted"] += 1
+        return slot
+
+    def _hand_off(self) -> None:
+        """Give a freed slot straight to the oldest waiter, if any."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._reserved += 1
+                return
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        """Drop a waiter that gave up; pass its slot on if one was just handed to it."""
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        if waiter.done() and not waiter.cancelled():
+            # release() handed us a slot we will not use
+            self._reserved -= 1
+            self._hand_off()
+        else:
+            waiter.cancel()
+
+    def _increment_user(self, user_id: str | None) -> None:
+        if user_id is not None:
+            self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+
+    def _decrement_user(self, user_id: str | None) -> None:
+        if user_id is None:
+            return
+        remaining = self._per_user.get(user_id, 0) - 1
+        if remaining > 0:
+            self._per_user[user_id] = remaining
+        else:
+            self._per_user.pop(user_id, None)
+
+    def _reject_capacity(self, reason: str) -> None:
+        self._stats["rejected_capacity"] += 1
+        logger.warning(f"Voice session rejected ({reason}): {len(self._active)} active")
+        raise CapacityError(
+            reason,
+            "Voice service is at capacity, try again shortly",
+            self.retry_after_seconds,
+        )
+
+
+voice_sessions = SessionRegistry()
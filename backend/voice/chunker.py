@@ -0,0 +1,238 @@
+"""
+Sentence-aware TTS Text Chunker
+
+Gemini streams text in arbitrary fragments. Forwarding each one to ElevenLabs
+as-is triggers many tiny generations (choppy prosody), while waiting for whole
+paragraphs delays the first audio. The chunker re-cuts the stream at natural
+boundaries:
+
+- Sentence ends (``. ! ? …`` followed by whitespace, or a newline) always cut,
+  except after known abbreviations and inside numbers (``3.5``)
+- Clause boundaries (``, ; : —``) cut once the phrase is long enough; the
+  first phrase of a turn uses a lower threshold so speech starts sooner
+- Runs without any boundary are cut at the last space before ``max_chars``
+- A max-latency timer releases buffered text (up to the last complete word)
+  when Gemini pauses mid-sentence
+
+Thresholds are tuned per language (``es`` / ``en``); Spanish sentences run
+longer, so its phrase thresholds are slightly higher.
+"""
+
+import asyncio
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import AsyncGenerator, Awaitable, Callable
+
+from settings import env_flag
+
+VOICE_TTS_CHUNKING = env_flag("VOICE_TTS_CHUNKING", default=True)
+# Overrides the per-language max latency when set
+VOICE_TTS_MAX_LATENCY_MS = os.getenv("VOICE_TTS_MAX_LATENCY_MS")
+
+# Boundaries need trailing whitespace, so "3.5" or "1,000" never cut and a
+# trailing "." waits for the next fragment
+SENTENCE_END = re.compile(r"[.!?…]+[\"'»”)\]]*(?=\s)|\n")
+CLAUSE_END = re.compile(r"[,;:—]+(?=\s)| - ")
+_WORD_BEFORE = re.compile(r"(\w+)\W*$")
+
+
+@dataclass(frozen=True)
+class ChunkerProfile:
+    """Chunking thresholds for one language."""
+
+    first_min_chars: int  # First phrase of a turn may cut at a clause this early
+    min_chars: int  # Later phrases cut at a clause only once this long
+    max_chars: int  # Force a cut (at a space) beyond this
+    max_latency_ms: int  # Release buffered words after this long without a boundary
+    abbreviations: frozenset[str]  # Words whose trailing "." is not a sentence end
+
+
+PROFILES: dict[str, ChunkerProfile] = {
+    "es": ChunkerProfile(
+        first_min_chars=20,
+        min_chars=60,
+        max_chars=220,
+        max_latency_ms=350,
+        abbreviations=frozenset({
+            "sr", "sra", "srta", "dr", "dra", "ud", "uds", "lic", "ing",
+            "etc", "ej", "aprox", "núm", "pág", "vs",
+        }),
+    ),
+    "en": ChunkerProfile(
+        first_min_chars=15,
+        min_chars=50,
+        max_chars=200,
+        max_latency_ms=300,
+        abbreviations=frozenset({
+            "mr", "mrs", "ms", "dr", "prof", "st", "jr", "sr",
+            "etc", "approx", "vs", "no",
+        }),
+    ),
+}
+
+
+def get_profile(language: str) -> ChunkerProfile:
+    """Profile for a language code like ``es`` or ``en-US`` (falls back to ``es``)."""
+    return PROFILES.get(language.split("-")[0].lower(), PROFILES["es"])
+
+
+class TextChunker:
+    """
+    Incremental chunker for one spoken turn.
+
+    ``push`` returns the chunks that are complete after adding a fragment,
+    ``expire`` releases text held longer than the max latency and ``flush``
+    returns whatever is left at the end of the turn. Every chunk ends with a
+    single space, as ElevenLabs expects for streamed input.
+    """
+
+    def __init__(self, profile: ChunkerProfile, max_latency_ms: int | None = None):
+        self.profile = profile
+        if max_latency_ms is None and VOICE_TTS_MAX_LATENCY_MS:
+            max_latency_ms = int(VOICE_TTS_MAX_LATENCY_MS)
+        self.max_latency = (profile.max_latency_ms if max_latency_ms is None else max_latency_ms) / 1000
+        self._buffer = ""
+        self._pending_since: float | None = None
+        self.chunks_emitted = 0
+
+    @classmethod
+    def for_language(cls, language: str, max_latency_ms: int | None = None) -> "TextChunker":
+        return cls(get_profile(language), max_latency_ms)
+
+    # =========================================================================
+    # Feeding
+    # =========================================================================
+
+    def push(self, text: str, now: float | None = None) -> list[str]:
+        """
+        Add a text fragment.
+
+        Args:
+            text: Next fragment from the LLM
+            now: Monotonic timestamp (defaults to time.monotonic())
+
+        Returns:
+            Chunks ready to send, in order (possibly empty)
+        """
+        if not text:
+            return []
+        self._buffer += text
+        chunks = []
+        while True:
+            cut = self._find_cut()
+            if cut is None:
+                break
+            chunk = self._take(cut)
+            if chunk:
+                chunks.append(chunk)
+        self._touch(time.monotonic() if now is None else now, restart=bool(chunks))
+        return chunks
+
+    def time_until_deadline(self, now: float | None = None) -> float | None:
+        """Seconds until buffered text must be released, or None if nothing is held."""
+        if self._pending_since is None:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._pending_since + self.max_latency - now)
+
+    def expire(self, now: float | None = None) -> str | None:
+        """
+        Release held text after the max latency, up to the last complete word.
+
+        Returns:
+            A chunk, or None if the buffer holds only a partial word
+        """
+        if self._buffer[-1:].isspace():
+            cut = len(self._buffer)
+        else:
+            cut = self._buffer.rfind(" ") + 1
+        chunk = self._take(cut) if cut > 0 else None
+        self._touch(time.monotonic() if now is None else now, restart=True)
+        return chunk
+
+    def flush(self) -> str | None:
+        """Return all remaining text (end of turn)."""
+        chunk = self._take(len(self._buffer))
+        self._pending_since = None
+        return chunk
+
+    # =========================================================================
+    # Boundaries
+    # =========================================================================
+
+    def _find_cut(self) -> int | None:
+        buffer = self._buffer
+        for match in SENTENCE_END.finditer(buffer):
+            if match.group() == "\n" or not self._is_abbreviation(buffer, match.start()):
+                return match.end()
+
+        min_chars = self.profile.first_min_chars if self.chunks_emitted == 0 else self.profile.min_chars
+        for match in CLAUSE_END.finditer(buffer, min_chars):
+            return match.end()
+
+        if len(buffer) > self.profile.max_chars:
+            space = buffer.rfind(" ", 0, self.profile.max_chars)
+            return space + 1 if space > 0 else self.profile.max_chars
+        return None
+
+    def _is_abbreviation(self, buffer: str, end: int) -> bool:
+        if buffer[end] != ".":
+            return False
+        word = _WORD_BEFORE.search(buffer, 0, end)
+        if word is None:
+            return False
+        token = word.group(1).lower()
+        # Single letters are initials ("J. R. R. Tolkien") or "p. ej."
+        return token in self.profile.abbreviations or (len(token) == 1 and token.isalpha())
+
+    def _take(self, cut: int) -> str | None:
+        chunk, self._buffer = self._buffer[:cut].strip(), self._buffer[cut:].lstrip()
+        if not chunk:
+            return None
+        self.chunks_emitted += 1
+        return chunk + " "
+
+    def _touch(self, now: float, restart: bool) -> None:
+        if not self._buffer.strip():
+            self._pending_since = None
+        elif self._pending_since is None or restart:
+            self._pending_since = now
+
+
+async def chunk_text_stream(
+    next_text: Callable[[], Awaitable[str | None]],
+    chunker: TextChunker,
+) -> AsyncGenerator[str, None]:
+    """
+    Re-cut a text stream into TTS chunks, honouring the max-latency timer.
+
+    Args:
+        next_text: Returns the next fragment, or None at the end of the turn.
+            Must be safe to cancel (e.g. ``asyncio.Queue.get``), as it is
+            abandoned when the timer fires.
+        chunker: Chunker for this turn
+
+    Yields:
+        Chunks to send to the TTS provider
+    """
+    while True:
+        timeout = chunker.time_until_deadline()
+        if timeout == 0:
+            chunk = chunker.expire()
+            if chunk:
+                yield chunk
+            continue
+        try:
+            text = await asyncio.wait_for(next_text(), timeout)
+        except asyncio.TimeoutError:
+            continue
+
+        if text is None:
+            chunk = chunker.flush()
+            if chunk:
+                yield chunk
+            return
+        for chunk in chunker.push(text):
+            yield chunk
@@ -2,7 +2,8 @@
 ElevenLabs Client for Streaming TTS
 
 Handles real-time text-to-speech streaming using ElevenLabs WebSockets.
-Optimized for low latency conversational responses.
+Optimized for low latency conversational responses: stream sockets are
+opened and authenticated ahead of time by a shared TTSConnectionPool.
 """
 
 import asyncio
@@ -14,8 +15,44 @@ from typing import AsyncGenerator
 
 import websockets
 
+from .tts_pool import TTSConnectionPool
+
 logger = logging.getLogger(__name__)
 
+# Bound the close handshake so a cancelled (barged-in) stream frees up fast
+CLOSE_TIMEOUT = 1.0
+
+# Beginning-of-stream settings sent when a socket is opened
+VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75,
+}
+
+
+async def open_stream_input(url: str, api_key: str):
+    """Open a stream-input socket and send the BOS (auth + settings) message."""
+    ws = await websockets.connect(url, close_timeout=CLOSE_TIMEOUT)
+    try:
+        # Only use xi_api_key (not authorization header - can't use both)
+        await ws.send(json.dumps({
+            "text": " ",
+            "voice_settings": VOICE_SETTINGS,
+            "xi_api_key": api_key,
+        }))
+    except Exception:
+        await ws.close()
+        raise
+    return ws
+
+
+async def send_keepalive(ws) -> None:
+    """A single space resets the server's inactivity timer without generating audio."""
+    await ws.send(json.dumps({"text": " "}))
+
+
+tts_pool = TTSConnectionPool(open_stream_input, send_keepalive)
+
+
 class ElevenLabsClient:
     """
     Client for ElevenLabs streaming Text-to-Speech via WebSockets.
@@ -29,10 +66,22 @@ class ElevenLabsClient:
     DEFAULT_MODEL = "eleven_turbo_v2_5" # Best for latency + multilingual
     DEFAULT_VOICE_ID = "52mH4ITatkHKLhAdkH2A"  # GENESIS voice
     
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, pool: TTSConnectionPool | None = None):
         self.api_key = api_key or os.getenv("ELEVENLABS_API_KEY")
+        self.pool = pool or tts_pool
         if not self.api_key:
             logger.warning("ELEVENLABS_API_KEY not set. TTS will fail.")
+
+    def stream_url(self, voice_id: str | None = None, model_id: str | None = None) -> str:
+        return self.WS_URL.format(
+            voice_id=voice_id or self.DEFAULT_VOICE_ID,
+            model_id=model_id or self.DEFAULT_MODEL,
+        )
+
+    def prewarm(self, voice_id: str | None = None, model_id: str | None = None) -> None:
+        """Open a stream socket for this voice in the background (e.g. at session start)."""
+        if self.api_key:
+            self.pool.warm(self.stream_url(voice_id, model_id), self.api_key)
             
     async def stream_audio(
         self, 
@@ -54,62 +103,54 @@ class ElevenLabsClient:
         if not self.api_key:
             raise ValueError("ELEVENLABS_API_KEY is required")
 
-        voice = voice_id or self.DEFAULT_VOICE_ID
-        model = model_id or self.DEFAULT_MODEL
-        
-        url = self.WS_URL.format(voice_id=voice, model_id=model)
-        
+        url = self.stream_url(voice_id, model_id)
+
+        try:
+            # Pre-opened socket with BOS already sent (or a fresh one on a pool miss)
+            ws = await self.pool.acquire(url, self.api_key)
+        except Exception as e:
+            logger.error(f"ElevenLabs streaming error: {e}")
+            raise
+
         try:
-            async with websockets.connect(url) as ws:
-                # 1. Send BOS (Beginning of Stream) message with auth
-                # Only use xi_api_key (not authorization header - can't use both)
-                bos_message = {
-                    "text": " ",
-                    "voice_settings": {
-                        "stability": 0.5,
-                        "similarity_boost": 0.75
-                    },
-                    "xi_api_key": self.api_key,
-                }
-                await ws.send(json.dumps(bos_message))
-                
-                # 2. Create tasks for sending text and receiving audio
-                
-                async def send_text():
-                    async for text_chunk in text_iterator:
-                        if text_chunk and text_chunk.strip():
-                            # Send text chunk with try_trigger_generation
-                            # This tells ElevenLabs to try to generate audio immediately for this chunk
-                            await ws.send(json.dumps({
-                                "text": text_chunk, 
-                                "try_trigger_generation": True
-                            }))
-                    # Send EOS (End of Stream)
-                    await ws.send(json.dumps({"text": ""}))
-
-                async def receive_audio():
-                    async for message in ws:
-                        data = json.loads(message)
-                        if data.get("audio"):
-                            # Audio is base64 encoded PCM 16kHz
-                            chunk = base64.b64decode(data["audio"])
-                            yield chunk
-                        if data.get("isFinal"):
-                            break
-
-                # Run sender in background, yield from receiver
-                sender_task = asyncio.create_task(send_text())
-                
-                try:
-                    async for audio_chunk in receive_audio():
-                        yield audio_chunk
-                finally:
-                    # Ensure sender task is cleaned up/awaited if it finished or cancelled
-                    if not sender_task.done():
-                        sender_task.cancel()
-                    else:
-                        await sender_task
-                    
+            async def send_text():
+                async for text_chunk in text_iterator:
+                    if text_chunk and text_chunk.strip():
+                        # Send text chunk with try_trigger_generation
+                        # This tells ElevenLabs to try to generate audio immediately for this chunk
+                        await ws.send(json.dumps({
+                            "text": text_chunk, 
+                            "try_trigger_generation": True
+                        }))
+                # Send EOS (End of Stream)
+                await ws.send(json.dumps({"text": ""}))
+
+            async def receive_audio():
+                async for message in ws:
+                    data = json.loads(message)
+                    if data.get("audio"):
+                        # Audio is base64 encoded PCM 16kHz
+                        chunk = base64.b64decode(data["audio"])
+                        yield chunk
+                    if data.get("isFinal"):
+                        break
+
+            # Run sender in background, yield from receiver
+            sender_task = asyncio.create_task(send_text())
+            
+            try:
+                async for audio_chunk in receive_audio():
+                    yield audio_chunk
+            finally:
+                # Ensure sender task is cleaned up/awaited if it finished or cancelled
+                if not sender_task.done():
+                    sender_task.cancel()
+                else:
+                    await sender_task
+
         except Exception as e:
             logger.error(f"ElevenLabs streaming error: {e}")
             raise
+        finally:
+            # Stream sockets are single-use; the pool opens a replacement
+            await ws.close()
@@ -33,6 +33,7 @@ class GeminiEventType(str, Enum):
     TRANSCRIPT = "transcript"
     TOOL_CALL = "tool_call"
     TURN_COMPLETE = "turn_complete"
+    INTERRUPTED = "interrupted"  # Gemini detected user speech over its response
     ERROR = "error"
     SETUP_COMPLETE = "setup_complete"
 
@@ -250,6 +251,24 @@ class GeminiLiveClient:
             turn_complete=True,
         )
 
+    async def send_context(self, text: str) -> None:
+        """
+        Add context to the conversation without asking for a response.
+
+        Used for context that is only known after connecting (e.g. the user
+        profile, when the connection was opened while it was still loading).
+
+        Args:
+            text: Context to add
+        """
+        if not self.is_connected:
+            raise RuntimeError("Not connected to Gemini Live API")
+
+        await self.session.send_client_content(
+            turns={"role": "user", "parts": [{"text": text}]},
+            turn_complete=False,
+        )
+
     async def end_audio_stream(self) -> None:
         """
         Signal end of audio stream (e.g., user stopped speaking).
@@ -323,6 +342,14 @@ class GeminiLiveClient:
                             tool_id=fc.id,
                         )
 
+                # Handle server-side barge-in
+                if (
+                    hasattr(response, "server_content")
+                    and response.server_content
+                    and getattr(response.server_content, "interrupted", False) is True
+                ):
+                    yield GeminiEvent(type=GeminiEventType.INTERRUPTED)
+
                 # Handle turn complete
                 if (
                     hasattr(response, "server_content")
@@ -348,6 +375,39 @@ class GeminiLiveClient:
         await self.disconnect()
 
 
+# Static part of the voice prompt, assembled once
+VOICE_BASE_PROMPT = "\n".join([
+    "Eres GENESIS, un coach de fitness inteligente y empático.",
+    "",
+    "MODO DE VOZ - INSTRUCCIONES IMPORTANTES:",
+    "1. Responde de forma natural y conversacional, como si hablaras con un amigo",
+    "2. Mantén las respuestas CONCISAS - máximo 2-3 oraciones por turno",
+    "3. Usa un tono motivador pero profesional",
+    "4. Detecta automáticamente si el usuario habla en español o inglés y responde en el mismo idioma",
+    "5. Cuando muestres datos visuales, USA la herramienta show_widget DESPUÉS de explicar verbalmente",
+    "",
+    "CAPACIDADES:",
+    "- Entrenamiento: rutinas, ejercicios, técnica, periodización",
+    "- Nutrición: planes de comidas, recetas, hidratación, suplementos",
+    "- Hábitos: check-ins diarios, seguimiento, motivación",
+    "- Análisis: progreso, métricas, insights",
+    "- Recuperación: descanso, movilidad, sueño",
+    "",
+    "WIDGETS DISPONIBLES (usa show_widget solo cuando sea útil):",
+    "- workout-card: para mostrar rutinas de ejercicio",
+    "- meal-plan: para planes de alimentación",
+    "- recipe-card: para recetas específicas",
+    "- daily-checkin: para registro diario",
+    "- progress-dashboard: para mostrar progreso",
+    "- habit-streak: para hábitos y rachas",
+    "",
+    "IMPORTANTE:",
+    "- SIEMPRE explica verbalmente ANTES de mostrar un widget",
+    "- No uses widgets para respuestas simples que se explican mejor hablando",
+    "- Sé proactivo pero no invasivo",
+])
+
+
 def build_voice_system_prompt(
     user_context: dict[str, Any] | None = None,
     language: str = "es",
@@ -362,51 +422,34 @@ def build_voice_system_prompt(
     Returns:
         System instruction string for Gemini Live
     """
-    # Base prompt
-    prompt_parts = [
-        "Eres GENESIS, un coach de fitness inteligente y empático.",
-        "",
-        "MODO DE VOZ - INSTRUCCIONES IMPORTANTES:",
-        "1. Responde de forma natural y conversacional, como si hablaras con un amigo",
-        "2. Mantén las respuestas CONCISAS - máximo 2-3 oraciones por turno",
-        "3. Usa un tono motivador pero profesional",
-        "4. Detecta automáticamente si el usuario habla en español o inglés y responde en el mismo idioma",
-        "5. Cuando muestres datos visuales, USA la herramienta show_widget DESPUÉS de explicar verbalmente",
-        "",
-        "CAPACIDADES:",
-        "- Entrenamiento: rutinas, ejercicios, técnica, periodización",
-        "- Nutrición: planes de comidas, recetas, hidratación, suplementos",
-        "- Hábitos: check-ins diarios, seguimiento, motivación",
-        "- Análisis: progreso, métricas, insights",
-        "- Recuperación: descanso, movilidad, sueño",
-        "",
-        "WIDGETS DISPONIBLES (usa show_widget solo cuando sea útil):",
-        "- workout-card: para mostrar rutinas de ejercicio",
-        "- meal-plan: para planes de alimentación",
-        "- recipe-card: para recetas específicas",
-        "- daily-checkin: para registro diario",
-        "- progress-dashboard: para mostrar progreso",
-        "- habit-streak: para hábitos y rachas",
-        "",
-        "IMPORTANTE:",
-        "- SIEMPRE explica verbalmente ANTES de mostrar un widget",
-        "- No uses widgets para respuestas simples que se explican mejor hablando",
-        "- Sé proactivo pero no invasivo",
-    ]
+    if not user_context:
+        return VOICE_BASE_PROMPT
+    return f"{VOICE_BASE_PROMPT}\n\n{build_user_context_prompt(user_context)}"
 
-    # Add user context if available
-    if user_context:
-        prompt_parts.append("")
-        prompt_parts.append("CONTEXTO DEL USUARIO:")
-        if user_context.get("name"):
-            prompt_parts.append(f"- Nombre: {user_context['name']}")
-        if user_context.get("goals"):
-            prompt_parts.append(f"- Objetivos: {', '.join(user_context['goals'])}")
-        if user_context.get("fitness_level"):
-            prompt_parts.append(f"- Nivel: {user_context['fitness_level']}")
-        if user_context.get("recent_workouts"):
-            prompt_parts.append(
-                f"- Entrenamientos recientes: {len(user_context['recent_workouts'])}"
-            )
 
-    return "\n".join(prompt_parts)
+def build_user_context_prompt(user_context: dict[str, Any]) -> str:
+    """
+    Build the user context section of the voice prompt.
+
+    Part of the system prompt when the context is known at connect time,
+    otherwise sent as a context turn once it is loaded (see
+    GeminiLiveClient.send_context).
+
+    Args:
+        user_context: User-specific context from clipboard
+
+    Returns:
+        Context block ("CONTEXTO DEL USUARIO: ...")
+    """
+    lines = ["CONTEXTO DEL USUARIO:"]
+    if user_context.get("name"):
+        lines.append(f"- Nombre: {user_context['name']}")
+    if user_context.get("goals"):
+        lines.append(f"- Objetivos: {', '.join(user_context['goals'])}")
+    if user_context.get("fitness_level"):
+        lines.append(f"- Nivel: {user_context['fitness_level']}")
+    if user_context.get("recent_workouts"):
+        lines.append(
+            f"- Entrenamientos recientes: {len(user_context['recent_workouts'])}"
+        )
+    return "\n".join(lines)
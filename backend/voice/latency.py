@@ -0,0 +1,152 @@
+"""
+Voice Turn Latency Tracing
+
+Each session records when the milestones of a conversational turn happen
+and, when the turn is over, folds the gaps between them into process-wide
+histograms (exposed on /voice/health):
+
+    user_speech       first user audio      -> end of user turn
+    llm_first_text    end of user turn      -> first Gemini text delta
+    tts_first_audio   first Gemini text     -> first TTS audio byte
+    response          end of user turn      -> first audio byte sent to client
+    playback          first audio sent      -> last audio byte sent
+    widget            last audio sent       -> widget delivered
+    total             end of user turn      -> last audio byte / widget
+
+The end of the user turn is the client's end_turn, server VAD or a text
+message, whichever closed the turn (recorded as ``end_source``).
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+# Histogram bucket upper bounds (ms); the last bucket is open-ended
+BUCKETS_MS = (50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 10000)
+# Recent samples kept per stage for percentiles
+WINDOW = 512
+
+STAGES: dict[str, tuple[str, str]] = {
+    "user_speech": ("first_user_audio", "user_turn_end"),
+    "llm_first_text": ("user_turn_end", "first_text"),
+    "tts_first_audio": ("first_text", "first_tts_audio"),
+    "response": ("user_turn_end", "first_audio_sent"),
+    "playback": ("first_audio_sent", "last_audio_sent"),
+    "widget": ("last_audio_sent", "widget_delivered"),
+}
+# Milestones reached after the user's turn ended
+RESPONSE_MILESTONES = ("first_text", "first_tts_audio", "first_audio_sent", "last_audio_sent", "widget_delivered")
+
+
+@dataclass
+class TurnTrace:
+    """Monotonic timestamps for one turn; a milestone is set once, when first reached."""
+
+    first_user_audio: float | None = None
+    user_turn_end: float | None = None
+    end_source: str | None = None  # "client", "vad" or "text"
+    first_text: float | None = None
+    first_tts_audio: float | None = None
+    first_audio_sent: float | None = None
+    last_audio_sent: float | None = None
+    widget_delivered: float | None = None
+
+    def mark(self, milestone: str, now: float | None = None) -> None:
+        """Record a milestone unless it was already reached this turn."""
+        if getattr(self, milestone) is None:
+            setattr(self, milestone, time.monotonic() if now is None else now)
+
+    def durations(self) -> dict[str, float]:
+        """Stage durations in ms, for the stages whose both ends were reached."""
+        result = {}
+        for stage, (start, end) in STAGES.items():
+            started, ended = getattr(self, start), getattr(self, end)
+            if started is not None and ended is not None and ended >= started:
+                result[stage] = (ended - started) * 1000
+        finished = self.widget_delivered or self.last_audio_sent
+        if self.user_turn_end is not None and finished is not None and finished >= self.user_turn_end:
+            result["total"] = (finished - self.user_turn_end) * 1000
+        return result
+
+
+@dataclass
+class LatencyHistogram:
+    """Bucketed counts plus a window of recent samples for percentiles."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(BUCKETS_MS) + 1))
+    total: int = 0
+    sum_ms: float = 0.0
+    recent: deque = field(default_factory=lambda: deque(maxlen=WINDOW))
+
+    def observe(self, value_ms: float) -> None:
+        index = int(np.searchsorted(BUCKETS_MS, value_ms))
+        self.counts[index] += 1
+        self.total += 1
+        self.sum_ms += value_ms
+        self.recent.append(value_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        if not self.total:
+            return {"count": 0}
+        p50, p95, p99 = np.percentile(np.fromiter(self.recent, dtype=np.float64), (50, 95, 99))
+        labels = [f"le_{bound}" for bound in BUCKETS_MS] + ["inf"]
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum_ms / self.total, 1),
+            "p50_ms": round(float(p50), 1),
+            "p95_ms": round(float(p95), 1),
+            "p99_ms": round(float(p99), 1),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class LatencyMetrics:
+    """Process-wide latency histograms per stage."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.histograms: dict[str, LatencyHistogram] = {
+            stage: LatencyHistogram() for stage in (*STAGES, "total")
+        }
+        self.turns = 0
+        self.interrupted_turns = 0
+        self.end_sources: dict[str, int] = {}
+
+    def record(self, trace: TurnTrace, interrupted: bool = False) -> dict[str, float]:
+        """
+        Fold a finished turn into the histograms.
+
+        Interrupted turns are only counted; their timings would skew playback
+        and total.
+
+        Returns:
+            The turn's stage durations in ms
+        """
+        if trace == TurnTrace():
+            return {}  # Nothing happened (e.g. a cancel while idle)
+        durations = trace.durations()
+        if interrupted:
+            self.interrupted_turns += 1
+            return durations
+        self.turns += 1
+        if trace.end_source:
+            self.end_sources[trace.end_source] = self.end_sources.get(trace.end_source, 0) + 1
+        for stage, value in durations.items():
+            self.histograms[stage].observe(value)
+        return durations
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "turns": self.turns,
+            "interrupted_turns": self.interrupted_turns,
+            "end_sources": dict(self.end_sources),
+            "stages": {stage: histogram.snapshot() for stage, histogram in self.histograms.items()},
+        }
+
+
+latency_metrics = LatencyMetrics()
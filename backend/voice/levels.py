@@ -0,0 +1,82 @@
+"""
+Audio Level Publisher
+
+Turns per-chunk input levels into a smoothed envelope and decides when an
+``audio_level`` message is worth sending, so the orb animation stays
+reactive without one WebSocket message per inbound chunk.
+
+- Envelope: fast attack, slower release (per update)
+- Rate limit: at most ``max_hz`` messages per second
+- Change gate: only when the envelope moved by ``min_delta`` since the last
+  published value, or just reached silence
+"""
+
+import os
+import time
+
+from settings import env_flag
+
+VOICE_LEVEL_MAX_HZ = float(os.getenv("VOICE_LEVEL_MAX_HZ", "10"))
+VOICE_LEVEL_MIN_DELTA = float(os.getenv("VOICE_LEVEL_MIN_DELTA", "0.03"))
+VOICE_LEVEL_ON_STATE = env_flag("VOICE_LEVEL_ON_STATE", default=True)
+
+ATTACK = 0.6
+RELEASE = 0.25
+# Levels below this are treated as silence
+NOISE_GATE = 0.01
+
+
+class AudioLevelPublisher:
+    """Per-session smoothed, rate-limited audio level."""
+
+    def __init__(
+        self,
+        max_hz: float = VOICE_LEVEL_MAX_HZ,
+        min_delta: float = VOICE_LEVEL_MIN_DELTA,
+    ):
+        self.min_interval = 1.0 / max_hz if max_hz > 0 else None
+        self.min_delta = min_delta
+        self.level = 0.0
+        self._last_published = 0.0
+        self._last_sent_at: float | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """False when standalone level messages are disabled (max_hz <= 0)."""
+        return self.min_interval is not None
+
+    def update(self, raw_level: float, now: float | None = None) -> float | None:
+        """
+        Fold in the level of the latest chunk.
+
+        Args:
+            raw_level: Level of the chunk (0.0-1.0)
+            now: Monotonic timestamp (defaults to time.monotonic())
+
+        Returns:
+            The level to publish now, or None to skip this update
+        """
+        target = raw_level if raw_level >= NOISE_GATE else 0.0
+        coefficient = ATTACK if target > self.level else RELEASE
+        self.level += coefficient * (target - self.level)
+        if self.level < NOISE_GATE:
+            self.level = 0.0
+
+        if not self.enabled:
+            return None
+        now = time.monotonic() if now is None else now
+        if self._last_sent_at is not None and now - self._last_sent_at < self.min_interval:
+            return None
+        # Always let the final drop to silence through so the UI settles
+        settled = self.level == 0.0 and self._last_published != 0.0
+        if abs(self.level - self._last_published) < self.min_delta and not settled:
+            return None
+
+        self._last_sent_at = now
+        self._last_published = self.level
+        return round(self.level, 3)
+
+    def reset(self) -> None:
+        self.level = 0.0
+        self._last_published = 0.0
+        self._last_sent_at = None
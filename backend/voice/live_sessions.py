@@ -0,0 +1,182 @@
+"""
+Gemini Live Connection Manager
+
+Setting up a Live API session (WebSocket + setup handshake) is the slowest
+part of opening /ws/voice. The manager takes it off the critical path:
+
+- Pre-connect: ``acquire`` starts connecting immediately, with the base voice
+  prompt, while the router is still loading the session clipboard. The user
+  context is sent as a context turn once it is known.
+- Resume: when a client drops without a normal close (mobile network
+  switches, app backgrounded), the session ``park``s its Live connection for
+  ``grace_seconds``. A reconnect with the same session_id and user within
+  that window resumes on the same Live session, conversation intact.
+
+Parked connections are bounded (oldest evicted) and closed on expiry or
+shutdown.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .gemini_live import GeminiLiveClient, build_voice_system_prompt
+
+logger = logging.getLogger(__name__)
+
+VOICE_LIVE_RESUME_GRACE_SECONDS = float(os.getenv("VOICE_LIVE_RESUME_GRACE_SECONDS", "30"))
+VOICE_LIVE_MAX_PARKED = int(os.getenv("VOICE_LIVE_MAX_PARKED", "50"))
+
+LeaseKey = tuple[str, str]  # (session_id, user_id)
+
+
+@dataclass
+class LiveLease:
+    """A Gemini Live connection handed to one voice session."""
+
+    manager: "LiveSessionManager"
+    key: LeaseKey
+    client: GeminiLiveClient
+    connect_task: asyncio.Task | None = None
+    resumed: bool = False  # Reused from a dropped session
+    turn_active: bool = False  # A response was in flight when it was parked
+    parked_at: float = field(default=0.0, repr=False)
+
+    async def ready(self) -> None:
+        """Wait for the connection (raises if connecting failed)."""
+        if self.connect_task is not None:
+            await self.connect_task
+
+    def park(self, turn_active: bool = False) -> None:
+        """Keep the connection for a reconnect of the same session."""
+        self.manager.park(self, turn_active)
+
+    async def release(self) -> None:
+        """Close the connection (session ended normally)."""
+        await self.manager.release(self)
+
+
+class LiveSessionManager:
+    """Pre-connects and parks Gemini Live connections."""
+
+    def __init__(
+        self,
+        client_factory: Callable[[], GeminiLiveClient] = GeminiLiveClient,
+        grace_seconds: float = VOICE_LIVE_RESUME_GRACE_SECONDS,
+        max_parked: int = VOICE_LIVE_MAX_PARKED,
+    ):
+        self.client_factory = client_factory
+        self.grace_seconds = grace_seconds
+        self.max_parked = max_parked
+        self._parked: dict[LeaseKey, LiveLease] = {}
+        self._expiry: dict[LeaseKey, asyncio.Task] = {}
+        self._stats = {"connects": 0, "resumed": 0, "parked": 0, "expired": 0, "evicted": 0}
+
+    def acquire(self, session_id: str, user_id: str, language: str = "es") -> LiveLease:
+        """
+        Get a Live connection for a voice session without waiting for it.
+
+        Resumes a parked connection for the same session and user, otherwise
+        starts connecting in the background (await ``lease.ready()``).
+
+        Args:
+            session_id: Voice session ID (stable across client reconnects)
+            user_id: Resolved user ID
+            language: Primary language for the base prompt
+
+        Returns:
+            The lease
+        """
+        key = (session_id, user_id)
+        lease = self._parked.pop(key, None)
+        if lease is not None:
+            self._cancel_expiry(key)
+            if lease.client.is_connected:
+                self._stats["resumed"] += 1
+                lease.resumed = True
+                logger.info(f"Resuming Gemini Live session for voice session {session_id}")
+                return lease
+            asyncio.create_task(self._disconnect(lease))
+
+        client = self.client_factory()
+        # User context is not loaded yet; the session sends it once it is
+        task = asyncio.create_task(
+            client.connect(
+                system_instruction=build_voice_system_prompt(language=language),
+                response_modalities=["TEXT"],  # Critical for TTS handoff
+            )
+        )
+        self._stats["connects"] += 1
+        return LiveLease(manager=self, key=key, client=client, connect_task=task)
+
+    def park(self, lease: LiveLease, turn_active: bool = False) -> None:
+        """Keep a dropped session's connection for ``grace_seconds``."""
+        if self.grace_seconds <= 0 or not lease.client.is_connected:
+            asyncio.create_task(self._disconnect(lease))
+            return
+
+        previous = self._parked.pop(lease.key, None)
+        if previous is not None and previous is not lease:
+            self._cancel_expiry(lease.key)
+            asyncio.create_task(self._disconnect(previous))
+        while len(self._parked) >= self.max_parked:
+            oldest = min(self._parked.values(), key=lambda parked: parked.parked_at)
+            self._parked.pop(oldest.key)
+            self._cancel_expiry(oldest.key)
+            self._stats["evicted"] += 1
+            asyncio.create_task(self._disconnect(oldest))
+
+        lease.turn_active = turn_active
+        lease.resumed = False
+        lease.parked_at = time.monotonic()
+        self._parked[lease.key] = lease
+        self._expiry[lease.key] = asyncio.create_task(self._expire(lease))
+        self._stats["parked"] += 1
+
+    async def release(self, lease: LiveLease) -> None:
+        """Close a lease's connection, or stop it connecting."""
+        if lease.connect_task is not None and not lease.connect_task.done():
+            lease.connect_task.cancel()
+            await asyncio.gather(lease.connect_task, return_exceptions=True)
+        await self._disconnect(lease)
+
+    async def close(self) -> None:
+        """Close all parked connections (shutdown)."""
+        for task in self._expiry.values():
+            task.cancel()
+        await asyncio.gather(*self._expiry.values(), return_exceptions=True)
+        self._expiry.clear()
+        parked = list(self._parked.values())
+        self._parked.clear()
+        for lease in parked:
+            await self._disconnect(lease)
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._stats, "parked_now": len(self._parked), "grace_seconds": self.grace_seconds}
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    async def _expire(self, lease: LiveLease) -> None:
+        await asyncio.sleep(self.grace_seconds)
+        if self._parked.get(lease.key) is lease:
+            del self._parked[lease.key]
+            self._expiry.pop(lease.key, None)
+            self._stats["expired"] += 1
+            await self._disconnect(lease)
+
+    def _cancel_expiry(self, key: LeaseKey) -> None:
+        task = self._expiry.pop(key, None)
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _disconnect(self, lease: LiveLease) -> None:
+        if lease.client.is_connected:
+            await lease.client.disconnect()
+
+
+live_sessions = LiveSessionManager()
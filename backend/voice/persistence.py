@@ -0,0 +1,144 @@
+"""
+Batched Clipboard Persistence for Voice Sessions
+
+Writing the SessionClipboard (Redis SETEX + a Supabase upsert) after every
+spoken turn is wasteful in a fast back-and-forth. Turns are added to the
+in-memory clipboard immediately and written out in one ``set_session``:
+
+- ``debounce_seconds`` after the last turn (the conversation went quiet)
+- at the latest ``max_delay_seconds`` after the first unsaved turn
+- as soon as ``max_pending_turns`` turns are unsaved, so nothing falls out of
+  the clipboard's 20-message window before it is stored
+- when the session ends (disconnect)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+if TYPE_CHECKING:
+    from schemas.clipboard import SessionClipboard
+
+logger = logging.getLogger(__name__)
+
+VOICE_PERSIST_DEBOUNCE_SECONDS = float(os.getenv("VOICE_PERSIST_DEBOUNCE_SECONDS", "3"))
+VOICE_PERSIST_MAX_DELAY_SECONDS = float(os.getenv("VOICE_PERSIST_MAX_DELAY_SECONDS", "20"))
+VOICE_PERSIST_MAX_PENDING_TURNS = int(os.getenv("VOICE_PERSIST_MAX_PENDING_TURNS", "5"))
+
+# Process-wide counters for /voice/health
+persistence_stats = {"turns": 0, "writes": 0, "failed_writes": 0}
+
+
+async def _save_clipboard(clipboard: "SessionClipboard") -> None:
+    # Import here to avoid circular imports
+    from services.session_store import set_session
+
+    await set_session(clipboard)
+
+
+class ClipboardWriter:
+    """Buffers a voice session's turns and writes its clipboard in batches."""
+
+    def __init__(
+        self,
+        clipboard: "SessionClipboard",
+        save: Callable[["SessionClipboard"], Awaitable[None]] = _save_clipboard,
+        debounce_seconds: float = VOICE_PERSIST_DEBOUNCE_SECONDS,
+        max_delay_seconds: float = VOICE_PERSIST_MAX_DELAY_SECONDS,
+        max_pending_turns: int = VOICE_PERSIST_MAX_PENDING_TURNS,
+    ):
+        self.clipboard = clipboard
+        self.save = save
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_pending_turns = max(1, max_pending_turns)
+
+        self.pending_turns = 0
+        self._first_pending_at: float | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+
+    def record_turn(self, user_text: str, assistant_text: str, widget_type: str | None = None) -> None:
+        """
+        Add a finished turn to the clipboard and schedule a write.
+
+        Args:
+            user_text: What the user said (may be empty)
+            assistant_text: What GENESIS answered (may be empty)
+            widget_type: Widget shown with the answer, if any
+        """
+        from schemas.clipboard import MessageRole
+
+        if user_text:
+            self.clipboard.add_message(role=MessageRole.USER, content=user_text, agent="GENESIS")
+        if assistant_text:
+            self.clipboard.add_message(
+                role=MessageRole.ASSISTANT,
+                content=assistant_text,
+                agent="GENESIS",
+                widget_type=widget_type,
+            )
+        if not (user_text or assistant_text):
+            return
+
+        persistence_stats["turns"] += 1
+        self.pending_turns += 1
+        now = time.monotonic()
+        if self._first_pending_at is None:
+            self._first_pending_at = now
+
+        if self.pending_turns >= self.max_pending_turns:
+            self._schedule(0)
+        else:
+            deadline = self._first_pending_at + self.max_delay_seconds
+            self._schedule(max(0.0, min(self.debounce_seconds, deadline - now)))
+
+    async def flush(self) -> None:
+        """Write the clipboard now if any turn is unsaved."""
+        self._cancel_timer()
+        async with self._lock:
+            if not self.pending_turns:
+                return
+            pending = self.pending_turns
+            self.pending_turns = 0
+            self._first_pending_at = None
+            try:
+                await self.save(self.clipboard)
+            except Exception as e:
+                persistence_stats["failed_writes"] += 1
+                logger.warning(f"Failed to persist voice conversation: {e}")
+                # Keep the turns unsaved; the next flush retries
+                self.pending_turns += pending
+                self._first_pending_at = self._first_pending_at or time.monotonic()
+                return
+            persistence_stats["writes"] += 1
+            logger.debug(
+                f"Persisted {pending} voice turn(s) for session {self.clipboard.session_id}"
+            )
+
+    async def close(self) -> None:
+        """Final write when the session ends."""
+        if self._flush_task is not None and not self._flush_task.done():
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        await self.flush()
+
+    # =========================================================================
+    # Timer
+    # =========================================================================
+
+    def _schedule(self, delay: float) -> None:
+        self._cancel_timer()
+        self._timer = asyncio.get_running_loop().call_later(delay, self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._timer = None
+        # A running flush is never cancelled; a new one queues on the lock
+        self._flush_task = asyncio.create_task(self.flush())
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,213 @@
+"""
+Outbound Audio Playout Buffer
+
+ElevenLabs delivers audio in bursts, much faster than real time. Sending each
+chunk as soon as it arrives saturates the client socket, and on a slow
+network the backlog piles up inside Starlette where an interruption can no
+longer reach it. Each session instead queues outbound PCM here and a sender
+task paces it:
+
+- Chunks are split into frames of at most ``frame_ms``
+- Frames go out at real-time rate, keeping the client ``lead_ms`` ahead of
+  playback (enough for its jitter buffer, little enough to stop quickly)
+- The queue holds at most ``max_buffer_ms`` of audio; producers wait for
+  space (backpressure on the TTS stream) instead of growing it
+- ``clear()`` drops everything still queued, oldest first (barge-in)
+
+Metrics: queue depth, underruns (the client ran out of audio mid-response),
+dropped audio, frames sent. Per-session via ``stats()`` and summed across
+sessions in ``playout_metrics``.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable
+
+from .audio_utils import SAMPLE_RATE
+
+logger = logging.getLogger(__name__)
+
+VOICE_PLAYOUT_FRAME_MS = int(os.getenv("VOICE_PLAYOUT_FRAME_MS", "40"))
+VOICE_PLAYOUT_LEAD_MS = int(os.getenv("VOICE_PLAYOUT_LEAD_MS", "200"))
+VOICE_PLAYOUT_MAX_BUFFER_MS = int(os.getenv("VOICE_PLAYOUT_MAX_BUFFER_MS", "3000"))
+
+BYTES_PER_MS = SAMPLE_RATE * 2 // 1000  # PCM 16-bit mono
+
+
+@dataclass
+class PlayoutMetrics:
+    """Counters summed over every session in this process."""
+
+    frames_sent: int = 0
+    audio_sent_ms: float = 0.0
+    underruns: int = 0
+    dropped_ms: float = 0.0
+    max_depth_ms: float = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {key: round(value, 1) for key, value in asdict(self).items()}
+
+
+playout_metrics = PlayoutMetrics()
+
+
+class AudioPlayout:
+    """Paced, bounded outbound audio queue for one session."""
+
+    def __init__(
+        self,
+        send: Callable[[bytes], Awaitable[None]],
+        frame_ms: int = VOICE_PLAYOUT_FRAME_MS,
+        lead_ms: int = VOICE_PLAYOUT_LEAD_MS,
+        max_buffer_ms: int = VOICE_PLAYOUT_MAX_BUFFER_MS,
+        metrics: PlayoutMetrics | None = None,
+    ):
+        self.send = send
+        self.frame_bytes = max(2, frame_ms * BYTES_PER_MS)
+        self.lead = lead_ms / 1000
+        # Always room for at least one frame, or put() could never proceed
+        self.max_buffer_bytes = max(max_buffer_ms * BYTES_PER_MS, self.frame_bytes)
+        self.metrics = metrics or playout_metrics
+
+        # Audio frames, and None markers for the end of a response
+        self._frames: deque[bytes | None] = deque()
+        self._buffered_bytes = 0
+        self._changed = asyncio.Condition()
+        self._sender: asyncio.Task | None = None
+        self._sending = False
+        # Monotonic time at which the client finishes playing what was sent
+        self._play_until = 0.0
+        # True from the first frame sent of a response until its end marker
+        self._in_response = False
+
+        self.underruns = 0
+        self.dropped_ms = 0.0
+        self.max_depth_ms = 0.0
+
+    @property
+    def depth_ms(self) -> float:
+        """Audio queued but not yet sent."""
+        return self._buffered_bytes / BYTES_PER_MS
+
+    # =========================================================================
+    # Producer side
+    # =========================================================================
+
+    async def put(self, audio_bytes: bytes) -> None:
+        """
+        Queue audio for paced sending, waiting while the buffer is full.
+
+        Args:
+            audio_bytes: PCM 16-bit mono audio at the client rate
+        """
+        self._ensure_sender()
+        for start in range(0, len(audio_bytes), self.frame_bytes):
+            frame = audio_bytes[start:start + self.frame_bytes]
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda: self._buffered_bytes + len(frame) <= self.max_buffer_bytes
+                )
+                self._frames.append(frame)
+                self._buffered_bytes += len(frame)
+                self.max_depth_ms = max(self.max_depth_ms, self.depth_ms)
+                self.metrics.max_depth_ms = max(self.metrics.max_depth_ms, self.depth_ms)
+                self._changed.notify_all()
+
+    async def drain(self) -> None:
+        """Wait until everything queued has been sent."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: not self._frames and not self._sending)
+
+    async def finish(self) -> None:
+        """Mark the end of a response; the gap before the next one is not an underrun."""
+        self._ensure_sender()
+        async with self._changed:
+            self._frames.append(None)
+            self._changed.notify_all()
+
+    async def clear(self) -> None:
+        """Drop all queued audio (interruption). Returns once nothing more can be sent."""
+        async with self._changed:
+            dropped = self._buffered_bytes / BYTES_PER_MS
+            self._frames.clear()
+            self._buffered_bytes = 0
+            await self._changed.wait_for(lambda: not self._sending)
+            self._play_until = 0.0
+            self._in_response = False
+            self._changed.notify_all()
+        if dropped:
+            self.dropped_ms += dropped
+            self.metrics.dropped_ms += dropped
+
+    async def close(self) -> None:
+        """Stop the sender task, dropping queued audio."""
+        self._frames.clear()
+        self._buffered_bytes = 0
+        if self._sender is not None:
+            self._sender.cancel()
+            await asyncio.gather(self._sender, return_exceptions=True)
+            self._sender = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "depth_ms": round(self.depth_ms, 1),
+            "max_depth_ms": round(self.max_depth_ms, 1),
+            "underruns": self.underruns,
+            "dropped_ms": round(self.dropped_ms, 1),
+        }
+
+    # =========================================================================
+    # Sender
+    # =========================================================================
+
+    def _ensure_sender(self) -> None:
+        if self._sender is None or self._sender.done():
+            self._sender = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: bool(self._frames))
+                frame = self._frames[0]
+                if frame is None:
+                    self._frames.popleft()
+                    self._in_response = False
+                    self._changed.notify_all()
+                    continue
+
+            now = time.monotonic()
+            if self._play_until < now:
+                if self._in_response:
+                    # Client played everything we sent before more arrived
+                    self.underruns += 1
+                    self.metrics.underruns += 1
+                self._play_until = now
+            ahead = self._play_until - now - self.lead
+            if ahead > 0:
+                await asyncio.sleep(ahead)
+
+            async with self._changed:
+                # clear() may have run while we slept
+                if not self._frames or self._frames[0] is not frame:
+                    continue
+                self._frames.popleft()
+                self._buffered_bytes -= len(frame)
+                self._sending = True
+                self._changed.notify_all()
+            try:
+                await self.send(frame)
+            except Exception as e:
+                logger.debug(f"Playout send failed: {e}")
+            finally:
+                async with self._changed:
+                    duration_ms = len(frame) / BYTES_PER_MS
+                    self._play_until += duration_ms / 1000
+                    self._in_response = True
+                    self._sending = False
+                    self._changed.notify_all()
+            self.metrics.frames_sent += 1
+            self.metrics.audio_sent_ms += duration_ms
@@ -0,0 +1,84 @@
+"""
+Voice WebSocket Binary Protocol
+
+Optional transport for /ws/voice where audio travels as raw PCM in binary
+WebSocket frames instead of base64 inside JSON. Control messages (state,
+transcript, widget, end_turn, cancel, ...) stay JSON text frames in both modes.
+
+Negotiation (either is enough):
+- WebSocket subprotocol ``ngx-voice.binary.v1`` (echoed back on accept)
+- Query parameter ``protocol=binary``
+Clients that do neither get the original JSON/base64 protocol.
+
+Binary frame layout (little-endian):
+    byte 0     frame kind (0x01 = PCM 16-bit mono audio at 16 kHz)
+    byte 1     flags (reserved, 0)
+    bytes 2-3  sequence number (uint16, wraps), per direction
+    bytes 4-   payload
+"""
+
+import struct
+
+from fastapi import WebSocket
+
+BINARY_SUBPROTOCOL = "ngx-voice.binary.v1"
+
+FRAME_AUDIO = 0x01
+
+FRAME_HEADER = struct.Struct("<BBH")
+FRAME_HEADER_SIZE = FRAME_HEADER.size
+
+
+class FrameError(ValueError):
+    """Raised for binary frames that cannot be decoded."""
+
+
+def encode_frame(payload: bytes, sequence: int, kind: int = FRAME_AUDIO) -> bytes:
+    """
+    Prefix a payload with the binary frame header.
+
+    Args:
+        payload: Frame payload (raw PCM for audio frames)
+        sequence: Per-direction frame counter (wrapped to 16 bits)
+        kind: Frame kind
+
+    Returns:
+        Header + payload bytes
+    """
+    return FRAME_HEADER.pack(kind, 0, sequence & 0xFFFF) + payload
+
+
+def decode_frame(data: bytes) -> tuple[int, int, bytes]:
+    """
+    Split a binary frame into its header fields and payload.
+
+    Args:
+        data: Raw binary WebSocket message
+
+    Returns:
+        (kind, sequence, payload)
+
+    Raises:
+        FrameError: If the frame is shorter than the header
+    """
+    if len(data) < FRAME_HEADER_SIZE:
+        raise FrameError(f"Binary frame too short: {len(data)} bytes")
+    kind, _flags, sequence = FRAME_HEADER.unpack_from(data)
+    return kind, sequence, data[FRAME_HEADER_SIZE:]
+
+
+def negotiate_binary(websocket: WebSocket, requested: str | None) -> tuple[bool, str | None]:
+    """
+    Decide the audio transport for a connection before accepting it.
+
+    Args:
+        websocket: Incoming (not yet accepted) WebSocket
+        requested: Value of the ``protocol`` query parameter
+
+    Returns:
+        (binary_audio, subprotocol_to_accept)
+    """
+    offered = websocket.scope.get("subprotocols") or []
+    if BINARY_SUBPROTOCOL in offered:
+        return True, BINARY_SUBPROTOCOL
+    return (requested or "").lower() == "binary", None
@@ -0,0 +1,167 @@
+"""
+Streaming Polyphase Resampler
+
+Converts PCM 16-bit mono audio between sample rates chunk by chunk, e.g.
+Gemini Live output (24 kHz) to the 16 kHz client wire format.
+
+Rational resampling by L/M (reduced by their gcd) with a Kaiser-windowed sinc
+low-pass filter, split into L polyphase branches so only the taps that touch
+real input samples are evaluated. Filter history, the output phase and any odd
+trailing byte are carried across ``process`` calls, so consecutive chunks
+produce exactly the same samples as resampling the concatenated stream (no
+boundary clicks).
+
+Usage:
+    resampler = StreamingResampler(24000, 16000)
+    for chunk in chunks:
+        out = resampler.process(chunk)
+    tail = resampler.flush()
+"""
+
+from math import gcd
+
+import numpy as np
+
+from .audio_utils import PCM_DTYPE, SAMPLE_WIDTH
+
+# Filter taps per polyphase branch (filter length = TAPS_PER_PHASE * L)
+TAPS_PER_PHASE = 32
+# Passband edge as a fraction of the lower Nyquist frequency
+ROLLOFF = 0.9
+# Kaiser window beta (~80 dB stopband attenuation)
+KAISER_BETA = 8.6
+
+
+def design_polyphase_filter(
+    up: int,
+    down: int,
+    taps_per_phase: int = TAPS_PER_PHASE,
+    rolloff: float = ROLLOFF,
+    beta: float = KAISER_BETA,
+) -> np.ndarray:
+    """
+    Design the low-pass prototype and split it into polyphase branches.
+
+    Args:
+        up: Interpolation factor L
+        down: Decimation factor M
+        taps_per_phase: Taps in each branch
+        rolloff: Cutoff as a fraction of the lower Nyquist frequency
+        beta: Kaiser window shape parameter
+
+    Returns:
+        Array of shape (L, taps_per_phase); row p holds h[p + i*L]
+    """
+    length = up * taps_per_phase
+    # Cutoff in cycles/sample at the upsampled rate
+    cutoff = 0.5 * rolloff / max(up, down)
+    # Centre on an integer tap (length // 2) so the delay is a whole number
+    # of upsampled samples and can be compensated exactly
+    n = np.arange(length) - length // 2
+    window = np.kaiser(length + 1, beta)[:length]
+    prototype = 2 * cutoff * np.sinc(2 * cutoff * n) * window
+    # Gain of L compensates for the zeros inserted by upsampling
+    prototype *= up / prototype.sum()
+    return prototype.reshape(taps_per_phase, up).T.copy()
+
+
+class StreamingResampler:
+    """
+    Stateful rational-ratio resampler for streamed PCM 16-bit mono audio.
+
+    Output is time-aligned with the input but held back by about
+    ``taps_per_phase / 2`` input samples (~0.7 ms at 24 kHz with the
+    defaults) until the filter has seen them; call ``flush`` at the end of a
+    stream to emit that tail.
+    """
+
+    def __init__(
+        self,
+        from_rate: int,
+        to_rate: int,
+        taps_per_phase: int = TAPS_PER_PHASE,
+    ):
+        if from_rate <= 0 or to_rate <= 0:
+            raise ValueError("Sample rates must be positive")
+
+        self.from_rate = from_rate
+        self.to_rate = to_rate
+        divisor = gcd(from_rate, to_rate)
+        self.up = to_rate // divisor
+        self.down = from_rate // divisor
+        self.taps_per_phase = taps_per_phase
+        self._bank = design_polyphase_filter(self.up, self.down, taps_per_phase)
+        # Tap i of every branch reads the input sample i steps before the newest
+        self._offsets = np.arange(taps_per_phase)
+        self.reset()
+
+    @property
+    def passthrough(self) -> bool:
+        return self.up == self.down
+
+    def reset(self) -> None:
+        """Drop filter history, e.g. when a turn is interrupted."""
+        self._history = np.zeros(self.taps_per_phase - 1, dtype=np.float64)
+        # Next output position on the upsampled time axis, relative to
+        # history[0]. Starting half a filter length in compensates the group
+        # delay, so output sample 0 is centred on input sample 0.
+        self._position = (self.taps_per_phase - 1) * self.up + self.taps_per_phase * self.up // 2
+        self._odd_byte = b""
+        self._has_input = False
+
+    def process(self, audio_bytes: bytes) -> bytes:
+        """
+        Resample the next chunk of the stream.
+
+        Args:
+            audio_bytes: Raw PCM audio data (16-bit signed, little-endian);
+                may split a sample across chunks
+
+        Returns:
+            Resampled PCM bytes (possibly empty for very small chunks)
+        """
+        if self._odd_byte:
+            audio_bytes = self._odd_byte + audio_bytes
+        usable = len(audio_bytes) - len(audio_bytes) % SAMPLE_WIDTH
+        self._odd_byte = bytes(audio_bytes[usable:])
+
+        if self.passthrough:
+            return bytes(audio_bytes[:usable])
+
+        samples = np.frombuffer(audio_bytes, dtype=PCM_DTYPE, count=usable // SAMPLE_WIDTH)
+        self._has_input = self._has_input or samples.size > 0
+        return self._filter(samples)
+
+    def flush(self) -> bytes:
+        """Emit the delayed tail of the stream and reset the state.
+
+        Returns empty bytes when nothing was processed since the last reset.
+        """
+        if self.passthrough or not self._has_input:
+            self.reset()
+            return b""
+        tail = self._filter(np.zeros(self.taps_per_phase // 2, dtype=PCM_DTYPE))
+        self.reset()
+        return tail
+
+    def _filter(self, samples: np.ndarray) -> bytes:
+        signal = np.concatenate((self._history, samples))
+
+        # Output k sits at upsampled time t_k; its newest contributing input
+        # sample is t_k // L, which must already be in the buffer
+        last_time = len(signal) * self.up - 1
+        count = max(0, (last_time - self._position) // self.down + 1)
+        times = self._position + self.down * np.arange(count)
+
+        newest = times // self.up
+        phases = times % self.up
+        windows = signal[newest[:, None] - self._offsets[None, :]]
+        output = np.einsum("ij,ij->i", windows, self._bank[phases])
+
+        # Keep only what the next chunk's first outputs can reach
+        keep = self.taps_per_phase - 1
+        consumed = len(signal) - keep
+        self._history = signal[consumed:]
+        self._position += self.down * count - consumed * self.up
+
+        return np.clip(np.rint(output), -32768, 32767).astype(PCM_DTYPE).tobytes()
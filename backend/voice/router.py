@@ -4,21 +4,30 @@ Voice WebSocket Router
 FastAPI router for voice mode WebSocket endpoint.
 
 Endpoint: /ws/voice
-Protocol: Bidirectional WebSocket with JSON messages
+Protocol: Bidirectional WebSocket with JSON messages. Clients may negotiate
+binary audio frames (raw PCM, see protocol.py); control messages stay JSON.
+A client that drops without a normal close and reconnects with the same
+session_id within VOICE_LIVE_RESUME_GRACE_SECONDS resumes the same Gemini
+Live conversation (see live_sessions.py).
 
 Client → Server:
-  - audio_chunk: PCM audio data (base64)
-  - end_turn: User finished speaking
-  - cancel: User interrupted
+  - audio_chunk: PCM audio data (base64; binary frames in binary mode)
+  - end_turn: User finished speaking (optional when server VAD is enabled)
+  - cancel: User interrupted (barge-in: stops in-flight speech immediately)
   - text: Hybrid text input
 
 Server → Client:
-  - state: Voice state change (idle, listening, processing, speaking)
-  - audio_chunk: PCM audio response (base64)
+  - queued: Waiting for a free session slot (position in queue)
+  - protocol: Negotiated audio transport (binary mode only, sent first)
+  - state: Voice state change (idle, listening, processing, speaking),
+    optionally with the current input level
+  - audio_chunk: PCM audio response (base64; binary frames in binary mode),
+    paced at real time a little ahead of playback
   - transcript: Real-time transcript text
-  - audio_level: Audio level for UI animation
+  - audio_level: Smoothed audio level for UI animation (rate-limited)
   - widget: Widget payload to render
-  - error: Error message
+  - error: Error message; admission rejections add code (user_limit,
+    queue_full, capacity) and retry_after seconds, then close with 1013
   - end_response: Response complete signal
 """
 
@@ -31,6 +40,13 @@ from services.auth import resolve_user_id_from_headers
 from services.session_store import get_or_create_session, set_session
 from schemas.clipboard import MessageRole
 
+from .capacity import CapacityError, voice_sessions
+from .elevenlabs_client import tts_pool
+from .latency import latency_metrics
+from .live_sessions import live_sessions
+from .persistence import persistence_stats
+from .playout import playout_metrics
+from .protocol import BINARY_SUBPROTOCOL, negotiate_binary
 from .session import VoiceSession, VoiceSessionConfig
 
 logger = logging.getLogger(__name__)
@@ -45,6 +61,7 @@ async def voice_endpoint(
     session_id: str = Query(default=None, description="Session ID for context"),
     user_id: str = Query(default="default", description="User ID"),
     language: str = Query(default="es", description="Primary language (es/en)"),
+    protocol: str = Query(default="json", description="Audio transport: json (base64) or binary"),
 ):
     """
     WebSocket endpoint for voice mode.
@@ -56,13 +73,21 @@ async def voice_endpoint(
         session_id: Optional session ID for context continuity
         user_id: User identifier
         language: Primary language preference (es/en)
+        protocol: "binary" for raw PCM binary frames (or offer the
+            ngx-voice.binary.v1 subprotocol)
 
     Protocol:
         See module docstring for message formats.
     """
-    await websocket.accept()
-    effective_user_id = resolve_user_id_from_headers(websocket.headers, user_id)
-    logger.info(f"Voice WebSocket connected: user={effective_user_id}, session={session_id}")
+    binary_audio, subprotocol = negotiate_binary(websocket, protocol)
+    await websocket.accept(subprotocol=subprotocol)
+    # Only a user ID from a verified token counts for the per-user session limit
+    authenticated_user_id = resolve_user_id_from_headers(websocket.headers, "") or None
+    effective_user_id = authenticated_user_id or user_id
+    logger.info(
+        f"Voice WebSocket connected: user={effective_user_id}, session={session_id}, "
+        f"transport={'binary' if binary_audio else 'json'}"
+    )
 
     # Generate session ID if not provided
     effective_session_id = session_id or str(uuid4())
@@ -72,14 +97,51 @@ async def voice_endpoint(
         session_id=effective_session_id,
         user_id=effective_user_id,
         language=language,
+        binary_audio=binary_audio,
     )
 
+    # Admission control: bounded sessions per process and per user
+    try:
+        slot = await voice_sessions.admit(
+            effective_session_id,
+            authenticated_user_id,
+            on_wait=lambda position: websocket.send_json({"type": "queued", "position": position}),
+        )
+    except CapacityError as e:
+        logger.warning(f"Voice session not admitted: user={effective_user_id}, reason={e.reason}")
+        try:
+            await websocket.send_json({
+                "type": "error",
+                "code": e.reason,
+                "message": str(e),
+                "retry_after": e.retry_after,
+            })
+            await websocket.close(code=1013, reason=e.reason)  # Try again later
+        except Exception:
+            pass  # Client already gone
+        return
+
+    try:
+        await _serve_voice_session(websocket, config)
+    finally:
+        voice_sessions.release(slot)
+
+
+async def _serve_voice_session(websocket: WebSocket, config: VoiceSessionConfig) -> None:
+    """Load context and run an admitted voice session until it ends."""
+    # Start (or resume) the Gemini Live connection while the clipboard loads
+    live = live_sessions.acquire(config.session_id, config.user_id, config.language)
+
     # Load user context from SessionClipboard
-    clipboard = await get_or_create_session(effective_session_id, effective_user_id)
+    try:
+        clipboard = await get_or_create_session(config.session_id, config.user_id)
+    except BaseException:
+        await live.release()
+        raise
     user_context = None
     if clipboard.user_profile:
         user_context = clipboard.user_profile.model_dump()
-        logger.debug(f"Loaded user profile for voice session: {effective_user_id}")
+        logger.debug(f"Loaded user profile for voice session: {config.user_id}")
 
     # Create and run voice session
     session = VoiceSession(
@@ -87,12 +149,13 @@ async def voice_endpoint(
         config=config,
         user_context=user_context,
         clipboard=clipboard,  # Pass clipboard for conversation persistence
+        live=live,
     )
 
     try:
         await session.run()
     except WebSocketDisconnect:
-        logger.info(f"Voice WebSocket disconnected: session={effective_session_id}")
+        logger.info(f"Voice WebSocket disconnected: session={config.session_id}")
     except Exception as e:
         # Check if this is a normal close (code 1000, 1001) or ASGI message after close
         error_str = str(e)
@@ -118,17 +181,27 @@ async def voice_health():
     Health check for voice service.
 
     Returns:
-        Status and configuration info
+        Status and configuration info, plus live session counts and TTS pool,
+        playout, per-stage turn latency, Gemini Live connection and clipboard
+        write metrics for this process
     """
     return {
         "status": "ok",
         "service": "voice",
         "features": {
             "bidirectional_audio": True,
+            "binary_audio": True,
+            "binary_subprotocol": BINARY_SUBPROTOCOL,
             "widget_generation": True,
             "languages": ["es", "en"],
             "model_audio": "gemini-2.5-flash-native-audio-preview-12-2025",
             "model_text": "gemini-2.0-flash-exp",
             "tts": "elevenlabs",
         },
+        "tts_pool": tts_pool.stats(),
+        "playout": playout_metrics.snapshot(),
+        "latency": latency_metrics.snapshot(),
+        "live_sessions": live_sessions.stats(),
+        "sessions": voice_sessions.stats(),
+        "clipboard_persistence": dict(persistence_stats),
     }
@@ -16,25 +16,37 @@ Responsibilities:
 """
 
 import asyncio
+import json
 import logging
+import time
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import TYPE_CHECKING, Any, AsyncGenerator
 
-from fastapi import WebSocket
+from fastapi import WebSocket, WebSocketDisconnect
 
 from .audio_utils import decode_audio_base64, encode_audio_base64, calculate_audio_level
 from .gemini_live import (
     GeminiLiveClient,
     GeminiEvent,
     GeminiEventType,
+    build_user_context_prompt,
     build_voice_system_prompt,
 )
+from .chunker import VOICE_TTS_CHUNKING, TextChunker, chunk_text_stream
 from .elevenlabs_client import ElevenLabsClient
+from .persistence import ClipboardWriter
+from .playout import AudioPlayout
+from .latency import RESPONSE_MILESTONES, TurnTrace, latency_metrics
+from .levels import VOICE_LEVEL_MAX_HZ, VOICE_LEVEL_ON_STATE, AudioLevelPublisher
+from .protocol import FRAME_AUDIO, FRAME_HEADER_SIZE, FrameError, decode_frame, encode_frame
+from .vad import VOICE_VAD_ENABLED, VOICE_VAD_HANGOVER_MS, VadEvent, VoiceActivityDetector
 
 if TYPE_CHECKING:
     from schemas.clipboard import SessionClipboard
 
+    from .live_sessions import LiveLease
+
 logger = logging.getLogger(__name__)
 
 
@@ -56,6 +68,12 @@ class VoiceSessionConfig:
     user_id: str = "default"
     language: str = "es"
     voice_name: str | None = None  # ElevenLabs voice ID
+    vad_enabled: bool = VOICE_VAD_ENABLED  # End turns on server-detected silence
+    vad_hangover_ms: int = VOICE_VAD_HANGOVER_MS
+    binary_audio: bool = False  # Raw PCM binary frames instead of base64 JSON
+    level_max_hz: float = VOICE_LEVEL_MAX_HZ  # audio_level message rate cap (0 = off)
+    level_on_state: bool = VOICE_LEVEL_ON_STATE  # Include the level in state messages
+    tts_chunking: bool = VOICE_TTS_CHUNKING  # Re-cut LLM text at phrase boundaries for TTS
 
 
 @dataclass
@@ -96,17 +114,30 @@ class VoiceSession:
         config: VoiceSessionConfig,
         user_context: dict[str, Any] | None = None,
         clipboard: "SessionClipboard | None" = None,
+        live: "LiveLease | None" = None,
     ):
         self.websocket = websocket
         self.config = config
         self.user_context = user_context or {}
         self.clipboard = clipboard  # For conversation persistence
+        self.persistence = ClipboardWriter(clipboard) if clipboard is not None else None
         self.state = VoiceSessionState()
 
-        # Clients
-        self.gemini_client = GeminiLiveClient()
+        # Clients (a lease is already connecting, or resumed from a dropped session)
+        self.live = live
+        self.gemini_client = live.client if live is not None else GeminiLiveClient()
         self.elevenlabs_client = ElevenLabsClient()
 
+        # Server-side end-of-speech detection
+        self.vad = VoiceActivityDetector(hangover_ms=config.vad_hangover_ms) if config.vad_enabled else None
+        self._turn_ended_by_vad = False
+
+        # Smoothed, rate-limited input level for the orb animation
+        self.level_publisher = AudioLevelPublisher(max_hz=config.level_max_hz)
+
+        # Paced, bounded outbound audio (jitter buffer toward the client)
+        self.playout = AudioPlayout(self._send_audio_frame)
+
         # Queues for text-to-speech pipeline
         self.tts_text_queue: asyncio.Queue[str | None] = asyncio.Queue()
 
@@ -114,8 +145,22 @@ class VoiceSession:
         self._current_turn_user_text: str = ""
         self._current_turn_assistant_text: str = ""
 
+        # Barge-in: the in-flight TTS turn, and whether the rest of the
+        # interrupted Gemini response must be dropped
+        self._tts_task: asyncio.Task | None = None
+        self._gemini_turn_active = False
+        self._discard_gemini_turn = False
+
+        # Time from the first text of a turn to its first audio chunk (last turn)
+        self.last_time_to_first_audio_ms: float | None = None
+        # Milestones of the current turn, folded into latency_metrics at its end
+        self.trace = TurnTrace()
+
         self._running = False
         self._ws_open = True  # Track WebSocket state for safe sending
+        self._outbound_sequence = 0  # Binary audio frame counter
+        self._client_close_code: int | None = None  # Set when the client disconnects
+        self._cleaned_up = False
         self._tasks: list[asyncio.Task] = []
 
     @property
@@ -129,21 +174,21 @@ class VoiceSession:
     async def run(self) -> None:
         """Main session loop."""
         try:
-            # Build system prompt
-            system_prompt = build_voice_system_prompt(
-                user_context=self.user_context,
-                language=self.config.language,
-            )
+            await self._connect_gemini()
 
-            # Connect to Gemini Live API in TEXT-only output mode
-            # We want Gemini to listen to audio but respond with text + tools
-            await self.gemini_client.connect(
-                system_instruction=system_prompt,
-                response_modalities=["TEXT"],  # Critical for TTS handoff
-            )
+            # Open the TTS socket now so the first response starts speaking sooner
+            self.elevenlabs_client.prewarm(self.config.voice_name)
 
             self._running = True
 
+            # Announce the negotiated audio transport to binary clients
+            if self.config.binary_audio:
+                await self._safe_send({
+                    "type": "protocol",
+                    "value": "binary",
+                    "header_bytes": FRAME_HEADER_SIZE,
+                })
+
             # Send initial state
             await self._send_state(VoiceState.IDLE)
 
@@ -168,18 +213,58 @@ class VoiceSession:
         finally:
             await self.cleanup()
 
+    async def _connect_gemini(self) -> None:
+        """Connect to Gemini Live, or finish attaching the leased connection."""
+        if self.live is None:
+            # Build system prompt
+            system_prompt = build_voice_system_prompt(
+                user_context=self.user_context,
+                language=self.config.language,
+            )
+
+            # Connect to Gemini Live API in TEXT-only output mode
+            # We want Gemini to listen to audio but respond with text + tools
+            await self.gemini_client.connect(
+                system_instruction=system_prompt,
+                response_modalities=["TEXT"],  # Critical for TTS handoff
+            )
+            return
+
+        # Started while the clipboard was loading
+        await self.live.ready()
+        if self.live.resumed:
+            # Drop whatever is left of a response cut off by the disconnect
+            self._gemini_turn_active = self.live.turn_active
+            self._discard_gemini_turn = self.live.turn_active
+        elif self.user_context:
+            await self.gemini_client.send_context(build_user_context_prompt(self.user_context))
+
     async def cleanup(self) -> None:
-        """Clean up resources."""
+        """Clean up resources (safe to call more than once)."""
+        if self._cleaned_up:
+            return
+        self._cleaned_up = True
         self._running = False
         self._ws_open = False  # Mark WebSocket as closed to prevent further sends
 
         # Cancel all tasks
+        if self._tts_task and not self._tts_task.done():
+            self._tts_task.cancel()
         for task in self._tasks:
             if not task.done():
                 task.cancel()
-
-        # Disconnect clients
-        if self.gemini_client.is_connected:
+        await self.playout.close()
+        if self.persistence is not None:
+            await self.persistence.close()  # Unsaved turns are written on disconnect
+        logger.debug(f"Voice session {self.session_id} playout: {self.playout.stats()}")
+
+        # Disconnect clients; keep a leased connection if the client just dropped
+        if self.live is not None:
+            if self._client_close_code not in (None, 1000):
+                self.live.park(turn_active=self._gemini_turn_active)
+            else:
+                await self.live.release()
+        elif self.gemini_client.is_connected:
             await self.gemini_client.disconnect()
 
         logger.info(f"Voice session {self.session_id} cleaned up")
@@ -190,39 +275,22 @@ class VoiceSession:
         """Handle incoming WebSocket messages."""
         try:
             while self._running:
-                message = await self.websocket.receive_json()
-                msg_type = message.get("type")
-
-                if msg_type == "audio_chunk":
-                    audio_b64 = message.get("data", "")
-                    audio_bytes = decode_audio_base64(audio_b64)
-
-                    if self.state.current_state == VoiceState.IDLE:
-                        await self._send_state(VoiceState.LISTENING)
-
-                    # UI Audio feedback
-                    level = calculate_audio_level(audio_bytes)
-                    if level > 0.01:
-                        await self._send_audio_level(level)
-
-                    await self.gemini_client.send_audio(audio_bytes)
-
-                elif msg_type == "end_turn":
-                    await self._send_state(VoiceState.PROCESSING)
-                    await self.gemini_client.end_audio_stream()
-
-                elif msg_type == "cancel":
-                    await self._handle_interruption()
-
-                elif msg_type == "text":
-                    text = message.get("text", "")
-                    if text:
-                        # Capture user text for persistence (hybrid mode)
-                        self._current_turn_user_text = text
-                        await self._send_state(VoiceState.PROCESSING)
-                        await self.gemini_client.send_text(text)
+                if not self.config.binary_audio:
+                    await self._handle_client_message(await self.websocket.receive_json())
+                    continue
+
+                # Binary protocol: audio arrives as binary frames, control as JSON text
+                frame = await self.websocket.receive()
+                if frame["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(frame.get("code", 1000), frame.get("reason"))
+                if frame.get("bytes") is not None:
+                    await self._handle_client_frame(frame["bytes"])
+                elif frame.get("text") is not None:
+                    await self._handle_client_message(json.loads(frame["text"]))
 
         except Exception as e:
+            if isinstance(e, WebSocketDisconnect):
+                self._client_close_code = e.code
             # Check if this is a normal WebSocket close (code 1000 or 1001)
             error_str = str(e)
             is_normal_close = "(1000," in error_str or "(1001," in error_str
@@ -234,6 +302,87 @@ class VoiceSession:
                 logger.error(f"Error receiving from client: {e}")
                 raise
 
+    async def _handle_client_frame(self, data: bytes) -> None:
+        """Handle a binary frame (binary protocol only)."""
+        try:
+            kind, _sequence, payload = decode_frame(data)
+        except FrameError as e:
+            logger.warning(f"Dropping invalid binary frame: {e}")
+            return
+        if kind == FRAME_AUDIO:
+            await self._handle_client_audio(payload)
+        else:
+            logger.debug(f"Ignoring binary frame of unknown kind {kind}")
+
+    async def _handle_client_message(self, message: dict[str, Any]) -> None:
+        """Handle a JSON message (both protocols)."""
+        msg_type = message.get("type")
+
+        if msg_type == "audio_chunk":
+            await self._handle_client_audio(decode_audio_base64(message.get("data", "")))
+
+        elif msg_type == "end_turn":
+            # The client's own silence timeout fires after our VAD did
+            if self._turn_ended_by_vad:
+                self._turn_ended_by_vad = False
+                return
+            if self.vad is not None:
+                self.vad.reset()
+            await self._end_user_turn("client")
+
+        elif msg_type == "cancel":
+            if self.vad is not None:
+                self.vad.reset()
+            self._turn_ended_by_vad = False
+            await self._handle_interruption()
+
+        elif msg_type == "text":
+            text = message.get("text", "")
+            if text:
+                # Capture user text for persistence (hybrid mode)
+                self._current_turn_user_text = text
+                self._close_stale_trace()
+                self.trace.mark("user_turn_end")
+                self.trace.end_source = self.trace.end_source or "text"
+                await self._send_state(VoiceState.PROCESSING)
+                await self.gemini_client.send_text(text)
+
+    async def _handle_client_audio(self, audio_bytes: bytes) -> None:
+        """Forward a chunk of user audio to Gemini and run end-of-speech detection."""
+        if self.state.current_state == VoiceState.IDLE:
+            # New user turn: a quiet one may never trigger VAD, so the
+            # client's end_turn must close it
+            self._turn_ended_by_vad = False
+            self._close_stale_trace()
+            self.trace.mark("first_user_audio")
+            await self._send_state(VoiceState.LISTENING)
+
+        # UI Audio feedback
+        level = self.level_publisher.update(calculate_audio_level(audio_bytes))
+        self.state.audio_level = self.level_publisher.level
+        if level is not None:
+            await self._send_audio_level(level)
+
+        await self.gemini_client.send_audio(audio_bytes)
+
+        if self.vad is not None:
+            vad_event = self.vad.process(audio_bytes)
+            if vad_event == VadEvent.SPEECH_START:
+                self._turn_ended_by_vad = False
+            elif vad_event == VadEvent.SPEECH_END and not self._turn_ended_by_vad:
+                logger.debug(f"VAD end of speech, closing turn: session={self.session_id}")
+                self._turn_ended_by_vad = True
+                await self._end_user_turn("vad")
+
+    async def _end_user_turn(self, source: str) -> None:
+        """Close the user's audio turn so Gemini starts responding."""
+        self.trace.mark("user_turn_end")
+        self.trace.end_source = self.trace.end_source or source
+        self.level_publisher.reset()
+        self.state.audio_level = 0.0
+        await self._send_state(VoiceState.PROCESSING)
+        await self.gemini_client.end_audio_stream()
+
     async def _receive_from_gemini(self) -> None:
         """Handle Gemini events and route to TTS."""
         try:
@@ -241,11 +390,31 @@ class VoiceSession:
                 if not self._running:
                     break
 
+                if event.type == GeminiEventType.INTERRUPTED:
+                    # Gemini heard the user over its response: same as a client cancel
+                    if self._gemini_turn_active and not self._discard_gemini_turn:
+                        await self._handle_interruption()
+                    self._gemini_turn_active = False
+                    self._discard_gemini_turn = False
+                    continue
+
+                if event.type == GeminiEventType.TURN_COMPLETE:
+                    self._gemini_turn_active = False
+                    if self._discard_gemini_turn:
+                        # Tail of an interrupted response, already cut off
+                        self._discard_gemini_turn = False
+                        continue
+                elif event.type in (GeminiEventType.TRANSCRIPT, GeminiEventType.AUDIO, GeminiEventType.TOOL_CALL):
+                    if self._discard_gemini_turn:
+                        continue
+                    self._gemini_turn_active = True
+
                 if event.type == GeminiEventType.TRANSCRIPT:
                     # Gemini sends text chunks. We queue them for ElevenLabs.
                     if event.text:
                         # Accumulate assistant text for persistence
                         self._current_turn_assistant_text += event.text
+                        self.trace.mark("first_text")
                         await self.tts_text_queue.put(event.text)
                         # Also forward to client for UI transcript
                         await self._send_transcript(event.text, event.is_final)
@@ -270,86 +439,176 @@ class VoiceSession:
         """
         Consumes text from Gemini and streams audio from ElevenLabs.
         This runs continuously.
-        """
-        
-        async def text_generator() -> AsyncGenerator[str, None]:
-            """Yields text chunks for a single turn."""
-            while self._running:
-                chunk = await self.tts_text_queue.get()
-                if chunk is None: # End of turn
-                    break
-                yield chunk
 
+        Each spoken turn runs in its own task (``_tts_task``) so an
+        interruption can cancel it, which also closes the ElevenLabs socket.
+        """
         while self._running:
             # Wait for the first chunk of text to start a TTS stream
             first_chunk = await self.tts_text_queue.get()
             
-            # Flush queue if we got a None (end marker) unexpectedly
+            # A turn that ended without text (e.g. only a tool call): nothing
+            # to speak, but its trace is done
             if first_chunk is None:
+                self._record_trace(interrupted=False)
                 continue
-                
-            # Put it back or use a generator that starts with it
-            async def text_gen_with_first():
-                yield first_chunk
-                async for chunk in text_generator():
-                    yield chunk
-
-            # Start speaking state
-            self.state.is_speaking = True
-            await self._send_state(VoiceState.SPEAKING)
 
+            self._tts_task = asyncio.create_task(self._speak_turn(first_chunk))
             try:
-                # Stream audio from ElevenLabs
-                # Pass voice_name from config if set (defaults to GENESIS official in client)
-                async for audio_chunk in self.elevenlabs_client.stream_audio(
-                    text_gen_with_first(),
-                    voice_id=self.config.voice_name
-                ):
-                    if not self._running:
-                        break
-                    await self._send_audio(audio_chunk)
-                    
-            except Exception as e:
-                logger.error(f"TTS Streaming error: {e}")
-            finally:
-                # Turn complete logic
-                self.state.is_speaking = False
-                await self._send_state(VoiceState.IDLE)
-
-                # Determine widget type for persistence
-                widget_type = None
-                if self.state.pending_widgets:
-                    widget_type = self.state.pending_widgets[0].widget_type
-
-                # Deliver widgets after speaking
-                if self.state.pending_widgets:
-                    await asyncio.sleep(self.WIDGET_DELAY_MS / 1000)
-                    await self._deliver_pending_widgets()
-
-                # Persist conversation turn to clipboard
-                await self._persist_voice_conversation(widget_type=widget_type)
+                await asyncio.wait({self._tts_task})
+            except asyncio.CancelledError:
+                self._tts_task.cancel()
+                raise
+            interrupted = self._tts_task.cancelled()
+            self._tts_task = None
+
+            await self._finish_turn(interrupted)
+
+    async def _speak_turn(self, first_chunk: str) -> None:
+        """Stream one turn of text through ElevenLabs to the client."""
+
+        started_at = time.monotonic()
+        pending = [first_chunk]
+
+        async def next_text() -> str | None:
+            """Next Gemini text fragment of this turn (None = end of turn)."""
+            if pending:
+                return pending.pop()
+            if not self._running:
+                return None
+            return await self.tts_text_queue.get()
+
+        async def text_gen_with_first() -> AsyncGenerator[str, None]:
+            """Yields text chunks for a single turn."""
+            while (chunk := await next_text()) is not None:
+                yield chunk
+
+        if self.config.tts_chunking:
+            chunker = TextChunker.for_language(self.config.language)
+            text_stream = chunk_text_stream(next_text, chunker)
+        else:
+            text_stream = text_gen_with_first()
+
+        # Start speaking state
+        self.state.is_speaking = True
+        await self._send_state(VoiceState.SPEAKING)
+
+        first_audio = True
+        try:
+            # Stream audio from ElevenLabs
+            # Pass voice_name from config if set (defaults to GENESIS official in client)
+            async for audio_chunk in self.elevenlabs_client.stream_audio(
+                text_stream,
+                voice_id=self.config.voice_name
+            ):
+                if not self._running:
+                    break
+                if first_audio:
+                    first_audio = False
+                    self.trace.mark("first_tts_audio")
+                    self.last_time_to_first_audio_ms = (time.monotonic() - started_at) * 1000
+                    logger.info(
+                        f"TTS time-to-first-audio: {self.last_time_to_first_audio_ms:.0f} ms "
+                        f"(session {self.session_id})"
+                    )
+                await self._send_audio(audio_chunk)
+
+        except Exception as e:
+            logger.error(f"TTS Streaming error: {e}")
+
+        # Widgets and the idle state follow the audio, not the TTS stream
+        await self.playout.finish()
+        await self.playout.drain()
+
+    async def _finish_turn(self, interrupted: bool) -> None:
+        """Post-speech bookkeeping: state, widgets, persistence."""
+        self.state.is_speaking = False
+        if not interrupted:
+            await self._send_state(VoiceState.IDLE)
+
+        # Determine widget type for persistence
+        widget_type = None
+        if self.state.pending_widgets:
+            widget_type = self.state.pending_widgets[0].widget_type
+
+        # Deliver widgets after speaking
+        if self.state.pending_widgets:
+            await asyncio.sleep(self.WIDGET_DELAY_MS / 1000)
+            await self._deliver_pending_widgets()
+
+        # Persist conversation turn to clipboard
+        await self._persist_voice_conversation(widget_type=widget_type)
+
+        # Interrupted turns were already recorded by _handle_interruption
+        if not interrupted:
+            self._record_trace(interrupted=False)
 
     async def _handle_interruption(self) -> None:
-        """Handle user interruption."""
-        # 1. Clear pending TTS text
+        """
+        Handle user interruption (barge-in).
+
+        Stops everything the assistant is saying right now: queued text, the
+        in-flight TTS stream (and its ElevenLabs socket), buffered output
+        audio, and whatever Gemini still sends for the interrupted response.
+        """
+        # 1. Drop the rest of Gemini's response for this turn. Set before any
+        #    await, so text arriving while TTS shuts down is not queued
+        if self._gemini_turn_active:
+            self._discard_gemini_turn = True
+
+        # 2. Clear pending TTS text
+        self._drain_tts_text()
+
+        # 3. Cancel the in-flight TTS turn; returns once no more audio can be sent
+        tts_task = self._tts_task
+        if tts_task is not None and not tts_task.done():
+            tts_task.cancel()
+            await asyncio.wait({tts_task})
+            # Text queued while the stream was closing belongs to the interrupted turn
+            self._drain_tts_text()
+
+        # 4. Clear pending widgets and buffered output audio
+        self.state.pending_widgets.clear()
+        await self.playout.clear()
+
+        # 5. Reset state
+        self._record_trace(interrupted=True)
+        self.state.is_speaking = False
+        await self._send_state(VoiceState.IDLE)
+
+    # === Helpers ===
+
+    def _drain_tts_text(self) -> None:
+        """Drop text queued for TTS that has not been spoken yet."""
         while not self.tts_text_queue.empty():
             try:
                 self.tts_text_queue.get_nowait()
             except asyncio.QueueEmpty:
                 break
-        
-        # 2. Clear pending widgets
-        self.state.pending_widgets.clear()
-        
-        # 3. Reset state
-        self.state.is_speaking = False
-        await self._send_state(VoiceState.IDLE)
-        
-        # Note: ElevenLabs WS doesn't have a "cancel" message, 
-        # but stopping sending text effectively stops it.
-        # Ideally we would cancel the current _process_tts_pipeline task iteration.
 
-    # === Helpers ===
+    def _close_stale_trace(self) -> None:
+        """
+        Make sure a new user turn starts with a clean trace.
+
+        A turn that never reached _finish_turn or _handle_interruption
+        (Gemini interrupted it before replying, or never answered) leaves its
+        end on the trace: it is recorded as interrupted. Response milestones
+        of a turn already recorded (text of a cancelled turn arriving after
+        the cancel) are dropped.
+        """
+        trace = self.trace
+        if trace.user_turn_end is not None:
+            self._record_trace(interrupted=True)
+        elif any(getattr(trace, milestone) is not None for milestone in RESPONSE_MILESTONES):
+            self.trace = TurnTrace()
+
+    def _record_trace(self, interrupted: bool) -> None:
+        """Fold the current turn's timings into the latency histograms and start a new trace."""
+        durations = latency_metrics.record(self.trace, interrupted=interrupted)
+        self.trace = TurnTrace()
+        if durations and not interrupted:
+            summary = ", ".join(f"{stage}={value:.0f}ms" for stage, value in durations.items())
+            logger.info(f"Voice turn latency (session {self.session_id}): {summary}")
 
     async def _handle_widget_tool(self, event: GeminiEvent) -> None:
         if not event.tool_args:
@@ -378,46 +637,24 @@ class VoiceSession:
             })
             if not success:
                 break  # WebSocket closed, stop trying
+        else:
+            self.trace.mark("widget_delivered")
         self.state.pending_widgets.clear()
 
     async def _persist_voice_conversation(self, widget_type: str | None = None) -> None:
-        """Persist voice conversation turn to SessionClipboard."""
-        if not self.clipboard:
+        """Record the finished turn in the SessionClipboard (written in batches)."""
+        if self.persistence is None:
             return
 
-        # Import here to avoid circular imports
-        from schemas.clipboard import MessageRole
-        from services.session_store import set_session
-
-        try:
-            # Add user message if we captured it
-            if self._current_turn_user_text.strip():
-                self.clipboard.add_message(
-                    role=MessageRole.USER,
-                    content=self._current_turn_user_text.strip(),
-                    agent="GENESIS",
-                )
-
-            # Add assistant response
-            if self._current_turn_assistant_text.strip():
-                self.clipboard.add_message(
-                    role=MessageRole.ASSISTANT,
-                    content=self._current_turn_assistant_text.strip(),
-                    agent="GENESIS",
-                    widget_type=widget_type,
-                )
-
-            # Persist to storage
-            await set_session(self.clipboard)
+        self.persistence.record_turn(
+            user_text=self._current_turn_user_text.strip(),
+            assistant_text=self._current_turn_assistant_text.strip(),
+            widget_type=widget_type,
+        )
 
-            # Reset for next turn
-            self._current_turn_user_text = ""
-            self._current_turn_assistant_text = ""
-
-            logger.debug(f"Persisted voice conversation turn for session {self.session_id}")
-
-        except Exception as e:
-            logger.warning(f"Failed to persist voice conversation: {e}")
+        # Reset for next turn
+        self._current_turn_user_text = ""
+        self._current_turn_assistant_text = ""
 
     # === WebSocket Senders ===
 
@@ -432,11 +669,36 @@ class VoiceSession:
             self._ws_open = False
             return False
 
+    async def _safe_send_bytes(self, data: bytes) -> bool:
+        """Safely send a binary frame, returns False if WebSocket is closed."""
+        if not self._ws_open:
+            return False
+        try:
+            await self.websocket.send_bytes(data)
+            return True
+        except Exception:
+            self._ws_open = False
+            return False
+
     async def _send_state(self, state: VoiceState) -> None:
         self.state.current_state = state
-        await self._safe_send({"type": "state", "value": state.value})
+        message: dict[str, Any] = {"type": "state", "value": state.value}
+        if self.config.level_on_state:
+            message["level"] = round(self.state.audio_level, 3)
+        await self._safe_send(message)
 
     async def _send_audio(self, audio_bytes: bytes) -> None:
+        """Queue audio for the client; the playout task paces the actual sends."""
+        await self.playout.put(audio_bytes)
+
+    async def _send_audio_frame(self, audio_bytes: bytes) -> None:
+        self.trace.mark("first_audio_sent")
+        self.trace.last_audio_sent = time.monotonic()
+        if self.config.binary_audio:
+            frame = encode_frame(audio_bytes, self._outbound_sequence)
+            self._outbound_sequence += 1
+            await self._safe_send_bytes(frame)
+            return
         encoded = encode_audio_base64(audio_bytes)
         await self._safe_send({"type": "audio_chunk", "data": encoded})
 
@@ -0,0 +1,175 @@
+"""
+Pre-warmed TTS WebSocket Pool
+
+ElevenLabs stream-input sockets carry exactly one synthesis stream, so a new
+socket (TLS handshake + BOS/auth message) is normally opened at the start of
+every spoken turn. The pool opens and authenticates them ahead of time, per
+endpoint (voice/model URL) and API key, so a turn can start sending text
+immediately.
+
+- Idle connections are kept alive with the provider's keep-alive message
+  and rotated after ``max_age_seconds``
+- Connections are health-checked on checkout; dead ones are replaced
+- Checked-out connections are owned by the caller and never returned; the
+  pool refills in the background
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from websockets.protocol import State
+
+logger = logging.getLogger(__name__)
+
+TTS_POOL_SIZE = int(os.getenv("TTS_POOL_SIZE", "1"))
+TTS_POOL_MAX_AGE_SECONDS = float(os.getenv("TTS_POOL_MAX_AGE_SECONDS", "120"))
+TTS_POOL_KEEPALIVE_SECONDS = float(os.getenv("TTS_POOL_KEEPALIVE_SECONDS", "8"))
+
+PoolKey = tuple[str, str]  # (url, api_key)
+Connector = Callable[[str, str], Awaitable[Any]]
+KeepAlive = Callable[[Any], Awaitable[None]]
+
+
+@dataclass
+class PooledConnection:
+    """An idle, ready-to-use connection."""
+
+    ws: Any
+    opened_at: float
+
+
+def is_open(ws: Any) -> bool:
+    return getattr(ws, "state", None) is State.OPEN
+
+
+class TTSConnectionPool:
+    """Keeps ``size`` authenticated idle sockets per (url, api_key)."""
+
+    def __init__(
+        self,
+        connector: Connector,
+        keepalive: KeepAlive,
+        size: int = TTS_POOL_SIZE,
+        max_age_seconds: float = TTS_POOL_MAX_AGE_SECONDS,
+        keepalive_seconds: float = TTS_POOL_KEEPALIVE_SECONDS,
+    ):
+        self.connector = connector
+        self.keepalive = keepalive
+        self.size = max(0, size)
+        self.max_age_seconds = max_age_seconds
+        self.keepalive_seconds = keepalive_seconds
+
+        self._idle: dict[PoolKey, deque[PooledConnection]] = {}
+        self._refills: dict[PoolKey, asyncio.Task] = {}
+        self._keepalive_task: asyncio.Task | None = None
+        self._stats = {"hits": 0, "misses": 0, "replaced": 0, "opened": 0, "errors": 0}
+
+    # =========================================================================
+    # Checkout
+    # =========================================================================
+
+    async def acquire(self, url: str, api_key: str) -> Any:
+        """
+        Take a ready connection, or open one if none is idle.
+
+        The caller owns the returned socket and must close it.
+        """
+        key = (url, api_key)
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.popleft()
+            if self._usable(conn):
+                self._stats["hits"] += 1
+                self.warm(url, api_key)
+                return conn.ws
+            self._stats["replaced"] += 1
+            await self._close(conn.ws)
+
+        self._stats["misses"] += 1
+        self.warm(url, api_key)
+        ws = await self.connector(url, api_key)
+        self._stats["opened"] += 1
+        return ws
+
+    def warm(self, url: str, api_key: str) -> None:
+        """Start filling the pool for this endpoint in the background."""
+        if self.size <= 0:
+            return
+        key = (url, api_key)
+        task = self._refills.get(key)
+        if task is None or task.done():
+            self._refills[key] = asyncio.create_task(self._refill(key))
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    # =========================================================================
+    # Maintenance
+    # =========================================================================
+
+    def _usable(self, conn: PooledConnection) -> bool:
+        return is_open(conn.ws) and time.monotonic() - conn.opened_at < self.max_age_seconds
+
+    async def _refill(self, key: PoolKey) -> None:
+        idle = self._idle.setdefault(key, deque())
+        while len(idle) < self.size:
+            try:
+                ws = await self.connector(*key)
+            except Exception as e:
+                self._stats["errors"] += 1
+                logger.warning(f"TTS pool could not pre-open a connection: {e}")
+                return
+            self._stats["opened"] += 1
+            idle.append(PooledConnection(ws=ws, opened_at=time.monotonic()))
+
+    async def _keepalive_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive_seconds)
+            for key, idle in list(self._idle.items()):
+                stale = 0
+                for conn in list(idle):
+                    if self._usable(conn):
+                        try:
+                            await self.keepalive(conn.ws)
+                            continue
+                        except Exception as e:
+                            logger.debug(f"TTS pool keep-alive failed: {e}")
+                    idle.remove(conn)
+                    stale += 1
+                    await self._close(conn.ws)
+                if stale:
+                    self._stats["replaced"] += stale
+                    self.warm(*key)
+
+    async def _close(self, ws: Any) -> None:
+        try:
+            await ws.close()
+        except Exception:
+            pass
+
+    async def close(self) -> None:
+        """Close idle connections and stop background tasks."""
+        tasks = [task for task in self._refills.values() if not task.done()]
+        if self._keepalive_task is not None:
+            tasks.append(self._keepalive_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refills.clear()
+        self._keepalive_task = None
+
+        for idle in self._idle.values():
+            while idle:
+                await self._close(idle.popleft().ws)
+        self._idle.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "size": self.size,
+            "idle": sum(len(idle) for idle in self._idle.values()),
+        }
@@ -0,0 +1,144 @@
+"""
+Server-side Voice Activity Detection
+
+Detects end of speech on the inbound 16 kHz PCM stream so the session can
+close the user's turn (``end_audio_stream``) without waiting for the client's
+own silence timeout.
+
+Each chunk is split into 20 ms frames and two features are computed for all
+frames at once with numpy:
+- energy (dBFS) against an adaptive noise floor
+- speech-band ratio: share of spectral power between 250 Hz and 4 kHz, which
+  rejects low rumble and hiss that pass the energy gate
+
+A frame is voiced when both pass. Speech starts after ``min_speech_ms`` of
+voiced frames and ends after ``hangover_ms`` of continuous unvoiced frames.
+
+Off unless VOICE_VAD_ENABLED=true: turns then end on the client's
+``end_turn`` only, as before.
+"""
+
+import os
+from enum import Enum
+
+import numpy as np
+
+from settings import env_flag
+
+from .audio_utils import SAMPLE_RATE, pcm_to_samples
+
+VOICE_VAD_ENABLED = env_flag("VOICE_VAD_ENABLED")
+VOICE_VAD_HANGOVER_MS = int(os.getenv("VOICE_VAD_HANGOVER_MS", "700"))
+VOICE_VAD_MIN_SPEECH_MS = int(os.getenv("VOICE_VAD_MIN_SPEECH_MS", "120"))
+
+FRAME_MS = 20
+# Voiced frames must be this far above the noise floor...
+ENERGY_MARGIN_DB = 12.0
+# ...and above this absolute level
+MIN_ENERGY_DB = -50.0
+MIN_SPEECH_BAND_RATIO = 0.6
+SPEECH_BAND_HZ = (250, 4000)
+# Noise floor tracking: drop immediately, rise slowly during unvoiced frames
+NOISE_FLOOR_INITIAL_DB = -70.0
+NOISE_FLOOR_RISE = 0.05
+
+
+class VadEvent(str, Enum):
+    """Transitions reported by the detector."""
+
+    SPEECH_START = "speech_start"
+    SPEECH_END = "speech_end"
+
+
+class VoiceActivityDetector:
+    """
+    Per-session streaming VAD over PCM 16-bit mono audio.
+
+    Samples that do not fill a whole frame are carried over to the next chunk.
+    """
+
+    def __init__(
+        self,
+        hangover_ms: int = VOICE_VAD_HANGOVER_MS,
+        min_speech_ms: int = VOICE_VAD_MIN_SPEECH_MS,
+        sample_rate: int = SAMPLE_RATE,
+    ):
+        self.hangover_ms = hangover_ms
+        self.min_speech_ms = min_speech_ms
+        self.sample_rate = sample_rate
+        self.frame_size = sample_rate * FRAME_MS // 1000
+
+        freqs = np.fft.rfftfreq(self.frame_size, d=1 / sample_rate)
+        self._band = (freqs >= SPEECH_BAND_HZ[0]) & (freqs <= SPEECH_BAND_HZ[1])
+        self.noise_floor_db = NOISE_FLOOR_INITIAL_DB
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget speech state (keeps the learned noise floor)."""
+        self._leftover = np.zeros(0, dtype=np.float64)
+        self.in_speech = False
+        self._voiced_ms = 0
+        self._unvoiced_ms = 0
+
+    def frame_features(self, frames: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Compute energy and speech-band ratio for a batch of frames.
+
+        Args:
+            frames: Float array of shape (n_frames, frame_size), int16 scale
+
+        Returns:
+            (energy_db, band_ratio), one value per frame
+        """
+        power = np.mean(frames ** 2, axis=1) / (32768.0 ** 2)
+        energy_db = 10 * np.log10(power + 1e-12)
+
+        spectrum = np.abs(np.fft.rfft(frames, axis=1)) ** 2
+        total = spectrum.sum(axis=1) + 1e-12
+        band_ratio = spectrum[:, self._band].sum(axis=1) / total
+        return energy_db, band_ratio
+
+    def process(self, audio_bytes: bytes) -> VadEvent | None:
+        """
+        Feed the next inbound chunk.
+
+        Args:
+            audio_bytes: Raw PCM audio data (16-bit signed, little-endian)
+
+        Returns:
+            The last transition detected in this chunk, or None
+        """
+        samples = np.concatenate((self._leftover, pcm_to_samples(audio_bytes)))
+        n_frames = len(samples) // self.frame_size
+        self._leftover = samples[n_frames * self.frame_size:]
+        if not n_frames:
+            return None
+
+        frames = samples[: n_frames * self.frame_size].reshape(n_frames, self.frame_size)
+        energy_db, band_ratio = self.frame_features(frames)
+
+        event = None
+        for energy, ratio in zip(energy_db.tolist(), band_ratio.tolist()):
+            voiced = (
+                energy > max(self.noise_floor_db + ENERGY_MARGIN_DB, MIN_ENERGY_DB)
+                and ratio >= MIN_SPEECH_BAND_RATIO
+            )
+            if voiced:
+                self._voiced_ms += FRAME_MS
+                self._unvoiced_ms = 0
+                if not self.in_speech and self._voiced_ms >= self.min_speech_ms:
+                    self.in_speech = True
+                    event = VadEvent.SPEECH_START
+            else:
+                self._unvoiced_ms += FRAME_MS
+                if energy < self.noise_floor_db:
+                    self.noise_floor_db = energy
+                else:
+                    self.noise_floor_db += NOISE_FLOOR_RISE * (energy - self.noise_floor_db)
+                if not self.in_speech:
+                    self._voiced_ms = 0
+                elif self._unvoiced_ms >= self.hangover_ms:
+                    self.in_speech = False
+                    self._voiced_ms = 0
+                    event = VadEvent.SPEECH_END
+        return event
@@ -1,5 +1,6 @@
 """Wearables integration layer for NGX GENESIS."""
 
-from wearables.router import wearables_router
+from wearables.queue import webhook_queue
+from wearables.router import process_webhook_job, wearables_router
 
-__all__ = ["wearables_router"]
+__all__ = ["wearables_router", "webhook_queue", "process_webhook_job"]
@@ -0,0 +1,237 @@
+"""Compressed, content-addressed archive for raw wearable payloads.
+
+Raw provider payloads used to be inserted as JSONB into ``wearable_raw`` on
+every webhook, sync and Apple ingest. They are now written as gzip-compressed
+newline-delimited JSON segments to a blob store, keyed by the SHA-256 of the
+canonical payload, and only a pointer row is kept in Postgres.
+
+Segment format (one JSON document per line):
+- Collection payloads (``dailies``/``data``/``records``/...): the first line
+  is ``{"_envelope": {...}}`` with the non-collection keys, followed by one
+  line per collection item.
+- Anything else: a single line with the whole payload.
+
+Backends:
+- GCSBlobStore: Google Cloud Storage bucket (WEARABLE_ARCHIVE_BUCKET)
+- LocalBlobStore: filesystem directory (WEARABLE_ARCHIVE_DIR; development, tests)
+
+With neither configured ``raw_archive`` is None and payloads stay inline.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+WEARABLE_ARCHIVE_DIR = os.getenv("WEARABLE_ARCHIVE_DIR", "")
+WEARABLE_ARCHIVE_BUCKET = os.getenv("WEARABLE_ARCHIVE_BUCKET", "")
+WEARABLE_ARCHIVE_PREFIX = os.getenv("WEARABLE_ARCHIVE_PREFIX", "wearable-raw")
+
+# Top-level keys that hold per-day record lists in provider payloads
+COLLECTION_KEYS = ("dailies", "data", "records", "sleeps", "epochs", "samples")
+
+
+class BlobStore(ABC):
+    """Minimal blob store interface used by the raw archive."""
+
+    uri_scheme = ""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def put(self, key: str, data: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        ...
+
+    def uri(self, key: str) -> str:
+        return f"{self.uri_scheme}{key}"
+
+
+class LocalBlobStore(BlobStore):
+    """Blob store backed by a local directory."""
+
+    uri_scheme = "file://"
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Own temp file per writer: concurrent puts of one digest must not
+        # move each other's file away
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(data)
+        try:
+            os.replace(tmp.name, path)
+        except OSError:
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+
+    def get(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def uri(self, key: str) -> str:
+        return f"{self.uri_scheme}{self._path(key).resolve()}"
+
+
+class GCSBlobStore(BlobStore):
+    """Blob store backed by a Google Cloud Storage bucket."""
+
+    uri_scheme = "gs://"
+
+    def __init__(self, bucket: str) -> None:
+        # Imported here so the rest of the archive works without the package
+        from google.cloud import storage
+
+        self.bucket_name = bucket
+        self._bucket = storage.Client().bucket(bucket)
+
+    def exists(self, key: str) -> bool:
+        return self._bucket.blob(key).exists()
+
+    def put(self, key: str, data: bytes) -> None:
+        blob = self._bucket.blob(key)
+        blob.content_encoding = "gzip"
+        blob.upload_from_string(data, content_type="application/x-ndjson")
+
+    def get(self, key: str) -> bytes:
+        return self._bucket.blob(key).download_as_bytes(raw_download=True)
+
+    def uri(self, key: str) -> str:
+        return f"{self.uri_scheme}{self.bucket_name}/{key}"
+
+
+@dataclass
+class ArchivedPayload:
+    """Pointer to an archived raw payload."""
+
+    key: str
+    uri: str
+    content_hash: str
+    size_bytes: int
+    record_count: int
+    created: bool  # False when the segment was already in the store
+
+
+def content_hash(payload: dict[str, Any]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def encode_segment(payload: dict[str, Any]) -> tuple[bytes, int]:
+    """Encode a payload as a gzip-compressed NDJSON segment.
+
+    Returns:
+        (compressed_bytes, record_count)
+    """
+    collection_key = next(
+        (key for key in COLLECTION_KEYS if isinstance(payload.get(key), list)),
+        None,
+    )
+    if collection_key is None:
+        lines = [_dumps(payload)]
+        record_count = 1
+    else:
+        envelope = {key: value for key, value in payload.items() if key != collection_key}
+        envelope["_collection"] = collection_key
+        records = payload[collection_key]
+        lines = [_dumps({"_envelope": envelope})]
+        lines.extend(_dumps(record) for record in records)
+        record_count = len(records)
+
+    body = ("\n".join(lines) + "\n").encode("utf-8")
+    # mtime=0 keeps the compressed bytes deterministic for identical payloads
+    return gzip.compress(body, mtime=0), record_count
+
+
+def decode_segment(data: bytes) -> dict[str, Any]:
+    """Rebuild the original payload from an NDJSON segment."""
+    lines = [line for line in gzip.decompress(data).decode("utf-8").splitlines() if line]
+    if not lines:
+        return {}
+
+    first = json.loads(lines[0])
+    if not isinstance(first, dict) or "_envelope" not in first:
+        return first
+
+    envelope = dict(first["_envelope"])
+    collection_key = envelope.pop("_collection")
+    envelope[collection_key] = [json.loads(line) for line in lines[1:]]
+    return envelope
+
+
+class RawArchive:
+    """Writes raw payloads to a blob store, deduplicated by content hash."""
+
+    def __init__(self, store: BlobStore, prefix: str = WEARABLE_ARCHIVE_PREFIX) -> None:
+        self.store = store
+        self.prefix = prefix.strip("/")
+
+    def key_for(self, provider: str, digest: str) -> str:
+        # Fan out by hash prefix to keep directories/listing pages small
+        return f"{self.prefix}/{provider}/{digest[:2]}/{digest}.ndjson.gz"
+
+    def put(self, provider: str, payload: dict[str, Any], digest: str | None = None) -> ArchivedPayload:
+        digest = digest or content_hash(payload)
+        key = self.key_for(provider, digest)
+        data, record_count = encode_segment(payload)
+
+        created = not self.store.exists(key)
+        if created:
+            self.store.put(key, data)
+
+        return ArchivedPayload(
+            key=key,
+            uri=self.store.uri(key),
+            content_hash=digest,
+            size_bytes=len(data),
+            record_count=record_count,
+            created=created,
+        )
+
+    def get(self, key: str) -> dict[str, Any]:
+        return decode_segment(self.store.get(key))
+
+
+def _default_store() -> BlobStore | None:
+    if WEARABLE_ARCHIVE_BUCKET:
+        try:
+            return GCSBlobStore(WEARABLE_ARCHIVE_BUCKET)
+        except Exception as exc:
+            logger.warning("GCS archive unavailable: %s", exc)
+    if WEARABLE_ARCHIVE_DIR:
+        return LocalBlobStore(WEARABLE_ARCHIVE_DIR)
+    logger.info("No raw wearable archive configured, raw payloads are stored inline")
+    return None
+
+
+_store = _default_store()
+raw_archive: RawArchive | None = RawArchive(_store) if _store is not None else None
@@ -0,0 +1,128 @@
+"""Cache for provider user id -> NGX user id resolution.
+
+Webhooks identify users by the provider's own id, and resolving it costs a
+Supabase query. The mapping only changes when a connection is (re)created,
+so it is cached in two tiers:
+
+- Process-local LRU with a short TTL (absorbs webhook bursts)
+- Redis (shared across instances, longer TTL)
+
+Misses are cached too (negative caching) with a shorter TTL, and
+``upsert_connection`` invalidates both tiers for the affected provider user.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections import OrderedDict
+
+from services.session_store import session_store
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_LOCAL_TTL_SECONDS = int(os.getenv("WEARABLE_USER_CACHE_LOCAL_TTL_SECONDS", "60"))
+USER_CACHE_REDIS_TTL_SECONDS = int(os.getenv("WEARABLE_USER_CACHE_REDIS_TTL_SECONDS", "3600"))
+USER_CACHE_NEGATIVE_TTL_SECONDS = int(os.getenv("WEARABLE_USER_CACHE_NEGATIVE_TTL_SECONDS", "30"))
+USER_CACHE_MAX_ENTRIES = int(os.getenv("WEARABLE_USER_CACHE_MAX_ENTRIES", "10000"))
+
+USER_CACHE_PREFIX = "ngx:wearable-user:"
+
+# Stored in Redis for negative entries (user ids are never empty)
+_NEGATIVE = ""
+
+
+class ProviderUserCache:
+    """Two-tier (local + Redis) cache with negative entries."""
+
+    def __init__(
+        self,
+        local_ttl: int = USER_CACHE_LOCAL_TTL_SECONDS,
+        redis_ttl: int = USER_CACHE_REDIS_TTL_SECONDS,
+        negative_ttl: int = USER_CACHE_NEGATIVE_TTL_SECONDS,
+        max_entries: int = USER_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._local: OrderedDict[tuple[str, str], tuple[str | None, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _redis_key(self, provider: str, provider_user_id: str) -> str:
+        return f"{USER_CACHE_PREFIX}{provider}:{provider_user_id}"
+
+    async def get(self, provider: str, provider_user_id: str) -> tuple[bool, str | None]:
+        """Look up a mapping.
+
+        Returns:
+            (found, user_id). ``found`` with ``user_id=None`` is a cached miss.
+        """
+        key = (provider, provider_user_id)
+        entry = self._local.get(key)
+        if entry is not None:
+            user_id, expires_at = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end(key)
+                self.hits += 1
+                return True, user_id
+            del self._local[key]
+
+        client = session_store.redis
+        if client is not None:
+            try:
+                value = await client.get(self._redis_key(provider, provider_user_id))
+            except Exception as exc:
+                logger.warning("Redis wearable user cache get failed: %s", exc)
+                value = None
+            if value is not None:
+                user_id = value or None
+                self._remember_local(key, user_id)
+                self.hits += 1
+                return True, user_id
+
+        self.misses += 1
+        return False, None
+
+    async def set(self, provider: str, provider_user_id: str, user_id: str | None) -> None:
+        self._remember_local((provider, provider_user_id), user_id)
+
+        client = session_store.redis
+        if client is None:
+            return
+        ttl = self.redis_ttl if user_id else self.negative_ttl
+        try:
+            await client.setex(self._redis_key(provider, provider_user_id), ttl, user_id or _NEGATIVE)
+        except Exception as exc:
+            logger.warning("Redis wearable user cache set failed: %s", exc)
+
+    async def invalidate(self, provider: str, provider_user_id: str) -> None:
+        self._local.pop((provider, provider_user_id), None)
+
+        client = session_store.redis
+        if client is None:
+            return
+        try:
+            await client.delete(self._redis_key(provider, provider_user_id))
+        except Exception as exc:
+            logger.warning("Redis wearable user cache delete failed: %s", exc)
+
+    def clear(self) -> None:
+        self._local.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._local), "hits": self.hits, "misses": self.misses}
+
+    def _remember_local(self, key: tuple[str, str], user_id: str | None) -> None:
+        ttl = self.local_ttl if user_id else min(self.local_ttl, self.negative_ttl)
+        self._local[key] = (user_id, time.monotonic() + ttl)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+
+provider_user_cache = ProviderUserCache()
@@ -104,27 +104,26 @@ def _tokens_from_response(token_data: dict[str, Any]) -> WearableTokens:
     )
 
 
+def normalize_garmin_daily(daily: dict[str, Any], user_id: str) -> WearableMetrics:
+    start_ts = daily.get("startTimeInSeconds") or daily.get("summaryStartTimeInSeconds")
+    if start_ts:
+        data_date = datetime.utcfromtimestamp(int(start_ts)).date()
+    else:
+        data_date = datetime.utcnow().date()
+
+    return WearableMetrics(
+        user_id=user_id,
+        provider="garmin",
+        data_date=data_date,
+        resting_hr=daily.get("restingHeartRateInBeatsPerMinute"),
+        steps=daily.get("steps") or daily.get("totalSteps"),
+        active_calories=daily.get("activeKilocalories"),
+        total_calories=daily.get("totalKilocalories"),
+        body_battery=daily.get("bodyBatteryMostRecentValue"),
+        stress_level=daily.get("averageStressLevel"),
+        sleep_hours=(daily.get("sleepingSeconds") or 0) / 3600 if daily.get("sleepingSeconds") else None,
+    )
+
+
 def parse_garmin_webhook(payload: dict[str, Any], user_id: str) -> list[WearableMetrics]:
-    metrics: list[WearableMetrics] = []
-    for daily in payload.get("dailies", []):
-        start_ts = daily.get("startTimeInSeconds") or daily.get("summaryStartTimeInSeconds")
-        if start_ts:
-            data_date = datetime.utcfromtimestamp(int(start_ts)).date()
-        else:
-            data_date = datetime.utcnow().date()
-
-        metrics.append(
-            WearableMetrics(
-                user_id=user_id,
-                provider="garmin",
-                data_date=data_date,
-                resting_hr=daily.get("restingHeartRateInBeatsPerMinute"),
-                steps=daily.get("steps") or daily.get("totalSteps"),
-                active_calories=daily.get("activeKilocalories"),
-                total_calories=daily.get("totalKilocalories"),
-                body_battery=daily.get("bodyBatteryMostRecentValue"),
-                stress_level=daily.get("averageStressLevel"),
-                sleep_hours=(daily.get("sleepingSeconds") or 0) / 3600 if daily.get("sleepingSeconds") else None,
-            )
-        )
-    return metrics
+    return [normalize_garmin_daily(daily, user_id) for daily in payload.get("dailies", [])]
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import date, datetime
-from typing import Any
+from operator import attrgetter
+from typing import Any, Iterable
 
 
 @dataclass
@@ -14,8 +15,15 @@ class WearableTokens:
     provider_user_id: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class WearableMetrics:
+    """One day of normalized metrics for a user/provider.
+
+    Slotted: bulk backfills hold hundreds of thousands of these, so instances
+    skip the per-instance ``__dict__``. Use ``to_records``/``to_columns`` to
+    export a batch rather than calling ``to_record`` in a loop.
+    """
+
     user_id: str
     provider: str
     data_date: date
@@ -66,3 +74,53 @@ class WearableMetrics:
             "raw_data_id": self.raw_data_id,
             "synced_at": self.synced_at.isoformat() if self.synced_at else None,
         }
+
+
+# Column order of ``wearable_data`` rows (matches ``to_record`` keys)
+RECORD_FIELDS: tuple[str, ...] = tuple(
+    [f.name for f in fields(WearableMetrics) if f.name != "synced_at"] + ["synced_at"]
+)
+_get_record_values = attrgetter(*RECORD_FIELDS)
+
+_DATE_FIELDS = ("data_date", "synced_at")
+
+
+def _isoformatter() -> Any:
+    """Memoized isoformat; a backfill has few distinct dates across many rows."""
+    cache: dict[Any, str | None] = {None: None}
+
+    def _format(value: date | datetime | None) -> str | None:
+        text = cache.get(value)
+        if text is None and value is not None:
+            text = cache[value] = value.isoformat()
+        return text
+
+    return _format
+
+
+def to_records(metrics_list: Iterable[WearableMetrics]) -> list[dict[str, Any]]:
+    """Batch ``to_record``: one attribute fetch per row, dates formatted once."""
+    isoformat = _isoformatter()
+    records: list[dict[str, Any]] = []
+    for metrics in metrics_list:
+        record = dict(zip(RECORD_FIELDS, _get_record_values(metrics)))
+        record["data_date"] = isoformat(record["data_date"])
+        record["synced_at"] = isoformat(record["synced_at"])
+        records.append(record)
+    return records
+
+
+def to_columns(metrics_list: Iterable[WearableMetrics]) -> dict[str, list[Any]]:
+    """Columnar export: one list per field, keyed in ``RECORD_FIELDS`` order.
+
+    Dates are serialized like ``to_record``. Useful for bulk loaders and for
+    aggregates over a backfill without materializing per-row dicts.
+    """
+    rows = [_get_record_values(metrics) for metrics in metrics_list]
+    if not rows:
+        return {name: [] for name in RECORD_FIELDS}
+    columns = {name: list(values) for name, values in zip(RECORD_FIELDS, zip(*rows))}
+    isoformat = _isoformatter()
+    for key in _DATE_FIELDS:
+        columns[key] = [isoformat(value) for value in columns[key]]
+    return columns
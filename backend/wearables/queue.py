@@ -0,0 +1,317 @@
+"""On-disk spool for deferred wearable webhook processing.
+
+Webhooks are acknowledged as soon as the payload is persisted to the spool;
+a small pool of asyncio workers drains it in the background. Jobs are keyed
+by the SHA-256 of the provider + canonical payload JSON, so provider retries
+of the same delivery are accepted but processed only once.
+
+The spool is instance-local and its workers only get CPU while the process
+is serving, so on Cloud Run webhooks go through Cloud Tasks instead (see
+``wearable_webhook``); the spool is the fallback when Cloud Tasks is not
+configured (development) or rejects the task.
+
+Layout under ``WEBHOOK_SPOOL_DIR``:
+- pending/     jobs waiting for a worker
+- processing/  jobs claimed by a worker (moved back to pending on restart)
+- done/        empty markers of processed job ids (idempotency window)
+- failed/      jobs that exhausted ``WEBHOOK_MAX_ATTEMPTS``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_SPOOL_DIR = os.getenv("WEBHOOK_SPOOL_DIR", "/tmp/ngx-wearables-spool")
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "2"))
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "5"))
+WEBHOOK_DONE_TTL_HOURS = int(os.getenv("WEBHOOK_DONE_TTL_HOURS", "48"))
+
+_PRUNE_INTERVAL_SECONDS = 3600
+_MAX_RETRY_DELAY_SECONDS = 300
+
+
+@dataclass
+class WebhookJob:
+    job_id: str
+    provider: str
+    payload: dict[str, Any]
+    user_id: str | None = None
+    attempts: int = 0
+    received_at: float = 0.0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, default=str)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "WebhookJob":
+        return cls(**json.loads(raw))
+
+
+JobHandler = Callable[[WebhookJob], Awaitable[Any]]
+
+
+class PermanentJobError(Exception):
+    """A job that retrying cannot fix; it is parked in failed/ right away."""
+
+
+def payload_hash(provider: str, payload: dict[str, Any]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{provider}:{canonical}".encode("utf-8")).hexdigest()
+
+
+class WebhookQueue:
+    """File-backed job queue with an asyncio worker pool."""
+
+    def __init__(
+        self,
+        spool_dir: str | Path = WEBHOOK_SPOOL_DIR,
+        workers: int = WEBHOOK_WORKERS,
+        max_attempts: int = WEBHOOK_MAX_ATTEMPTS,
+        done_ttl_hours: int = WEBHOOK_DONE_TTL_HOURS,
+        poll_interval: float = 1.0,
+    ) -> None:
+        self.spool_dir = Path(spool_dir)
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.done_ttl_seconds = done_ttl_hours * 3600
+        self.poll_interval = poll_interval
+
+        self._handler: JobHandler | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: asyncio.Event | None = None
+        self._last_prune = 0.0
+        self.rejected = 0
+
+    @property
+    def pending_dir(self) -> Path:
+        return self.spool_dir / "pending"
+
+    @property
+    def processing_dir(self) -> Path:
+        return self.spool_dir / "processing"
+
+    @property
+    def done_dir(self) -> Path:
+        return self.spool_dir / "done"
+
+    @property
+    def failed_dir(self) -> Path:
+        return self.spool_dir / "failed"
+
+    @property
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def _ensure_dirs(self) -> None:
+        for directory in (self.pending_dir, self.processing_dir, self.done_dir, self.failed_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    # =========================================================================
+    # Producer side
+    # =========================================================================
+
+    async def enqueue(
+        self,
+        provider: str,
+        payload: dict[str, Any],
+        user_id: str | None = None,
+    ) -> tuple[str, bool]:
+        """Persist a webhook payload to the spool.
+
+        Returns:
+            (job_id, accepted). ``accepted`` is False when the same payload is
+            already pending, in flight or was processed recently.
+        """
+        job = WebhookJob(
+            job_id=payload_hash(provider, payload),
+            provider=provider,
+            payload=payload,
+            user_id=user_id,
+            received_at=time.time(),
+        )
+        accepted = await asyncio.to_thread(self._write_job, job)
+        if accepted and self._wakeup is not None:
+            self._wakeup.set()
+        return job.job_id, accepted
+
+    def _write_job(self, job: WebhookJob) -> bool:
+        self._ensure_dirs()
+        filename = f"{job.job_id}.json"
+        if (
+            (self.pending_dir / filename).exists()
+            or (self.processing_dir / filename).exists()
+            or (self.done_dir / job.job_id).exists()
+        ):
+            return False
+
+        tmp_path = self.pending_dir / f".{filename}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            handle.write(job.to_json())
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, self.pending_dir / filename)
+        return True
+
+    # =========================================================================
+    # Worker side
+    # =========================================================================
+
+    async def start(self, handler: JobHandler) -> None:
+        """Recover interrupted jobs and start the worker pool."""
+        if self.is_running:
+            return
+
+        self._handler = handler
+        self._wakeup = asyncio.Event()
+        await asyncio.to_thread(self._recover_processing)
+        self._tasks = [asyncio.create_task(self._worker(index)) for index in range(self.workers)]
+        logger.info("Webhook queue started: %s workers, spool=%s", self.workers, self.spool_dir)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+    async def drain(self, handler: JobHandler | None = None) -> int:
+        """Process pending jobs inline until the spool is empty.
+
+        Returns the number of jobs handled (successfully or not).
+        """
+        if handler is not None:
+            self._handler = handler
+        handled = 0
+        while True:
+            path = await asyncio.to_thread(self._claim_next)
+            if path is None:
+                return handled
+            await self._process(path)
+            handled += 1
+
+    def stats(self) -> dict[str, Any]:
+        def _count(directory: Path, pattern: str) -> int:
+            if not directory.exists():
+                return 0
+            return sum(1 for _ in directory.glob(pattern))
+
+        return {
+            "running": self.is_running,
+            "workers": self.workers,
+            "pending": _count(self.pending_dir, "*.json"),
+            "processing": _count(self.processing_dir, "*.json"),
+            "failed": _count(self.failed_dir, "*.json"),
+            "rejected": self.rejected,
+        }
+
+    def _recover_processing(self) -> None:
+        self._ensure_dirs()
+        for path in self.processing_dir.glob("*.json"):
+            os.replace(path, self.pending_dir / path.name)
+
+    def _claim_next(self) -> Path | None:
+        self._ensure_dirs()
+        now = time.time()
+        candidates: list[tuple[float, Path]] = []
+        for path in self.pending_dir.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            # Retried jobs carry a future mtime until their backoff expires
+            if mtime <= now:
+                candidates.append((mtime, path))
+
+        for _, path in sorted(candidates):
+            target = self.processing_dir / path.name
+            try:
+                os.replace(path, target)
+            except FileNotFoundError:
+                # Claimed by another worker in the meantime
+                continue
+            return target
+        return None
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                path = await asyncio.to_thread(self._claim_next)
+                if path is not None:
+                    await self._process(path)
+                    continue
+
+                await asyncio.to_thread(self._maybe_prune_done)
+                assert self._wakeup is not None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.exception("Webhook worker %s crashed on iteration: %s", index, exc)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _process(self, path: Path) -> None:
+        try:
+            job = WebhookJob.from_json(path.read_text(encoding="utf-8"))
+        except Exception as exc:
+            logger.exception("Discarding unreadable webhook job %s: %s", path.name, exc)
+            os.replace(path, self.failed_dir / path.name)
+            return
+
+        if self._handler is None:
+            raise RuntimeError("Webhook queue has no handler")
+
+        try:
+            await self._handler(job)
+        except PermanentJobError as exc:
+            logger.warning("Webhook job %s rejected: %s", job.job_id, exc)
+            self.rejected += 1
+            os.replace(path, self.failed_dir / path.name)
+            return
+        except Exception as exc:
+            job.attempts += 1
+            if job.attempts >= self.max_attempts:
+                logger.exception("Webhook job %s failed permanently: %s", job.job_id, exc)
+                destination = self.failed_dir / path.name
+            else:
+                logger.warning("Webhook job %s failed (attempt %s): %s", job.job_id, job.attempts, exc)
+                destination = self.pending_dir / path.name
+            path.write_text(job.to_json(), encoding="utf-8")
+            os.replace(path, destination)
+            if destination.parent == self.pending_dir:
+                retry_at = time.time() + min(_MAX_RETRY_DELAY_SECONDS, 2 ** job.attempts)
+                os.utime(destination, (retry_at, retry_at))
+            return
+
+        (self.done_dir / job.job_id).touch()
+        path.unlink(missing_ok=True)
+
+    def _maybe_prune_done(self) -> None:
+        now = time.time()
+        if now - self._last_prune < _PRUNE_INTERVAL_SECONDS:
+            return
+        self._last_prune = now
+        cutoff = now - self.done_ttl_seconds
+        for marker in self.done_dir.glob("*"):
+            try:
+                if marker.stat().st_mtime < cutoff:
+                    marker.unlink()
+            except FileNotFoundError:
+                continue
+
+
+webhook_queue = WebhookQueue()
@@ -1,16 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import date, datetime, timedelta
+import logging
 import os
-from typing import Any
+from typing import Any, AsyncIterator, Callable
 from uuid import uuid4
 
 from fastapi import APIRouter, Body, HTTPException, Query, Request
 from pydantic import BaseModel, Field
 
 from wearables.apple_health import AppleHealthBridge
-from wearables.garmin import GarminClient, parse_garmin_webhook
+from wearables.cache import provider_user_cache
+from wearables.garmin import GarminClient, normalize_garmin_daily, parse_garmin_webhook
 from wearables.oura import OuraClient, normalize_sleep_payload
+from wearables.queue import PermanentJobError, WebhookJob, payload_hash, webhook_queue
+from wearables.models import WearableMetrics
 from wearables.readiness import calculate_readiness
 from wearables.store import (
     get_connection,
@@ -18,13 +23,17 @@ from wearables.store import (
     resolve_user_id,
     save_raw_payload,
     save_wearable_data,
+    save_wearable_data_batch,
     upsert_connection,
     touch_connection_sync,
 )
+from wearables.streaming import StreamingParseError, iter_json_records, iter_ndjson
 from wearables.tasks import enqueue_http_task, is_tasks_configured
 from services.auth import verify_internal_request
 from wearables.whoop import WhoopClient, normalize_recovery_payload
 
+logger = logging.getLogger(__name__)
+
 wearables_router = APIRouter(prefix="/api/wearables", tags=["wearables"])
 
 GARMIN = GarminClient()
@@ -41,6 +50,14 @@ PROVIDERS = {
 
 API_BASE_URL = os.getenv("API_BASE_URL", "").rstrip("/")
 SYNC_MIN_INTERVAL_MINUTES = int(os.getenv("SYNC_MIN_INTERVAL_MINUTES", "60"))
+STREAM_BATCH_SIZE = int(os.getenv("WEARABLE_STREAM_BATCH_SIZE", "200"))
+STREAM_MAX_REPORTED_ERRORS = 100
+
+# Per-record (one day) normalizers for streaming ingest
+STREAM_NORMALIZERS = {
+    "apple": APPLE.normalize_payload,
+    "garmin": normalize_garmin_daily,
+}
 
 
 class AuthResponse(BaseModel):
@@ -82,6 +99,8 @@ async def wearables_health() -> dict[str, Any]:
         "tasks_configured": is_tasks_configured(),
         "sync_min_interval_minutes": SYNC_MIN_INTERVAL_MINUTES,
         "api_base_url": API_BASE_URL or None,
+        "webhook_queue": webhook_queue.stats(),
+        "user_cache": provider_user_cache.stats(),
     }
 
 
@@ -121,20 +140,89 @@ async def oauth_callback(
 @wearables_router.post("/{provider}/webhook")
 async def wearable_webhook(
     provider: str,
+    request: Request,
     payload: dict[str, Any] = Body(...),
     user_id: str | None = Query(default=None, description="Optional override user id"),
 ):
+    """Validate and queue a provider webhook, acknowledging immediately.
+
+    User resolution, normalization and storage happen later (see
+    ``process_webhook_job``) so large pushes don't time out: in a Cloud Task
+    calling ``/{provider}/webhook/process`` when Cloud Tasks is configured,
+    otherwise in the local spool's workers.
+    """
     if provider not in PROVIDERS or provider == "apple":
         raise HTTPException(status_code=404, detail="Provider not supported")
 
+    provider_user_id = payload.get("userId") or payload.get("user_id")
+    if not provider_user_id and not user_id:
+        raise HTTPException(status_code=400, detail="user_id is required for this webhook")
+
+    job_id = payload_hash(provider, payload)
+    accepted = None
+    if is_tasks_configured():
+        base_url = API_BASE_URL or str(request.base_url).rstrip("/")
+        try:
+            task = await asyncio.to_thread(
+                enqueue_http_task,
+                f"{base_url}/api/wearables/{provider}/webhook/process",
+                {"job_id": job_id, "payload": payload, "user_id": user_id},
+                job_id,
+            )
+            accepted = task is not None
+        except Exception as exc:
+            logger.warning("Cloud Tasks webhook enqueue failed, spooling %s locally: %s", job_id, exc)
+    if accepted is None:
+        job_id, accepted = await webhook_queue.enqueue(provider, payload, user_id=user_id)
+
+    return {
+        "status": "accepted",
+        "provider": provider,
+        "job_id": job_id,
+        "duplicate": not accepted,
+    }
+
+
+@wearables_router.post("/{provider}/webhook/process")
+async def process_webhook_task(
+    provider: str,
+    request: Request,
+    job_id: str = Body(...),
+    payload: dict[str, Any] = Body(...),
+    user_id: str | None = Body(default=None),
+):
+    """Process a webhook queued in Cloud Tasks (errors make Cloud Tasks retry)."""
+    verify_internal_request(request)
+    if provider not in PROVIDERS or provider == "apple":
+        raise HTTPException(status_code=404, detail="Provider not supported")
+
+    job = WebhookJob(job_id=job_id, provider=provider, payload=payload, user_id=user_id)
+    try:
+        saved = await process_webhook_job(job)
+    except PermanentJobError as exc:
+        logger.warning("Webhook task %s rejected: %s", job_id, exc)
+        webhook_queue.rejected += 1
+        return {"status": "rejected", "job_id": job_id, "records": 0}
+    return {"status": "ok", "job_id": job_id, "records": saved}
+
+
+async def process_webhook_job(job: WebhookJob) -> int:
+    """Resolve, normalize and persist a queued webhook payload.
+
+    Raises:
+        PermanentJobError: If no NGX user is connected to the provider user
+    """
+    provider = job.provider
+    payload = job.payload
+
     provider_user_id = payload.get("userId") or payload.get("user_id")
     resolved_user_id = None
     if provider_user_id:
         resolved_user_id = await resolve_user_id(provider, str(provider_user_id))
 
-    effective_user_id = resolved_user_id or user_id
+    effective_user_id = resolved_user_id or job.user_id
     if not effective_user_id:
-        raise HTTPException(status_code=400, detail="user_id is required for this webhook")
+        raise PermanentJobError(f"unknown {provider} provider user {provider_user_id}")
 
     metrics_list: list = []
     if provider == "garmin":
@@ -153,11 +241,7 @@ async def wearable_webhook(
         await save_wearable_data(metrics)
         saved += 1
 
-    return {
-        "status": "ok",
-        "provider": provider,
-        "records": saved,
-    }
+    return saved
 
 
 @wearables_router.post("/apple/ingest")
@@ -177,6 +261,98 @@ async def ingest_apple_health(request: AppleIngestRequest):
     }
 
 
+@wearables_router.post("/{provider}/ingest/stream")
+async def ingest_stream(
+    request: Request,
+    provider: str,
+    user_id: str = Query(..., description="User identifier"),
+):
+    """Ingest a large export without buffering the whole body.
+
+    Accepts NDJSON (``Content-Type: application/x-ndjson``, one day per
+    line), a JSON array of days, or an object with a ``dailies``/``data``
+    array. Days are normalized as they are parsed and stored in batches, so
+    on a malformed body the batches before the error are kept. Days that
+    parse but fail normalization are skipped and listed in ``errors``.
+    """
+    normalize = STREAM_NORMALIZERS.get(provider)
+    if not normalize:
+        raise HTTPException(status_code=404, detail="Provider not supported")
+
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type:
+        records = iter_ndjson(request.stream())
+    else:
+        records = iter_json_records(request.stream())
+
+    try:
+        result = await ingest_records(provider, user_id, records, normalize)
+    except StreamingParseError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return {
+        "status": "ok",
+        "provider": provider,
+        **result,
+    }
+
+
+async def ingest_records(
+    provider: str,
+    user_id: str,
+    records: AsyncIterator[dict[str, Any]],
+    normalize: Callable[[dict[str, Any], str], WearableMetrics],
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> dict[str, Any]:
+    """Normalize streamed day records and persist them in batches.
+
+    A record that fails normalization is skipped and reported by its
+    position in the stream (1-based; blank NDJSON lines are not counted)
+    instead of failing the whole stream.
+
+    Returns:
+        {"records": rows the store saved, "rejected": records skipped,
+        "errors": [{"record": position, "error": message}, ...]} with at
+        most STREAM_MAX_REPORTED_ERRORS errors listed
+    """
+    saved = 0
+    errors: list[dict[str, Any]] = []
+    rejected = 0
+    raw_batch: list[dict[str, Any]] = []
+    metrics_batch: list[WearableMetrics] = []
+
+    async def _flush() -> int:
+        await save_raw_payload(
+            user_id, provider, "stream", {"data": raw_batch}, data_date=metrics_batch[0].data_date
+        )
+        return await save_wearable_data_batch(metrics_batch)
+
+    position = 0
+    async for record in records:
+        position += 1
+        try:
+            metrics = normalize(record, user_id)
+            metrics.readiness_score = calculate_readiness(metrics)
+        except Exception as exc:
+            rejected += 1
+            if len(errors) < STREAM_MAX_REPORTED_ERRORS:
+                errors.append({"record": position, "error": str(exc) or type(exc).__name__})
+            continue
+        raw_batch.append(record)
+        metrics_batch.append(metrics)
+        if len(raw_batch) >= batch_size:
+            saved += await _flush()
+            raw_batch = []
+            metrics_batch = []
+
+    if raw_batch:
+        saved += await _flush()
+
+    if rejected:
+        logger.warning("Skipped %d invalid %s records for %s", rejected, provider, user_id)
+    return {"records": saved, "rejected": rejected, "errors": errors}
+
+
 def _parse_expires_at(value: Any) -> datetime | None:
     if not value:
         return None
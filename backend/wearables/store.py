@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import date, datetime
 from typing import Any
 
 from services import supabase_client
 from services.crypto import encrypt_string, decrypt_string
-from wearables.models import WearableMetrics, WearableTokens
+from wearables.archive import content_hash, raw_archive
+from wearables.cache import provider_user_cache
+from wearables.models import WearableMetrics, WearableTokens, to_records
 
 logger = logging.getLogger(__name__)
 
@@ -35,17 +38,35 @@ async def upsert_connection(
         "scopes": tokens.scopes or [],
         "updated_at": datetime.utcnow().isoformat(),
     }
+    # The provider account may have changed (reconnected with another
+    # account): the old id must stop resolving to this user
+    previous_provider_user_id = _connection_provider_user_id(user_id, provider)
 
     try:
         result = SUPABASE.table("wearable_connections").upsert(
             payload,
             on_conflict="user_id,provider",
         ).execute()
-        return result.data[0] if result.data else None
     except Exception as exc:
         logger.exception("Failed to upsert wearable connection: %s", exc)
         return None
 
+    for provider_user_id in {previous_provider_user_id, tokens.provider_user_id}:
+        if provider_user_id:
+            await provider_user_cache.invalidate(provider, str(provider_user_id))
+    return result.data[0] if result.data else None
+
+
+def _connection_provider_user_id(user_id: str, provider: str) -> str | None:
+    try:
+        result = SUPABASE.table("wearable_connections").select("provider_user_id").eq(
+            "user_id", user_id
+        ).eq("provider", provider).maybe_single().execute()
+    except Exception as exc:
+        logger.warning("Failed to read previous provider user id: %s", exc)
+        return None
+    return (result.data or {}).get("provider_user_id") if result else None
+
 
 async def get_connection(user_id: str, provider: str) -> dict[str, Any] | None:
     if not SUPABASE_ENABLED:
@@ -86,6 +107,34 @@ async def save_wearable_data(metrics: WearableMetrics) -> dict[str, Any] | None:
         return None
 
 
+async def save_wearable_data_batch(metrics_list: list[WearableMetrics]) -> int:
+    """Upsert many metrics rows in a single request.
+
+    Returns the number of rows sent. Rows for the same user/provider/day are
+    collapsed (last one wins) since Postgres can't upsert a row twice in one
+    statement.
+    """
+    if not metrics_list:
+        return 0
+    if not SUPABASE_ENABLED:
+        logger.warning("Supabase not configured. Skipping wearable data batch save.")
+        return 0
+
+    records: dict[tuple[str, str, str], dict[str, Any]] = {}
+    for record in to_records(metrics_list):
+        records[(record["user_id"], record["provider"], record["data_date"])] = record
+
+    try:
+        SUPABASE.table("wearable_data").upsert(
+            list(records.values()),
+            on_conflict="user_id,provider,data_date",
+        ).execute()
+        return len(records)
+    except Exception as exc:
+        logger.exception("Failed to save wearable data batch: %s", exc)
+        return 0
+
+
 async def save_raw_payload(
     user_id: str,
     provider: str,
@@ -93,20 +142,49 @@ async def save_raw_payload(
     payload: dict[str, Any],
     data_date: date | None = None,
 ) -> dict[str, Any] | None:
+    """Archive a raw provider payload and record a pointer row.
+
+    The payload itself goes to the compressed raw archive; ``wearable_raw``
+    only stores its location and hash. Rows are deduplicated in the database
+    on (user_id, content_hash), so a retry after a failed insert still writes
+    the row. If no archive is configured or the archive write fails, the
+    payload is stored inline as before so nothing is lost.
+    """
     if not SUPABASE_ENABLED:
         logger.warning("Supabase not configured. Skipping raw wearable payload save.")
         return None
 
+    digest = content_hash(payload)
+    raw_payload: dict[str, Any] = {
+        "user_id": user_id,
+        "provider": provider,
+        "endpoint": endpoint,
+        "data_date": data_date.isoformat() if data_date else None,
+        "synced_at": datetime.utcnow().isoformat(),
+        "content_hash": digest,
+        "payload": payload,
+    }
+
+    if raw_archive is not None:
+        try:
+            archived = await asyncio.to_thread(raw_archive.put, provider, payload, digest)
+        except Exception as exc:
+            logger.exception("Failed to archive wearable raw payload, storing inline: %s", exc)
+        else:
+            raw_payload.update({
+                "payload": None,
+                "archive_uri": archived.uri,
+                "size_bytes": archived.size_bytes,
+                "record_count": archived.record_count,
+            })
+
     try:
-        raw_payload = {
-            "user_id": user_id,
-            "provider": provider,
-            "endpoint": endpoint,
-            "data_date": data_date.isoformat() if data_date else None,
-            "payload": payload,
-            "synced_at": datetime.utcnow().isoformat(),
-        }
-        result = SUPABASE.table("wearable_raw").insert(raw_payload).execute()
+        # Identical payloads for the same user keep their first row
+        result = SUPABASE.table("wearable_raw").upsert(
+            raw_payload,
+            on_conflict="user_id,content_hash",
+            ignore_duplicates=True,
+        ).execute()
         return result.data[0] if result.data else None
     except Exception as exc:
         logger.exception("Failed to save wearable raw payload: %s", exc)
@@ -117,15 +195,22 @@ async def resolve_user_id(provider: str, provider_user_id: str) -> str | None:
     if not SUPABASE_ENABLED:
         return None
 
+    found, cached_user_id = await provider_user_cache.get(provider, provider_user_id)
+    if found:
+        return cached_user_id
+
     try:
         result = SUPABASE.table("wearable_connections").select("user_id").eq(
             "provider", provider
         ).eq("provider_user_id", provider_user_id).maybe_single().execute()
-        if result.data:
-            return result.data.get("user_id")
     except Exception as exc:
+        # Don't cache lookup failures, only definitive answers
         logger.exception("Failed to resolve user id: %s", exc)
-    return None
+        return None
+
+    user_id = result.data.get("user_id") if result and result.data else None
+    await provider_user_cache.set(provider, provider_user_id, user_id)
+    return user_id
 
 
 async def list_active_connections(provider: str | None = None) -> list[dict[str, Any]]:
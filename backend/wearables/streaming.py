@@ -0,0 +1,195 @@
+"""Incremental JSON / NDJSON readers for large wearable payloads.
+
+Multi-month HealthKit exports and Garmin backfills can be tens of MB. These
+readers consume the request body chunk by chunk and yield one record (one
+day) at a time, so memory stays bounded by the largest single record rather
+than the whole body.
+
+Supported body shapes:
+- NDJSON: one JSON object per line
+- JSON array: ``[{...}, {...}]``
+- JSON object with a collection key: ``{"dailies": [{...}, ...], ...}``
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Iterable
+
+# Largest single record we are willing to buffer
+MAX_RECORD_BYTES = 1024 * 1024
+
+_WHITESPACE = " \t\r\n"
+_DECODER = json.JSONDecoder()
+
+
+class StreamingParseError(ValueError):
+    """Raised when a streamed body is malformed or a record is too large."""
+
+
+async def iter_ndjson(
+    chunks: AsyncIterable[bytes],
+    max_record_bytes: int = MAX_RECORD_BYTES,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield one object per non-empty line of an NDJSON body."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    line_no = 0
+
+    def _parse(line: str) -> dict[str, Any] | None:
+        nonlocal line_no
+        line_no += 1
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise StreamingParseError(f"Invalid JSON on line {line_no}: {exc.msg}") from exc
+        if not isinstance(record, dict):
+            raise StreamingParseError(f"Line {line_no} is not a JSON object")
+        return record
+
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        start = 0
+        while True:
+            newline = buffer.find("\n", start)
+            if newline == -1:
+                break
+            record = _parse(buffer[start:newline])
+            if record is not None:
+                yield record
+            start = newline + 1
+        buffer = buffer[start:]
+        if len(buffer) > max_record_bytes:
+            raise StreamingParseError("NDJSON record exceeds maximum size")
+
+    buffer += decoder.decode(b"", final=True)
+    record = _parse(buffer)
+    if record is not None:
+        yield record
+
+
+class _Reader:
+    """Character buffer over an async byte stream with refill on demand."""
+
+    def __init__(self, chunks: AsyncIterable[bytes], max_record_bytes: int) -> None:
+        self._chunks = chunks.__aiter__()
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._max_record_bytes = max_record_bytes
+        self.buffer = ""
+        self.pos = 0
+        self.exhausted = False
+
+    async def fill(self) -> bool:
+        """Append the next chunk; returns False when the stream is exhausted."""
+        if self.exhausted:
+            return False
+        # Drop consumed text so the buffer only holds the unparsed tail
+        if self.pos:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self.buffer += self._decoder.decode(b"", final=True)
+            self.exhausted = True
+            return False
+        self.buffer += self._decoder.decode(chunk)
+        return True
+
+    async def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not await self.fill():
+                return ""
+
+    async def expect(self, chars: str) -> str:
+        char = await self.peek()
+        if not char or char not in chars:
+            raise StreamingParseError(f"Expected one of {chars!r}, got {char or 'end of body'!r}")
+        self.pos += 1
+        return char
+
+    async def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        await self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if len(self.buffer) - self.pos > self._max_record_bytes:
+                    raise StreamingParseError("JSON record exceeds maximum size")
+                if not await self.fill():
+                    raise StreamingParseError("Truncated or invalid JSON body")
+                continue
+            # A scalar at the very end of the buffer may continue in the
+            # next chunk (e.g. a number split across chunks)
+            if end >= len(self.buffer) and not self.exhausted:
+                if await self.fill():
+                    continue
+            self.pos = end
+            return value
+
+
+async def _iter_array(reader: _Reader) -> AsyncIterator[Any]:
+    await reader.expect("[")
+    if await reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield await reader.value()
+        if await reader.expect(",]") == "]":
+            return
+
+
+async def iter_json_records(
+    chunks: AsyncIterable[bytes],
+    collection_keys: Iterable[str] = ("dailies", "data", "records", "samples", "days"),
+    envelope: dict[str, Any] | None = None,
+    max_record_bytes: int = MAX_RECORD_BYTES,
+) -> AsyncIterator[dict[str, Any]]:
+    """Yield records from a JSON array or from the collection array of an object.
+
+    Top-level scalar/object values of an enveloped body are collected into
+    ``envelope`` (when provided) as they are parsed; values that appear after
+    the collection are only available once iteration finishes.
+    """
+    keys = set(collection_keys)
+    reader = _Reader(chunks, max_record_bytes)
+
+    first = await reader.peek()
+    if first == "[":
+        async for item in _iter_array(reader):
+            if isinstance(item, dict):
+                yield item
+        return
+
+    if first != "{":
+        raise StreamingParseError("Body must be a JSON array or object")
+
+    reader.pos += 1
+    if await reader.peek() == "}":
+        reader.pos += 1
+        return
+    while True:
+        key = await reader.value()
+        if not isinstance(key, str):
+            raise StreamingParseError("Object keys must be strings")
+        await reader.expect(":")
+        if key in keys and await reader.peek() == "[":
+            async for item in _iter_array(reader):
+                if isinstance(item, dict):
+                    yield item
+        else:
+            value = await reader.value()
+            if envelope is not None:
+                envelope[key] = value
+        if await reader.expect(",}") == "}":
+            return
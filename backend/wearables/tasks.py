@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import base64
 import json
 import os
 from typing import Any
@@ -23,7 +24,16 @@ def _queue_path() -> str:
     return f"projects/{CLOUD_TASKS_PROJECT}/locations/{CLOUD_TASKS_LOCATION}/queues/{CLOUD_TASKS_QUEUE}"
 
 
-def enqueue_http_task(url: str, payload: dict[str, Any] | None = None) -> dict[str, Any]:
+def enqueue_http_task(
+    url: str,
+    payload: dict[str, Any] | None = None,
+    task_id: str | None = None,
+) -> dict[str, Any] | None:
+    """Create an HTTP task on the configured queue.
+
+    ``task_id`` names the task so Cloud Tasks rejects a second task with the
+    same id; that case returns None instead of raising.
+    """
     if not is_tasks_configured():
         raise RuntimeError("Cloud Tasks not configured")
 
@@ -40,8 +50,12 @@ def enqueue_http_task(url: str, payload: dict[str, Any] | None = None) -> dict[s
         }
     }
 
+    if task_id:
+        task["name"] = f"{_queue_path()}/tasks/{task_id}"
+
     if payload is not None:
-        task["httpRequest"]["body"] = json.dumps(payload).encode("utf-8")
+        # The REST API takes the body as a base64 string
+        task["httpRequest"]["body"] = base64.b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
 
     if SYNC_API_KEY:
         task["httpRequest"]["headers"]["X-API-Key"] = SYNC_API_KEY
@@ -61,5 +75,7 @@ def enqueue_http_task(url: str, payload: dict[str, Any] | None = None) -> dict[s
         json={"task": task},
         timeout=10,
     )
+    if task_id and response.status_code == 409:
+        return None
     response.raise_for_status()
     return response.json()
@@ -0,0 +1,35 @@
+-- NGX GENESIS - Wearable Raw Archive Pointers
+-- Migration: 20261019000001_wearable_raw_archive
+--
+-- Raw provider payloads are now written to a compressed, content-addressed
+-- NDJSON archive (local dir or GCS bucket). wearable_raw keeps only a
+-- pointer to the archived segment; payload stays as a nullable fallback for
+-- rows written when the archive is unavailable.
+
+-- ============================================================================
+-- STEP 1: Pointer columns
+-- ============================================================================
+
+ALTER TABLE wearable_raw ALTER COLUMN payload DROP NOT NULL;
+
+ALTER TABLE wearable_raw ADD COLUMN IF NOT EXISTS archive_uri TEXT;
+ALTER TABLE wearable_raw ADD COLUMN IF NOT EXISTS content_hash CHAR(64);
+ALTER TABLE wearable_raw ADD COLUMN IF NOT EXISTS size_bytes INT;
+ALTER TABLE wearable_raw ADD COLUMN IF NOT EXISTS record_count INT;
+
+-- Every row must carry either an inline payload or an archive pointer
+ALTER TABLE wearable_raw DROP CONSTRAINT IF EXISTS wearable_raw_payload_or_pointer;
+ALTER TABLE wearable_raw ADD CONSTRAINT wearable_raw_payload_or_pointer
+  CHECK (payload IS NOT NULL OR archive_uri IS NOT NULL);
+
+-- ============================================================================
+-- STEP 2: Indexes
+-- ============================================================================
+
+-- Dedup key for save_raw_payload (upsert ... on_conflict ignore). Rows
+-- without a hash (written before this migration) never conflict.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_wearable_raw_user_content_hash
+  ON wearable_raw(user_id, content_hash);
+
+COMMENT ON COLUMN wearable_raw.archive_uri IS 'Location of the gzip NDJSON segment in the raw archive';
+COMMENT ON COLUMN wearable_raw.content_hash IS 'SHA-256 of the canonical payload JSON (dedup key per user)';